@@ -25,6 +25,25 @@ class BackendConfiguration(ServiceConfiguration):
         """
         ServiceConfiguration.__init__(self)
         self.set_db_connection_string('sqlite:////GreenInHouse/db/GreenInHouseBackend.sqlite3.db')
+        self.set_db_journal_mode('WAL')
+        self.set_db_synchronous('NORMAL')
+        self.set_db_cache_size(-8000)
+        self.set_db_mmap_size(67108864)
+        self.set_db_temp_store('MEMORY')
+        self.set_db_busy_timeout(5000)
+        self.set_db_retention_raw_days(30)
+        self.set_db_retention_hourly_days(365)
+        self.set_db_retention_daily_days(0)
+        self.set_db_compaction_chunk_size(5000)
+        self.set_db_compaction_hour(3)
+        self.set_sampling_interval(600)
+        self.set_sampling_read_deadline(20)
+        self.set_sampling_heartbeat_interval(3600)
+        self.set_sampling_spool_path('/GreenInHouse/db/GreenInHouseBackend.spool')
+        self.set_metadata_cache_ttl(60)
+        self.set_metadata_cache_size(1024)
+        self.set_interval_cache_size(4096)
+        self.set_interval_cache_grace(900)
         self.set_service_host('127.0.0.1')
         self.set_service_port(5000)
         self.set_debug_flag(False)
@@ -44,6 +63,44 @@ class BackendConfiguration(ServiceConfiguration):
         ServiceConfiguration._set_values(self, values)
         if 'db_connection_string' in values:
             self.set_db_connection_string(values['db_connection_string'])
+        if 'db_journal_mode' in values:
+            self.set_db_journal_mode(values['db_journal_mode'])
+        if 'db_synchronous' in values:
+            self.set_db_synchronous(values['db_synchronous'])
+        if 'db_cache_size' in values:
+            self.set_db_cache_size(values['db_cache_size'])
+        if 'db_mmap_size' in values:
+            self.set_db_mmap_size(values['db_mmap_size'])
+        if 'db_temp_store' in values:
+            self.set_db_temp_store(values['db_temp_store'])
+        if 'db_busy_timeout' in values:
+            self.set_db_busy_timeout(values['db_busy_timeout'])
+        if 'db_retention_raw_days' in values:
+            self.set_db_retention_raw_days(values['db_retention_raw_days'])
+        if 'db_retention_hourly_days' in values:
+            self.set_db_retention_hourly_days(values['db_retention_hourly_days'])
+        if 'db_retention_daily_days' in values:
+            self.set_db_retention_daily_days(values['db_retention_daily_days'])
+        if 'db_compaction_chunk_size' in values:
+            self.set_db_compaction_chunk_size(values['db_compaction_chunk_size'])
+        if 'db_compaction_hour' in values:
+            self.set_db_compaction_hour(values['db_compaction_hour'])
+        if 'sampling_interval' in values:
+            self.set_sampling_interval(values['sampling_interval'])
+        if 'sampling_read_deadline' in values:
+            self.set_sampling_read_deadline(values['sampling_read_deadline'])
+        if 'sampling_heartbeat_interval' in values:
+            self.set_sampling_heartbeat_interval(values['sampling_heartbeat_interval'])
+        if 'sampling_spool_path' in values:
+            self.set_sampling_spool_path(values['sampling_spool_path'])
+        if 'metadata_cache_ttl' in values:
+            self.set_metadata_cache_ttl(values['metadata_cache_ttl'])
+        if 'metadata_cache_size' in values:
+            self.set_metadata_cache_size(values['metadata_cache_size'])
+        if 'interval_cache_size' in values:
+            self.set_interval_cache_size(values['interval_cache_size'])
+        if 'interval_cache_grace' in values:
+            self.set_interval_cache_grace(values['interval_cache_grace'])
         if 'salt' in values:
             self.set_password_salt(values['salt'])
         if 'jws_secret' in values:
@@ -73,6 +130,425 @@ class BackendConfiguration(ServiceConfiguration):
 
         return str(self._values['db_connection_string'])
 
+    def set_db_journal_mode(self, journal_mode: str) -> None:
+        """ Sets the SQLite journal_mode configuration value.
+
+        Args:
+            - journal_mode: A string with the configuration value (DELETE, TRUNCATE, PERSIST, MEMORY, WAL or OFF).
+
+        Raises:
+            - ValueError: If validation is not passed.
+        """
+        journal_mode = str(journal_mode).upper()
+        if journal_mode not in ('DELETE', 'TRUNCATE', 'PERSIST', 'MEMORY', 'WAL', 'OFF'):
+            raise ValueError('Invalid db_journal_mode value: ' + journal_mode)
+        self._values['db_journal_mode'] = journal_mode
+
+    def get_db_journal_mode(self) -> str:
+        """ Gets the SQLite journal_mode configuration value.
+
+        Returns:
+            - str: A string with the value of db_journal_mode.
+        """
+
+        return str(self._values['db_journal_mode'])
+
+    def set_db_synchronous(self, synchronous: str) -> None:
+        """ Sets the SQLite synchronous configuration value.
+
+        Args:
+            - synchronous: A string with the configuration value (OFF, NORMAL, FULL or EXTRA).
+
+        Raises:
+            - ValueError: If validation is not passed.
+        """
+        synchronous = str(synchronous).upper()
+        if synchronous not in ('OFF', 'NORMAL', 'FULL', 'EXTRA'):
+            raise ValueError('Invalid db_synchronous value: ' + synchronous)
+        self._values['db_synchronous'] = synchronous
+
+    def get_db_synchronous(self) -> str:
+        """ Gets the SQLite synchronous configuration value.
+
+        Returns:
+            - str: A string with the value of db_synchronous.
+        """
+
+        return str(self._values['db_synchronous'])
+
+    def set_db_cache_size(self, cache_size: int) -> None:
+        """ Sets the SQLite cache_size configuration value.
+
+        Args:
+            - cache_size: An integer with the configuration value (pages if positive, KiB if negative).
+
+        Raises:
+            - ValueError: If validation is not passed.
+        """
+        self._values['db_cache_size'] = int(cache_size)
+
+    def get_db_cache_size(self) -> int:
+        """ Gets the SQLite cache_size configuration value.
+
+        Returns:
+            - int: An integer with the value of db_cache_size.
+        """
+
+        return int(self._values['db_cache_size'])
+
+    def set_db_mmap_size(self, mmap_size: int) -> None:
+        """ Sets the SQLite mmap_size configuration value.
+
+        Args:
+            - mmap_size: An integer with the configuration value in bytes.
+
+        Raises:
+            - ValueError: If validation is not passed.
+        """
+        if int(mmap_size) < 0:
+            raise ValueError('Invalid db_mmap_size value: ' + str(mmap_size))
+        self._values['db_mmap_size'] = int(mmap_size)
+
+    def get_db_mmap_size(self) -> int:
+        """ Gets the SQLite mmap_size configuration value.
+
+        Returns:
+            - int: An integer with the value of db_mmap_size.
+        """
+
+        return int(self._values['db_mmap_size'])
+
+    def set_db_temp_store(self, temp_store: str) -> None:
+        """ Sets the SQLite temp_store configuration value.
+
+        Args:
+            - temp_store: A string with the configuration value (DEFAULT, FILE or MEMORY).
+
+        Raises:
+            - ValueError: If validation is not passed.
+        """
+        temp_store = str(temp_store).upper()
+        if temp_store not in ('DEFAULT', 'FILE', 'MEMORY'):
+            raise ValueError('Invalid db_temp_store value: ' + temp_store)
+        self._values['db_temp_store'] = temp_store
+
+    def get_db_temp_store(self) -> str:
+        """ Gets the SQLite temp_store configuration value.
+
+        Returns:
+            - str: A string with the value of db_temp_store.
+        """
+
+        return str(self._values['db_temp_store'])
+
+    def set_db_busy_timeout(self, busy_timeout: int) -> None:
+        """ Sets the SQLite busy_timeout configuration value.
+
+        Args:
+            - busy_timeout: An integer with the configuration value in milliseconds.
+
+        Raises:
+            - ValueError: If validation is not passed.
+        """
+        if int(busy_timeout) < 0:
+            raise ValueError('Invalid db_busy_timeout value: ' + str(busy_timeout))
+        self._values['db_busy_timeout'] = int(busy_timeout)
+
+    def get_db_busy_timeout(self) -> int:
+        """ Gets the SQLite busy_timeout configuration value.
+
+        Returns:
+            - int: An integer with the value of db_busy_timeout.
+        """
+
+        return int(self._values['db_busy_timeout'])
+
+    def set_db_retention_raw_days(self, retention_days: int) -> None:
+        """ Sets the number of days the raw sensor readings are kept before being compacted.
+
+        Args:
+            - retention_days: An integer with the configuration value in days (0 keeps them forever).
+
+        Raises:
+            - ValueError: If validation is not passed.
+        """
+        if int(retention_days) < 0:
+            raise ValueError('Invalid db_retention_raw_days value: ' + str(retention_days))
+        self._values['db_retention_raw_days'] = int(retention_days)
+
+    def get_db_retention_raw_days(self) -> int:
+        """ Gets the number of days the raw sensor readings are kept.
+
+        Returns:
+            - int: An integer with the value of db_retention_raw_days.
+        """
+
+        return int(self._values['db_retention_raw_days'])
+
+    def set_db_retention_hourly_days(self, retention_days: int) -> None:
+        """ Sets the number of days the hourly aggregated sensor readings are kept.
+
+        Args:
+            - retention_days: An integer with the configuration value in days (0 keeps them forever).
+
+        Raises:
+            - ValueError: If validation is not passed.
+        """
+        if int(retention_days) < 0:
+            raise ValueError('Invalid db_retention_hourly_days value: ' + str(retention_days))
+        self._values['db_retention_hourly_days'] = int(retention_days)
+
+    def get_db_retention_hourly_days(self) -> int:
+        """ Gets the number of days the hourly aggregated sensor readings are kept.
+
+        Returns:
+            - int: An integer with the value of db_retention_hourly_days.
+        """
+
+        return int(self._values['db_retention_hourly_days'])
+
+    def set_db_retention_daily_days(self, retention_days: int) -> None:
+        """ Sets the number of days the daily aggregated sensor readings are kept.
+
+        Args:
+            - retention_days: An integer with the configuration value in days (0 keeps them forever).
+
+        Raises:
+            - ValueError: If validation is not passed.
+        """
+        if int(retention_days) < 0:
+            raise ValueError('Invalid db_retention_daily_days value: ' + str(retention_days))
+        self._values['db_retention_daily_days'] = int(retention_days)
+
+    def get_db_retention_daily_days(self) -> int:
+        """ Gets the number of days the daily aggregated sensor readings are kept.
+
+        Returns:
+            - int: An integer with the value of db_retention_daily_days.
+        """
+
+        return int(self._values['db_retention_daily_days'])
+
+    def set_db_compaction_chunk_size(self, chunk_size: int) -> None:
+        """ Sets the maximum number of rows deleted per transaction by the compaction job.
+
+        Args:
+            - chunk_size: An integer with the configuration value.
+
+        Raises:
+            - ValueError: If validation is not passed.
+        """
+        if int(chunk_size) <= 0:
+            raise ValueError('Invalid db_compaction_chunk_size value: ' + str(chunk_size))
+        self._values['db_compaction_chunk_size'] = int(chunk_size)
+
+    def get_db_compaction_chunk_size(self) -> int:
+        """ Gets the maximum number of rows deleted per transaction by the compaction job.
+
+        Returns:
+            - int: An integer with the value of db_compaction_chunk_size.
+        """
+
+        return int(self._values['db_compaction_chunk_size'])
+
+    def set_db_compaction_hour(self, hour: int) -> None:
+        """ Sets the local hour of the day from which the sampler runs the daily compaction job.
+
+        Args:
+            - hour: An integer with the configuration value (0 to 23).
+
+        Raises:
+            - ValueError: If validation is not passed.
+        """
+        if int(hour) < 0 or int(hour) > 23:
+            raise ValueError('Invalid db_compaction_hour value: ' + str(hour))
+        self._values['db_compaction_hour'] = int(hour)
+
+    def get_db_compaction_hour(self) -> int:
+        """ Gets the local hour of the day from which the sampler runs the daily compaction job.
+
+        Returns:
+            - int: An integer with the value of db_compaction_hour.
+        """
+
+        return int(self._values['db_compaction_hour'])
+
+    def set_sampling_interval(self, sampling_interval: float) -> None:
+        """ Sets the time between the starts of two consecutive sensor sampling cycles.
+
+        Args:
+            - sampling_interval: A float with the configuration value in seconds.
+
+        Raises:
+            - ValueError: If validation is not passed.
+        """
+        if float(sampling_interval) <= 0:
+            raise ValueError('Invalid sampling_interval value: ' + str(sampling_interval))
+        self._values['sampling_interval'] = float(sampling_interval)
+
+    def get_sampling_interval(self) -> float:
+        """ Gets the time between the starts of two consecutive sensor sampling cycles.
+
+        Returns:
+            - float: A float with the value of sampling_interval in seconds.
+        """
+
+        return float(self._values['sampling_interval'])
+
+    def set_sampling_read_deadline(self, sampling_read_deadline: float) -> None:
+        """ Sets the maximum time allowed to read a single sensor, retries included.
+
+        Args:
+            - sampling_read_deadline: A float with the configuration value in seconds.
+
+        Raises:
+            - ValueError: If validation is not passed.
+        """
+        if float(sampling_read_deadline) <= 0:
+            raise ValueError('Invalid sampling_read_deadline value: ' + str(sampling_read_deadline))
+        self._values['sampling_read_deadline'] = float(sampling_read_deadline)
+
+    def get_sampling_read_deadline(self) -> float:
+        """ Gets the maximum time allowed to read a single sensor, retries included.
+
+        Returns:
+            - float: A float with the value of sampling_read_deadline in seconds.
+        """
+
+        return float(self._values['sampling_read_deadline'])
+
+    def set_sampling_heartbeat_interval(self, sampling_heartbeat_interval: float) -> None:
+        """ Sets the maximum time between two stored readings of a sensor with compressed readings.
+
+        Args:
+            - sampling_heartbeat_interval: A float with the configuration value in seconds.
+
+        Raises:
+            - ValueError: If validation is not passed.
+        """
+        if float(sampling_heartbeat_interval) <= 0:
+            raise ValueError('Invalid sampling_heartbeat_interval value: ' + str(sampling_heartbeat_interval))
+        self._values['sampling_heartbeat_interval'] = float(sampling_heartbeat_interval)
+
+    def get_sampling_heartbeat_interval(self) -> float:
+        """ Gets the maximum time between two stored readings of a sensor with compressed readings.
+
+        Returns:
+            - float: A float with the value of sampling_heartbeat_interval in seconds.
+        """
+
+        return float(self._values['sampling_heartbeat_interval'])
+
+    def set_sampling_spool_path(self, sampling_spool_path: str) -> None:
+        """ Sets the path of the file where the sampler keeps the readings until they are stored in the database.
+
+        Args:
+            - sampling_spool_path: A string with the configuration value.
+
+        Raises:
+            - ValueError: If validation is not passed.
+        """
+        if not str(sampling_spool_path):
+            raise ValueError('Invalid sampling_spool_path value: ' + str(sampling_spool_path))
+        self._values['sampling_spool_path'] = str(sampling_spool_path)
+
+    def get_sampling_spool_path(self) -> str:
+        """ Gets the path of the file where the sampler keeps the readings until they are stored in the database.
+
+        Returns:
+            - str: A string with the value of sampling_spool_path.
+        """
+
+        return str(self._values['sampling_spool_path'])
+
+    def set_metadata_cache_ttl(self, metadata_cache_ttl: float) -> None:
+        """ Sets the time plants, plant types, sensors, their associations and advice are kept in the in-process cache.
+
+        Args:
+            - metadata_cache_ttl: A float with the configuration value in seconds (0 disables the cache).
+
+        Raises:
+            - ValueError: If validation is not passed.
+        """
+        if float(metadata_cache_ttl) < 0:
+            raise ValueError('Invalid metadata_cache_ttl value: ' + str(metadata_cache_ttl))
+        self._values['metadata_cache_ttl'] = float(metadata_cache_ttl)
+
+    def get_metadata_cache_ttl(self) -> float:
+        """ Gets the time plants, plant types, sensors, their associations and advice are kept in the in-process cache.
+
+        Returns:
+            - float: A float with the value of metadata_cache_ttl in seconds.
+        """
+
+        return float(self._values['metadata_cache_ttl'])
+
+    def set_metadata_cache_size(self, metadata_cache_size: int) -> None:
+        """ Sets the maximum number of entries of the in-process metadata cache.
+
+        Args:
+            - metadata_cache_size: An integer with the configuration value.
+
+        Raises:
+            - ValueError: If validation is not passed.
+        """
+        if int(metadata_cache_size) < 1:
+            raise ValueError('Invalid metadata_cache_size value: ' + str(metadata_cache_size))
+        self._values['metadata_cache_size'] = int(metadata_cache_size)
+
+    def get_metadata_cache_size(self) -> int:
+        """ Gets the maximum number of entries of the in-process metadata cache.
+
+        Returns:
+            - int: An integer with the value of metadata_cache_size.
+        """
+
+        return int(self._values['metadata_cache_size'])
+
+    def set_interval_cache_size(self, interval_cache_size: int) -> None:
+        """ Sets the maximum number of closed intervals whose sensor averages are kept in the in-process cache.
+
+        Args:
+            - interval_cache_size: An integer with the configuration value (0 disables the cache).
+
+        Raises:
+            - ValueError: If validation is not passed.
+        """
+        if int(interval_cache_size) < 0:
+            raise ValueError('Invalid interval_cache_size value: ' + str(interval_cache_size))
+        self._values['interval_cache_size'] = int(interval_cache_size)
+
+    def get_interval_cache_size(self) -> int:
+        """ Gets the maximum number of closed intervals whose sensor averages are kept in the in-process cache.
+
+        Returns:
+            - int: An integer with the value of interval_cache_size.
+        """
+
+        return int(self._values['interval_cache_size'])
+
+    def set_interval_cache_grace(self, interval_cache_grace: float) -> None:
+        """ Sets the time after its end an interval is still recomputed, waiting for late readings, before it is cached.
+
+        Args:
+            - interval_cache_grace: A float with the configuration value in seconds.
+
+        Raises:
+            - ValueError: If validation is not passed.
+        """
+        if float(interval_cache_grace) < 0:
+            raise ValueError('Invalid interval_cache_grace value: ' + str(interval_cache_grace))
+        self._values['interval_cache_grace'] = float(interval_cache_grace)
+
+    def get_interval_cache_grace(self) -> float:
+        """ Gets the time after its end an interval is still recomputed, waiting for late readings, before it is cached.
+
+        Returns:
+            - float: A float with the value of interval_cache_grace in seconds.
+        """
+
+        return float(self._values['interval_cache_grace'])
+
     def set_password_salt(self, salt: str) -> None:
         """ Sets the password salt configuration value.
 
@@ -3,13 +3,18 @@ Modulo de clase Esquema
 """
 #Author: Oscar Valverde Escobar
 
-from sqlalchemy import create_engine, event  # type: ignore
+import threading
+from typing import Dict, Optional
+from sqlalchemy import create_engine, event, inspect  # type: ignore
 from sqlalchemy.engine import Engine  # type: ignore
 from sqlalchemy.ext.declarative import declarative_base  # type: ignore
 from sqlalchemy.orm import sessionmaker, scoped_session, registry  # type: ignore
 from sqlalchemy.orm.session import Session  # type: ignore
 from backend.data.config import BackendConfiguration
+from backend.data.util.cache_metadatos import CacheMetadatos
+from backend.data.util.cache_intervalos import CacheIntervalos
 from backend.data.db.results import Sensor, RegistroSensor, Planta
+from backend.data.db.results import RegistroSensorHorario, RegistroSensorDiario, EstadoRegistrosSensores
 from backend.data.db.results import TipoPlanta, SensorPlanta
 from backend.data.db.results import ConsejoTipoPlanta, ConsejoPlanta
 
@@ -44,29 +49,204 @@ class Esquema:
             )
         db_connection_string: str = config.get_db_connection_string() or ''
         self.__create_engine = create_engine(db_connection_string)
+        if self.__create_engine.dialect.name == 'sqlite':
+            self.__pragmas_sqlite = [
+                'PRAGMA auto_vacuum = INCREMENTAL;',
+                'PRAGMA journal_mode = ' + config.get_db_journal_mode() + ';',
+                'PRAGMA synchronous = ' + config.get_db_synchronous() + ';',
+                'PRAGMA cache_size = ' + str(config.get_db_cache_size()) + ';',
+                'PRAGMA mmap_size = ' + str(config.get_db_mmap_size()) + ';',
+                'PRAGMA temp_store = ' + config.get_db_temp_store() + ';',
+                'PRAGMA busy_timeout = ' + str(config.get_db_busy_timeout()) + ';',
+            ]
+            event.listen(self.__create_engine, "connect", self.__set_sqlite_tuning_pragmas)
         self.__session_maker = scoped_session(sessionmaker(bind=self.__create_engine))
+        self.__unidad_trabajo = threading.local()
+        event.listen(self.__create_engine, "before_cursor_execute", self.__count_query)
+        self.__cache_metadatos = CacheMetadatos(config.get_metadata_cache_ttl(), config.get_metadata_cache_size(),
+                                                self.__count_cache_lookup)
+        self.__cache_intervalos = CacheIntervalos(config.get_interval_cache_size())
+        self.__margen_intervalos: float = config.get_interval_cache_grace()
 
         Sensor.map(self.__registry)
         TipoPlanta.map(self.__registry)
         Planta.map(self.__registry)
         RegistroSensor.map(self.__registry)
+        RegistroSensorHorario.map(self.__registry)
+        RegistroSensorDiario.map(self.__registry)
+        EstadoRegistrosSensores.map(self.__registry)
         SensorPlanta.map(self.__registry)
         ConsejoTipoPlanta.map(self.__registry)
         ConsejoPlanta.map(self.__registry)
 
         self.__registry.metadata.create_all(self.__create_engine)
+        self.__add_missing_columns()
+        self.__create_indexes()
+
+    def __set_sqlite_tuning_pragmas(
+        self, conexion_dbapi, connection_record) -> None:  # pylint: disable=unused-argument
+        """
+        Ajuste de SQLite (journal, sincronizacion, cache, mmap, temporales y espera por bloqueo)
+        al realizar la conexion a la base de datos.
+        Args:
+            - dbapi_connection: Conexion de API a la base de datos
+        """
+        cursor = conexion_dbapi.cursor()
+        for pragma in self.__pragmas_sqlite:
+            cursor.execute(pragma)
+        cursor.close()
+
+    def __add_missing_columns(self) -> None:
+        """
+        Creacion de las columnas que no existan en las tablas de la base de datos.
+
+        create_all no modifica las tablas ya existentes, por lo que en bases de datos ya existentes
+        las columnas añadidas posteriormente (todas admiten nulos) se crean aqui.
+        """
+        inspector = inspect(self.__create_engine)
+        with self.__create_engine.begin() as conexion:
+            for tabla in self.__registry.metadata.sorted_tables:
+                columnas_existentes = [columna['name'] for columna in inspector.get_columns(tabla.name)]
+                for columna in tabla.columns:
+                    if columna.name not in columnas_existentes:
+                        conexion.exec_driver_sql('ALTER TABLE ' + tabla.name + ' ADD COLUMN ' + columna.name + ' ' +
+                                                 columna.type.compile(dialect=self.__create_engine.dialect))
+
+    def __create_indexes(self) -> None:
+        """
+        Creacion de los indices que no existan en la base de datos.
+
+        create_all solo crea los indices de las tablas nuevas, por lo que en bases de datos
+        ya existentes los indices añadidos posteriormente se crean aqui. Los indices existentes
+        cuyas columnas han cambiado se vuelven a crear.
+        """
+        inspector = inspect(self.__create_engine)
+        for tabla in self.__registry.metadata.sorted_tables:
+            indices_existentes = {indice['name']: indice['column_names'] for indice in inspector.get_indexes(tabla.name)}
+            for indice in tabla.indexes:
+                columnas_existentes = indices_existentes.get(indice.name)
+                if columnas_existentes is not None and columnas_existentes != [columna.name for columna in indice.columns]:
+                    indice.drop(self.__create_engine)
+                indice.create(self.__create_engine, checkfirst=True)
+
+    def incremental_vacuum(self) -> None:
+        """
+        Devolucion al sistema de ficheros del espacio de las paginas libres de la base de datos.
+
+        Las bases de datos creadas antes de activar auto_vacuum = INCREMENTAL se convierten
+        una unica vez con un VACUUM completo. En modo WAL se vuelca el WAL para reducir el fichero.
+        """
+        if self.__create_engine.dialect.name != 'sqlite':
+            return
+        conexion_dbapi = self.__create_engine.raw_connection()
+        try:
+            cursor = conexion_dbapi.cursor()
+            cursor.execute('PRAGMA auto_vacuum;')
+            if cursor.fetchone()[0] != 2:
+                cursor.executescript('PRAGMA auto_vacuum = INCREMENTAL; VACUUM;')
+            else:
+                # executescript ejecuta la pragma hasta el final, liberando todas las paginas libres.
+                cursor.executescript('PRAGMA incremental_vacuum;')
+            cursor.executescript('PRAGMA wal_checkpoint(TRUNCATE);')
+            cursor.close()
+        finally:
+            conexion_dbapi.close()
+
+    def __count_query(
+        self, conexion, cursor, sentencia, parametros, contexto, executemany) -> None:  # pylint: disable=unused-argument
+        """
+        Recuento de las consultas ejecutadas dentro de la unidad de trabajo del hilo actual.
+        """
+        estadisticas: Optional[Dict[str, int]] = getattr(self.__unidad_trabajo, 'estadisticas', None)
+        if estadisticas is not None:
+            estadisticas['consultas'] += 1
+
+    def __count_cache_lookup(self, acierto: bool) -> None:
+        """
+        Recuento de los aciertos y fallos de la cache de metadatos dentro de la unidad de trabajo del hilo actual.
+        """
+        estadisticas: Optional[Dict[str, int]] = getattr(self.__unidad_trabajo, 'estadisticas', None)
+        if estadisticas is not None:
+            estadisticas['cache_aciertos' if acierto else 'cache_fallos'] += 1
+
+    def get_metadata_cache(self) -> CacheMetadatos:
+        """
+        Cache de plantas, tipos de planta, sensores, sus asociaciones y consejos de esta base de datos.
+        Returns:
+            - CacheMetadatos: La cache de metadatos.
+        """
+        return self.__cache_metadatos
+
+    def get_interval_cache(self) -> CacheIntervalos:
+        """
+        Cache de las medias de los sensores de las plantas en intervalos cerrados de esta base de datos.
+        Returns:
+            - CacheIntervalos: La cache de intervalos.
+        """
+        return self.__cache_intervalos
+
+    def get_interval_cache_grace(self) -> float:
+        """
+        Segundos tras el fin de un intervalo durante los que aun se recalcula, a la espera de registros que
+        lleguen con retraso, antes de guardarlo en la cache de intervalos.
+        Returns:
+            - float: Margen en segundos.
+        """
+        return self.__margen_intervalos
+
+    def begin_unit_of_work(self) -> None:
+        """
+        Inicio de una unidad de trabajo en el hilo actual (por ejemplo una peticion REST).
+
+        Hasta end_unit_of_work todas las llamadas a new_session devuelven la misma sesion y
+        remove_session no la libera, de forma que los servicios comparten una unica sesion.
+        """
+        self.__session_maker.remove()
+        self.__unidad_trabajo.estadisticas = {'sesiones': 0, 'sesiones_solicitadas': 0, 'consultas': 0,
+                                              'cache_aciertos': 0, 'cache_fallos': 0}
+
+    def get_unit_of_work_statistics(self) -> Optional[Dict[str, int]]:
+        """
+        Estadisticas de la unidad de trabajo en curso en el hilo actual.
+        Returns:
+            - Optional[Dict[str, int]]: Sesiones creadas, sesiones solicitadas por los servicios, consultas
+              ejecutadas y aciertos y fallos de la cache de metadatos, o None si no hay ninguna unidad de
+              trabajo en curso.
+        """
+        estadisticas: Optional[Dict[str, int]] = getattr(self.__unidad_trabajo, 'estadisticas', None)
+        if estadisticas is None:
+            return None
+        return dict(estadisticas)
+
+    def end_unit_of_work(self) -> Optional[Dict[str, int]]:
+        """
+        Fin de la unidad de trabajo del hilo actual, liberando su sesion.
+        Returns:
+            - Optional[Dict[str, int]]: Estadisticas finales de la unidad de trabajo.
+        """
+        estadisticas: Optional[Dict[str, int]] = self.get_unit_of_work_statistics()
+        self.__unidad_trabajo.estadisticas = None
+        self.__session_maker.remove()
+        return estadisticas
 
-        
     def new_session(self) -> Session:
         """ 
         Construccion de una nueva sesion
         Returns:
-            - Session: Un nuevo objeto de Session.
+            - Session: Un nuevo objeto de Session, o la sesion de la unidad de trabajo en curso.
         """
+        estadisticas: Optional[Dict[str, int]] = getattr(self.__unidad_trabajo, 'estadisticas', None)
+        if estadisticas is not None:
+            estadisticas['sesiones_solicitadas'] += 1
+            if not self.__session_maker.registry.has():
+                estadisticas['sesiones'] += 1
         return self.__session_maker()
 
     def remove_session(self) -> None:
         """
-        Liberar el recurso existente de hilo de sesion
+        Liberar el recurso existente de hilo de sesion. Dentro de una unidad de trabajo
+        la sesion se mantiene hasta end_unit_of_work.
         """
+        if getattr(self.__unidad_trabajo, 'estadisticas', None) is not None:
+            return
         self.__session_maker.remove()
\ No newline at end of file
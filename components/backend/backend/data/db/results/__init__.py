@@ -2,6 +2,10 @@
 
 from .modulo_base import ModuloBase
 from .registro_sensor import RegistroSensor
+from .registro_sensor_agregado import RegistroSensorAgregado
+from .registro_sensor_horario import RegistroSensorHorario
+from .registro_sensor_diario import RegistroSensorDiario
+from .estado_registros_sensores import EstadoRegistrosSensores
 from .planta import Planta
 from .tipo_planta import TipoPlanta
 from .sensor import Sensor
@@ -0,0 +1,54 @@
+#Author: Oscar Valverde Escobar
+
+from datetime import datetime
+from typing import Dict, Optional
+from sqlalchemy import Table, MetaData, Column, Integer, TIMESTAMP # type: ignore
+from backend.data.db.results import ModuloBase
+
+class EstadoRegistrosSensores(ModuloBase):
+    """
+    Estado comun a todos los registros de los sensores, almacenado en una unica fila.
+    """
+
+    # Clave de la unica fila de la tabla.
+    ID_ESTADO: int = 1
+
+    def __init__(self, version_modificacion: int = 0, fecha_compactacion: Optional[datetime] = None,
+                 ultimo_id_agregado: Optional[int] = None):
+        self.id_: int = EstadoRegistrosSensores.ID_ESTADO
+        self.version_modificacion: int = version_modificacion
+        self.fecha_compactacion: Optional[datetime] = fecha_compactacion
+        self.ultimo_id_agregado: Optional[int] = ultimo_id_agregado
+
+    @staticmethod
+    def _table_definition(metadata: MetaData) -> Table:
+        """
+        Definicion de la tabla.
+        Args:
+            - metadata (MetaData): Metadatos del esquema de la base de datos
+                        (usado para la definicion y mapeo de entidades)
+
+        Returns:
+            - Table: Objeto tabla con al definicion de la tabla.
+        """
+        return Table(
+            'estado_registros_sensores',
+            metadata,
+            Column('id_', Integer, primary_key=True),
+            # Contador de las modificaciones de registros ya almacenados, que no cambian su id ni sus fechas.
+            Column('version_modificacion', Integer, nullable=False),
+            # Fecha desde la que se conservan todos los registros originales; los anteriores se han compactado.
+            # Nula si nunca se han eliminado registros originales.
+            Column('fecha_compactacion', TIMESTAMP, nullable=True),
+            # Mayor id de los registros ya incorporados a los niveles de agregacion. Nulo si se desconoce.
+            Column('ultimo_id_agregado', Integer, nullable=True),
+        )
+
+    @staticmethod
+    def _mapping_properties() -> Dict:
+        """
+        Obtiene el diccionario con las propiedades de mapeado.
+        Returns:
+            - Dict: Diccionario con las propiedades de mapeado.
+        """
+        return {}
@@ -3,7 +3,7 @@
 from datetime import datetime
 from typing import Dict, Optional
 from sqlalchemy import Table, MetaData, Column, String, Enum, Integer, Float, TIMESTAMP # type: ignore
-from sqlalchemy import ForeignKey, ForeignKeyConstraint  # type: ignore
+from sqlalchemy import ForeignKey, ForeignKeyConstraint, Index  # type: ignore
 from sqlalchemy.orm import relationship  # type: ignore
 from backend.data.db.results import ModuloBase
 from common.data.util import TipoSensor, ZonaSensor, TipoMedida, UnidadMedida
@@ -14,7 +14,8 @@ class RegistroSensor(ModuloBase):
     """
 
     def __init__(self, tipo_sensor:TipoSensor, zona_sensor: ZonaSensor ,numero_sensor:int, 
-                 valor:float, unidad_medida: UnidadMedida, fecha: datetime):
+                 valor:float, unidad_medida: UnidadMedida, fecha: datetime,
+                 numero_lecturas: int = None, suma_lecturas: float = None):
         self.id_: int
         self.tipo_sensor: TipoSensor = tipo_sensor
         self.zona_sensor: ZonaSensor = zona_sensor
@@ -22,6 +23,8 @@ class RegistroSensor(ModuloBase):
         self.valor: float = valor   
         self.unidad_medida: UnidadMedida = unidad_medida     
         self.fecha: datetime = fecha
+        self.numero_lecturas: int = numero_lecturas
+        self.suma_lecturas: float = suma_lecturas
 
     @staticmethod
     def _table_definition(metadata: MetaData) -> Table:
@@ -45,8 +48,19 @@ class RegistroSensor(ModuloBase):
             Column('valor', Float, nullable=False),
             Column('unidad_medida', Enum(UnidadMedida), nullable=False),
             Column('fecha', TIMESTAMP, nullable=False),
+            # Lecturas representadas por el registro cuando se comprimen: las descartadas desde el registro
+            # anterior del sensor y la propia, y la suma de sus valores. Si son nulos, solo la propia lectura.
+            Column('numero_lecturas', Integer, nullable=True),
+            Column('suma_lecturas', Float, nullable=True),
             ForeignKeyConstraint(['tipo_sensor','zona_sensor','numero_sensor'],
                                  ['sensores.tipo_sensor','sensores.zona_sensor','sensores.numero_sensor']),
+            # Indice de series temporales: todas las consultas filtran por sensor y rango de fechas.
+            # Incluye unidad_medida, valor y las lecturas representadas para que las medias se resuelvan solo con el indice.
+            Index('ix_registros_sensores_sensor_fecha',
+                  'tipo_sensor', 'zona_sensor', 'numero_sensor', 'fecha', 'unidad_medida', 'valor',
+                  'numero_lecturas', 'suma_lecturas'),
+            # Orden cronologico de todos los registros para la paginacion por (fecha, id_).
+            Index('ix_registros_sensores_fecha', 'fecha'),
         )
 
     @staticmethod
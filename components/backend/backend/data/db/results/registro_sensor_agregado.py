@@ -0,0 +1,102 @@
+#Author: Oscar Valverde Escobar
+
+from datetime import datetime, timedelta
+from typing import Dict
+from sqlalchemy import Table, MetaData, Column, Enum, Integer, Float, TIMESTAMP # type: ignore
+from sqlalchemy import ForeignKeyConstraint, Index  # type: ignore
+from backend.data.db.results import ModuloBase
+from common.data.util import TipoSensor, ZonaSensor, UnidadMedida
+
+class RegistroSensorAgregado(ModuloBase):
+    """ 
+    Clase base de los registros de sensores agregados por intervalos de tiempo.
+
+    Cada fila resume todos los registros de un sensor y unidad de medida dentro de un
+    intervalo (numero de registros, suma, minimo y maximo de los valores).
+    """
+
+    # Duracion de cada intervalo de agregacion.
+    DURACION_INTERVALO: timedelta = None
+    # Formato strftime de SQLite que trunca una fecha al inicio de su intervalo. Coincide con
+    # el formato con el que SQLAlchemy almacena los TIMESTAMP en SQLite.
+    FORMATO_INTERVALO: str = None
+
+    def __init__(self, tipo_sensor:TipoSensor, zona_sensor: ZonaSensor ,numero_sensor:int, 
+                 unidad_medida: UnidadMedida, fecha: datetime, numero_registros: int,
+                 suma_valores: float, valor_minimo: float, valor_maximo: float):
+        self.tipo_sensor: TipoSensor = tipo_sensor
+        self.zona_sensor: ZonaSensor = zona_sensor
+        self.numero_sensor: int = numero_sensor
+        self.unidad_medida: UnidadMedida = unidad_medida
+        self.fecha: datetime = fecha
+        self.numero_registros: int = numero_registros
+        self.suma_valores: float = suma_valores
+        self.valor_minimo: float = valor_minimo
+        self.valor_maximo: float = valor_maximo
+
+    @classmethod
+    def truncarFecha(cls, fecha: datetime) -> datetime:
+        """ 
+        Obtiene el inicio del intervalo al que pertenece la fecha.
+        Args:
+            - fecha (datetime): Fecha a truncar.
+
+        Returns:
+            - datetime: Fecha de inicio del intervalo.
+        """
+        return datetime.strptime(fecha.strftime(cls.FORMATO_INTERVALO), '%Y-%m-%d %H:%M:%S.%f')
+
+    @classmethod
+    def redondearFecha(cls, fecha: datetime) -> datetime:
+        """ 
+        Obtiene el inicio del primer intervalo que empieza en la fecha o despues de ella.
+        Args:
+            - fecha (datetime): Fecha a redondear.
+
+        Returns:
+            - datetime: Fecha de inicio del intervalo.
+        """
+        fecha_truncada: datetime = cls.truncarFecha(fecha)
+        if fecha_truncada < fecha:
+            fecha_truncada = fecha_truncada + cls.DURACION_INTERVALO
+        return fecha_truncada
+
+    @staticmethod
+    def _tabla_agregado(nombre_tabla: str, metadata: MetaData) -> Table:
+        """ 
+        Definicion comun de las tablas de registros agregados.
+        Args:
+            - nombre_tabla (str): Nombre de la tabla.
+            - metadata (MetaData): Metadatos del esquema de la base de datos
+                        (usado para la definicion y mapeo de entidades)
+        
+        Returns:
+            - Table: Objeto tabla con al definicion de la tabla.
+        """
+        return Table(
+            nombre_tabla,
+            metadata,
+            Column('tipo_sensor', Enum(TipoSensor), primary_key=True ),
+            Column('zona_sensor', Enum(ZonaSensor), primary_key=True ),
+            Column('numero_sensor', Integer, primary_key=True),
+            Column('unidad_medida', Enum(UnidadMedida), primary_key=True),
+            Column('fecha', TIMESTAMP, primary_key=True),
+            Column('numero_registros', Integer, nullable=False),
+            Column('suma_valores', Float, nullable=False),
+            Column('valor_minimo', Float, nullable=False),
+            Column('valor_maximo', Float, nullable=False),
+            ForeignKeyConstraint(['tipo_sensor','zona_sensor','numero_sensor'],
+                                 ['sensores.tipo_sensor','sensores.zona_sensor','sensores.numero_sensor']),
+            # Orden cronologico de los intervalos, por sensor y global, para la paginacion.
+            Index('ix_' + nombre_tabla + '_sensor_fecha', 'tipo_sensor', 'zona_sensor', 'numero_sensor', 'fecha'),
+            Index('ix_' + nombre_tabla + '_fecha', 'fecha'),
+        )
+
+    @staticmethod
+    def _mapping_properties() -> Dict:
+        """ 
+        Obtiene el diccionario con las propiedades de mapeado.
+        Returns:
+            - Dict: Diccionario con las propiedades de mapeado.
+        """
+        return {}
@@ -0,0 +1,26 @@
+#Author: Oscar Valverde Escobar
+
+from datetime import timedelta
+from sqlalchemy import Table, MetaData # type: ignore
+from backend.data.db.results import RegistroSensorAgregado
+
+class RegistroSensorHorario(RegistroSensorAgregado):
+    """ 
+    Definicion y almacenamiento de los registros de sensores agregados por horas.
+    """
+
+    DURACION_INTERVALO: timedelta = timedelta(hours=1)
+    FORMATO_INTERVALO: str = '%Y-%m-%d %H:00:00.000000'
+
+    @staticmethod
+    def _table_definition(metadata: MetaData) -> Table:
+        """ 
+        Definicion de la tabla.
+        Args:
+            - metadata (MetaData): Metadatos del esquema de la base de datos
+                        (usado para la definicion y mapeo de entidades)
+        
+        Returns:
+            - Table: Objeto tabla con al definicion de la tabla.
+        """
+        return RegistroSensorAgregado._tabla_agregado('registros_sensores_horarios', metadata)
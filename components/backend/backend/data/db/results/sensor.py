@@ -6,7 +6,7 @@ from sqlalchemy import Table, MetaData, Column, String, Enum, Integer, Boolean,
 from sqlalchemy import ForeignKey  # type: ignore
 from sqlalchemy.orm import relationship  # type: ignore
 from backend.data.db.results import ModuloBase
-from common.data.util import TipoSensor, ZonaSensor, ModeloSensor, TipoMedida, UnidadMedida
+from common.data.util import TipoSensor, ZonaSensor, ModeloSensor, TipoMedida, UnidadMedida, FiltroLectura, CompresionLectura
 
 class Sensor(ModuloBase):
     """ 
@@ -19,7 +19,9 @@ class Sensor(ModuloBase):
                  patilla_1_lectura:int, patilla_2_lectura:int, patilla_3_lectura:int,
                  unidad_medida_0:UnidadMedida, unidad_medida_1:UnidadMedida, 
                  unidad_medida_2:UnidadMedida, unidad_medida_3:UnidadMedida, 
-                 fecha_creacion:datetime ,fecha_eliminacion:datetime):
+                 fecha_creacion:datetime ,fecha_eliminacion:datetime, intervalo_lectura:int = None,
+                 muestras_lectura:int = None, filtro_lectura:FiltroLectura = None,
+                 compresion_lectura:CompresionLectura = None, desviacion_compresion:float = None):
         self.tipo_sensor: TipoSensor = tipo_sensor
         self.zona_sensor: ZonaSensor = zona_sensor
         self.numero_sensor: int = numero_sensor
@@ -36,6 +38,11 @@ class Sensor(ModuloBase):
         self.unidad_medida_3: UnidadMedida = unidad_medida_3
         self.fecha_creacion: datetime = fecha_creacion
         self.fecha_eliminacion: datetime = fecha_eliminacion
+        self.intervalo_lectura: int = intervalo_lectura
+        self.muestras_lectura: int = muestras_lectura
+        self.filtro_lectura: FiltroLectura = filtro_lectura
+        self.compresion_lectura: CompresionLectura = compresion_lectura
+        self.desviacion_compresion: float = desviacion_compresion
 
     @staticmethod
     def _table_definition(metadata: MetaData) -> Table:
@@ -67,6 +74,14 @@ class Sensor(ModuloBase):
             Column('unidad_medida_3', Enum(UnidadMedida), nullable=True),
             Column('fecha_creacion', TIMESTAMP, nullable=False ),
             Column('fecha_eliminacion', TIMESTAMP, nullable=True ),
+            # Segundos entre lecturas del sensor. Si es nulo se usa el intervalo de muestreo general.
+            Column('intervalo_lectura', Integer, nullable=True),
+            # Muestras que se toman en cada lectura y filtro con el que se reducen. Si son nulos, una muestra y la mediana.
+            Column('muestras_lectura', Integer, nullable=True),
+            Column('filtro_lectura', Enum(FiltroLectura), nullable=True),
+            # Compresion de las lecturas antes de almacenarlas y desviacion admitida. Si es nula, se almacenan todas.
+            Column('compresion_lectura', Enum(CompresionLectura), nullable=True),
+            Column('desviacion_compresion', Float, nullable=True),
         )
 
     @staticmethod
@@ -1,5 +1,7 @@
 #Author: Oscar Valverde Escobar
 
+from .estado_registros_sensores_set import EstadoRegistrosSensoresSet
+from .registro_sensor_agregado_set import RegistroSensorAgregadoSet
 from .registro_sensor_set import RegistroSensorSet
 from .planta_set import PlantaSet
 from .tipo_planta_set import TipoPlantaSet
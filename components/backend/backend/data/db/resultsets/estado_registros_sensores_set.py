@@ -0,0 +1,131 @@
+#Author: Oscar Valverde Escobar
+
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import select, update  # type: ignore
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert  # type: ignore
+from sqlalchemy.orm.session import Session  # type: ignore
+from sqlalchemy.sql import func
+from backend.data.db.results import EstadoRegistrosSensores, RegistroSensor, RegistroSensorHorario, RegistroSensorDiario
+
+class EstadoRegistrosSensoresSet():
+    """
+    Clase responsable a nivel de tabla de las operaciones con el estado comun de los registros de los sensores.
+    """
+
+    @staticmethod
+    def get(session: Session) -> EstadoRegistrosSensores:
+        """
+        Estado de los registros de los sensores. Si no existe se crea a partir de los registros almacenados: la fecha
+        de compactacion es el inicio del dia del registro mas antiguo si hay intervalos agregados anteriores (o el dia
+        siguiente al ultimo intervalo diario si ya no quedan registros) y el ultimo id agregado se desconoce, salvo
+        que no haya registros.
+
+        Nota:
+            No realiza commit de la transaccion.
+
+        Args:
+            - session (Session): Objeto de sesion.
+
+        Returns:
+            - EstadoRegistrosSensores: Estado de los registros.
+        """
+        estado: EstadoRegistrosSensores = session.get(EstadoRegistrosSensores, EstadoRegistrosSensores.ID_ESTADO,
+                                                      populate_existing=True)
+        if estado is not None:
+            return estado
+        fecha_minima, fecha_minima_horaria, fecha_minima_diaria, fecha_maxima_diaria = session.execute(select(
+            select(func.min(RegistroSensor.fecha)).scalar_subquery(),
+            select(func.min(RegistroSensorHorario.fecha)).scalar_subquery(),
+            select(func.min(RegistroSensorDiario.fecha)).scalar_subquery(),
+            select(func.max(RegistroSensorDiario.fecha)).scalar_subquery())).one()
+        fecha_compactacion: Optional[datetime] = None
+        if fecha_minima is None:
+            if fecha_maxima_diaria is not None:
+                fecha_compactacion = fecha_maxima_diaria + RegistroSensorDiario.DURACION_INTERVALO
+        else:
+            dia_minimo: datetime = RegistroSensorDiario.truncarFecha(fecha_minima)
+            if any(fecha is not None and fecha < dia_minimo for fecha in (fecha_minima_horaria, fecha_minima_diaria)):
+                fecha_compactacion = dia_minimo
+        session.execute(sqlite_insert(EstadoRegistrosSensores).values(
+            id_=EstadoRegistrosSensores.ID_ESTADO, version_modificacion=0, fecha_compactacion=fecha_compactacion,
+            ultimo_id_agregado=0 if fecha_minima is None else None).on_conflict_do_nothing())
+        return session.get(EstadoRegistrosSensores, EstadoRegistrosSensores.ID_ESTADO, populate_existing=True)
+
+    @staticmethod
+    def registerModification(session: Session) -> None:
+        """
+        Incrementa el contador de modificaciones de los registros ya almacenados.
+
+        Nota:
+            No realiza commit de la transaccion, se incluye en la transaccion de la modificacion.
+
+        Args:
+            - session (Session): Objeto de sesion.
+        """
+        EstadoRegistrosSensoresSet.get(session)
+        session.execute(update(EstadoRegistrosSensores).where(EstadoRegistrosSensores.id_ == EstadoRegistrosSensores.ID_ESTADO).values(
+            version_modificacion=EstadoRegistrosSensores.version_modificacion + 1).execution_options(synchronize_session=False))
+
+    @staticmethod
+    def getModificationVersionQuery():
+        """
+        Subconsulta escalar con el contador de modificaciones, para incluirla en la consulta de la version.
+
+        Returns:
+            - Subconsulta con el contador, nulo si nunca se ha modificado un registro.
+        """
+        return select(EstadoRegistrosSensores.version_modificacion).where(
+            EstadoRegistrosSensores.id_ == EstadoRegistrosSensores.ID_ESTADO).scalar_subquery()
+
+    @staticmethod
+    def advanceCompactionDate(session: Session, fecha: datetime) -> None:
+        """
+        Avanza la fecha de compactacion antes de eliminar los registros originales anteriores a la fecha. Se alinea
+        al inicio del primer dia que empieza en la fecha o despues, de forma que un dia del que solo se conserva
+        una parte de los registros no se recalcule.
+
+        Nota:
+            No realiza commit de la transaccion.
+
+        Args:
+            - session (Session): Objeto de sesion.
+            - fecha (datetime): Se van a eliminar los registros originales anteriores a esta fecha.
+        """
+        estado: EstadoRegistrosSensores = EstadoRegistrosSensoresSet.get(session)
+        fecha_compactacion: datetime = RegistroSensorDiario.redondearFecha(fecha)
+        if estado.fecha_compactacion is None or estado.fecha_compactacion < fecha_compactacion:
+            estado.fecha_compactacion = fecha_compactacion
+
+    @staticmethod
+    def getAggregatedMaxId(session: Session) -> int:
+        """
+        Mayor id de los registros de los sensores antes de insertar otros nuevos, para avanzar despues con
+        advanceAggregated el ultimo id agregado.
+
+        Args:
+            - session (Session): Objeto de sesion.
+
+        Returns:
+            - int: Mayor id de los registros, 0 si no hay registros.
+        """
+        return session.query(func.coalesce(func.max(RegistroSensor.id_), 0)).scalar()
+
+    @staticmethod
+    def advanceAggregated(session: Session, ultimo_id_anterior: Optional[int]) -> None:
+        """
+        Marca como agregados todos los registros de los sensores si el ultimo id agregado era ultimo_id_anterior.
+        Si no lo era (hay registros pendientes de agregar o se desconoce), no cambia, y es catchUp quien lo avanza.
+
+        Nota:
+            No realiza commit de la transaccion, se incluye en la transaccion que ha agregado los registros.
+
+        Args:
+            - session (Session): Objeto de sesion.
+            - ultimo_id_anterior (Optional[int]): Ultimo id agregado antes de agregar los registros.
+        """
+        session.execute(update(EstadoRegistrosSensores).where(
+            EstadoRegistrosSensores.id_ == EstadoRegistrosSensores.ID_ESTADO,
+            EstadoRegistrosSensores.ultimo_id_agregado.is_(ultimo_id_anterior)).values(
+            ultimo_id_agregado=select(func.coalesce(func.max(RegistroSensor.id_), 0)).scalar_subquery()).execution_options(
+            synchronize_session=False))
@@ -0,0 +1,703 @@
+#Author: Oscar Valverde Escobar
+
+import calendar
+import math
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple, Type
+from sqlalchemy import Integer, and_, cast, delete, inspect, insert, literal_column, select, tuple_  # type: ignore
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert  # type: ignore
+from sqlalchemy.orm.session import Session  # type: ignore
+from sqlalchemy.sql import func
+from backend.data.db.results import RegistroSensor, RegistroSensorAgregado, RegistroSensorHorario, RegistroSensorDiario, SensorPlanta
+from backend.data.db.resultsets import EstadoRegistrosSensoresSet
+from common.data.util import TipoSensor, ZonaSensor, UnidadMedida
+
+class RegistroSensorAgregadoSet():
+    """
+    Clase responsable a nivel de tabla de las operaciones con los registros agregados por intervalos
+    (horas y dias) de los sensores.
+    """
+
+    # Niveles de agregacion mantenidos, de menor a mayor duracion del intervalo.
+    AGREGADOS: List[Type[RegistroSensorAgregado]] = [RegistroSensorHorario, RegistroSensorDiario]
+
+    @staticmethod
+    def updateFromRecords(session: Session, registros_sensores: List[RegistroSensor]) -> None:
+        """
+        Incorpora nuevos registros de sensores a todos los niveles de agregacion.
+
+        Nota:
+            No realiza commit de la transaccion, se incluye en la transaccion de insercion de los registros.
+
+        Args:
+            - session (Session): Objeto de sesion.
+            - registros_sensores (List[RegistroSensor]): Registros de sensores recien creados. Los registros
+              comprimidos cuentan por todas las lecturas que representan.
+        """
+        for agregado in RegistroSensorAgregadoSet.AGREGADOS:
+            intervalos: Dict[Tuple, List] = {}
+            for registro_sensor in registros_sensores:
+                clave: Tuple = (registro_sensor.tipo_sensor, registro_sensor.zona_sensor, registro_sensor.numero_sensor,
+                                registro_sensor.unidad_medida, agregado.truncarFecha(registro_sensor.fecha))
+                numero_lecturas: int = registro_sensor.numero_lecturas if registro_sensor.numero_lecturas is not None else 1
+                suma_lecturas: float = registro_sensor.suma_lecturas if registro_sensor.suma_lecturas is not None else registro_sensor.valor
+                intervalo: List = intervalos.get(clave)
+                if intervalo is None:
+                    intervalos[clave] = [numero_lecturas, suma_lecturas, registro_sensor.valor, registro_sensor.valor]
+                else:
+                    intervalo[0] += numero_lecturas
+                    intervalo[1] += suma_lecturas
+                    intervalo[2] = min(intervalo[2], registro_sensor.valor)
+                    intervalo[3] = max(intervalo[3], registro_sensor.valor)
+            if len(intervalos) == 0:
+                continue
+            filas: List[Dict] = []
+            for clave, intervalo in intervalos.items():
+                filas.append({'tipo_sensor': clave[0], 'zona_sensor': clave[1], 'numero_sensor': clave[2],
+                              'unidad_medida': clave[3], 'fecha': clave[4], 'numero_registros': intervalo[0],
+                              'suma_valores': intervalo[1], 'valor_minimo': intervalo[2], 'valor_maximo': intervalo[3]})
+            sentencia = sqlite_insert(agregado).values(filas)
+            sentencia = sentencia.on_conflict_do_update(
+                index_elements=['tipo_sensor', 'zona_sensor', 'numero_sensor', 'unidad_medida', 'fecha'],
+                set_={'numero_registros': agregado.numero_registros + sentencia.excluded.numero_registros,
+                      'suma_valores': agregado.suma_valores + sentencia.excluded.suma_valores,
+                      'valor_minimo': func.min(agregado.valor_minimo, sentencia.excluded.valor_minimo),
+                      'valor_maximo': func.max(agregado.valor_maximo, sentencia.excluded.valor_maximo)})
+            session.execute(sentencia)
+
+    @staticmethod
+    def rebuild(session: Session, agregado: Type[RegistroSensorAgregado], fecha_inicio: datetime = None,
+                fecha_fin: datetime = None) -> None:
+        """
+        Recalcula a partir de los registros de los sensores los intervalos agregados comprendidos entre las fechas.
+
+        Nota:
+            Realiza commit de la transaccion. Los intervalos anteriores a la fecha de compactacion no se recalculan,
+            ya que sus registros originales han sido eliminados.
+
+        Args:
+            - session (Session): Objeto de sesion.
+            - agregado (Type[RegistroSensorAgregado]): Nivel de agregacion a recalcular.
+            - fecha_inicio (datetime): Fecha incluida en el primer intervalo a recalcular. Si no se especifica, desde el principio.
+            - fecha_fin (datetime): Fecha incluida en el ultimo intervalo a recalcular. Si no se especifica, hasta el final.
+        """
+        fecha_compactacion: Optional[datetime] = RegistroSensorAgregadoSet.getCompactionDate(session)
+        if fecha_compactacion is not None and (fecha_inicio is None or fecha_inicio < fecha_compactacion):
+            fecha_inicio = fecha_compactacion
+        if fecha_inicio is not None and fecha_fin is not None and fecha_fin < fecha_inicio:
+            return
+        intervalo = func.strftime(agregado.FORMATO_INTERVALO, RegistroSensor.fecha)
+        borrado = delete(agregado)
+        seleccion = select(RegistroSensor.tipo_sensor, RegistroSensor.zona_sensor, RegistroSensor.numero_sensor,
+                           RegistroSensor.unidad_medida, intervalo, func.sum(func.coalesce(RegistroSensor.numero_lecturas, 1)),
+                           func.sum(func.coalesce(RegistroSensor.suma_lecturas, RegistroSensor.valor)),
+                           func.min(RegistroSensor.valor), func.max(RegistroSensor.valor))
+        if fecha_inicio is not None:
+            inicio: datetime = agregado.truncarFecha(fecha_inicio)
+            borrado = borrado.where(agregado.fecha >= inicio)
+            seleccion = seleccion.where(RegistroSensor.fecha >= inicio)
+        if fecha_fin is not None:
+            fin: datetime = agregado.truncarFecha(fecha_fin) + agregado.DURACION_INTERVALO
+            borrado = borrado.where(agregado.fecha < fin)
+            seleccion = seleccion.where(RegistroSensor.fecha < fin)
+        seleccion = seleccion.group_by(RegistroSensor.tipo_sensor, RegistroSensor.zona_sensor, RegistroSensor.numero_sensor,
+                                       RegistroSensor.unidad_medida, intervalo)
+        session.execute(borrado)
+        session.execute(insert(agregado).from_select(['tipo_sensor', 'zona_sensor', 'numero_sensor', 'unidad_medida', 'fecha',
+                                                      'numero_registros', 'suma_valores', 'valor_minimo', 'valor_maximo'],
+                                                     seleccion))
+        session.commit()
+
+    @staticmethod
+    def getCompactionDate(session: Session) -> Optional[datetime]:
+        """
+        Fecha desde la que se conservan todos los registros originales de los sensores, almacenada al compactar.
+        Los intervalos agregados anteriores estan compactados, aunque despues se inserten o modifiquen registros
+        con fechas anteriores.
+
+        Args:
+            - session (Session): Objeto de sesion.
+
+        Returns:
+            - Optional[datetime]: Fecha de compactacion o None si nunca se han compactado registros.
+        """
+        return EstadoRegistrosSensoresSet.get(session).fecha_compactacion
+
+    @staticmethod
+    def getVersion(session: Session) -> Tuple:
+        """
+        Version de los registros de los sensores, con una unica consulta resuelta con los indices: el mayor id de
+        los registros, que cambia con cada registro nuevo, el contador de modificaciones, que cambia al modificar
+        un registro ya almacenado, y la fecha minima de los registros y de cada nivel de agregacion, que cambian
+        al compactar.
+
+        Args:
+            - session (Session): Objeto de sesion.
+
+        Returns:
+            - Tuple: Version de los registros.
+        """
+        return tuple(session.execute(select(select(func.max(RegistroSensor.id_)).scalar_subquery(),
+                                            EstadoRegistrosSensoresSet.getModificationVersionQuery(),
+                                            select(func.min(RegistroSensor.fecha)).scalar_subquery(),
+                                            select(func.min(RegistroSensorHorario.fecha)).scalar_subquery(),
+                                            select(func.min(RegistroSensorDiario.fecha)).scalar_subquery())).one())
+
+    @staticmethod
+    def deleteBefore(session: Session, agregado: Type[RegistroSensorAgregado], fecha: datetime, tamano_bloque: int) -> int:
+        """
+        Eliminacion de los intervalos agregados anteriores a una fecha en bloques de tamaño acotado.
+
+        Nota:
+            Realiza commit de la transaccion tras cada bloque.
+
+        Args:
+            - session (Session): Objeto de sesion.
+            - agregado (Type[RegistroSensorAgregado]): Nivel de agregacion.
+            - fecha (datetime): Se eliminan los intervalos que comienzan antes de esta fecha.
+            - tamano_bloque (int): Numero maximo de intervalos eliminados por transaccion.
+
+        Returns:
+            - int: Numero de intervalos eliminados.
+        """
+        eliminados: int = 0
+        while True:
+            bloque = select(literal_column('rowid')).select_from(agregado).where(agregado.fecha < fecha).limit(tamano_bloque)
+            resultado = session.execute(delete(agregado).where(literal_column('rowid').in_(bloque)).execution_options(
+                synchronize_session=False))
+            session.commit()
+            eliminados += resultado.rowcount
+            if resultado.rowcount < tamano_bloque:
+                return eliminados
+
+    @staticmethod
+    def catchUp(session: Session) -> None:
+        """
+        Pone al dia todos los niveles de agregacion con los registros posteriores al ultimo id agregado, recalculando
+        solo los intervalos entre la fecha minima y maxima de esos registros. Como cada insercion agrega sus registros
+        y avanza el ultimo id agregado en su misma transaccion, normalmente no hay nada que recalcular y solo se
+        consultan el estado y el mayor id. Si el ultimo id agregado se desconoce (bases de datos anteriores), se
+        recalcula una unica vez desde el ultimo intervalo almacenado de cada nivel (o desde el principio si estan vacios).
+
+        Nota:
+            Realiza commit de la transaccion.
+
+        Args:
+            - session (Session): Objeto de sesion.
+        """
+        ultimo_id_agregado: Optional[int] = EstadoRegistrosSensoresSet.get(session).ultimo_id_agregado
+        maximo_id: int = EstadoRegistrosSensoresSet.getAggregatedMaxId(session)
+        if ultimo_id_agregado == maximo_id:
+            session.commit()
+            return
+        if ultimo_id_agregado is None:
+            for agregado in RegistroSensorAgregadoSet.AGREGADOS:
+                ultima_fecha: datetime = session.query(func.max(agregado.fecha)).scalar()
+                RegistroSensorAgregadoSet.rebuild(session, agregado, ultima_fecha)
+        elif ultimo_id_agregado < maximo_id:
+            fecha_inicio, fecha_fin = session.query(func.min(RegistroSensor.fecha), func.max(RegistroSensor.fecha)).filter(
+                RegistroSensor.id_ > ultimo_id_agregado).one()
+            for agregado in RegistroSensorAgregadoSet.AGREGADOS:
+                RegistroSensorAgregadoSet.rebuild(session, agregado, fecha_inicio, fecha_fin)
+        # Los registros insertados mientras tanto ya se han agregado en su propia transaccion. Si se han eliminado
+        # los registros mas recientes, el ultimo id agregado vuelve al mayor id que queda.
+        EstadoRegistrosSensoresSet.advanceAggregated(session, ultimo_id_agregado)
+        session.commit()
+
+    @staticmethod
+    def __addSumAndCount(sumas: Dict[UnidadMedida, List], filas: List[Tuple]) -> None:
+        for fila in filas:
+            if fila[2] == 0 or fila[1] is None:
+                continue
+            suma_unidad: List = sumas.setdefault(fila[0], [0.0, 0])
+            suma_unidad[0] += fila[1]
+            suma_unidad[1] += fila[2]
+
+    @staticmethod
+    def __getSumAndCountFromRecords(session: Session, tipo_sensor:TipoSensor, zona_sensor: ZonaSensor ,numero_sensor:int,
+                                    fecha_inicio: datetime, fecha_fin: datetime, incluir_fecha_fin: bool) -> List[Tuple]:
+        query = session.query(RegistroSensor.unidad_medida, func.sum(func.coalesce(RegistroSensor.suma_lecturas, RegistroSensor.valor)),
+                              func.sum(func.coalesce(RegistroSensor.numero_lecturas, 1))).filter(
+            RegistroSensor.tipo_sensor == tipo_sensor, RegistroSensor.zona_sensor == zona_sensor,
+            RegistroSensor.numero_sensor == numero_sensor, RegistroSensor.fecha >= fecha_inicio)
+        if incluir_fecha_fin:
+            query = query.filter(RegistroSensor.fecha <= fecha_fin)
+        else:
+            query = query.filter(RegistroSensor.fecha < fecha_fin)
+        return query.group_by(RegistroSensor.unidad_medida).all()
+
+    @staticmethod
+    def __getSumAndCountFromAggregates(session: Session, agregado: Type[RegistroSensorAgregado], tipo_sensor:TipoSensor,
+                                       zona_sensor: ZonaSensor ,numero_sensor:int, fecha_inicio: datetime, fecha_fin: datetime) -> List[Tuple]:
+        query = session.query(agregado.unidad_medida, func.sum(agregado.suma_valores), func.sum(agregado.numero_registros)).filter(
+            agregado.tipo_sensor == tipo_sensor, agregado.zona_sensor == zona_sensor, agregado.numero_sensor == numero_sensor,
+            agregado.fecha >= fecha_inicio, agregado.fecha < fecha_fin)
+        return query.group_by(agregado.unidad_medida).all()
+
+    @staticmethod
+    def getAvgFromSensorBetweenDates(session: Session, tipo_sensor:TipoSensor, zona_sensor: ZonaSensor ,numero_sensor:int,
+                                     fecha_inicio: datetime, fecha_fin: datetime = None) -> List[RegistroSensor]:
+        """
+        Media de los registros del sensor entre las fechas (ambas incluidas) por unidad de medida.
+
+        Los dias y horas completos y ya cerrados se obtienen de las tablas agregadas; solo los extremos
+        del rango y la hora en curso se calculan a partir de los registros de los sensores.
+
+        Args:
+            - session (Session): Objeto de sesion.
+            - tipo_sensor (TipoSensor): Tipo de sensor.
+            - zona_sensor (ZonaSensor): Zona del sensor.
+            - numero_sensor (int): Numero de sensor.
+            - fecha_inicio (datetime): Fecha de inicio.
+            - fecha_fin (datetime): Fecha de fin. Si no se especifica, la fecha actual.
+
+        Returns:
+            - List[RegistroSensor]: Un registro con la media por cada unidad de medida con registros.
+        """
+        if fecha_fin is None:
+            fecha_fin = datetime.now()
+        sumas: Dict[UnidadMedida, List] = {}
+        hora_inicio: datetime = RegistroSensorHorario.redondearFecha(fecha_inicio)
+        hora_fin: datetime = min(RegistroSensorHorario.truncarFecha(fecha_fin), RegistroSensorHorario.truncarFecha(datetime.now()))
+        if hora_inicio >= hora_fin:
+            RegistroSensorAgregadoSet.__addSumAndCount(sumas, RegistroSensorAgregadoSet.__getSumAndCountFromRecords(
+                session, tipo_sensor, zona_sensor, numero_sensor, fecha_inicio, fecha_fin, True))
+        else:
+            RegistroSensorAgregadoSet.__addSumAndCount(sumas, RegistroSensorAgregadoSet.__getSumAndCountFromRecords(
+                session, tipo_sensor, zona_sensor, numero_sensor, fecha_inicio, hora_inicio, False))
+            dia_inicio: datetime = RegistroSensorDiario.redondearFecha(hora_inicio)
+            dia_fin: datetime = RegistroSensorDiario.truncarFecha(hora_fin)
+            if dia_inicio < dia_fin:
+                tramos: List[Tuple] = [(RegistroSensorHorario, hora_inicio, dia_inicio), (RegistroSensorDiario, dia_inicio, dia_fin),
+                                       (RegistroSensorHorario, dia_fin, hora_fin)]
+            else:
+                tramos: List[Tuple] = [(RegistroSensorHorario, hora_inicio, hora_fin)]
+            for agregado, inicio, fin in tramos:
+                if inicio < fin:
+                    RegistroSensorAgregadoSet.__addSumAndCount(sumas, RegistroSensorAgregadoSet.__getSumAndCountFromAggregates(
+                        session, agregado, tipo_sensor, zona_sensor, numero_sensor, inicio, fin))
+            RegistroSensorAgregadoSet.__addSumAndCount(sumas, RegistroSensorAgregadoSet.__getSumAndCountFromRecords(
+                session, tipo_sensor, zona_sensor, numero_sensor, hora_fin, fecha_fin, True))
+        registros_sensores: List[RegistroSensor] = []
+        for unidad_medida in sorted(sumas.keys(), key=lambda unidad: unidad.name):
+            registro_sensor = RegistroSensor(tipo_sensor, zona_sensor, numero_sensor, sumas[unidad_medida][0] / sumas[unidad_medida][1],
+                                             unidad_medida, fecha_inicio)
+            registro_sensor.id_ = -1
+            registros_sensores.append(registro_sensor)
+        return registros_sensores
+
+    @staticmethod
+    def __filterFromSensorBetweenDates(query, tabla, sensor: Optional[Tuple], fecha_inicio: datetime, fecha_fin: datetime):
+        if sensor is not None:
+            query = query.filter(tabla.tipo_sensor == sensor[0], tabla.zona_sensor == sensor[1], tabla.numero_sensor == sensor[2])
+        if fecha_inicio is not None:
+            query = query.filter(tabla.fecha >= fecha_inicio)
+        if fecha_fin is not None:
+            query = query.filter(tabla.fecha <= fecha_fin)
+        return query
+
+    @staticmethod
+    def __getResolutionSections(session: Session, sensor: Optional[Tuple]) -> List[Tuple]:
+        # Cada nivel solo se usa antes del primer intervalo del nivel inmediatamente mas fino disponible.
+        fecha_minima_registros: datetime = RegistroSensorAgregadoSet.__filterFromSensorBetweenDates(
+            session.query(func.min(RegistroSensor.fecha)), RegistroSensor, sensor, None, None).scalar()
+        fecha_minima_horaria: datetime = RegistroSensorAgregadoSet.__filterFromSensorBetweenDates(
+            session.query(func.min(RegistroSensorHorario.fecha)), RegistroSensorHorario, sensor, None, None).scalar()
+        if fecha_minima_horaria is None:
+            fecha_minima_horaria = fecha_minima_registros
+        tramos: List[Tuple] = []
+        for agregado, fecha_limite in [(RegistroSensorDiario, fecha_minima_horaria), (RegistroSensorHorario, fecha_minima_registros)]:
+            tramos.append((agregado, None if fecha_limite is None else agregado.truncarFecha(fecha_limite)))
+        return tramos
+
+    @staticmethod
+    def __getRecordFromInterval(intervalo: RegistroSensorAgregado) -> RegistroSensor:
+        registro_sensor = RegistroSensor(intervalo.tipo_sensor, intervalo.zona_sensor, intervalo.numero_sensor,
+                                         intervalo.suma_valores / intervalo.numero_registros, intervalo.unidad_medida,
+                                         intervalo.fecha)
+        registro_sensor.id_ = -1
+        return registro_sensor
+
+    @staticmethod
+    def __listAllWithFinestResolution(session: Session, sensor: Optional[Tuple], fecha_inicio: datetime,
+                                      fecha_fin: datetime) -> List[RegistroSensor]:
+        registros_sensores: List[RegistroSensor] = []
+        for agregado, fecha_limite in RegistroSensorAgregadoSet.__getResolutionSections(session, sensor):
+            query = RegistroSensorAgregadoSet.__filterFromSensorBetweenDates(session.query(agregado), agregado, sensor,
+                                                                             fecha_inicio, fecha_fin)
+            if fecha_limite is not None:
+                query = query.filter(agregado.fecha < fecha_limite)
+            for intervalo in query.order_by(agregado.fecha).all():
+                registros_sensores.append(RegistroSensorAgregadoSet.__getRecordFromInterval(intervalo))
+        registros_sensores.extend(RegistroSensorAgregadoSet.__filterFromSensorBetweenDates(
+            session.query(RegistroSensor), RegistroSensor, sensor, fecha_inicio, fecha_fin).all())
+        return registros_sensores
+
+    @staticmethod
+    def listAll(session: Session) -> List[RegistroSensor]:
+        """
+        Registros de todos los sensores con la mayor resolucion disponible: los registros originales y,
+        para los periodos ya compactados, la media por hora o, si tampoco se conserva, por dia.
+
+        Args:
+            - session (Session): Objeto de sesion.
+
+        Returns:
+            - List[RegistroSensor]: Registros de los sensores. Las medias tienen id -1 y la fecha de inicio del intervalo.
+        """
+        return RegistroSensorAgregadoSet.__listAllWithFinestResolution(session, None, None, None)
+
+    @staticmethod
+    def listAllFromSensorBetweenDates(session: Session, tipo_sensor:TipoSensor, zona_sensor: ZonaSensor ,numero_sensor:int,
+                                      fecha_inicio: datetime = None, fecha_fin: datetime = None) -> List[RegistroSensor]:
+        """
+        Registros del sensor entre las fechas (ambas incluidas) con la mayor resolucion disponible: los registros
+        originales y, para los periodos ya compactados, la media por hora o, si tampoco se conserva, por dia.
+
+        Args:
+            - session (Session): Objeto de sesion.
+            - tipo_sensor (TipoSensor): Tipo de sensor.
+            - zona_sensor (ZonaSensor): Zona del sensor.
+            - numero_sensor (int): Numero de sensor.
+            - fecha_inicio (datetime): Fecha de inicio. Si no se especifica, desde el principio.
+            - fecha_fin (datetime): Fecha de fin. Si no se especifica, hasta el final.
+
+        Returns:
+            - List[RegistroSensor]: Registros del sensor. Las medias tienen id -1 y la fecha de inicio del intervalo.
+        """
+        return RegistroSensorAgregadoSet.__listAllWithFinestResolution(session, (tipo_sensor, zona_sensor, numero_sensor),
+                                                                       fecha_inicio, fecha_fin)
+
+    @staticmethod
+    def listAllCompactedFromPlant(session: Session, nombre_planta: str, fecha_inicio: datetime = None,
+                                  fecha_fin: datetime = None) -> List[RegistroSensor]:
+        """
+        Medias por hora o por dia de los sensores asociados a una planta para los periodos cuyos registros originales
+        ya han sido compactados, uniendo las asociaciones entre sensores y plantas con los niveles de agregacion.
+
+        Args:
+            - session (Session): Objeto de sesion.
+            - nombre_planta (str): Nombre de la planta.
+            - fecha_inicio (datetime): Fecha de inicio (incluida). Si no se especifica, desde la asociacion.
+            - fecha_fin (datetime): Fecha de fin (incluida). Si no se especifica, la fecha actual.
+
+        Returns:
+            - List[RegistroSensor]: Medias ordenadas por fecha, con id -1 y la fecha de inicio del intervalo.
+        """
+        if nombre_planta is None:
+            raise ValueError('Necesario especificar el nombre de la planta.')
+        if fecha_fin is None:
+            fecha_fin = datetime.now()
+        registros_sensores: List[RegistroSensor] = []
+        for agregado, fecha_limite in RegistroSensorAgregadoSet.__getResolutionSections(session, None):
+            if fecha_limite is not None and fecha_inicio is not None and fecha_inicio >= fecha_limite:
+                continue
+            query = session.query(agregado).join(SensorPlanta, and_(SensorPlanta.tipo_sensor == agregado.tipo_sensor,
+                                                                    SensorPlanta.zona_sensor == agregado.zona_sensor,
+                                                                    SensorPlanta.numero_sensor == agregado.numero_sensor)).filter(
+                SensorPlanta.nombre_planta == nombre_planta, agregado.fecha >= SensorPlanta.fecha_asociacion,
+                agregado.fecha <= func.coalesce(SensorPlanta.fecha_anulacion, fecha_fin), agregado.fecha <= fecha_fin)
+            if fecha_limite is not None:
+                query = query.filter(agregado.fecha < fecha_limite)
+            if fecha_inicio is not None:
+                query = query.filter(agregado.fecha >= fecha_inicio)
+            query = query.order_by(agregado.fecha, agregado.tipo_sensor, agregado.zona_sensor, agregado.numero_sensor, agregado.unidad_medida)
+            for intervalo in query.all():
+                registros_sensores.append(RegistroSensorAgregadoSet.__getRecordFromInterval(intervalo))
+        return registros_sensores
+
+    @staticmethod
+    def getFirstDateFromPlant(session: Session, nombre_planta: str) -> Optional[datetime]:
+        """
+        Fecha a partir de la que puede haber registros de los sensores de una planta, con una unica consulta resuelta
+        con los indices: la mas tardia entre la primera asociacion de un sensor con la planta y el registro o
+        intervalo agregado mas antiguo de cualquier sensor.
+
+        Args:
+            - session (Session): Objeto de sesion.
+            - nombre_planta (str): Nombre de la planta.
+
+        Returns:
+            - Optional[datetime]: Fecha o None si la planta no tiene sensores asociados o no hay registros.
+        """
+        fechas: Tuple = tuple(session.execute(select(
+            select(func.min(SensorPlanta.fecha_asociacion)).where(SensorPlanta.nombre_planta == nombre_planta).scalar_subquery(),
+            select(func.min(RegistroSensor.fecha)).scalar_subquery(),
+            select(func.min(RegistroSensorHorario.fecha)).scalar_subquery(),
+            select(func.min(RegistroSensorDiario.fecha)).scalar_subquery())).one())
+        fechas_registros: List[datetime] = [fecha for fecha in fechas[1:] if fecha is not None]
+        if fechas[0] is None or len(fechas_registros) == 0:
+            return None
+        return max(fechas[0], min(fechas_registros))
+
+    @staticmethod
+    def listRangesFromPlant(session: Session, nombre_planta: str, fecha_inicio: datetime, fecha_fin: datetime,
+                            numero_intervalos: int) -> List[Tuple]:
+        """
+        Registros con el valor minimo y con el valor maximo de los sensores asociados a una planta por zona y unidad de
+        medida en cada uno de numero_intervalos intervalos consecutivos de igual duracion entre dos fechas, calculados
+        en la base de datos agrupando por el indice del intervalo de cada registro.
+
+        Se usa la menor resolucion disponible cuyos intervalos no duran mas que los pedidos: los registros originales,
+        las horas o los dias agregados (con su minimo y su maximo). Los periodos sin esa resolucion se toman de la
+        inmediatamente menor, como en listAllCompactedFromPlant. Asi se leen como mucho unas 24 filas por sensor,
+        unidad de medida e intervalo (horas en intervalos de casi un dia), en lugar de todos los registros del
+        periodo, y solo se devuelven dos filas por zona, unidad de medida, intervalo y nivel.
+
+        Args:
+            - session (Session): Objeto de sesion.
+            - nombre_planta (str): Nombre de la planta.
+            - fecha_inicio (datetime): Fecha de inicio (incluida).
+            - fecha_fin (datetime): Fecha de fin (incluida).
+            - numero_intervalos (int): Numero de intervalos.
+
+        Returns:
+            - List[Tuple]: Filas (tipo_sensor, zona_sensor, numero_sensor, unidad_medida, fecha, valor_minimo,
+              valor_maximo, indice del intervalo) ordenadas por nivel y fecha. En los registros originales el minimo
+              y el maximo son el valor.
+        """
+        if nombre_planta is None:
+            raise ValueError('Necesario especificar el nombre de la planta.')
+        if numero_intervalos <= 0:
+            return []
+        segundos_inicio: int = calendar.timegm(fecha_inicio.timetuple())
+        segundos_intervalo: int = max(math.ceil((fecha_fin - fecha_inicio).total_seconds() / numero_intervalos), 1)
+        # Niveles desde la resolucion elegida hasta la menor.
+        niveles: List[Type] = [RegistroSensor] + RegistroSensorAgregadoSet.AGREGADOS
+        while len(niveles) > 1 and niveles[1].DURACION_INTERVALO.total_seconds() <= segundos_intervalo:
+            niveles.pop(0)
+        # Cada nivel solo se usa antes del primer intervalo del nivel inmediatamente mas fino disponible.
+        tramos: List[Tuple] = []
+        fecha_minima_fina: Optional[datetime] = None
+        for tabla in niveles:
+            tramos.append((tabla, None if fecha_minima_fina is None else tabla.truncarFecha(fecha_minima_fina)))
+            fecha_minima: Optional[datetime] = session.query(func.min(tabla.fecha)).scalar()
+            if fecha_minima is not None:
+                fecha_minima_fina = fecha_minima
+        filas: List[Tuple] = []
+        for tabla, fecha_limite in reversed(tramos):
+            if fecha_limite is not None and fecha_limite <= fecha_inicio:
+                continue
+            if tabla is RegistroSensor:
+                minimo, maximo = RegistroSensor.valor, RegistroSensor.valor
+            else:
+                minimo, maximo = tabla.valor_minimo, tabla.valor_maximo
+            indice = func.min((cast(func.strftime('%s', tabla.fecha), Integer) - segundos_inicio) // segundos_intervalo,
+                              numero_intervalos - 1)
+            # Una unica cota inferior y superior por asociacion, para que el indice (sensor, fecha) se recorra solo
+            # entre las fechas pedidas y no desde la asociacion.
+            condiciones: List = [SensorPlanta.nombre_planta == nombre_planta,
+                                 tabla.fecha >= func.max(SensorPlanta.fecha_asociacion, fecha_inicio),
+                                 tabla.fecha <= func.min(func.coalesce(SensorPlanta.fecha_anulacion, fecha_fin), fecha_fin)]
+            if fecha_limite is not None:
+                condiciones.append(tabla.fecha < fecha_limite)
+            # Con un unico min o max en la consulta, SQLite toma las demas columnas de la fila con ese valor.
+            for extremo in (func.min(minimo), func.max(maximo)):
+                query = select(tabla.tipo_sensor, tabla.zona_sensor, tabla.numero_sensor, tabla.unidad_medida, tabla.fecha,
+                               minimo, maximo, indice.label('indice'), extremo).join(
+                    SensorPlanta, and_(SensorPlanta.tipo_sensor == tabla.tipo_sensor, SensorPlanta.zona_sensor == tabla.zona_sensor,
+                                       SensorPlanta.numero_sensor == tabla.numero_sensor)).where(*condiciones).group_by(
+                    tabla.zona_sensor, tabla.unidad_medida, literal_column('indice'))
+                filas.extend(fila[:8] for fila in session.execute(query.order_by(tabla.fecha)).all())
+        return filas
+
+    @staticmethod
+    def __filterFromPlant(query, tabla, nombre_planta: str, fecha_fin: datetime):
+        asociado = select(SensorPlanta.id_).where(
+            SensorPlanta.nombre_planta == nombre_planta, SensorPlanta.tipo_sensor == tabla.tipo_sensor,
+            SensorPlanta.zona_sensor == tabla.zona_sensor, SensorPlanta.numero_sensor == tabla.numero_sensor,
+            tabla.fecha >= SensorPlanta.fecha_asociacion, tabla.fecha <= func.coalesce(SensorPlanta.fecha_anulacion, fecha_fin)).exists()
+        return query.filter(asociado)
+
+    @staticmethod
+    def __listPage(session: Session, sensor: Optional[Tuple], nombre_planta: Optional[str], limite: int,
+                   cursor: Optional[Tuple[int, datetime, int]], fecha_inicio: datetime,
+                   fecha_fin: datetime) -> Tuple[List[RegistroSensor], Optional[Tuple[int, datetime, int]]]:
+        # Los niveles (medias por dia, medias por hora y registros originales) no se solapan en el tiempo, por lo que
+        # recorrerlos en orden y cada uno por (fecha, clave) da un orden total estable para la paginacion por clave.
+        niveles: List[Tuple] = RegistroSensorAgregadoSet.__getResolutionSections(session, sensor)
+        niveles.append((RegistroSensor, None))
+        filas: List[Tuple] = []
+        for nivel, (tabla, fecha_limite) in enumerate(niveles):
+            if cursor is not None and nivel < cursor[0]:
+                continue
+            if tabla is RegistroSensor:
+                clave = RegistroSensor.id_
+            else:
+                clave = literal_column(inspect(tabla).local_table.name + '.rowid')
+            query = RegistroSensorAgregadoSet.__filterFromSensorBetweenDates(session.query(tabla, clave), tabla, sensor,
+                                                                             fecha_inicio, fecha_fin)
+            if nombre_planta is not None:
+                query = RegistroSensorAgregadoSet.__filterFromPlant(query, tabla, nombre_planta, fecha_fin)
+            if fecha_limite is not None:
+                query = query.filter(tabla.fecha < fecha_limite)
+            if cursor is not None and nivel == cursor[0]:
+                query = query.filter(tuple_(tabla.fecha, clave) > tuple_(cursor[1], cursor[2]))
+            for fila in query.order_by(tabla.fecha, clave).limit(limite + 1 - len(filas)).all():
+                filas.append((nivel, fila[0], fila[1]))
+            if len(filas) > limite:
+                break
+        siguiente: Optional[Tuple[int, datetime, int]] = None
+        if len(filas) > limite:
+            filas = filas[:limite]
+            siguiente = (filas[-1][0], filas[-1][1].fecha, filas[-1][2])
+        registros_sensores: List[RegistroSensor] = []
+        for nivel, registro, clave in filas:
+            if isinstance(registro, RegistroSensorAgregado):
+                registro = RegistroSensorAgregadoSet.__getRecordFromInterval(registro)
+            registros_sensores.append(registro)
+        return registros_sensores, siguiente
+
+    @staticmethod
+    def listPage(session: Session, limite: int, cursor: Optional[Tuple[int, datetime, int]] = None, fecha_inicio: datetime = None,
+                 fecha_fin: datetime = None) -> Tuple[List[RegistroSensor], Optional[Tuple[int, datetime, int]]]:
+        """
+        Pagina de registros de todos los sensores con la mayor resolucion disponible, en orden cronologico.
+
+        La paginacion es por clave: cada pagina continua a partir del cursor devuelto por la anterior con una
+        consulta por indice, por lo que su coste no depende de la cantidad de registros almacenados.
+
+        Args:
+            - session (Session): Objeto de sesion.
+            - limite (int): Numero maximo de registros de la pagina.
+            - cursor (Optional[Tuple[int, datetime, int]]): Posicion tras la que comienza la pagina (nivel de resolucion,
+              fecha y clave del ultimo registro de la pagina anterior). Si no se especifica, desde el principio.
+            - fecha_inicio (datetime): Fecha de inicio (incluida). Si no se especifica, desde el principio.
+            - fecha_fin (datetime): Fecha de fin (incluida). Si no se especifica, hasta el final.
+
+        Returns:
+            - Tuple[List[RegistroSensor], Optional[Tuple[int, datetime, int]]]: Registros de la pagina y cursor de la
+              pagina siguiente, o None si es la ultima.
+        """
+        return RegistroSensorAgregadoSet.__listPage(session, None, None, limite, cursor, fecha_inicio, fecha_fin)
+
+    @staticmethod
+    def listPageFromSensor(session: Session, tipo_sensor:TipoSensor, zona_sensor: ZonaSensor ,numero_sensor:int, limite: int,
+                           cursor: Optional[Tuple[int, datetime, int]] = None, fecha_inicio: datetime = None,
+                           fecha_fin: datetime = None) -> Tuple[List[RegistroSensor], Optional[Tuple[int, datetime, int]]]:
+        """
+        Pagina de registros del sensor con la mayor resolucion disponible, en orden cronologico.
+
+        Args:
+            - session (Session): Objeto de sesion.
+            - tipo_sensor (TipoSensor): Tipo de sensor.
+            - zona_sensor (ZonaSensor): Zona del sensor.
+            - numero_sensor (int): Numero de sensor.
+            - limite (int): Numero maximo de registros de la pagina.
+            - cursor (Optional[Tuple[int, datetime, int]]): Cursor devuelto por la pagina anterior.
+            - fecha_inicio (datetime): Fecha de inicio (incluida). Si no se especifica, desde el principio.
+            - fecha_fin (datetime): Fecha de fin (incluida). Si no se especifica, hasta el final.
+
+        Returns:
+            - Tuple[List[RegistroSensor], Optional[Tuple[int, datetime, int]]]: Registros de la pagina y cursor de la
+              pagina siguiente, o None si es la ultima.
+        """
+        return RegistroSensorAgregadoSet.__listPage(session, (tipo_sensor, zona_sensor, numero_sensor), None, limite, cursor,
+                                                    fecha_inicio, fecha_fin)
+
+    @staticmethod
+    def listPageFromPlant(session: Session, nombre_planta: str, limite: int, cursor: Optional[Tuple[int, datetime, int]] = None,
+                          fecha_inicio: datetime = None, fecha_fin: datetime = None) -> Tuple[List[RegistroSensor], Optional[Tuple[int, datetime, int]]]:
+        """
+        Pagina de registros de los sensores asociados a una planta mientras estuvieron asociados a ella,
+        con la mayor resolucion disponible, en orden cronologico.
+
+        Args:
+            - session (Session): Objeto de sesion.
+            - nombre_planta (str): Nombre de la planta.
+            - limite (int): Numero maximo de registros de la pagina.
+            - cursor (Optional[Tuple[int, datetime, int]]): Cursor devuelto por la pagina anterior.
+            - fecha_inicio (datetime): Fecha de inicio (incluida). Si no se especifica, desde la asociacion.
+            - fecha_fin (datetime): Fecha de fin (incluida). Si no se especifica, la fecha actual.
+
+        Returns:
+            - Tuple[List[RegistroSensor], Optional[Tuple[int, datetime, int]]]: Registros de la pagina y cursor de la
+              pagina siguiente, o None si es la ultima.
+        """
+        if nombre_planta is None:
+            raise ValueError('Necesario especificar el nombre de la planta.')
+        if fecha_fin is None:
+            fecha_fin = datetime.now()
+        return RegistroSensorAgregadoSet.__listPage(session, None, nombre_planta, limite, cursor, fecha_inicio, fecha_fin)
+
+    @staticmethod
+    def __iterate(session: Session, sensor: Optional[Tuple], nombre_planta: Optional[str], fecha_inicio: datetime,
+                  fecha_fin: datetime, tamano_bloque: int) -> Iterator[RegistroSensor]:
+        niveles: List[Tuple] = RegistroSensorAgregadoSet.__getResolutionSections(session, sensor)
+        niveles.append((RegistroSensor, None))
+        for tabla, fecha_limite in niveles:
+            query = RegistroSensorAgregadoSet.__filterFromSensorBetweenDates(session.query(tabla), tabla, sensor,
+                                                                             fecha_inicio, fecha_fin)
+            if nombre_planta is not None:
+                query = RegistroSensorAgregadoSet.__filterFromPlant(query, tabla, nombre_planta, fecha_fin)
+            if fecha_limite is not None:
+                query = query.filter(tabla.fecha < fecha_limite)
+            # Lectura por bloques con cursor en el servidor: solo se mantiene en memoria el bloque en curso.
+            query = query.order_by(tabla.fecha).execution_options(stream_results=True).yield_per(tamano_bloque)
+            for registro in query:
+                if isinstance(registro, RegistroSensorAgregado):
+                    registro = RegistroSensorAgregadoSet.__getRecordFromInterval(registro)
+                yield registro
+
+    @staticmethod
+    def iterate(session: Session, tamano_bloque: int, fecha_inicio: datetime = None,
+                fecha_fin: datetime = None) -> Iterator[RegistroSensor]:
+        """
+        Recorrido de los registros de todos los sensores con la mayor resolucion disponible, en orden cronologico,
+        leyendolos de la base de datos por bloques.
+
+        Args:
+            - session (Session): Objeto de sesion.
+            - tamano_bloque (int): Numero de registros leidos de la base de datos en cada bloque.
+            - fecha_inicio (datetime): Fecha de inicio (incluida). Si no se especifica, desde el principio.
+            - fecha_fin (datetime): Fecha de fin (incluida). Si no se especifica, hasta el final.
+
+        Returns:
+            - Iterator[RegistroSensor]: Registros de los sensores.
+        """
+        return RegistroSensorAgregadoSet.__iterate(session, None, None, fecha_inicio, fecha_fin, tamano_bloque)
+
+    @staticmethod
+    def iterateFromSensor(session: Session, tipo_sensor:TipoSensor, zona_sensor: ZonaSensor ,numero_sensor:int, tamano_bloque: int,
+                          fecha_inicio: datetime = None, fecha_fin: datetime = None) -> Iterator[RegistroSensor]:
+        """
+        Recorrido de los registros del sensor con la mayor resolucion disponible, en orden cronologico,
+        leyendolos de la base de datos por bloques.
+
+        Args:
+            - session (Session): Objeto de sesion.
+            - tipo_sensor (TipoSensor): Tipo de sensor.
+            - zona_sensor (ZonaSensor): Zona del sensor.
+            - numero_sensor (int): Numero de sensor.
+            - tamano_bloque (int): Numero de registros leidos de la base de datos en cada bloque.
+            - fecha_inicio (datetime): Fecha de inicio (incluida). Si no se especifica, desde el principio.
+            - fecha_fin (datetime): Fecha de fin (incluida). Si no se especifica, hasta el final.
+
+        Returns:
+            - Iterator[RegistroSensor]: Registros del sensor.
+        """
+        return RegistroSensorAgregadoSet.__iterate(session, (tipo_sensor, zona_sensor, numero_sensor), None,
+                                                   fecha_inicio, fecha_fin, tamano_bloque)
+
+    @staticmethod
+    def iterateFromPlant(session: Session, nombre_planta: str, tamano_bloque: int, fecha_inicio: datetime = None,
+                         fecha_fin: datetime = None) -> Iterator[RegistroSensor]:
+        """
+        Recorrido de los registros de los sensores asociados a una planta mientras estuvieron asociados a ella,
+        con la mayor resolucion disponible, en orden cronologico, leyendolos de la base de datos por bloques.
+
+        Args:
+            - session (Session): Objeto de sesion.
+            - nombre_planta (str): Nombre de la planta.
+            - tamano_bloque (int): Numero de registros leidos de la base de datos en cada bloque.
+            - fecha_inicio (datetime): Fecha de inicio (incluida). Si no se especifica, desde la asociacion.
+            - fecha_fin (datetime): Fecha de fin (incluida). Si no se especifica, la fecha actual.
+
+        Returns:
+            - Iterator[RegistroSensor]: Registros de los sensores de la planta.
+        """
+        if nombre_planta is None:
+            raise ValueError('Necesario especificar el nombre de la planta.')
+        if fecha_fin is None:
+            fecha_fin = datetime.now()
+        return RegistroSensorAgregadoSet.__iterate(session, None, nombre_planta, fecha_inicio, fecha_fin, tamano_bloque)
@@ -1,13 +1,16 @@
 #Author: Oscar Valverde Escobar
 
-from datetime import datetime
-from typing import List, Optional
+import calendar
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import Integer, and_, cast, delete, insert, select, tuple_, union_all  # type: ignore
 from sqlalchemy.exc import IntegrityError  # type: ignore
 from sqlalchemy.orm.session import Session  # type: ignore
 from sqlalchemy.orm.exc import NoResultFound  # type: ignore
 from sqlalchemy.sql import func
-from backend.data.db.results import RegistroSensor, Sensor
+from backend.data.db.results import RegistroSensor, RegistroSensorHorario, Sensor, SensorPlanta
 from backend.data.db.exc import ErrorSensorExiste, ErrorSensorNoExiste, ErrorRegistroSensorExiste, ErrorRegistroSensorNoExiste
+from backend.data.db.resultsets import EstadoRegistrosSensoresSet, RegistroSensorAgregadoSet
 from common.data.util import TipoSensor, ZonaSensor, TipoMedida, UnidadMedida
 
 class RegistroSensorSet():
@@ -51,7 +54,10 @@ class RegistroSensorSet():
         nuevo_registro_sensor: RegistroSensor = None
         try:
             nuevo_registro_sensor = RegistroSensor(tipo_sensor, zona_sensor, numero_sensor, valor, unidad_medida, fecha)
+            ultimo_id_anterior: int = EstadoRegistrosSensoresSet.getAggregatedMaxId(session)
             session.add(nuevo_registro_sensor)
+            RegistroSensorAgregadoSet.updateFromRecords(session, [nuevo_registro_sensor])
+            EstadoRegistrosSensoresSet.advanceAggregated(session, ultimo_id_anterior)
             session.commit()
         except IntegrityError as ex:
             session.rollback()
@@ -62,6 +68,143 @@ class RegistroSensorSet():
         finally:
             return nuevo_registro_sensor
 
+    @staticmethod
+    def createMany(session: Session, registros_sensores: List[RegistroSensor]) -> int:
+        """
+        Creacion de multiples registros de sensores en una unica transaccion.
+
+        Nota:
+            Realiza commit de la transaccion. Todos los registros se insertan con un unico
+            executemany, por lo que un ciclo de lectura completo cuesta un solo commit.
+            Los registros agregados por horas y dias, y con ellos el ultimo id agregado, se actualizan en la misma
+            transaccion.
+
+        Args:
+            - session (Session): Objeto de sesion.
+            - registros_sensores (List[RegistroSensor]): Registros a insertar.
+
+        Raises:
+            - ValueError: Si no es proporcionado alguno de los datos necesarios.
+            - ErrorRegistroSensorExiste: Si alguno de los registros ya existe.
+
+        Returns:
+            - int: Numero de registros insertados.
+        """
+        filas: List[Dict] = []
+        for registro_sensor in registros_sensores:
+            if registro_sensor.tipo_sensor is None:
+                raise ValueError('Necesario especificar el tipo de sensor.')
+            if registro_sensor.zona_sensor is None:
+                raise ValueError('Necesario especificar la zona del sensor.')
+            if registro_sensor.numero_sensor is None:
+                raise ValueError('Necesario especificar el numero de sensor.')
+            if registro_sensor.valor is None:
+                raise ValueError('Necesario especificar el valor del sensor.')
+            if registro_sensor.unidad_medida is None:
+                raise ValueError('Necesario especificar la unidad_medida del sensor.')
+            if registro_sensor.fecha is None:
+                registro_sensor.fecha = datetime.now()
+            filas.append({'tipo_sensor': registro_sensor.tipo_sensor,
+                          'zona_sensor': registro_sensor.zona_sensor,
+                          'numero_sensor': registro_sensor.numero_sensor,
+                          'valor': registro_sensor.valor,
+                          'unidad_medida': registro_sensor.unidad_medida,
+                          'fecha': registro_sensor.fecha,
+                          'numero_lecturas': registro_sensor.numero_lecturas,
+                          'suma_lecturas': registro_sensor.suma_lecturas})
+        if len(filas) == 0:
+            return 0
+        try:
+            ultimo_id_anterior: int = EstadoRegistrosSensoresSet.getAggregatedMaxId(session)
+            session.execute(insert(RegistroSensor), filas)
+            RegistroSensorAgregadoSet.updateFromRecords(session, registros_sensores)
+            EstadoRegistrosSensoresSet.advanceAggregated(session, ultimo_id_anterior)
+            session.commit()
+        except IntegrityError as ex:
+            session.rollback()
+            raise ErrorRegistroSensorExiste(
+                'Alguno de los ' + str(len(filas)) + ' registros de sensores ya existe.'
+                ) from ex
+        return len(filas)
+
+    @staticmethod
+    def filterNew(session: Session, registros_sensores: List[RegistroSensor]) -> List[RegistroSensor]:
+        """
+        Descarte de los registros que ya existen en la base de datos: los de un mismo sensor, unidad de medida
+        y fecha. Permite repetir sin duplicados la insercion de registros que pueden haberse insertado ya.
+
+        Args:
+            - session (Session): Objeto de sesion.
+            - registros_sensores (List[RegistroSensor]): Registros a comprobar, todos con fecha.
+
+        Returns:
+            - List[RegistroSensor]: Registros que no existen, en el mismo orden.
+        """
+        if len(registros_sensores) == 0:
+            return []
+        claves_sensores = {(registro_sensor.tipo_sensor, registro_sensor.zona_sensor, registro_sensor.numero_sensor)
+                           for registro_sensor in registros_sensores}
+        query = session.query(RegistroSensor.tipo_sensor, RegistroSensor.zona_sensor, RegistroSensor.numero_sensor,
+                              RegistroSensor.unidad_medida, RegistroSensor.fecha).filter(
+            tuple_(RegistroSensor.tipo_sensor, RegistroSensor.zona_sensor, RegistroSensor.numero_sensor).in_(claves_sensores),
+            RegistroSensor.fecha >= min(registro_sensor.fecha for registro_sensor in registros_sensores),
+            RegistroSensor.fecha <= max(registro_sensor.fecha for registro_sensor in registros_sensores))
+        existentes = set(tuple(fila) for fila in query.all())
+        return [registro_sensor for registro_sensor in registros_sensores
+                if (registro_sensor.tipo_sensor, registro_sensor.zona_sensor, registro_sensor.numero_sensor,
+                    registro_sensor.unidad_medida, registro_sensor.fecha) not in existentes]
+
+    @staticmethod
+    def listSensorDatesBetweenIds(session: Session, id_inicio: int, id_fin: int, fecha_fin: datetime) -> List[Tuple]:
+        """
+        Sensor y fecha de los registros con id en (id_inicio, id_fin] y fecha anterior a fecha_fin, recorriendo solo
+        ese rango de la clave primaria. Permite conocer los registros almacenados desde una version con fecha en
+        intervalos ya cerrados.
+
+        Args:
+            - session (Session): Objeto de sesion.
+            - id_inicio (int): Id a partir del que se buscan registros (excluido).
+            - id_fin (int): Ultimo id buscado (incluido).
+            - fecha_fin (datetime): Solo se devuelven los registros anteriores a esta fecha.
+
+        Returns:
+            - List[Tuple]: (tipo, zona, numero, fecha) de cada registro.
+        """
+        query = session.query(RegistroSensor.tipo_sensor, RegistroSensor.zona_sensor, RegistroSensor.numero_sensor,
+                              RegistroSensor.fecha).filter(RegistroSensor.id_ > id_inicio, RegistroSensor.id_ <= id_fin,
+                                                           RegistroSensor.fecha < fecha_fin)
+        return [tuple(fila) for fila in query.all()]
+
+    @staticmethod
+    def deleteBefore(session: Session, fecha: datetime, tamano_bloque: int) -> int:
+        """
+        Eliminacion de los registros de sensores anteriores a una fecha en bloques de tamaño acotado.
+
+        Nota:
+            Realiza commit de la transaccion tras cada bloque, de forma que el lector de sensores
+            no queda bloqueado durante toda la eliminacion. Antes de eliminar ningun registro se avanza
+            la fecha de compactacion almacenada.
+
+        Args:
+            - session (Session): Objeto de sesion.
+            - fecha (datetime): Se eliminan los registros con fecha anterior a esta.
+            - tamano_bloque (int): Numero maximo de registros eliminados por transaccion.
+
+        Returns:
+            - int: Numero de registros eliminados.
+        """
+        EstadoRegistrosSensoresSet.advanceCompactionDate(session, fecha)
+        session.commit()
+        eliminados: int = 0
+        while True:
+            bloque = select(RegistroSensor.id_).where(RegistroSensor.fecha < fecha).limit(tamano_bloque)
+            resultado = session.execute(delete(RegistroSensor).where(RegistroSensor.id_.in_(bloque)).execution_options(
+                synchronize_session=False))
+            session.commit()
+            eliminados += resultado.rowcount
+            if resultado.rowcount < tamano_bloque:
+                return eliminados
+
     @staticmethod
     def listAll(session: Session) -> List[RegistroSensor]:
     #def list_all(session: Session, tipo_sensor:str ,numero_sensor:str) -> List[Sensor]:
@@ -93,12 +236,41 @@ class RegistroSensorSet():
         registros_sensores: List[RegistroSensor] = query.all()
         return registros_sensores
     
+    @staticmethod
+    def listAllFromPlant(session: Session, nombre_planta: str, fecha_inicio: datetime = None, fecha_fin: datetime = None) -> List[RegistroSensor]:
+        """
+        Registros de los sensores asociados a una planta mientras estuvieron asociados a ella, con una unica consulta
+        que une las asociaciones entre sensores y plantas con los registros de los sensores.
+
+        Args:
+            - session (Session): Objeto de sesion.
+            - nombre_planta (str): Nombre de la planta.
+            - fecha_inicio (datetime): Fecha de inicio (incluida). Si no se especifica, desde la asociacion.
+            - fecha_fin (datetime): Fecha de fin (incluida). Si no se especifica, la fecha actual.
+
+        Returns:
+            - List[RegistroSensor]: Registros de los sensores de la planta ordenados por fecha.
+        """
+        if nombre_planta is None:
+            raise ValueError('Necesario especificar el nombre de la planta.')
+        if fecha_fin is None:
+            fecha_fin = datetime.now()
+        query = session.query(RegistroSensor).join(SensorPlanta, and_(SensorPlanta.tipo_sensor == RegistroSensor.tipo_sensor,
+                                                                      SensorPlanta.zona_sensor == RegistroSensor.zona_sensor,
+                                                                      SensorPlanta.numero_sensor == RegistroSensor.numero_sensor)).filter(
+            SensorPlanta.nombre_planta == nombre_planta, RegistroSensor.fecha >= SensorPlanta.fecha_asociacion,
+            RegistroSensor.fecha <= func.coalesce(SensorPlanta.fecha_anulacion, fecha_fin), RegistroSensor.fecha <= fecha_fin)
+        if fecha_inicio is not None:
+            query = query.filter(RegistroSensor.fecha >= fecha_inicio)
+        registros_sensores: List[RegistroSensor] = query.order_by(RegistroSensor.fecha, RegistroSensor.id_).all()
+        return registros_sensores
+
     @staticmethod
     def getAvgFromSensorBetweenDates(session: Session, tipo_sensor:TipoSensor, zona_sensor: ZonaSensor ,numero_sensor:int, fecha_inicio: datetime, fecha_fin: datetime = None) -> List[RegistroSensor]:
         if fecha_fin is None:
             fecha_fin = datetime.now()
         registros_sensores = None
-        query = session.query(func.avg(RegistroSensor.valor),RegistroSensor.unidad_medida).filter(RegistroSensor.tipo_sensor == tipo_sensor, RegistroSensor.zona_sensor == zona_sensor, RegistroSensor.numero_sensor == numero_sensor, RegistroSensor.fecha >= fecha_inicio, RegistroSensor.fecha <= fecha_fin).group_by(RegistroSensor.unidad_medida)
+        query = session.query(func.sum(func.coalesce(RegistroSensor.suma_lecturas, RegistroSensor.valor)) / func.sum(func.coalesce(RegistroSensor.numero_lecturas, 1)),RegistroSensor.unidad_medida).filter(RegistroSensor.tipo_sensor == tipo_sensor, RegistroSensor.zona_sensor == zona_sensor, RegistroSensor.numero_sensor == numero_sensor, RegistroSensor.fecha >= fecha_inicio, RegistroSensor.fecha <= fecha_fin).group_by(RegistroSensor.unidad_medida)
         registros_sensores: List[RegistroSensor] = []
         for registro in query.all():
             registro_sensor = RegistroSensor(tipo_sensor, zona_sensor, numero_sensor, registro[0], registro[1], fecha_inicio)
@@ -111,7 +283,7 @@ class RegistroSensorSet():
         if fecha_fin is None:
             fecha_fin = datetime.now()
         registros_sensores = None
-        query = session.query(func.avg(RegistroSensor.valor),RegistroSensor.unidad_medida).filter(RegistroSensor.tipo_sensor == tipo_sensor, RegistroSensor.zona_sensor == zona_sensor, RegistroSensor.fecha >= fecha_inicio, RegistroSensor.fecha <= fecha_fin).group_by(RegistroSensor.unidad_medida)
+        query = session.query(func.sum(func.coalesce(RegistroSensor.suma_lecturas, RegistroSensor.valor)) / func.sum(func.coalesce(RegistroSensor.numero_lecturas, 1)),RegistroSensor.unidad_medida).filter(RegistroSensor.tipo_sensor == tipo_sensor, RegistroSensor.zona_sensor == zona_sensor, RegistroSensor.fecha >= fecha_inicio, RegistroSensor.fecha <= fecha_fin).group_by(RegistroSensor.unidad_medida)
         registros_sensores: List[RegistroSensor] = []
         for registro in query.all():
             registro_sensor = RegistroSensor(tipo_sensor, zona_sensor, 0, registro[0], registro[1], fecha_inicio)
@@ -119,6 +291,67 @@ class RegistroSensorSet():
             registros_sensores.append(registro_sensor)
         return registros_sensores
 
+    @staticmethod
+    def __intervalIndex(fecha, segundos_inicio: int, segundos_intervalo: int):
+        # Indice del intervalo de la fecha calculado en la base de datos con aritmetica entera sobre segundos.
+        return (cast(func.strftime('%s', fecha), Integer) - segundos_inicio) // segundos_intervalo
+
+    @staticmethod
+    def getAvgFromPlantGroupByIntervals(session: Session, nombre_planta: str, fecha_inicio: datetime,
+                                        duracion_intervalo: timedelta, numero_intervalos: int) -> List[RegistroSensor]:
+        """
+        Media de los registros de todos los sensores asociados a una planta agrupados por intervalos consecutivos
+        de igual duracion, calculada con una unica consulta agrupando por el indice del intervalo de cada registro.
+
+        Nota:
+            Los intervalos son semiabiertos [inicio, inicio + duracion) y deben estar alineados a horas completas.
+            Las horas ya cerradas se obtienen de la tabla agregada por horas y solo la hora en curso
+            se calcula a partir de los registros de los sensores.
+
+        Args:
+            - session (Session): Objeto de sesion.
+            - nombre_planta (str): Nombre de la planta.
+            - fecha_inicio (datetime): Fecha de inicio del primer intervalo.
+            - duracion_intervalo (timedelta): Duracion de cada intervalo.
+            - numero_intervalos (int): Numero de intervalos.
+
+        Returns:
+            - List[RegistroSensor]: Un registro por sensor, unidad de medida e intervalo con registros,
+              con la media como valor y la fecha de inicio del intervalo como fecha.
+        """
+        if nombre_planta is None:
+            raise ValueError('Necesario especificar el nombre de la planta.')
+        if numero_intervalos <= 0:
+            return []
+        fecha_fin: datetime = fecha_inicio + duracion_intervalo * numero_intervalos
+        fecha_limite: datetime = min(max(RegistroSensorHorario.truncarFecha(datetime.now()), fecha_inicio), fecha_fin)
+        segundos_inicio: int = calendar.timegm(fecha_inicio.timetuple())
+        segundos_intervalo: int = int(duracion_intervalo.total_seconds())
+        sensores_planta = select(SensorPlanta.tipo_sensor, SensorPlanta.zona_sensor, SensorPlanta.numero_sensor).where(
+            SensorPlanta.nombre_planta == nombre_planta)
+        horas_cerradas = select(RegistroSensorHorario.tipo_sensor, RegistroSensorHorario.zona_sensor, RegistroSensorHorario.numero_sensor,
+                                RegistroSensorHorario.unidad_medida, RegistroSensorSet.__intervalIndex(RegistroSensorHorario.fecha, segundos_inicio, segundos_intervalo).label('indice'),
+                                RegistroSensorHorario.suma_valores.label('suma_valores'),
+                                RegistroSensorHorario.numero_registros.label('numero_registros')).where(
+            tuple_(RegistroSensorHorario.tipo_sensor, RegistroSensorHorario.zona_sensor, RegistroSensorHorario.numero_sensor).in_(sensores_planta),
+            RegistroSensorHorario.fecha >= fecha_inicio, RegistroSensorHorario.fecha < fecha_limite)
+        hora_en_curso = select(RegistroSensor.tipo_sensor, RegistroSensor.zona_sensor, RegistroSensor.numero_sensor,
+                               RegistroSensor.unidad_medida, RegistroSensorSet.__intervalIndex(RegistroSensor.fecha, segundos_inicio, segundos_intervalo),
+                               func.coalesce(RegistroSensor.suma_lecturas, RegistroSensor.valor), func.coalesce(RegistroSensor.numero_lecturas, 1)).where(
+            tuple_(RegistroSensor.tipo_sensor, RegistroSensor.zona_sensor, RegistroSensor.numero_sensor).in_(sensores_planta),
+            RegistroSensor.fecha >= fecha_limite, RegistroSensor.fecha < fecha_fin)
+        registros = union_all(horas_cerradas, hora_en_curso).subquery()
+        query = select(registros.c.tipo_sensor, registros.c.zona_sensor, registros.c.numero_sensor, registros.c.unidad_medida,
+                       registros.c.indice, func.sum(registros.c.suma_valores) / func.sum(registros.c.numero_registros)).group_by(
+            registros.c.tipo_sensor, registros.c.zona_sensor, registros.c.numero_sensor, registros.c.unidad_medida, registros.c.indice)
+        registros_sensores: List[RegistroSensor] = []
+        for registro in session.execute(query).all():
+            registro_sensor = RegistroSensor(registro[0], registro[1], registro[2], registro[5], registro[3],
+                                             fecha_inicio + duracion_intervalo * registro[4])
+            registro_sensor.id_ = -1
+            registros_sensores.append(registro_sensor)
+        return registros_sensores
+
     @staticmethod
     def get(session: Session, id_: str) -> Optional[RegistroSensor]:
         """ Determines whether a user exists or not.
@@ -150,7 +383,8 @@ class RegistroSensorSet():
         Creacion de un nuevo registro de un sensor
 
         Nota:
-            Realiza commit de la transaccion.
+            Realiza commit de la transaccion. Si el registro esta comprimido, la suma de sus lecturas se
+            escala al nuevo valor. Incrementa el contador de modificaciones, que forma parte de la version.
 
         Args:
             - session (Session): Objeto de sesion.
@@ -193,11 +427,16 @@ class RegistroSensorSet():
             if registro_sensor.numero_sensor != numero_sensor:
                 query.update({'numero_sensor' : numero_sensor})
             if registro_sensor.valor != valor:
-                query.update({'valor' : valor})
+                if registro_sensor.numero_lecturas is not None:
+                    # Un registro comprimido representa numero_lecturas lecturas, que pasan a tener el nuevo valor.
+                    query.update({'valor' : valor, 'suma_lecturas' : valor * registro_sensor.numero_lecturas})
+                else:
+                    query.update({'valor' : valor})
             if registro_sensor.unidad_medida != unidad_medida:
                 query.update({'unidad_medida' : unidad_medida})
             if registro_sensor.fecha != fecha:
                 query.update({'fecha' : fecha})
+            EstadoRegistrosSensoresSet.registerModification(session)
             session.commit()
             registro_sensor_modificado: RegistroSensor = query.one() 
         except NoResultFound as ex:
@@ -7,7 +7,7 @@ from sqlalchemy.orm.session import Session  # type: ignore
 from sqlalchemy.orm.exc import NoResultFound  # type: ignore
 from backend.data.db.results import Sensor
 from backend.data.db.exc import ErrorSensorExiste, ErrorSensorNoExiste
-from common.data.util import TipoSensor, ZonaSensor, ModeloSensor, TipoMedida, UnidadMedida
+from common.data.util import TipoSensor, ZonaSensor, ModeloSensor, TipoMedida, UnidadMedida, FiltroLectura, CompresionLectura
 
 class SensorSet():
     """ 
@@ -19,7 +19,10 @@ class SensorSet():
                direccion_lectura:str, patilla_0_lectura:int, 
                patilla_1_lectura:int,patilla_2_lectura:int, patilla_3_lectura:int,  
                unidad_medida_0:UnidadMedida,unidad_medida_1:UnidadMedida, unidad_medida_2:UnidadMedida, 
-               unidad_medida_3:UnidadMedida, fecha_creacion:datetime ,fecha_eliminacion:datetime) -> Optional[Sensor]:              
+               unidad_medida_3:UnidadMedida, fecha_creacion:datetime ,fecha_eliminacion:datetime,
+               intervalo_lectura:int = None, muestras_lectura:int = None,
+               filtro_lectura:FiltroLectura = None, compresion_lectura:CompresionLectura = None,
+               desviacion_compresion:float = None) -> Optional[Sensor]:              
         """
         Creacion de un nuevo sensor
 
@@ -44,6 +47,11 @@ class SensorSet():
             - unidad_medida_3 (UnidadMedida): Unidad de medida de lectura 4 del sensor.
             - fecha_creacion (datetime): Fecha de creacion del sensor.
             - fecha_eliminacion (datetime): Fecha de eliminacion del sensor.
+            - intervalo_lectura (int): Segundos entre lecturas del sensor. Si no se especifica, el intervalo de muestreo general.
+            - muestras_lectura (int): Muestras que se toman en cada lectura del sensor. Si no se especifica, una.
+            - filtro_lectura (FiltroLectura): Filtro con el que se reducen las muestras. Si no se especifica, la mediana.
+            - compresion_lectura (CompresionLectura): Compresion de las lecturas. Si no se especifica, se almacenan todas.
+            - desviacion_compresion (float): Desviacion admitida por la compresion. Si no se especifica, 0.
 
         Raises:
             - ValueError: Si no es proporcionado alguno de los datos necesarios.
@@ -64,13 +72,20 @@ class SensorSet():
             raise ValueError('Necesario especificar el nombre del sensor.')
         if direccion_lectura is None and patilla_0_lectura is None:
             raise ValueError('Necesario especificar la direccion o patilla de lectura del sensor.')
+        if intervalo_lectura is not None and intervalo_lectura <= 0:
+            raise ValueError('El intervalo de lectura del sensor tiene que ser mayor que 0.')
+        if muestras_lectura is not None and muestras_lectura <= 0:
+            raise ValueError('El numero de muestras por lectura del sensor tiene que ser mayor que 0.')
+        if desviacion_compresion is not None and desviacion_compresion < 0:
+            raise ValueError('La desviacion de compresion del sensor no puede ser negativa.')
         nuevo_sensor = None
         try:
             nuevo_sensor = Sensor(tipo_sensor, zona_sensor, numero_sensor, modelo_sensor, nombre_sensor,
                                   direccion_lectura, patilla_0_lectura, patilla_1_lectura, 
                                   patilla_2_lectura, patilla_3_lectura, unidad_medida_0, 
                                   unidad_medida_1, unidad_medida_2, unidad_medida_3, 
-                                  fecha_creacion, fecha_eliminacion)
+                                  fecha_creacion, fecha_eliminacion, intervalo_lectura,
+                                  muestras_lectura, filtro_lectura, compresion_lectura, desviacion_compresion)
             session.add(nuevo_sensor)
             session.commit()
             
@@ -297,7 +312,9 @@ class SensorSet():
                direccion_lectura:str, patilla_0_lectura:int, patilla_1_lectura:int, 
                patilla_2_lectura:int, patilla_3_lectura:int, unidad_medida_0:UnidadMedida, 
                unidad_medida_1:UnidadMedida, unidad_medida_2:UnidadMedida, unidad_medida_3:UnidadMedida, 
-               fecha_creacion:datetime ,fecha_eliminacion:datetime) -> Optional[Sensor]:
+               fecha_creacion:datetime ,fecha_eliminacion:datetime, intervalo_lectura:int = None,
+               muestras_lectura:int = None, filtro_lectura:FiltroLectura = None,
+               compresion_lectura:CompresionLectura = None, desviacion_compresion:float = None) -> Optional[Sensor]:
         """
         Creacion de un nuevo registro de un sensor
 
@@ -322,6 +339,11 @@ class SensorSet():
             - unidad_medida_3 (UnidadMedida): Unidad de medida de lectura 4 del sensor.
             - fecha_creacion (datetime): Fecha de creacion del sensor.
             - fecha_eliminacion (datetime): Fecha de eliminacion del sensor.
+            - intervalo_lectura (int): Segundos entre lecturas del sensor. Si no se especifica, el intervalo de muestreo general.
+            - muestras_lectura (int): Muestras que se toman en cada lectura del sensor. Si no se especifica, una.
+            - filtro_lectura (FiltroLectura): Filtro con el que se reducen las muestras. Si no se especifica, la mediana.
+            - compresion_lectura (CompresionLectura): Compresion de las lecturas. Si no se especifica, se almacenan todas.
+            - desviacion_compresion (float): Desviacion admitida por la compresion. Si no se especifica, 0.
 
         Raises:
             - ValueError: Si no es proporcionado alguno de los datos necesarios.
@@ -337,6 +359,12 @@ class SensorSet():
             raise ValueError('Necesario especificar la zona del sensor.')
         if not numero_sensor:
             raise ValueError('Necesario especificar el numero de sensor.')
+        if intervalo_lectura is not None and intervalo_lectura <= 0:
+            raise ValueError('El intervalo de lectura del sensor tiene que ser mayor que 0.')
+        if muestras_lectura is not None and muestras_lectura <= 0:
+            raise ValueError('El numero de muestras por lectura del sensor tiene que ser mayor que 0.')
+        if desviacion_compresion is not None and desviacion_compresion < 0:
+            raise ValueError('La desviacion de compresion del sensor no puede ser negativa.')
 
         sensor_modificado: Sensor = None
         try:
@@ -368,6 +396,16 @@ class SensorSet():
                 # query.update({'fecha_creacion' : fecha_creacion})
             if sensor.fecha_eliminacion != fecha_eliminacion:
                 query.update({'fecha_eliminacion' : fecha_eliminacion})
+            if sensor.intervalo_lectura != intervalo_lectura:
+                query.update({'intervalo_lectura' : intervalo_lectura})
+            if sensor.muestras_lectura != muestras_lectura:
+                query.update({'muestras_lectura' : muestras_lectura})
+            if sensor.filtro_lectura != filtro_lectura:
+                query.update({'filtro_lectura' : filtro_lectura})
+            if sensor.compresion_lectura != compresion_lectura:
+                query.update({'compresion_lectura' : compresion_lectura})
+            if sensor.desviacion_compresion != desviacion_compresion:
+                query.update({'desviacion_compresion' : desviacion_compresion})
             session.commit()
             sensor_modificado: Sensor = query.one() 
         except NoResultFound as ex:
@@ -1,10 +1,25 @@
 #Author: Oscar Valverde Escobar
 
-from .sensor_electronico import SensorElectronico
-from .sensor_electronico_MCP3008 import SensorElectronicoMCP3008
-from .sensor_electronico_DHT11 import SensorElectronicoDHT11
-from .sensor_electronico_FC28 import SensorElectronicoFC28
-from .sensor_electronico_LDR import SensorElectronicoLDR
-from .sensor_electronico_LM35 import SensorElectronicoLM35
-from .sensor_electronico_BH1750 import SensorElectronicoBH1750
-from .factoria_sensor_electronico import FactoriaSensorElectronico
\ No newline at end of file
+import importlib
+from .factoria_sensor_electronico import FactoriaSensorElectronico
+
+# Los sensores electronicos y los buses importan las librerias del hardware (board, busio, adafruit_*), por
+# lo que se importan al usarse por primera vez y no al importar el paquete.
+__modulos = {
+    'RegistroBuses': '.registro_buses',
+    'DispositivoCompartido': '.registro_buses',
+    'SensorElectronico': '.sensor_electronico',
+    'LectorMCP3008': '.lector_MCP3008',
+    'SensorElectronicoMCP3008': '.sensor_electronico_MCP3008',
+    'SensorElectronicoDHT11': '.sensor_electronico_DHT11',
+    'SensorElectronicoFC28': '.sensor_electronico_FC28',
+    'SensorElectronicoLDR': '.sensor_electronico_LDR',
+    'SensorElectronicoLM35': '.sensor_electronico_LM35',
+    'SensorElectronicoBH1750': '.sensor_electronico_BH1750',
+}
+
+def __getattr__(nombre: str) -> object:
+    modulo = __modulos.get(nombre)
+    if modulo is None:
+        raise AttributeError('module ' + repr(__name__) + ' has no attribute ' + repr(nombre))
+    return getattr(importlib.import_module(modulo, __name__), nombre)
\ No newline at end of file
@@ -1,30 +1,92 @@
 #Author: Oscar Valverde Escobar
 
+import importlib
+import importlib.metadata
+import threading
 from datetime import datetime
-from typing import Optional,Dict,List
+from typing import Optional,Dict,List,Tuple
 from enum import Enum
 from common.data.util import Sensor as SensorCommon
 from common.data.util import TipoSensor, ZonaSensor, ModeloSensor, TipoMedida, UnidadMedida
-from backend.data.electronic import SensorElectronico, SensorElectronicoDHT11, SensorElectronicoFC28
-from backend.data.electronic import SensorElectronicoLDR, SensorElectronicoLM35, SensorElectronicoBH1750
 
 class FactoriaSensorElectronico ():
+    """
+    Construccion del sensor electronico de cada modelo de sensor.
+
+    La clase de cada ModeloSensor se registra como entry point del grupo GRUPO_DRIVERS (nombre del modelo =
+    modulo:clase), de forma que otros paquetes pueden aportar o sustituir sensores electronicos. Sin el
+    paquete instalado se usan los DRIVERS_INTEGRADOS. Cada clase se importa la primera vez que se construye
+    un sensor de su modelo, por lo que los procesos que no leen sensores no importan las librerias del hardware.
+    """
+
+    # Grupo de entry points con las clases de los sensores electronicos.
+    GRUPO_DRIVERS: str = 'backend.sensores_electronicos'
+    # Clases de los sensores electronicos incluidos en el paquete, por nombre de ModeloSensor.
+    DRIVERS_INTEGRADOS: Dict[str, str] = {
+        ModeloSensor.DHT11.name: 'backend.data.electronic.sensor_electronico_DHT11:SensorElectronicoDHT11',
+        ModeloSensor.FC28.name: 'backend.data.electronic.sensor_electronico_FC28:SensorElectronicoFC28',
+        ModeloSensor.LDR.name: 'backend.data.electronic.sensor_electronico_LDR:SensorElectronicoLDR',
+        ModeloSensor.LM35.name: 'backend.data.electronic.sensor_electronico_LM35:SensorElectronicoLM35',
+        ModeloSensor.BH1750.name: 'backend.data.electronic.sensor_electronico_BH1750:SensorElectronicoBH1750',
+        ModeloSensor.OTRO.name: 'backend.data.electronic.sensor_electronico:SensorElectronico',
+    }
+
+    __cerrojo = threading.Lock()
+    __rutas: Optional[Dict[str, str]] = None
+    __drivers: Dict[Optional[ModeloSensor], type] = {}
 
     @staticmethod
-    def getSensorElectronico(sensor_common: SensorCommon) -> SensorElectronico :
-        
-        sensor_electronico: SensorElectronico = SensorElectronico(sensor_common)
+    def __getPaths() -> Dict[str, str]:
+        if FactoriaSensorElectronico.__rutas is None:
+            rutas: Dict[str, str] = dict(FactoriaSensorElectronico.DRIVERS_INTEGRADOS)
+            for entry_point in importlib.metadata.entry_points(group=FactoriaSensorElectronico.GRUPO_DRIVERS):
+                rutas[entry_point.name] = entry_point.value
+            FactoriaSensorElectronico.__rutas = rutas
+        return FactoriaSensorElectronico.__rutas
+
+    @staticmethod
+    def getDriver(modelo_sensor: ModeloSensor) -> type:
+        """
+        Clase del sensor electronico de un modelo de sensor, importada la primera vez que se pide.
+
+        Args:
+            - modelo_sensor (ModeloSensor): Modelo del sensor.
+
+        Returns:
+            - type: Clase derivada de SensorElectronico. La de OTRO para los modelos sin clase registrada.
+        """
+        driver: type = FactoriaSensorElectronico.__drivers.get(modelo_sensor)
+        if driver is not None:
+            return driver
+        with FactoriaSensorElectronico.__cerrojo:
+            rutas: Dict[str, str] = FactoriaSensorElectronico.__getPaths()
+            ruta: str = rutas.get(modelo_sensor.name if modelo_sensor is not None else None, rutas[ModeloSensor.OTRO.name])
+            modulo, clase = ruta.split(':')
+            driver = getattr(importlib.import_module(modulo), clase)
+            FactoriaSensorElectronico.__drivers[modelo_sensor] = driver
+        return driver
+
+    @staticmethod
+    def getSensorElectronico(sensor_common: SensorCommon) -> 'SensorElectronico' :
+        return FactoriaSensorElectronico.getDriver(sensor_common.getModeloSensor())(sensor_common)
+
+    @staticmethod
+    def getBusLectura(sensor_common: SensorCommon) -> Tuple:
+        """
+        Bus fisico por el que se lee el sensor. Las lecturas de un mismo bus no pueden solaparse, mientras
+        que las de buses distintos pueden hacerse a la vez: cada patilla GPIO de los DHT11, cada chip select
+        de los MCP3008 y el bus I2C de los BH1750.
+
+        Args:
+            - sensor_common (SensorCommon): Sensor.
+
+        Returns:
+            - Tuple: Identificador del bus.
+        """
         if sensor_common.getModeloSensor() == ModeloSensor.DHT11:
-            sensor_electronico = SensorElectronicoDHT11(sensor_common)
-        elif sensor_common.getModeloSensor() == ModeloSensor.FC28:
-            sensor_electronico = SensorElectronicoFC28(sensor_common)
-        elif sensor_common.getModeloSensor() == ModeloSensor.LDR:
-            sensor_electronico = SensorElectronicoLDR(sensor_common)
-        elif sensor_common.getModeloSensor() == ModeloSensor.LM35:
-            sensor_electronico = SensorElectronicoLM35(sensor_common)
+            return ('GPIO', sensor_common.getPatillaLectura(0))
+        elif sensor_common.getModeloSensor() in (ModeloSensor.FC28, ModeloSensor.LDR, ModeloSensor.LM35):
+            return (sensor_common.getDireccionLectura(), sensor_common.getPatillaLectura(0))
         elif sensor_common.getModeloSensor() == ModeloSensor.BH1750:
-            sensor_electronico = SensorElectronicoBH1750(sensor_common)
-        elif sensor_common.getModeloSensor() == ModeloSensor.OTRO:
-            sensor_electronico = SensorElectronico(sensor_common)
-        return sensor_electronico
-        
+            return ('I2C',)
+        return (sensor_common.getDireccionLectura(), sensor_common.getPatillaLectura(0))
@@ -0,0 +1,106 @@
+#Author: Oscar Valverde Escobar
+
+import time
+from typing import Dict, List, Tuple
+import numpy as np
+from common.data.util import UnidadMedida
+from backend.data.electronic import SensorElectronico, DispositivoCompartido
+
+class LectorMCP3008():
+    """
+    Lectura conjunta de los sensores analogicos conectados a un mismo MCP3008.
+
+    Todos los canales de un chip se muestrean en una unica rafaga, con el bus SPI adquirido una sola vez,
+    las muestras de cada sensor se reducen con su filtro y las cuentas se convierten con NumPy de una vez
+    para todos los sensores del mismo modelo.
+    """
+
+    @staticmethod
+    def __burst(dispositivo_spi: object, canales: List[int], muestras: int, limite: float = None) -> List[int]:
+        # Una sola adquisicion y configuracion del bus SPI (SPIDevice de adafruit_bus_device, usado por
+        # MCP3008) para todas las conversiones. El chip select se alterna entre conversiones porque el
+        # MCP3008 inicia cada una en su flanco de bajada.
+        lecturas: List[int] = []
+        salida: bytearray = bytearray(3)
+        entrada: bytearray = bytearray(3)
+        with dispositivo_spi as spi:
+            for muestra in range(muestras):
+                if muestra > 0 and limite is not None and time.monotonic() >= limite:
+                    break
+                for canal in canales:
+                    if lecturas:
+                        dispositivo_spi.chip_select.value = True
+                        dispositivo_spi.chip_select.value = False
+                    salida[0] = 0x01
+                    salida[1] = 0x80 | (canal << 4)
+                    salida[2] = 0x00
+                    spi.write_readinto(salida, entrada)
+                    lecturas.append(((entrada[1] & 0x03) << 8) | entrada[2])
+        return lecturas
+
+    @staticmethod
+    def leer_canales(mcp: DispositivoCompartido, canales: List[int], muestras: int = 1, limite: float = None) -> np.ndarray:
+        """
+        Muestreo de varios canales de un MCP3008 en una unica rafaga.
+
+        Args:
+            - mcp (DispositivoCompartido): MCP3008 y el cerrojo de su bus SPI.
+            - canales (List[int]): Canales a muestrear.
+            - muestras (int): Numero de muestras de cada canal.
+            - limite (float): Limite (time.monotonic) a partir del cual no se toman mas muestras. Siempre se
+              toma al menos una.
+
+        Returns:
+            - np.ndarray: Cuentas de 16 bits (como AnalogIn.value), una fila por muestra y una columna por canal.
+        """
+        dispositivo_spi = getattr(mcp.dispositivo, '_spi_device', None)
+        with mcp.cerrojo:
+            if dispositivo_spi is None:
+                lecturas: List[int] = []
+                for muestra in range(muestras):
+                    if muestra > 0 and limite is not None and time.monotonic() >= limite:
+                        break
+                    lecturas.extend(mcp.dispositivo.read(canal) for canal in canales)
+            else:
+                lecturas: List[int] = LectorMCP3008.__burst(dispositivo_spi, canales, muestras, limite)
+        cuentas: np.ndarray = np.array(lecturas, dtype=np.uint16).reshape(-1, len(canales))
+        # El MCP3008 es de 10 bits; AnalogIn escala sus lecturas a 16 bits.
+        return np.left_shift(cuentas, 6)
+
+    @staticmethod
+    def leer_sensores(sensores: List[SensorElectronico], limite: float = None) -> List[List[Tuple[float, UnidadMedida]]]:
+        """
+        Lectura de sensores derivados de SensorElectronicoMCP3008 con una rafaga por chip.
+
+        En cada chip se toman tantas muestras como pida el sensor que mas necesite, y las de cada sensor
+        se reducen con su filtro. Las cuentas se convierten con el metodo convertir de la clase de cada
+        sensor, aplicado a la vez a todos los sensores de la misma clase.
+
+        Args:
+            - sensores (List[SensorElectronico]): Sensores a leer, de uno o varios chips.
+            - limite (float): Limite (time.monotonic) de la lectura.
+
+        Returns:
+            - List[List[Tuple[float, UnidadMedida]]]: Valores y unidades de medida de cada sensor, en el mismo orden.
+        """
+        chips: Dict[Tuple, List[int]] = {}
+        for indice, sensor in enumerate(sensores):
+            chips.setdefault((sensor.direccion_lectura, sensor.patilla_0_lectura), []).append(indice)
+        cuentas: np.ndarray = np.empty(len(sensores), dtype=np.float64)
+        for indices in chips.values():
+            canales: List[int] = [sensores[indice].patilla_1_lectura for indice in indices]
+            muestras: int = max(sensores[indice].muestras_lectura for indice in indices)
+            cuentas_chip: np.ndarray = LectorMCP3008.leer_canales(sensores[indices[0]].mcp, canales, muestras, limite)
+            if muestras == 1:
+                cuentas[indices] = cuentas_chip[0]
+                continue
+            for columna, indice in enumerate(indices):
+                cuentas[indice] = SensorElectronico.reducir_muestras(
+                    cuentas_chip[:sensores[indice].muestras_lectura, columna].astype(np.float64), sensores[indice].filtro_lectura)
+        clases: Dict[type, List[int]] = {}
+        for indice, sensor in enumerate(sensores):
+            clases.setdefault(type(sensor), []).append(indice)
+        valores: np.ndarray = np.empty(len(sensores), dtype=np.float64)
+        for clase, indices in clases.items():
+            valores[indices] = clase.convertir([sensores[indice] for indice in indices], cuentas[indices])
+        return [[[float(valor), sensor.unidad_medida_0]] for valor, sensor in zip(valores, sensores)]
@@ -0,0 +1,127 @@
+#Author: Oscar Valverde Escobar
+
+import threading
+from typing import Callable, Dict, Hashable
+import busio
+import digitalio
+import board
+from board import pin
+import adafruit_mcp3xxx.mcp3008 as MCP
+import adafruit_bh1750 as BH1750
+
+class DispositivoCompartido():
+    """
+    Objeto de acceso a un bus o dispositivo compartido por varios sensores, junto con el cerrojo del bus
+    fisico que lo contiene. Cada acceso al dispositivo se hace con el cerrojo adquirido.
+    """
+
+    def __init__(self, dispositivo: object, cerrojo: threading.RLock):
+        self.dispositivo: object = dispositivo
+        self.cerrojo: threading.RLock = cerrojo
+
+
+class RegistroBuses():
+    """
+    Registro de los buses y dispositivos del proceso, creados una unica vez y compartidos por todos los
+    sensores electronicos: un bus SPI por direccion de lectura, un MCP3008 por (direccion de lectura, chip
+    select), el bus I2C y un BH1750 por direccion I2C. Los dispositivos de un mismo bus comparten su cerrojo.
+    """
+
+    __cerrojo_registro = threading.RLock()
+    __cerrojos_bus: Dict[Hashable, threading.RLock] = {}
+    __dispositivos: Dict[Hashable, object] = {}
+
+    @staticmethod
+    def __getLock(bus: Hashable) -> threading.RLock:
+        cerrojo: threading.RLock = RegistroBuses.__cerrojos_bus.get(bus)
+        if cerrojo is None:
+            cerrojo = threading.RLock()
+            RegistroBuses.__cerrojos_bus[bus] = cerrojo
+        return cerrojo
+
+    @staticmethod
+    def __get(clave: Hashable, bus: Hashable, crear: Callable[[], object]) -> DispositivoCompartido:
+        with RegistroBuses.__cerrojo_registro:
+            dispositivo: object = RegistroBuses.__dispositivos.get(clave)
+            if dispositivo is None:
+                dispositivo = crear()
+                RegistroBuses.__dispositivos[clave] = dispositivo
+            return DispositivoCompartido(dispositivo, RegistroBuses.__getLock(bus))
+
+    @staticmethod
+    def getSPI(direccion_lectura: str) -> DispositivoCompartido:
+        """
+        Bus SPI de un MCP3008.
+
+        Args:
+            - direccion_lectura (str): Direccion de lectura del MCP3008 ('MCP3008_0' o 'MCP3008_1').
+
+        Returns:
+            - DispositivoCompartido: Bus SPI (busio.SPI) y su cerrojo.
+
+        Raises:
+            - ValueError: Si la direccion de lectura no corresponde a ningun bus SPI.
+        """
+        def crear() -> object:
+            if 'MCP3008_0' == direccion_lectura:
+                return busio.SPI(clock=board.SCK, MISO=board.MISO, MOSI=board.MOSI)
+            elif 'MCP3008_1' == direccion_lectura:
+                return busio.SPI(clock=board.SCK_1, MISO=board.MISO_1, MOSI=board.MOSI_1)
+            raise ValueError('La direccion de lectura ' + str(direccion_lectura) + ' no corresponde a ningun bus SPI.')
+        return RegistroBuses.__get(('SPI', direccion_lectura), ('SPI', direccion_lectura), crear)
+
+    @staticmethod
+    def getMCP3008(direccion_lectura: str, patilla_cs: int) -> DispositivoCompartido:
+        """
+        Convertidor MCP3008 conectado a un bus SPI con un chip select.
+
+        Args:
+            - direccion_lectura (str): Direccion de lectura del MCP3008 ('MCP3008_0' o 'MCP3008_1').
+            - patilla_cs (int): Patilla GPIO del chip select.
+
+        Returns:
+            - DispositivoCompartido: MCP3008 y el cerrojo de su bus SPI.
+        """
+        def crear() -> object:
+            spi: DispositivoCompartido = RegistroBuses.getSPI(direccion_lectura)
+            with spi.cerrojo:
+                return MCP.MCP3008(spi.dispositivo, digitalio.DigitalInOut(pin.Pin(patilla_cs)))
+        return RegistroBuses.__get(('MCP3008', direccion_lectura, patilla_cs), ('SPI', direccion_lectura), crear)
+
+    @staticmethod
+    def getI2C() -> DispositivoCompartido:
+        """
+        Bus I2C.
+
+        Returns:
+            - DispositivoCompartido: Bus I2C y su cerrojo.
+        """
+        return RegistroBuses.__get(('I2C',), ('I2C',), board.I2C)
+
+    @staticmethod
+    def getBH1750(direccion_i2c: int) -> DispositivoCompartido:
+        """
+        Sensor BH1750 del bus I2C.
+
+        Args:
+            - direccion_i2c (int): Direccion I2C del sensor.
+
+        Returns:
+            - DispositivoCompartido: BH1750 y el cerrojo del bus I2C.
+        """
+        def crear() -> object:
+            i2c: DispositivoCompartido = RegistroBuses.getI2C()
+            with i2c.cerrojo:
+                return BH1750.BH1750(i2c.dispositivo, direccion_i2c)
+        return RegistroBuses.__get(('BH1750', direccion_i2c), ('I2C',), crear)
+
+    @staticmethod
+    def discardBH1750(direccion_i2c: int) -> None:
+        """
+        Descarte de un BH1750 tras un error de comunicacion, para volver a inicializarlo en el siguiente acceso.
+
+        Args:
+            - direccion_i2c (int): Direccion I2C del sensor.
+        """
+        with RegistroBuses.__cerrojo_registro:
+            RegistroBuses.__dispositivos.pop(('BH1750', direccion_i2c), None)
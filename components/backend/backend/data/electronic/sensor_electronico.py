@@ -3,15 +3,24 @@
 from datetime import datetime
 import time
 from typing import Optional,Dict,List, Tuple
-from common.data.util import TipoSensor, ZonaSensor, ModeloSensor, TipoMedida, UnidadMedida
+import numpy as np
+from common.data.util import TipoSensor, ZonaSensor, ModeloSensor, TipoMedida, UnidadMedida, FiltroLectura
 from common.data.util import Sensor as SensorCommon
-import busio
-import digitalio
-import board
-from board import pin
 
 class SensorElectronico ():
 
+    # Muestras fallidas que se toleran en una lectura, ademas de las pedidas.
+    REINTENTOS: int = 9
+    # Segundos de espera tras una muestra fallida y entre dos muestras validas consecutivas.
+    ESPERA_REINTENTO: float = 0.0
+    ESPERA_MUESTRAS: float = 0.0
+    # Proporcion de muestras descartadas en cada extremo por la media recortada.
+    PROPORCION_RECORTE: float = 0.2
+    # Desviaciones (MAD escalada a desviacion tipica) a partir de las que una muestra se considera atipica.
+    UMBRAL_MAD: float = 3.0
+    # Los sensores conectados a un MCP3008 se leen juntos con LectorMCP3008.
+    LECTURA_MCP3008: bool = False
+
     def __init__(self, sensor_common: SensorCommon):
         self.direccion_lectura:str = sensor_common.getDireccionLectura()
         self.patilla_0_lectura:int = sensor_common.getPatillaLectura(0)
@@ -22,11 +31,66 @@ class SensorElectronico ():
         self.unidad_medida_1:UnidadMedida = sensor_common.getUnidadMedida(1)
         self.unidad_medida_2:UnidadMedida = sensor_common.getUnidadMedida(2)
         self.unidad_medida_3:UnidadMedida = sensor_common.getUnidadMedida(3)
+        self.muestras_lectura:int = sensor_common.getMuestrasLectura() or 1
+        self.filtro_lectura:FiltroLectura = sensor_common.getFiltroLectura() or FiltroLectura.MEDIANA
+
+    def tiempo_restante(self, limite: float = None) -> float:
+        # Segundos hasta el limite (time.monotonic) de la lectura; sin limite no se agota nunca.
+        if limite is None:
+            return float('inf')
+        return max(0.0, limite - time.monotonic())
+
+    @staticmethod
+    def reducir_muestras(muestras: np.ndarray, filtro: FiltroLectura) -> Optional[float]:
+        # Reduccion de las muestras de una magnitud (NaN las fallidas) a un valor, o None si no hay ninguna valida.
+        validas: np.ndarray = muestras[~np.isnan(muestras)]
+        if validas.size == 0:
+            return None
+        if filtro == FiltroLectura.MEDIA_RECORTADA:
+            recorte: int = int(validas.size * SensorElectronico.PROPORCION_RECORTE)
+            return float(np.sort(validas)[recorte:validas.size - recorte].mean())
+        if filtro == FiltroLectura.MAD:
+            mediana: float = np.median(validas)
+            desviacion: float = 1.4826 * np.median(np.abs(validas - mediana))
+            if desviacion == 0:
+                return float(mediana)
+            return float(validas[np.abs(validas - mediana) <= SensorElectronico.UMBRAL_MAD * desviacion].mean())
+        return float(np.median(validas))
 
-    def leer_sensor(self) -> List[Tuple[float, UnidadMedida]]:
-        lista_valor_unidad_medida: List[Tuple[float, UnidadMedida]] = [[0.0,UnidadMedida.OTRO]]
+    def unidades_lectura(self) -> List[UnidadMedida]:
+        # Unidad de medida de cada valor de leer_muestra.
+        return [UnidadMedida.OTRO]
+
+    def leer_muestra(self) -> List[Optional[float]]:
+        # Una muestra de cada magnitud del sensor, None si no se ha podido leer.
+        return [0.0]
+
+    def leer_sensor(self, limite: float = None) -> List[Tuple[Optional[float], UnidadMedida]]:
+        muestras: List[List[Optional[float]]] = []
+        validas = 0
+        fallidas = 0
+        while (validas < self.muestras_lectura and fallidas <= self.REINTENTOS and self.tiempo_restante(limite) > 0):
+            if muestras:
+                time.sleep(min(self.ESPERA_MUESTRAS if muestras[-1].count(None) == 0 else self.ESPERA_REINTENTO,
+                               self.tiempo_restante(limite)))
+                if self.tiempo_restante(limite) == 0:
+                    break
+            muestra: List[Optional[float]] = self.leer_muestra()
+            muestras.append(muestra)
+            if muestra.count(None) == 0:
+                validas += 1
+            else:
+                fallidas += 1
+        valores: np.ndarray = np.array(muestras, dtype=np.float64).reshape(len(muestras), len(self.unidades_lectura()))
+        lista_valor_unidad_medida: List[Tuple[Optional[float], UnidadMedida]] = [
+            [SensorElectronico.reducir_muestras(valores[:, indice], self.filtro_lectura), unidad_medida]
+            for indice, unidad_medida in enumerate(self.unidades_lectura())]
         return lista_valor_unidad_medida
 
+    def liberar(self) -> None:
+        # Liberacion de los recursos de hardware propios del sensor; los buses compartidos siguen abiertos.
+        pass
+
 
 '''
 D0 = pin.D0
@@ -13,6 +13,10 @@ import adafruit_dht
 
 class SensorElectronicoDHT11 (SensorElectronico):
 
+    # El DHT11 no admite lecturas a menos de 2 segundos de la anterior.
+    ESPERA_REINTENTO: float = 2.0
+    ESPERA_MUESTRAS: float = 2.0
+
     def __init__(self, sensor_common: SensorCommon):
         super().__init__(sensor_common)
         # self.direccion_lectura:str = sensor_common.getDireccionLectura()
@@ -22,44 +26,21 @@ class SensorElectronicoDHT11 (SensorElectronico):
         self.dhtDevice = adafruit_dht.DHT11(pin.Pin(self.patilla_0_lectura), use_pulseio=False)
         self.dhtDevice._trig_wait = 1500
 
-    def leer_sensor(self) -> List[Tuple[float, UnidadMedida]]:
-        temperatura_c = None
-        intentos_lectura = 0
-        while (temperatura_c is None and intentos_lectura < 10):
-            try:
-                temperatura_c = self.dhtDevice.temperature
-            except RuntimeError as error:
-                # Errors happen fairly often, DHT's are hard to read, just keep going
-                time.sleep(2.0)
-                continue
-            finally:
-                intentos_lectura += 1
-        registro_temperatura = None
-        if (temperatura_c is None):
-            temperatura_c = 0
+    def unidades_lectura(self) -> List[UnidadMedida]:
         if (self.unidad_medida_0.getTipoMedida()==TipoMedida.TEMPERATURA):
-            registro_temperatura: Tuple[float, UnidadMedida] = [temperatura_c, self.unidad_medida_0]
-        else:
-            registro_temperatura: Tuple[float, UnidadMedida] = [temperatura_c, self.unidad_medida_1]
+            return [self.unidad_medida_0, self.unidad_medida_1]
+        return [self.unidad_medida_1, self.unidad_medida_0]
 
+    def leer_muestra(self) -> List[Optional[float]]:
+        temperatura_c = None
         humedad = None
-        intentos_lectura = 0
-        while (humedad is None and intentos_lectura < 10):
-            try:
-                humedad = self.dhtDevice.humidity
-            except RuntimeError as error:
-                # Errors happen fairly often, DHT's are hard to read, just keep going
-                time.sleep(2.0)
-                continue
-            finally:
-                intentos_lectura += 1
-        if (humedad is None):
-            humedad = 0
-        registro_humedad = None
-        if (self.unidad_medida_0.getTipoMedida()==TipoMedida.HUMEDAD):
-            registro_humedad: Tuple[float, UnidadMedida] = [humedad, self.unidad_medida_0]
-        else:
-            registro_humedad: Tuple[float, UnidadMedida] = [humedad, self.unidad_medida_1]
+        try:
+            temperatura_c = self.dhtDevice.temperature
+            humedad = self.dhtDevice.humidity
+        except RuntimeError as error:
+            # Errors happen fairly often, DHT's are hard to read, just keep going
+            pass
+        return [temperatura_c, humedad]
 
-        lista_valor_unidad_medida: List[Tuple[float, UnidadMedida]] = [registro_temperatura,registro_humedad]
-        return lista_valor_unidad_medida
\ No newline at end of file
+    def liberar(self) -> None:
+        self.dhtDevice.exit()
@@ -1,6 +1,7 @@
 #Author: Oscar Valverde Escobar
 
 from typing import List, Tuple
+import numpy as np
 from common.data.util import TipoSensor, ZonaSensor, ModeloSensor, TipoMedida, UnidadMedida
 from backend.data.electronic import SensorElectronico, SensorElectronicoMCP3008
 from common.data.util import Sensor as SensorCommon
@@ -14,9 +15,9 @@ class SensorElectronicoLDR (SensorElectronicoMCP3008):
         self.R_c = R_c     #Resistencia calibracion en KΩ
 
 
-    def leer_sensor(self) -> List[Tuple[float, UnidadMedida]]:
-        lista_valor_unidad_medida: List[Tuple[float, UnidadMedida]] = super().leer_sensor()
-        valor = lista_valor_unidad_medida[0][0]
-        if (valor is not None):
-            lista_valor_unidad_medida[0][0]= (valor*self.R_o*10)/(self.R_l*self.R_c*(65535-valor))
-        return lista_valor_unidad_medida
\ No newline at end of file
+    @classmethod
+    def convertir(cls, sensores: List['SensorElectronicoLDR'], cuentas: np.ndarray) -> np.ndarray:
+        R_o: np.ndarray = np.array([sensor.R_o for sensor in sensores], dtype=np.float64)
+        R_l: np.ndarray = np.array([sensor.R_l for sensor in sensores], dtype=np.float64)
+        R_c: np.ndarray = np.array([sensor.R_c for sensor in sensores], dtype=np.float64)
+        return (cuentas*R_o*10)/(R_l*R_c*(65535-cuentas))
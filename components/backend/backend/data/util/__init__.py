@@ -1,3 +1,11 @@
 #Author: Oscar Valverde Escobar
 
-from .sensor_backend import SensorBackend
\ No newline at end of file
+from .sensor_backend import SensorBackend
+from .planificador_lecturas import PlanificadorLecturas
+from .carriles_lectura import CarrilesLectura
+from .compresor_lecturas import CompresorLecturas
+from .spool_registros import SpoolRegistros
+from .registro_sensores_backend import RegistroSensoresBackend
+from .cache_metadatos import CacheMetadatos
+from .cache_intervalos import CacheIntervalos
+from .reductor_series import ReductorSeries
\ No newline at end of file
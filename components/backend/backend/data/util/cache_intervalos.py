@@ -0,0 +1,134 @@
+#Author: Oscar Valverde Escobar
+
+import bisect
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from common.data.util import TipoSensor, ZonaSensor
+
+class CacheIntervalos():
+    """
+    Cache en memoria del proceso de las medias de los sensores de una planta en intervalos ya cerrados, que no
+    cambian al llegar registros nuevos, para calcular en cada grafica solo los intervalos abiertos.
+
+    La clave de cada entrada es (nombre de la planta, sensores asociados, inicio del intervalo, duracion del
+    intervalo), donde los sensores asociados son una tupla de (tipo, zona, numero), de forma que al cambiar
+    las asociaciones de la planta se usan entradas nuevas. El valor es un diccionario con la media de cada
+    (tipo, zona, numero, unidad de medida) con registros en el intervalo. Con mas de tamano_maximo entradas
+    se expulsan las usadas hace mas tiempo.
+
+    La cache guarda tambien la version de los registros de los sensores con la que se calcularon sus entradas.
+    Al cambiar la version se descartan los intervalos que contienen los registros nuevos o, si no se conocen
+    (registros modificados o compactados), todas las entradas, y solo se guardan las medias calculadas con la
+    version en curso. Asi los registros que otro proceso almacena tarde en intervalos ya cerrados tambien se ven.
+    """
+
+    def __init__(self, tamano_maximo: int):
+        """
+        Args:
+            - tamano_maximo (int): Numero maximo de entradas. Con 0 no se guarda ninguna.
+        """
+        self.__tamano_maximo: int = tamano_maximo
+        self.__cerrojo = threading.Lock()
+        self.__entradas: OrderedDict = OrderedDict()
+        self.__version: Optional[Tuple] = None
+
+    def get(self, clave: Tuple) -> Optional[Dict[Tuple, float]]:
+        """
+        Medias de un intervalo cerrado.
+
+        Args:
+            - clave (Tuple): Planta, sensores asociados, inicio y duracion del intervalo.
+
+        Returns:
+            - Optional[Dict[Tuple, float]]: Media por sensor y unidad de medida, o None si no esta en la cache.
+        """
+        with self.__cerrojo:
+            medias: Optional[Dict[Tuple, float]] = self.__entradas.get(clave)
+            if medias is not None:
+                self.__entradas.move_to_end(clave)
+            return medias
+
+    def put(self, clave: Tuple, medias: Dict[Tuple, float], version: Tuple) -> None:
+        """
+        Almacenamiento de las medias de un intervalo cerrado. Los valores no deben modificarse despues.
+
+        Args:
+            - clave (Tuple): Planta, sensores asociados, inicio y duracion del intervalo.
+            - medias (Dict[Tuple, float]): Media por sensor y unidad de medida.
+            - version (Tuple): Version de los registros con la que se han calculado. Si ya no es la version de la
+              cache, las medias pueden no incluir registros nuevos y no se guardan.
+        """
+        if self.__tamano_maximo <= 0:
+            return
+        with self.__cerrojo:
+            if version != self.__version:
+                return
+            self.__entradas[clave] = medias
+            self.__entradas.move_to_end(clave)
+            while len(self.__entradas) > self.__tamano_maximo:
+                self.__entradas.popitem(last=False)
+
+    def invalidate(self, tipo_sensor: TipoSensor, zona_sensor: ZonaSensor, numero_sensor: int, fecha: datetime) -> None:
+        """
+        Descarte de los intervalos de todas las plantas que contienen una fecha y a los que contribuye un sensor,
+        tras crear o modificar un registro suyo en esa fecha.
+
+        Args:
+            - tipo_sensor (TipoSensor): Tipo del sensor.
+            - zona_sensor (ZonaSensor): Zona del sensor.
+            - numero_sensor (int): Numero del sensor.
+            - fecha (datetime): Fecha del registro.
+        """
+        sensor: Tuple = (tipo_sensor, zona_sensor, numero_sensor)
+        with self.__cerrojo:
+            afectadas = [clave for clave in self.__entradas
+                         if sensor in clave[1] and clave[2] <= fecha < clave[2] + clave[3]]
+            for clave in afectadas:
+                del self.__entradas[clave]
+
+    def getVersion(self) -> Optional[Tuple]:
+        """
+        Version de los registros de los sensores de las entradas de la cache.
+
+        Returns:
+            - Optional[Tuple]: Version de los registros, o None si aun no se ha establecido.
+        """
+        with self.__cerrojo:
+            return self.__version
+
+    def changeVersion(self, version: Tuple, registros: Optional[List[Tuple]]) -> None:
+        """
+        Cambio de la version de los registros de los sensores de la cache, descartando las entradas afectadas.
+
+        Args:
+            - version (Tuple): Nueva version de los registros.
+            - registros (Optional[List[Tuple]]): (tipo, zona, numero, fecha) de los registros nuevos desde la version
+              anterior; se descartan los intervalos que los contienen. Si es None, se descartan todas las entradas.
+        """
+        with self.__cerrojo:
+            self.__version = version
+            if registros is None:
+                self.__entradas.clear()
+                return
+            fechas: Dict[Tuple, List[datetime]] = {}
+            for tipo_sensor, zona_sensor, numero_sensor, fecha in registros:
+                fechas.setdefault((tipo_sensor, zona_sensor, numero_sensor), []).append(fecha)
+            if len(fechas) == 0:
+                return
+            for fechas_sensor in fechas.values():
+                fechas_sensor.sort()
+            afectadas = [clave for clave in self.__entradas
+                         if any(CacheIntervalos.__containsDate(fechas.get(sensor), clave[2], clave[2] + clave[3])
+                                for sensor in clave[1])]
+            for clave in afectadas:
+                del self.__entradas[clave]
+
+    @staticmethod
+    def __containsDate(fechas: Optional[List[datetime]], inicio: datetime, fin: datetime) -> bool:
+        # Si alguna de las fechas ordenadas esta en [inicio, fin).
+        if fechas is None:
+            return False
+        posicion: int = bisect.bisect_left(fechas, inicio)
+        return posicion < len(fechas) and fechas[posicion] < fin
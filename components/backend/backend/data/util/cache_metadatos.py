@@ -0,0 +1,106 @@
+#Author: Oscar Valverde Escobar
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+class CacheMetadatos():
+    """
+    Cache en memoria del proceso de los datos que apenas cambian (plantas, tipos de planta, sensores, sus
+    asociaciones y los consejos), para no consultarlos en la base de datos en cada peticion.
+
+    Cada entrada pertenece a una region (por ejemplo 'plantas') y caduca a los ttl segundos de cargarse.
+    Con mas de tamano_maximo entradas se expulsan las usadas hace mas tiempo. Los servicios invalidan la
+    region de los datos que crean o modifican, y una carga que coincide con una invalidacion de su region
+    no se guarda, para no volver a guardar datos anteriores a la modificacion. Los cambios hechos desde
+    otro proceso se ven al caducar las entradas.
+
+    Los valores se devuelven copiados, ya que los servicios modifican los objetos que obtienen.
+    """
+
+    def __init__(self, ttl: float, tamano_maximo: int, notificar: Optional[Callable[[bool], None]] = None):
+        """
+        Args:
+            - ttl (float): Segundos que se conserva cada entrada. Con 0 no se guarda ninguna.
+            - tamano_maximo (int): Numero maximo de entradas.
+            - notificar (Optional[Callable[[bool], None]]): Funcion a la que se notifica cada consulta, con True si
+              es un acierto y False si es un fallo.
+        """
+        self.__ttl: float = ttl
+        self.__tamano_maximo: int = tamano_maximo
+        self.__notificar: Optional[Callable[[bool], None]] = notificar
+        self.__cerrojo = threading.Lock()
+        self.__entradas: OrderedDict = OrderedDict()
+        self.__generaciones: Dict[str, int] = {}
+        self.__estadisticas: Dict[str, int] = {'aciertos': 0, 'fallos': 0, 'expulsiones': 0, 'invalidaciones': 0}
+
+    def __count(self, acierto: bool) -> None:
+        with self.__cerrojo:
+            self.__estadisticas['aciertos' if acierto else 'fallos'] += 1
+        if self.__notificar is not None:
+            self.__notificar(acierto)
+
+    def get(self, region: str, clave: Hashable, cargar: Callable[[], object]) -> object:
+        """
+        Valor de una entrada, cargado con cargar si no esta en la cache o ha caducado.
+
+        Args:
+            - region (str): Region de la entrada.
+            - clave (Hashable): Clave de la entrada dentro de su region.
+            - cargar (Callable[[], object]): Funcion que obtiene el valor de la base de datos.
+
+        Returns:
+            - object: Copia del valor.
+        """
+        clave_region: Tuple = (region, clave)
+        ahora: float = time.monotonic()
+        with self.__cerrojo:
+            entrada: Optional[Tuple[float, object]] = self.__entradas.get(clave_region)
+            if entrada is not None and entrada[0] > ahora:
+                self.__entradas.move_to_end(clave_region)
+            else:
+                entrada = None
+            generacion: int = self.__generaciones.get(region, 0)
+        if entrada is not None:
+            self.__count(True)
+            return copy.deepcopy(entrada[1])
+        self.__count(False)
+        valor: object = cargar()
+        if self.__ttl <= 0:
+            return valor
+        with self.__cerrojo:
+            if self.__generaciones.get(region, 0) == generacion:
+                self.__entradas[clave_region] = (time.monotonic() + self.__ttl, copy.deepcopy(valor))
+                self.__entradas.move_to_end(clave_region)
+                while len(self.__entradas) > self.__tamano_maximo:
+                    self.__entradas.popitem(last=False)
+                    self.__estadisticas['expulsiones'] += 1
+        return valor
+
+    def invalidate(self, *regiones: str) -> None:
+        """
+        Descarte de todas las entradas de unas regiones, tras crear o modificar sus datos.
+
+        Args:
+            - regiones (str): Regiones a invalidar.
+        """
+        with self.__cerrojo:
+            for region in regiones:
+                self.__generaciones[region] = self.__generaciones.get(region, 0) + 1
+                self.__estadisticas['invalidaciones'] += 1
+            for clave_region in [clave_region for clave_region in self.__entradas if clave_region[0] in regiones]:
+                del self.__entradas[clave_region]
+
+    def getStatistics(self) -> Dict[str, int]:
+        """
+        Estadisticas de la cache desde su creacion.
+
+        Returns:
+            - Dict[str, int]: Aciertos, fallos, entradas expulsadas por tamano, invalidaciones y entradas actuales.
+        """
+        with self.__cerrojo:
+            estadisticas: Dict[str, int] = dict(self.__estadisticas)
+            estadisticas['entradas'] = len(self.__entradas)
+        return estadisticas
@@ -0,0 +1,93 @@
+#Author: Oscar Valverde Escobar
+
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Hashable, List, Tuple
+
+class CarrilesLectura():
+    """
+    Ejecucion concurrente de lecturas con un carril por bus fisico.
+
+    Cada carril es un hilo propio que ejecuta en orden las lecturas de su bus, de forma que las lecturas
+    de un mismo bus nunca se solapan y las de buses distintos se hacen a la vez. Cada lectura recibe un
+    limite (time.monotonic) que empieza a contar cuando el carril la comienza, no cuando se encola.
+    """
+
+    # Segundos de espera adicionales al plazo de las lecturas antes de abandonarlas.
+    MARGEN_ESPERA: float = 1.0
+
+    def __init__(self, plazo_lectura: float):
+        """
+        Args:
+            - plazo_lectura (float): Segundos de los que dispone cada lectura, reintentos incluidos.
+        """
+        if plazo_lectura <= 0:
+            raise ValueError('El plazo de lectura tiene que ser mayor que 0.')
+        self.__plazo_lectura: float = plazo_lectura
+        self.__carriles: Dict[Hashable, ThreadPoolExecutor] = {}
+        self.__cerrojo = threading.Lock()
+
+    def getReadDeadline(self) -> float:
+        """
+        Plazo de cada lectura.
+
+        Returns:
+            - float: Segundos de los que dispone cada lectura.
+        """
+        return self.__plazo_lectura
+
+    def __lane(self, bus: Hashable) -> ThreadPoolExecutor:
+        with self.__cerrojo:
+            carril: ThreadPoolExecutor = self.__carriles.get(bus)
+            if carril is None:
+                carril = ThreadPoolExecutor(max_workers=1, thread_name_prefix='carril-' + str(bus))
+                self.__carriles[bus] = carril
+            return carril
+
+    def __run(self, lectura: Callable[[float], object]) -> object:
+        return lectura(time.monotonic() + self.__plazo_lectura)
+
+    def runByBus(self, lecturas: List[Tuple[Hashable, Callable[[float], object]]]) -> List[Tuple[bool, object]]:
+        """
+        Ejecucion de las lecturas, cada una en el carril de su bus, esperando como mucho a que termine el
+        carril con mas lecturas agotando todas ellas su plazo.
+
+        Las lecturas que no terminan a tiempo se abandonan (y se cancelan si aun no han empezado): su carril
+        sigue ocupado hasta que terminan y las siguientes lecturas de ese bus esperan detras, pero no
+        retienen a los demas buses.
+
+        Args:
+            - lecturas (List[Tuple[Hashable, Callable[[float], object]]]): Bus y funcion de cada lectura,
+              que recibe el limite de la lectura.
+
+        Returns:
+            - List[Tuple[bool, object]]: Para cada lectura, en el mismo orden, si ha terminado a tiempo y
+              su resultado, o la excepcion producida, o None si no ha terminado.
+        """
+        futuros: List[Future] = []
+        lecturas_por_bus: Dict[Hashable, int] = {}
+        for bus, lectura in lecturas:
+            futuros.append(self.__lane(bus).submit(self.__run, lectura))
+            lecturas_por_bus[bus] = lecturas_por_bus.get(bus, 0) + 1
+        if futuros:
+            wait(futuros, timeout=max(lecturas_por_bus.values()) * self.__plazo_lectura + CarrilesLectura.MARGEN_ESPERA)
+        resultados: List[Tuple[bool, object]] = []
+        for futuro in futuros:
+            if not futuro.done():
+                futuro.cancel()
+                resultados.append((False, None))
+            elif futuro.exception() is not None:
+                resultados.append((False, futuro.exception()))
+            else:
+                resultados.append((True, futuro.result()))
+        return resultados
+
+    def shutdown(self) -> None:
+        """
+        Cierre de los carriles. Las lecturas en curso terminan en segundo plano.
+        """
+        with self.__cerrojo:
+            for carril in self.__carriles.values():
+                carril.shutdown(wait=False)
+            self.__carriles = {}
@@ -0,0 +1,198 @@
+#Author: Oscar Valverde Escobar
+
+import math
+from datetime import datetime
+from typing import Dict, Hashable, List, Optional, Tuple
+from common.data.util import Sensor as SensorCommon, RegistroSensor as RegistroSensorCommon
+from common.data.util import CompresionLectura
+
+class SerieComprimida():
+    """
+    Estado de la compresion de las lecturas de un sensor en una unidad de medida: el ultimo registro
+    almacenado y las lecturas retenidas desde entonces.
+    """
+
+    def __init__(self, compresion: CompresionLectura, desviacion: float):
+        self.compresion: CompresionLectura = compresion
+        self.desviacion: float = desviacion
+        self.almacenado: Optional[RegistroSensorCommon] = None
+        self.ultima_retenida: Optional[RegistroSensorCommon] = None
+        self.numero_retenidas: int = 0
+        self.suma_retenidas: float = 0.0
+        # Limites de la pendiente de la recta desde el ultimo registro almacenado que pasa a menos de la
+        # desviacion de todas las lecturas retenidas (puerta giratoria).
+        self.pendiente_minima: float = -math.inf
+        self.pendiente_maxima: float = math.inf
+
+
+class CompresorLecturas():
+    """
+    Compresion de las lecturas de los sensores antes de almacenarlas.
+
+    Con BANDA_MUERTA se retienen las lecturas que se desvian del ultimo valor almacenado como mucho la
+    desviacion del sensor. Con PUERTA_GIRATORIA se retienen mientras la recta entre el ultimo registro
+    almacenado y la ultima lectura retenida pase a menos de la desviacion de todas las retenidas; al
+    romperse se almacena la ultima retenida, de forma que interpolando linealmente entre registros se
+    reconstruyen las lecturas con un error acotado por la desviacion.
+
+    Cada registro almacenado lleva el numero y la suma de las lecturas que representa (las retenidas desde
+    el registro anterior y la propia), por lo que las medias y los agregados por horas y dias se calculan
+    sobre todas las lecturas. Las lecturas retenidas se almacenan antes de cambiar de hora, para que cada
+    hora cerrada tenga exactamente las mismas medias que sin compresion, y como mucho cada intervalo_latido
+    segundos se almacena un registro aunque la lectura no haya cambiado.
+    """
+
+    def __init__(self, intervalo_latido: float):
+        """
+        Args:
+            - intervalo_latido (float): Segundos maximos entre dos registros almacenados de un sensor.
+        """
+        if intervalo_latido <= 0:
+            raise ValueError('El intervalo de latido tiene que ser mayor que 0.')
+        self.__intervalo_latido: float = intervalo_latido
+        self.__series: Dict[Tuple, SerieComprimida] = {}
+
+    @staticmethod
+    def __hour(fecha: datetime) -> datetime:
+        return fecha.replace(minute=0, second=0, microsecond=0)
+
+    @staticmethod
+    def __store(serie: SerieComprimida, registro: RegistroSensorCommon, numero_lecturas: int,
+                suma_lecturas: float) -> RegistroSensorCommon:
+        # Los registros que solo representan su propia lectura se almacenan igual que sin compresion.
+        if numero_lecturas > 1:
+            registro = RegistroSensorCommon(registro.getTipoSensor(), registro.getZonaSensor(), registro.getNumeroSensor(),
+                                            registro.getValor(), registro.getUnidadMedida(), registro.getFecha(),
+                                            registro.getId(), numero_lecturas, suma_lecturas)
+        serie.almacenado = registro
+        serie.ultima_retenida = None
+        serie.numero_retenidas = 0
+        serie.suma_retenidas = 0.0
+        serie.pendiente_minima = -math.inf
+        serie.pendiente_maxima = math.inf
+        return registro
+
+    @staticmethod
+    def __storeRetained(serie: SerieComprimida) -> RegistroSensorCommon:
+        return CompresorLecturas.__store(serie, serie.ultima_retenida, serie.numero_retenidas, serie.suma_retenidas)
+
+    @staticmethod
+    def __storeWithRetained(serie: SerieComprimida, registro: RegistroSensorCommon) -> RegistroSensorCommon:
+        return CompresorLecturas.__store(serie, registro, serie.numero_retenidas + 1, serie.suma_retenidas + registro.getValor())
+
+    @staticmethod
+    def __retain(serie: SerieComprimida, registro: RegistroSensorCommon) -> None:
+        serie.ultima_retenida = registro
+        serie.numero_retenidas += 1
+        serie.suma_retenidas += registro.getValor()
+
+    def __add(self, serie: SerieComprimida, registro: RegistroSensorCommon) -> List[RegistroSensorCommon]:
+        almacenar: List[RegistroSensorCommon] = []
+        if serie.ultima_retenida is not None and \
+                CompresorLecturas.__hour(registro.getFecha()) != CompresorLecturas.__hour(serie.ultima_retenida.getFecha()):
+            almacenar.append(CompresorLecturas.__storeRetained(serie))
+        if serie.almacenado is None:
+            almacenar.append(CompresorLecturas.__storeWithRetained(serie, registro))
+            return almacenar
+        if (registro.getFecha() - serie.almacenado.getFecha()).total_seconds() >= self.__intervalo_latido:
+            if serie.ultima_retenida is None:
+                almacenar.append(CompresorLecturas.__storeWithRetained(serie, registro))
+                return almacenar
+            almacenar.append(CompresorLecturas.__storeRetained(serie))
+        desviacion: float = serie.desviacion
+        if serie.compresion == CompresionLectura.BANDA_MUERTA:
+            if abs(registro.getValor() - serie.almacenado.getValor()) <= desviacion:
+                CompresorLecturas.__retain(serie, registro)
+            else:
+                almacenar.append(CompresorLecturas.__storeWithRetained(serie, registro))
+            return almacenar
+        segundos: float = (registro.getFecha() - serie.almacenado.getFecha()).total_seconds()
+        if segundos <= 0:
+            almacenar.append(CompresorLecturas.__storeWithRetained(serie, registro))
+            return almacenar
+        pendiente: float = (registro.getValor() - serie.almacenado.getValor()) / segundos
+        if not serie.pendiente_minima <= pendiente <= serie.pendiente_maxima:
+            # La recta hasta la nueva lectura se aleja demasiado de alguna retenida: se almacena la ultima
+            # retenida y la nueva lectura se evalua desde ella.
+            almacenar.append(CompresorLecturas.__storeRetained(serie))
+            segundos = (registro.getFecha() - serie.almacenado.getFecha()).total_seconds()
+            if segundos <= 0:
+                almacenar.append(CompresorLecturas.__storeWithRetained(serie, registro))
+                return almacenar
+        serie.pendiente_minima = max(serie.pendiente_minima, (registro.getValor() - desviacion - serie.almacenado.getValor()) / segundos)
+        serie.pendiente_maxima = min(serie.pendiente_maxima, (registro.getValor() + desviacion - serie.almacenado.getValor()) / segundos)
+        CompresorLecturas.__retain(serie, registro)
+        return almacenar
+
+    def compress(self, registros: List[RegistroSensorCommon], sensores: Dict[Hashable, SensorCommon]) -> List[RegistroSensorCommon]:
+        """
+        Compresion de nuevas lecturas de los sensores.
+
+        Args:
+            - registros (List[RegistroSensorCommon]): Lecturas, en orden cronologico para cada sensor y unidad de medida.
+            - sensores (Dict[Hashable, SensorCommon]): Sensores por (tipo, zona, numero), con su compresion.
+
+        Returns:
+            - List[RegistroSensorCommon]: Registros a almacenar. Incluye las lecturas retenidas de las series cuya
+              compresion ha cambiado o se ha desactivado.
+        """
+        almacenar: List[RegistroSensorCommon] = []
+        for registro in registros:
+            clave_sensor: Tuple = (registro.getTipoSensor(), registro.getZonaSensor(), registro.getNumeroSensor())
+            clave: Tuple = clave_sensor + (registro.getUnidadMedida(),)
+            sensor: Optional[SensorCommon] = sensores.get(clave_sensor)
+            compresion: Optional[CompresionLectura] = sensor.getCompresionLectura() if sensor is not None else None
+            desviacion: float = float(sensor.getDesviacionCompresion() or 0.0) if sensor is not None else 0.0
+            serie: Optional[SerieComprimida] = self.__series.get(clave)
+            if serie is not None and (serie.compresion != compresion or serie.desviacion != desviacion):
+                if serie.ultima_retenida is not None:
+                    almacenar.append(CompresorLecturas.__storeRetained(serie))
+                del self.__series[clave]
+                serie = None
+            if compresion is None:
+                almacenar.append(registro)
+                continue
+            if serie is None:
+                serie = SerieComprimida(compresion, desviacion)
+                self.__series[clave] = serie
+            almacenar.extend(self.__add(serie, registro))
+        return almacenar
+
+    def remove(self, clave_sensor: Hashable) -> List[RegistroSensorCommon]:
+        """
+        Descarte del estado de compresion de un sensor.
+
+        Args:
+            - clave_sensor (Hashable): Sensor, como (tipo, zona, numero).
+
+        Returns:
+            - List[RegistroSensorCommon]: Registros a almacenar con las lecturas retenidas del sensor.
+        """
+        almacenar: List[RegistroSensorCommon] = []
+        for clave in [clave for clave in self.__series if clave[:3] == clave_sensor]:
+            serie: SerieComprimida = self.__series.pop(clave)
+            if serie.ultima_retenida is not None:
+                almacenar.append(CompresorLecturas.__storeRetained(serie))
+        return almacenar
+
+    def flush(self) -> List[RegistroSensorCommon]:
+        """
+        Vaciado de las lecturas retenidas de todos los sensores, al detener el muestreo.
+
+        Returns:
+            - List[RegistroSensorCommon]: Registros a almacenar con las lecturas retenidas.
+        """
+        almacenar: List[RegistroSensorCommon] = []
+        for serie in self.__series.values():
+            if serie.ultima_retenida is not None:
+                almacenar.append(CompresorLecturas.__storeRetained(serie))
+        return almacenar
+
+    def getRetainedCount(self) -> int:
+        """
+        Numero de lecturas retenidas pendientes de almacenar.
+
+        Returns:
+            - int: Lecturas retenidas.
+        """
+        return sum(serie.numero_retenidas for serie in self.__series.values())
@@ -0,0 +1,133 @@
+#Author: Oscar Valverde Escobar
+
+import heapq
+import math
+from typing import Dict, Hashable, List, Optional, Tuple
+
+class PlanificadorLecturas():
+    """
+    Planificacion de las lecturas de los sensores, cada uno con su propio intervalo, mediante una cola
+    de prioridad ordenada por el instante de su siguiente lectura.
+
+    Las lecturas se planifican en multiplos de su intervalo, de forma que los sensores con intervalos
+    multiplos entre si coinciden en el mismo despertar. Al obtener las lecturas pendientes tambien se
+    adelantan, como mucho adelanto_maximo segundos, las de los sensores de los buses que ya se van a leer.
+    """
+
+    def __init__(self, adelanto_maximo: float = 0.0):
+        """
+        Args:
+            - adelanto_maximo (float): Segundos que se puede adelantar una lectura para agruparla con las
+              lecturas pendientes de su mismo bus.
+        """
+        self.__adelanto_maximo: float = adelanto_maximo
+        # Entradas (instante, version, clave, indice): la lectura numero indice del sensor, en indice * intervalo.
+        self.__cola: List[Tuple[float, int, Hashable, Optional[int]]] = []
+        # Bus, intervalo y version de la planificacion vigente de cada sensor; las entradas de otras versiones se descartan.
+        self.__planificados: Dict[Hashable, Tuple[Hashable, float, int]] = {}
+        self.__version: int = 0
+        self.__omitidas: int = 0
+
+    def schedule(self, clave: Hashable, bus: Hashable, intervalo: float, ahora: float) -> None:
+        """
+        Planificacion (o replanificacion) de las lecturas de un sensor. La primera lectura es inmediata.
+
+        Args:
+            - clave (Hashable): Identificador del sensor.
+            - bus (Hashable): Bus por el que se lee el sensor.
+            - intervalo (float): Segundos entre lecturas.
+            - ahora (float): Instante actual.
+        """
+        if intervalo <= 0:
+            raise ValueError('El intervalo de lectura tiene que ser mayor que 0.')
+        self.__version += 1
+        self.__planificados[clave] = (bus, intervalo, self.__version)
+        heapq.heappush(self.__cola, (ahora, self.__version, clave, None))
+
+    def remove(self, clave: Hashable) -> None:
+        """
+        Eliminacion de la planificacion de las lecturas de un sensor.
+
+        Args:
+            - clave (Hashable): Identificador del sensor.
+        """
+        self.__planificados.pop(clave, None)
+
+    def getScheduled(self) -> Dict[Hashable, Tuple[Hashable, float]]:
+        """
+        Sensores planificados.
+
+        Returns:
+            - Dict[Hashable, Tuple[Hashable, float]]: Bus e intervalo de cada sensor planificado.
+        """
+        return {clave: (bus, intervalo) for clave, (bus, intervalo, version) in self.__planificados.items()}
+
+    def __isCurrent(self, entrada: Tuple) -> bool:
+        planificacion = self.__planificados.get(entrada[2])
+        return planificacion is not None and planificacion[2] == entrada[1]
+
+    def __next(self, entrada: Tuple, ahora: float) -> Tuple:
+        # Siguiente multiplo del intervalo; si ya ha pasado (lectura retrasada) se omiten las lecturas perdidas.
+        intervalo: float = self.__planificados[entrada[2]][1]
+        indice: int = entrada[3] + 1 if entrada[3] is not None else math.floor(entrada[0] / intervalo) + 1
+        if indice * intervalo <= ahora:
+            indice_actual: int = math.floor(ahora / intervalo) + 1
+            self.__omitidas += indice_actual - indice
+            indice = indice_actual
+        return (indice * intervalo, entrada[1], entrada[2], indice)
+
+    def nextTime(self) -> Optional[float]:
+        """
+        Instante de la siguiente lectura planificada.
+
+        Returns:
+            - Optional[float]: Instante de la siguiente lectura, o None si no hay sensores planificados.
+        """
+        while self.__cola and not self.__isCurrent(self.__cola[0]):
+            heapq.heappop(self.__cola)
+        return self.__cola[0][0] if self.__cola else None
+
+    def popDue(self, ahora: float) -> Dict[Hashable, List[Hashable]]:
+        """
+        Obtencion de las lecturas pendientes agrupadas por bus, planificando la siguiente lectura de cada sensor.
+
+        Args:
+            - ahora (float): Instante actual.
+
+        Returns:
+            - Dict[Hashable, List[Hashable]]: Sensores a leer por bus.
+        """
+        pendientes: Dict[Hashable, List[Hashable]] = {}
+        siguientes: List[Tuple] = []
+        while self.__cola and self.__cola[0][0] <= ahora:
+            entrada = heapq.heappop(self.__cola)
+            if self.__isCurrent(entrada):
+                pendientes.setdefault(self.__planificados[entrada[2]][0], []).append(entrada[2])
+                siguientes.append(self.__next(entrada, ahora))
+        if pendientes and self.__adelanto_maximo > 0:
+            aplazadas: List[Tuple] = []
+            while self.__cola and self.__cola[0][0] <= ahora + self.__adelanto_maximo:
+                entrada = heapq.heappop(self.__cola)
+                if not self.__isCurrent(entrada):
+                    continue
+                bus: Hashable = self.__planificados[entrada[2]][0]
+                if bus in pendientes:
+                    pendientes[bus].append(entrada[2])
+                    siguientes.append(self.__next(entrada, entrada[0]))
+                else:
+                    aplazadas.append(entrada)
+            siguientes.extend(aplazadas)
+        for entrada in siguientes:
+            heapq.heappush(self.__cola, entrada)
+        return pendientes
+
+    def popSkipped(self) -> int:
+        """
+        Numero de lecturas omitidas por retraso desde la ultima llamada.
+
+        Returns:
+            - int: Lecturas omitidas.
+        """
+        omitidas: int = self.__omitidas
+        self.__omitidas = 0
+        return omitidas
@@ -0,0 +1,37 @@
+#Author: Oscar Valverde Escobar
+
+import numpy as np
+from typing import Tuple
+
+class ReductorSeries():
+    """
+    Reduccion de series temporales para graficarlas con un numero maximo de puntos.
+
+    La serie se divide en intervalos de tiempo de la misma duracion y de cada intervalo se conservan el valor
+    minimo y el valor maximo (envolvente minimo/maximo). A diferencia de un muestreo o de una media por
+    intervalo, los picos y valles de la serie se mantienen, por lo que cualquier salida de los limites de un
+    consejo sigue apareciendo en la grafica reducida.
+    """
+
+    @staticmethod
+    def reduceMinMax(intervalos: np.ndarray, minimos: np.ndarray, maximos: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Posiciones del minimo y del maximo de cada intervalo con datos, calculadas de forma vectorizada.
+
+        Args:
+            - intervalos (np.ndarray): Indice del intervalo de cada punto.
+            - minimos (np.ndarray): Valor minimo de cada punto (el propio valor si el punto es una lectura).
+            - maximos (np.ndarray): Valor maximo de cada punto (el propio valor si el punto es una lectura).
+
+        Returns:
+            - Tuple[np.ndarray, np.ndarray]: Posiciones en los arrays de entrada del minimo y del maximo de cada
+              intervalo con datos, en orden de intervalo. Con empates se toma el primer punto.
+        """
+        if len(intervalos) == 0:
+            vacio: np.ndarray = np.empty(0, dtype=np.intp)
+            return vacio, vacio
+        # Ordenando de forma estable por intervalo y valor, el primer punto de cada intervalo es su extremo.
+        orden_minimos: np.ndarray = np.lexsort((minimos, intervalos))
+        orden_maximos: np.ndarray = np.lexsort((-maximos, intervalos))
+        _, primeros = np.unique(intervalos[orden_minimos], return_index=True)
+        return orden_minimos[primeros], orden_maximos[primeros]
@@ -0,0 +1,112 @@
+#Author: Oscar Valverde Escobar
+
+import logging
+import threading
+from typing import Dict, Tuple
+from common.data.util import Sensor as SensorCommon
+from common.data.util import TipoSensor, ZonaSensor
+from backend.data.util.sensor_backend import SensorBackend
+
+class RegistroSensoresBackend():
+    """
+    Registro de los SensorBackend del proceso, con su sensor electronico ya construido, para no volver a
+    construirlos en cada lectura.
+
+    Cada sensor (tipo, zona, numero) conserva su SensorBackend mientras no cambie su conexionado: modelo,
+    direccion de lectura, patillas, unidades de medida, muestras y filtro de lectura. Si cambia, se libera y
+    se construye otro. SensorService invalida el del sensor que modifica o da de baja, y los cambios hechos
+    desde otro proceso se detectan al comparar el conexionado en la siguiente lectura.
+    """
+
+    __cerrojo = threading.Lock()
+    __sensores_backend: Dict[Tuple, Tuple[Tuple, SensorBackend]] = {}
+    __construidos: int = 0
+
+    @staticmethod
+    def getWiring(sensor: SensorCommon) -> Tuple:
+        """
+        Campos del sensor de los que depende su sensor electronico.
+
+        Args:
+            - sensor (SensorCommon): Sensor.
+
+        Returns:
+            - Tuple: Conexionado del sensor.
+        """
+        return (sensor.getModeloSensor(), sensor.getDireccionLectura(),
+                sensor.getPatillaLectura(0), sensor.getPatillaLectura(1), sensor.getPatillaLectura(2), sensor.getPatillaLectura(3),
+                sensor.getUnidadMedida(0), sensor.getUnidadMedida(1), sensor.getUnidadMedida(2), sensor.getUnidadMedida(3),
+                sensor.getMuestrasLectura(), sensor.getFiltroLectura())
+
+    @staticmethod
+    def __release(sensor_backend: SensorBackend) -> None:
+        try:
+            sensor_backend.release()
+        except Exception:
+            logging.getLogger(__name__).exception('Error al liberar el sensor %s %s %d',
+                                                  sensor_backend.sensor_common.getTipoSensor(),
+                                                  sensor_backend.sensor_common.getZonaSensor(),
+                                                  sensor_backend.sensor_common.getNumeroSensor())
+
+    @staticmethod
+    def get(sensor: SensorCommon) -> SensorBackend:
+        """
+        SensorBackend de un sensor, construido solo si no existe o ha cambiado su conexionado.
+
+        Args:
+            - sensor (SensorCommon): Sensor.
+
+        Returns:
+            - SensorBackend: SensorBackend del sensor.
+        """
+        clave: Tuple = (sensor.getTipoSensor(), sensor.getZonaSensor(), sensor.getNumeroSensor())
+        conexionado: Tuple = RegistroSensoresBackend.getWiring(sensor)
+        with RegistroSensoresBackend.__cerrojo:
+            entrada: Tuple[Tuple, SensorBackend] = RegistroSensoresBackend.__sensores_backend.get(clave)
+            if entrada is not None and entrada[0] == conexionado:
+                # Los demas campos (nombre, intervalo, compresion...) no afectan a la lectura.
+                entrada[1].sensor_common = sensor
+                return entrada[1]
+            sensor_backend: SensorBackend = SensorBackend(sensor)
+            RegistroSensoresBackend.__construidos += 1
+            RegistroSensoresBackend.__sensores_backend[clave] = (conexionado, sensor_backend)
+        if entrada is not None:
+            RegistroSensoresBackend.__release(entrada[1])
+        return sensor_backend
+
+    @staticmethod
+    def invalidate(tipo_sensor: TipoSensor, zona_sensor: ZonaSensor, numero_sensor: int) -> None:
+        """
+        Descarte y liberacion del SensorBackend de un sensor, para construirlo de nuevo en su siguiente lectura.
+
+        Args:
+            - tipo_sensor (TipoSensor): Tipo del sensor.
+            - zona_sensor (ZonaSensor): Zona del sensor.
+            - numero_sensor (int): Numero del sensor.
+        """
+        with RegistroSensoresBackend.__cerrojo:
+            entrada: Tuple[Tuple, SensorBackend] = RegistroSensoresBackend.__sensores_backend.pop(
+                (tipo_sensor, zona_sensor, numero_sensor), None)
+        if entrada is not None:
+            RegistroSensoresBackend.__release(entrada[1])
+
+    @staticmethod
+    def release() -> None:
+        """
+        Liberacion de todos los SensorBackend, al terminar el proceso.
+        """
+        with RegistroSensoresBackend.__cerrojo:
+            entradas = list(RegistroSensoresBackend.__sensores_backend.values())
+            RegistroSensoresBackend.__sensores_backend.clear()
+        for _, sensor_backend in entradas:
+            RegistroSensoresBackend.__release(sensor_backend)
+
+    @staticmethod
+    def getConstructedCount() -> int:
+        """
+        Numero de SensorBackend construidos por el proceso.
+
+        Returns:
+            - int: SensorBackend construidos.
+        """
+        return RegistroSensoresBackend.__construidos
@@ -1,17 +1,18 @@
 #Author: Oscar Valverde Escobar
 
+import logging
 from datetime import datetime
 from typing import Optional,Dict,List,Tuple
 from enum import Enum
 from common.data.util import Sensor as SensorCommon, RegistroSensor as RegistroSensorCommon
 from common.data.util import TipoSensor, ZonaSensor, ModeloSensor, TipoMedida, UnidadMedida
-from backend.data.electronic import SensorElectronico, FactoriaSensorElectronico
+from backend.data.electronic import FactoriaSensorElectronico
 
 class SensorBackend():
 
     def __init__(self, sensor_common: SensorCommon):
         self.sensor_common: SensorCommon = sensor_common
-        self.sensor_electronico: SensorElectronico = FactoriaSensorElectronico.getSensorElectronico(sensor_common)
+        self.sensor_electronico: 'SensorElectronico' = FactoriaSensorElectronico.getSensorElectronico(sensor_common)
 
     def createRecordSensor(self, valor: float, unidad_medida: UnidadMedida) -> RegistroSensorCommon:
         return RegistroSensorCommon(self.sensor_common.getTipoSensor(),self.sensor_common.getZonaSensor(),
@@ -20,11 +21,41 @@ class SensorBackend():
     def createRecordsSensor(self, lista_valor_unidad_medida: List[Tuple[float, UnidadMedida]]) -> List[RegistroSensorCommon]:
         lista_registros_sensor  = []
         for registro_sensor in lista_valor_unidad_medida:
+            # Las magnitudes sin ninguna muestra valida se dan por perdidas en lugar de registrarse.
+            if registro_sensor[0] is None:
+                logging.getLogger(__name__).warning('Lectura perdida del sensor %s %s %d en %s', self.sensor_common.getTipoSensor(),
+                                                    self.sensor_common.getZonaSensor(), self.sensor_common.getNumeroSensor(),
+                                                    registro_sensor[1])
+                continue
             lista_registros_sensor.append(self.createRecordSensor(registro_sensor[0],registro_sensor[1]))
         return lista_registros_sensor
 
-    def readSensorAndCreateRecords(self) -> List[RegistroSensorCommon]:
+    def readSensorAndCreateRecords(self, limite: float = None) -> List[RegistroSensorCommon]:
         lista_registros_sensor  = []
-        registro = self.sensor_electronico.leer_sensor()
+        registro = self.sensor_electronico.leer_sensor(limite)
         lista_registros_sensor = self.createRecordsSensor(registro)
         return lista_registros_sensor
+
+    def release(self) -> None:
+        """
+        Liberacion de los recursos de hardware propios del sensor electronico.
+        """
+        self.sensor_electronico.liberar()
+
+    @staticmethod
+    def readMCP3008SensorsAndCreateRecords(sensores_backend: List['SensorBackend'],
+                                           limite: float = None) -> List[List[RegistroSensorCommon]]:
+        """
+        Lectura conjunta de sensores conectados a un MCP3008, con una unica rafaga por chip.
+
+        Args:
+            - sensores_backend (List[SensorBackend]): Sensores cuyo sensor electronico deriva de SensorElectronicoMCP3008.
+            - limite (float): Limite (time.monotonic) de la lectura.
+
+        Returns:
+            - List[List[RegistroSensorCommon]]: Registros de cada sensor, en el mismo orden.
+        """
+        # Importado al usarse, como los sensores electronicos, para no cargar el hardware al importar el modulo.
+        from backend.data.electronic import LectorMCP3008
+        lecturas = LectorMCP3008.leer_sensores([sensor_backend.sensor_electronico for sensor_backend in sensores_backend], limite)
+        return [sensor_backend.createRecordsSensor(lectura) for sensor_backend, lectura in zip(sensores_backend, lecturas)]
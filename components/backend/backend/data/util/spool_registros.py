@@ -0,0 +1,241 @@
+#Author: Oscar Valverde Escobar
+
+import json
+import logging
+import os
+import threading
+from datetime import datetime
+from typing import Callable, List, Optional
+from common.data.util import RegistroSensor as RegistroSensorCommon
+from common.data.util import TipoSensor, ZonaSensor, UnidadMedida
+
+class SpoolRegistros():
+    """
+    Fichero local de solo adicion por el que pasan los registros de los sensores antes de llegar a la base
+    de datos, para no perder lecturas cuando la base de datos esta bloqueada o no disponible.
+
+    Cada adicion escribe todos sus registros, uno por linea, con un unico fsync. Un hilo en segundo plano
+    los vuelca a la base de datos en lotes y guarda en un fichero de control (ruta + '.offset') hasta donde
+    se han almacenado; cuando todo esta almacenado el fichero se vacia. Si el proceso termina entre el
+    almacenamiento de un lote y la actualizacion del fichero de control, al arrancar se vuelven a volcar
+    los registros pendientes omitiendo los que ya existen en la base de datos.
+
+    Las lineas que no se pueden decodificar (JSON no valido o nombres de enumerados que ya no existen) fallarian
+    en cada intento y bloquearian los registros posteriores: se apartan en un fichero de rechazados
+    (ruta + '.rechazados') y se avanza sobre ellas.
+    """
+
+    # Registros almacenados en cada transaccion.
+    TAMANO_LOTE: int = 5000
+    # Segundos de espera tras un fallo al almacenar antes de reintentarlo.
+    ESPERA_REINTENTO: float = 5.0
+
+    def __init__(self, ruta: str, almacenar: Callable[[List[RegistroSensorCommon], bool], object]):
+        """
+        Args:
+            - ruta (str): Ruta del fichero.
+            - almacenar (Callable[[List[RegistroSensorCommon], bool], object]): Funcion que almacena un lote de
+              registros en la base de datos, omitiendo los que ya existen si el segundo argumento es True.
+        """
+        self.__ruta: str = ruta
+        self.__ruta_control: str = ruta + '.offset'
+        self.__ruta_rechazados: str = ruta + '.rechazados'
+        self.__almacenar: Callable[[List[RegistroSensorCommon], bool], object] = almacenar
+        self.__cerrojo = threading.Lock()
+        self.__cerrojo_volcado = threading.Lock()
+        self.__aviso = threading.Event()
+        self.__parada = threading.Event()
+        self.__hilo: Optional[threading.Thread] = None
+        self.__logger = logging.getLogger(__name__)
+        directorio: str = os.path.dirname(os.path.abspath(ruta))
+        os.makedirs(directorio, exist_ok=True)
+        self.__fichero = open(ruta, 'ab')
+        self.__tamano: int = self.__discardTornLine()
+        self.__almacenado: int = min(self.__readControl(), self.__tamano)
+        # Los registros anteriores a esta posicion pueden haberse almacenado ya antes de una parada brusca.
+        self.__fin_recuperacion: int = self.__tamano
+        self.__pendientes: int = self.__countLines(self.__almacenado, self.__tamano)
+
+    def __discardTornLine(self) -> int:
+        # Una escritura interrumpida puede dejar una ultima linea incompleta, que nunca llego a confirmarse.
+        with open(self.__ruta, 'rb') as lector:
+            contenido: bytes = lector.read()
+        tamano: int = contenido.rfind(b'\n') + 1
+        if tamano < len(contenido):
+            os.ftruncate(self.__fichero.fileno(), tamano)
+            os.fsync(self.__fichero.fileno())
+        return tamano
+
+    def __readControl(self) -> int:
+        try:
+            with open(self.__ruta_control, 'r') as control:
+                return int(control.read().strip() or 0)
+        except FileNotFoundError:
+            return 0
+
+    def __writeControl(self, posicion: int) -> None:
+        temporal: str = self.__ruta_control + '.tmp'
+        with open(temporal, 'w') as control:
+            control.write(str(posicion))
+            control.flush()
+            os.fsync(control.fileno())
+        os.replace(temporal, self.__ruta_control)
+
+    def __countLines(self, inicio: int, fin: int) -> int:
+        with open(self.__ruta, 'rb') as lector:
+            lector.seek(inicio)
+            return lector.read(fin - inicio).count(b'\n')
+
+    def __reject(self, lineas: List[bytes]) -> None:
+        # Se anaden antes de avanzar el fichero de control: tras una parada brusca una linea puede quedar repetida.
+        with open(self.__ruta_rechazados, 'ab') as rechazados:
+            rechazados.write(b''.join(linea if linea.endswith(b'\n') else linea + b'\n' for linea in lineas))
+            rechazados.flush()
+            os.fsync(rechazados.fileno())
+
+    @staticmethod
+    def __encode(registro: RegistroSensorCommon) -> bytes:
+        return (json.dumps([registro.getTipoSensor().name, registro.getZonaSensor().name, registro.getNumeroSensor(),
+                            registro.getValor(), registro.getUnidadMedida().name, registro.getFecha().isoformat(),
+                            registro.getNumeroLecturas(), registro.getSumaLecturas()]) + '\n').encode()
+
+    @staticmethod
+    def __decode(linea: bytes) -> RegistroSensorCommon:
+        campos: List = json.loads(linea)
+        return RegistroSensorCommon(TipoSensor[campos[0]], ZonaSensor[campos[1]], campos[2], campos[3], UnidadMedida[campos[4]],
+                                    datetime.fromisoformat(campos[5]), 0, campos[6], campos[7])
+
+    def append(self, registros: List[RegistroSensorCommon]) -> None:
+        """
+        Adicion de registros al fichero, con un unico fsync, y aviso al hilo de volcado.
+
+        Args:
+            - registros (List[RegistroSensorCommon]): Registros a almacenar. Los que no tienen fecha reciben la actual.
+        """
+        if not registros:
+            return
+        lineas: List[bytes] = []
+        for registro in registros:
+            if registro.getFecha() is None:
+                registro = RegistroSensorCommon(registro.getTipoSensor(), registro.getZonaSensor(), registro.getNumeroSensor(),
+                                                registro.getValor(), registro.getUnidadMedida(), datetime.now(), 0,
+                                                registro.getNumeroLecturas(), registro.getSumaLecturas())
+            lineas.append(SpoolRegistros.__encode(registro))
+        datos: bytes = b''.join(lineas)
+        with self.__cerrojo:
+            self.__fichero.write(datos)
+            self.__fichero.flush()
+            os.fsync(self.__fichero.fileno())
+            self.__tamano += len(datos)
+            self.__pendientes += len(lineas)
+        self.__aviso.set()
+
+    def getPendingCount(self) -> int:
+        """
+        Numero de registros del fichero pendientes de almacenar en la base de datos.
+
+        Returns:
+            - int: Registros pendientes.
+        """
+        return self.__pendientes
+
+    def drain(self) -> int:
+        """
+        Volcado a la base de datos de todos los registros pendientes, en lotes de TAMANO_LOTE registros. Las
+        lineas que no se pueden decodificar se registran en el log y se apartan en el fichero de rechazados.
+
+        Raises:
+            - Exception: La excepcion producida al almacenar un lote. Los lotes anteriores quedan almacenados.
+
+        Returns:
+            - int: Numero de registros volcados.
+        """
+        volcados: int = 0
+        with self.__cerrojo_volcado:
+            with open(self.__ruta, 'rb') as lector:
+                while True:
+                    with self.__cerrojo:
+                        inicio: int = self.__almacenado
+                        fin: int = self.__tamano
+                    if inicio >= fin:
+                        break
+                    lector.seek(inicio)
+                    lineas: List[bytes] = []
+                    posicion: int = inicio
+                    while posicion < fin and len(lineas) < SpoolRegistros.TAMANO_LOTE:
+                        linea: bytes = lector.readline()
+                        posicion += len(linea)
+                        lineas.append(linea)
+                    registros: List[RegistroSensorCommon] = []
+                    rechazadas: List[bytes] = []
+                    for linea in lineas:
+                        try:
+                            registros.append(SpoolRegistros.__decode(linea))
+                        except (ValueError, KeyError, IndexError, TypeError) as ex:
+                            self.__logger.error('Linea no valida del fichero %s apartada en %s: %r (%s)', self.__ruta,
+                                                self.__ruta_rechazados, linea, ex)
+                            rechazadas.append(linea)
+                    if registros:
+                        self.__almacenar(registros, inicio < self.__fin_recuperacion)
+                    # Solo tras almacenar el lote, para no repetir los rechazados en cada reintento.
+                    if rechazadas:
+                        self.__reject(rechazadas)
+                    volcados += len(registros)
+                    with self.__cerrojo:
+                        self.__pendientes -= len(lineas)
+                        if posicion == self.__tamano:
+                            # Todo almacenado: se vacia el fichero. El fichero de control se actualiza antes, de
+                            # forma que una parada brusca entre ambos pasos solo provoca una recuperacion.
+                            self.__almacenado = 0
+                            self.__writeControl(0)
+                            os.ftruncate(self.__fichero.fileno(), 0)
+                            os.fsync(self.__fichero.fileno())
+                            self.__tamano = 0
+                            self.__fin_recuperacion = 0
+                        else:
+                            self.__almacenado = posicion
+                            self.__writeControl(posicion)
+        return volcados
+
+    def __run(self) -> None:
+        while not self.__parada.is_set():
+            self.__aviso.wait()
+            self.__aviso.clear()
+            if self.__parada.is_set():
+                break
+            try:
+                self.drain()
+            except Exception:
+                self.__logger.exception('Error al volcar a la base de datos los registros del fichero %s, %d pendientes',
+                                        self.__ruta, self.__pendientes)
+                self.__parada.wait(SpoolRegistros.ESPERA_REINTENTO)
+                self.__aviso.set()
+
+    def start(self) -> None:
+        """
+        Inicio del hilo de volcado, que vuelca los registros pendientes al arrancar y tras cada adicion.
+        """
+        if self.__hilo is not None:
+            return
+        self.__parada.clear()
+        self.__hilo = threading.Thread(target=self.__run, name='spool-registros', daemon=True)
+        self.__hilo.start()
+        self.__aviso.set()
+
+    def stop(self) -> None:
+        """
+        Detencion del hilo de volcado y ultimo intento de volcado. Los registros que no se pueden almacenar
+        se conservan en el fichero para el siguiente arranque.
+        """
+        if self.__hilo is not None:
+            self.__parada.set()
+            self.__aviso.set()
+            self.__hilo.join()
+            self.__hilo = None
+        try:
+            self.drain()
+        except Exception:
+            self.__logger.exception('Error al volcar a la base de datos los registros del fichero %s, %d pendientes '
+                                    'para el siguiente arranque', self.__ruta, self.__pendientes)
+        with self.__cerrojo:
+            self.__fichero.close()
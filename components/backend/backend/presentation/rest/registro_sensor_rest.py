@@ -1,10 +1,11 @@
 #Author: Oscar Valverde Escobar
 
-from datetime import datetime
+from datetime import datetime, timedelta
 import arrow
+import itertools
 from http import HTTPStatus
-from flask import current_app
-from typing import List, Dict
+from flask import current_app, request, Response
+from typing import Iterable, List, Dict, Optional, Tuple
 from backend.service import RegistroSensorService, SensorService, PlantaService, ConsejoPlantaService, ConsejoTipoPlantaService
 from common.data.util import RegistroSensor as RegistroSensorCommon, Sensor as SensorCommon, Planta as PlantaCommon
 from common.data.util import TipoSensor, ZonaSensor, TipoMedida, UnidadMedida
@@ -12,6 +13,50 @@ from common.data.util import ConsejoPlanta as ConsejoPlantaCommon, ConsejoTipoPl
 
 import traceback
 
+# Numero de registros por pagina cuando se pide una pagina sin indicar el limite.
+LIMITE_PAGINA: int = 1000
+# Formatos de las respuestas para graficar: diccionarios anidados por zona y tipo de medida, o una serie por
+# zona y tipo de medida con las fechas y los valores en columnas.
+FORMATOS_GRAFICA: List[str] = ['anidado', 'columnar']
+# Decimales de los valores en el formato columnar.
+DECIMALES_GRAFICA: int = 2
+
+def __paged(listar_pagina, limit: Optional[int], cursor: Optional[str]):
+    """
+    Respuesta paginada: los registros de la pagina y el cursor de la siguiente pagina en el campo next, nulo si
+    no hay mas. Si hay mas, el cursor tambien se envia en la cabecera X-Next-Cursor.
+    """
+    try:
+        registros, siguiente = listar_pagina(limit or LIMITE_PAGINA, cursor)
+    except(ValueError) as ex:
+        return (str(ex), HTTPStatus.NOT_ACCEPTABLE.value)
+    cabeceras: Dict = {}
+    if siguiente is not None:
+        cabeceras['X-Next-Cursor'] = siguiente
+    return {'registros': [item.toJson() for item in registros], 'next': siguiente}, HTTPStatus.OK.value, cabeceras
+
+def __reducedEnd(fecha: datetime) -> datetime:
+    """
+    Fecha de fin de una grafica reducida con max_points sin fecha de fin: la fecha actual redondeada al minuto
+    siguiente. Los intervalos de la reduccion se reparten hasta ella, por lo que no cambian en cada peticion
+    dentro del mismo minuto y pueden formar parte de la version.
+    """
+    fin: datetime = fecha.replace(second=0, microsecond=0)
+    return fin if fin == fecha else fin + timedelta(minutes=1)
+
+def __conditional(version: str, responder):
+    """
+    Respuesta condicional: si la version coincide con la de la cabecera If-None-Match del cliente, 304 Not Modified
+    sin contenido y sin calcular la respuesta; si no, la respuesta de responder con la version en la cabecera ETag.
+    """
+    cabeceras: Dict = {'ETag': 'W/"' + version + '"', 'Cache-Control': 'no-cache'}
+    if request.if_none_match.contains_weak(version):
+        return (None, HTTPStatus.NOT_MODIFIED.value, cabeceras)
+    respuesta = responder()
+    if respuesta[1] != HTTPStatus.OK.value:
+        return respuesta
+    return respuesta[0], respuesta[1], cabeceras
+
 def get(rsid: int) -> Dict:
     with current_app.app_context() :
         if RegistroSensorService.exists(current_app.db,rsid):
@@ -19,11 +64,14 @@ def get(rsid: int) -> Dict:
         else:
             return ("El registro de sensor " + str(rsid) + "no existe", HTTPStatus.NOT_FOUND.value)
         
-def getAll() -> List[Dict]:
+def getAll(limit: int = None, cursor: str = None) -> List[Dict]:
     with current_app.app_context() :
+        if limit is not None or cursor is not None:
+            return __paged(lambda limite, cursor_pagina: RegistroSensorService.listAllPage(current_app.db, limite, cursor_pagina),
+                           limit, cursor)
         return [item.toJson() for item in RegistroSensorService.listAll(current_app.db)], HTTPStatus.OK.value
 
-def getAllFromSensor(st:str, sz: str ,sid:int) -> List[Dict]:
+def getAllFromSensor(st:str, sz: str ,sid:int, limit: int = None, cursor: str = None) -> List[Dict]:
     try:
         tipo_sensor:TipoSensor = TipoSensor[st]
     except(KeyError):
@@ -35,11 +83,14 @@ def getAllFromSensor(st:str, sz: str ,sid:int) -> List[Dict]:
     numero_sensor:int = sid
     with current_app.app_context() :
         if SensorService.exists(current_app.db,tipo_sensor,zona_sensor,numero_sensor):
+            if limit is not None or cursor is not None:
+                return __paged(lambda limite, cursor_pagina: RegistroSensorService.listAllFromSensorPage(
+                    current_app.db, tipo_sensor, zona_sensor, numero_sensor, limite, cursor_pagina), limit, cursor)
             return [item.toJson() for item in RegistroSensorService.listAllFromSensor(current_app.db,tipo_sensor,zona_sensor,numero_sensor)], HTTPStatus.OK.value
         else:
             return ("El sensor " + str(numero_sensor) + " de tipo " + str(tipo_sensor) + " de la zona " + str(zona_sensor) + " no existe", HTTPStatus.NOT_FOUND.value)
 
-def getAllFromSensorBetweenDates(st:str, sz: str ,sid:int, fi: str, ff: str = None) -> List[Dict]:
+def getAllFromSensorBetweenDates(st:str, sz: str ,sid:int, fi: str, ff: str = None, limit: int = None, cursor: str = None) -> List[Dict]:
     try:
         tipo_sensor:TipoSensor = TipoSensor[st]
     except(KeyError):
@@ -63,20 +114,28 @@ def getAllFromSensorBetweenDates(st:str, sz: str ,sid:int, fi: str, ff: str = No
         return ("La fecha de inicio " + str(fi) + " no puede ser mayor que la fecha de fin " + str(ff) + " .", HTTPStatus.NOT_ACCEPTABLE.value)
     with current_app.app_context() :
         if SensorService.exists(current_app.db,tipo_sensor,zona_sensor,numero_sensor):
+            if limit is not None or cursor is not None:
+                return __paged(lambda limite, cursor_pagina: RegistroSensorService.listAllFromSensorPage(
+                    current_app.db, tipo_sensor, zona_sensor, numero_sensor, limite, cursor_pagina, fecha_inicio, fecha_fin), limit, cursor)
             return [item.toJson() for item in RegistroSensorService.listAllFromSensorBetweenDates(current_app.db,tipo_sensor,zona_sensor,numero_sensor,
                                                                                                     fecha_inicio,fecha_fin)], HTTPStatus.OK.value
         else:
             return ("El sensor " + str(numero_sensor) + " de tipo " + str(tipo_sensor) + " de la zona " + str(zona_sensor) + " no existe", HTTPStatus.NOT_FOUND.value)
 
-def getAllFromPlant(np:str) -> List[Dict]:
+def getAllFromPlant(np:str, limit: int = None, cursor: str = None) -> List[Dict]:
     with current_app.app_context() :
         if PlantaService.exists(current_app.db,np):
             nombre_planta: str = np
-            return [item.toJson() for item in RegistroSensorService.listAllFromPlant(current_app.db, nombre_planta)], HTTPStatus.OK.value
+            if limit is not None or cursor is not None:
+                return __paged(lambda limite, cursor_pagina: RegistroSensorService.listAllFromPlantPage(
+                    current_app.db, nombre_planta, limite, cursor_pagina), limit, cursor)
+            return __conditional(RegistroSensorService.getVersionFromPlant(current_app.db, nombre_planta),
+                                 lambda: ([item.toJson() for item in RegistroSensorService.listAllFromPlant(current_app.db, nombre_planta)],
+                                          HTTPStatus.OK.value))
         else:
             return ("La planta " + np + " no existe.", HTTPStatus.NOT_FOUND.value)
 
-def getAllFromPlantBetweenDates(np:str, fi: str, ff: str = None) -> List[Dict]:
+def getAllFromPlantBetweenDates(np:str, fi: str, ff: str = None, limit: int = None, cursor: str = None) -> List[Dict]:
     try:
         fecha_inicio=datetime.fromisoformat(fi)
     except(ValueError):
@@ -92,10 +151,59 @@ def getAllFromPlantBetweenDates(np:str, fi: str, ff: str = None) -> List[Dict]:
     with current_app.app_context() :
         if PlantaService.exists(current_app.db,np):
             nombre_planta: str = np
-            return [item.toJson() for item in RegistroSensorService.listAllFromPlantBetweenDates(current_app.db, nombre_planta, fecha_inicio, fecha_fin)], HTTPStatus.OK.value
+            if limit is not None or cursor is not None:
+                return __paged(lambda limite, cursor_pagina: RegistroSensorService.listAllFromPlantPage(
+                    current_app.db, nombre_planta, limite, cursor_pagina, fecha_inicio, fecha_fin), limit, cursor)
+            return __conditional(RegistroSensorService.getVersionFromPlant(current_app.db, nombre_planta),
+                                 lambda: ([item.toJson() for item in RegistroSensorService.listAllFromPlantBetweenDates(
+                                     current_app.db, nombre_planta, fecha_inicio, fecha_fin)], HTTPStatus.OK.value))
         else:
             return ("La planta " + np + " no existe.", HTTPStatus.NOT_FOUND.value)   
 
+def export(fmt: str = 'ndjson', st: str = None, sz: str = None, sid: int = None, np: str = None, fi: str = None, ff: str = None):
+    if fmt not in RegistroSensorService.FORMATOS_EXPORTACION:
+        return ("El formato de exportacion " + str(fmt) + " no existe.", HTTPStatus.NOT_ACCEPTABLE.value)
+    if np is not None and (st is not None or sz is not None or sid is not None):
+        return ("No se puede exportar a la vez por planta y por sensor.", HTTPStatus.NOT_ACCEPTABLE.value)
+    if (st is None) != (sz is None) or (st is None) != (sid is None):
+        return ("Para exportar por sensor es necesario especificar su tipo, zona y numero.", HTTPStatus.NOT_ACCEPTABLE.value)
+    fecha_inicio: datetime = None
+    fecha_fin: datetime = None
+    try:
+        if fi is not None:
+            fecha_inicio=datetime.fromisoformat(fi)
+    except(ValueError):
+        return ("Error en el formato de la fecha de inicio " + str(fi) +" .", HTTPStatus.NOT_ACCEPTABLE.value)
+    try:
+        if ff is not None:
+            fecha_fin=datetime.fromisoformat(ff)
+    except(ValueError):
+        return ("Error en el formato de la fecha de fin " + str(ff) +" .", HTTPStatus.NOT_ACCEPTABLE.value)
+    if fecha_inicio is not None and fecha_fin is not None and fecha_inicio > fecha_fin:
+        return ("La fecha de inicio " + str(fi) + " no puede ser mayor que la fecha de fin " + str(ff) + " .", HTTPStatus.NOT_ACCEPTABLE.value)
+    with current_app.app_context() :
+        if np is not None:
+            if not PlantaService.exists(current_app.db,np):
+                return ("La planta " + np + " no existe.", HTTPStatus.NOT_FOUND.value)
+            fragmentos = RegistroSensorService.exportFromPlant(current_app.db, fmt, np, fecha_inicio, fecha_fin)
+        elif st is not None:
+            try:
+                tipo_sensor:TipoSensor = TipoSensor[st]
+            except(KeyError):
+                return ("El tipo de sensor " + str(st) + " no existe.", HTTPStatus.NOT_ACCEPTABLE.value)   
+            try:
+                zona_sensor: ZonaSensor = ZonaSensor[sz]
+            except(KeyError):
+                return ("La zona de sensor " + str(sz) + " no existe.", HTTPStatus.NOT_ACCEPTABLE.value)   
+            if not SensorService.exists(current_app.db,tipo_sensor,zona_sensor,sid):
+                return ("El sensor " + str(sid) + " de tipo " + str(tipo_sensor) + " de la zona " + str(zona_sensor) + " no existe", HTTPStatus.NOT_FOUND.value)
+            fragmentos = RegistroSensorService.exportFromSensor(current_app.db, fmt, tipo_sensor, zona_sensor, sid, fecha_inicio, fecha_fin)
+        else:
+            fragmentos = RegistroSensorService.exportAll(current_app.db, fmt, fecha_inicio, fecha_fin)
+        # La respuesta se envia a medida que se generan los fragmentos, sin construirla completa en memoria.
+        return Response(fragmentos, mimetype='text/csv' if fmt == 'csv' else 'application/x-ndjson',
+                        headers={'Content-Disposition': 'attachment; filename=registros_sensores.' + fmt})
+
 def __createRecordsDcitToGraph() -> List[Dict]:
     dic_registros_graficar = {}
     for unidad_medida in list(UnidadMedida):
@@ -183,31 +291,88 @@ def __addTipsListToGraph(lista_consejos: List[ConsejoCommon], dic_registros_graf
         dic_medida_zona["lista_valores_maximos"] = lista_valores_maximos
     return dic_registros_graficar
 
+def __createColumnarGraph(registros_sensores: Iterable[RegistroSensorCommon], lista_consejos: List[ConsejoCommon]) -> Dict:
+    """
+    Grafica en formato columnar: una unica serie por zona y tipo de medida, con las fechas en milisegundos
+    desde epoch, los valores redondeados a DECIMALES_GRAFICA decimales y los limites del consejo como valores
+    escalares. Los registros consecutivos con la misma fecha se promedian como en el formato anidado.
+    """
+    series: Dict[Tuple, Dict] = {}
+    ultimas_fechas: Dict[Tuple, datetime] = {}
+    def getSeries(zona: ZonaSensor, tipo_medida: TipoMedida, unidad_medida: UnidadMedida) -> Dict:
+        clave: Tuple = (zona, tipo_medida)
+        serie: Optional[Dict] = series.get(clave)
+        if serie is None:
+            serie = {"zona_sensor": {"nombre": str(zona), "tipo": zona.getTipo()},
+                     "tipo_medida": {"nombre": str(tipo_medida), "tipo": tipo_medida.getTipo()},
+                     "unidad_medida": {"nombre": str(unidad_medida), "tipo": unidad_medida.getTipo()},
+                     "fechas": [], "valores": [], "valor_minimo": None, "valor_maximo": None}
+            series[clave] = serie
+        return serie
+    for registro_sensor in registros_sensores:
+        unidad_medida: UnidadMedida = registro_sensor.getUnidadMedida()
+        tipo_medida: TipoMedida = unidad_medida.getTipoMedida()
+        zona: ZonaSensor = registro_sensor.getZonaSensor()
+        if zona == ZonaSensor.SIN_ZONA or tipo_medida == TipoMedida.SIN_TIPO:
+            continue
+        serie: Dict = getSeries(zona, tipo_medida, unidad_medida)
+        valor: float = float(registro_sensor.getValor())
+        if ultimas_fechas.get((zona, tipo_medida)) == registro_sensor.getFecha():
+            serie["valores"][-1] = round((serie["valores"][-1] + valor) / 2, DECIMALES_GRAFICA)
+        else:
+            serie["valores"].append(round(valor, DECIMALES_GRAFICA))
+            serie["fechas"].append(round(registro_sensor.getFecha().timestamp() * 1000))
+            ultimas_fechas[(zona, tipo_medida)] = registro_sensor.getFecha()
+    for consejo in lista_consejos:
+        serie: Dict = getSeries(consejo.getZonaConsejo(), consejo.getTipoMedida(), consejo.getUnidadMedida())
+        serie["valor_minimo"] = consejo.getValorMinimo()
+        serie["valor_maximo"] = consejo.getValorMaximo()
+    return {"series": list(series.values())}
+
+def __graph(formato: str, listas_registros: Iterable[List[RegistroSensorCommon]], lista_consejos: List[ConsejoCommon]) -> Dict:
+    if formato == 'columnar':
+        return __createColumnarGraph(itertools.chain.from_iterable(listas_registros), lista_consejos)
+    dic_registros_graficar = __createRecordsDcitToGraph()
+    for lista_registros in listas_registros:
+        dic_registros_graficar = __addAllRecordsListToGraph(lista_registros, dic_registros_graficar)
+    return __addTipsListToGraph(lista_consejos, dic_registros_graficar)
+
 
-def getAllFromPlantToGraph(np:str) -> List[Dict]:
+def getAllFromPlantToGraph(np:str, format: str = 'anidado', max_points: int = None) -> List[Dict]:
+    if format not in FORMATOS_GRAFICA:
+        return ("El formato de grafica " + str(format) + " no existe.", HTTPStatus.NOT_ACCEPTABLE.value)
     with current_app.app_context() :
         if PlantaService.exists(current_app.db,np):
             nombre_planta: str = np
-            try:
-                dic_registros_graficar = __createRecordsDcitToGraph()
-                lista_registros = RegistroSensorService.listAllFromPlant(current_app.db, nombre_planta)
-                dic_registros_graficar = __addAllRecordsListToGraph(lista_registros, dic_registros_graficar)
-                lista_consejos: List[ConsejoPlantaCommon] = ConsejoPlantaService.listAllFromPlant(current_app.db, nombre_planta)
-                dic_registros_graficar = __addTipsListToGraph(lista_consejos, dic_registros_graficar)
-            except:
-                return ("Error al procesar los datos de la planta " + np + " para graficar.", HTTPStatus.NOT_FOUND.value)
-            return dic_registros_graficar, HTTPStatus.OK.value
+            fecha_fin: Optional[datetime] = None if max_points is None else __reducedEnd(datetime.now())
+            def graficar():
+                try:
+                    if max_points is None:
+                        lista_registros = RegistroSensorService.listAllFromPlant(current_app.db, nombre_planta)
+                    else:
+                        lista_registros = RegistroSensorService.listReducedFromPlantBetweenDates(current_app.db, nombre_planta, None,
+                                                                                                 fecha_fin, max_points)
+                    lista_consejos: List[ConsejoPlantaCommon] = ConsejoPlantaService.listAllFromPlant(current_app.db, nombre_planta)
+                    dic_registros_graficar = __graph(format, [lista_registros], lista_consejos)
+                except:
+                    return ("Error al procesar los datos de la planta " + np + " para graficar.", HTTPStatus.NOT_FOUND.value)
+                return dic_registros_graficar, HTTPStatus.OK.value
+            # Los intervalos de la reduccion dependen de la fecha de fin, por lo que forman parte de la version.
+            return __conditional(RegistroSensorService.getVersionFromPlant(current_app.db, nombre_planta, max_points, fecha_fin),
+                                 graficar)
         else:
             return ("La planta " + np + " no existe.", HTTPStatus.NOT_FOUND.value)
 
-def getAllFromPlantBetweenDatesToGraph(np:str, fi: str, ff: str = None) -> List[Dict]:
+def getAllFromPlantBetweenDatesToGraph(np:str, fi: str, ff: str = None, format: str = 'anidado', max_points: int = None) -> List[Dict]:
+    if format not in FORMATOS_GRAFICA:
+        return ("El formato de grafica " + str(format) + " no existe.", HTTPStatus.NOT_ACCEPTABLE.value)
     try:
         fecha_inicio=datetime.fromisoformat(fi)
     except(ValueError):
         return ("Error en el formato de la fecha de inicio " + str(fi) +" .", HTTPStatus.NOT_ACCEPTABLE.value)
     try:
         if ff is None:
-            ff=str(datetime.now())
+            ff=str(datetime.now() if max_points is None else __reducedEnd(datetime.now()))
         fecha_fin=datetime.fromisoformat(ff)
     except(ValueError):
         return ("Error en el formato de la fecha de fin " + str(ff) +" .", HTTPStatus.NOT_ACCEPTABLE.value)
@@ -216,15 +381,23 @@ def getAllFromPlantBetweenDatesToGraph(np:str, fi: str, ff: str = None) -> List[
     with current_app.app_context() :
         if PlantaService.exists(current_app.db,np):
             nombre_planta: str = np
-            try:
-                dic_registros_graficar = __createRecordsDcitToGraph()
-                lista_registros = RegistroSensorService.listAllFromPlantBetweenDates(current_app.db, nombre_planta, fecha_inicio, fecha_fin)
-                dic_registros_graficar = __addAllRecordsListToGraph(lista_registros, dic_registros_graficar)
-                lista_consejos: List[ConsejoPlantaCommon] = ConsejoPlantaService.listAllFromPlant(current_app.db, nombre_planta)
-                dic_registros_graficar = __addTipsListToGraph(lista_consejos, dic_registros_graficar)
-            except:
-                return ("Error al procesar los datos de la planta " + np + " para graficar.", HTTPStatus.NOT_FOUND.value)
-            return dic_registros_graficar, HTTPStatus.OK.value
+            def graficar():
+                try:
+                    if max_points is None:
+                        lista_registros = RegistroSensorService.listAllFromPlantBetweenDates(current_app.db, nombre_planta, fecha_inicio, fecha_fin)
+                    else:
+                        lista_registros = RegistroSensorService.listReducedFromPlantBetweenDates(current_app.db, nombre_planta, fecha_inicio,
+                                                                                                 fecha_fin, max_points)
+                    lista_consejos: List[ConsejoPlantaCommon] = ConsejoPlantaService.listAllFromPlant(current_app.db, nombre_planta)
+                    dic_registros_graficar = __graph(format, [lista_registros], lista_consejos)
+                except:
+                    return ("Error al procesar los datos de la planta " + np + " para graficar.", HTTPStatus.NOT_FOUND.value)
+                return dic_registros_graficar, HTTPStatus.OK.value
+            if max_points is None:
+                return __conditional(RegistroSensorService.getVersionFromPlant(current_app.db, nombre_planta), graficar)
+            # Los intervalos de la reduccion dependen de las fechas, por lo que forman parte de la version.
+            return __conditional(RegistroSensorService.getVersionFromPlant(current_app.db, nombre_planta, max_points, fecha_inicio,
+                                                                           fecha_fin), graficar)
         else:
             return ("La planta " + np + " no existe.", HTTPStatus.NOT_FOUND.value) 
         
@@ -257,7 +430,9 @@ def __dateListIntervals(dias: int, fecha: datetime = None) -> List[RegistroSenso
         f_int = f_int.shift(hours=+horas_intervalo)
     return lista_fechas
 
-def getAvgFromPlantAgroupByIntervalsToGraph(np:str, d: int, ff:str = None) -> List[Dict]:
+def getAvgFromPlantAgroupByIntervalsToGraph(np:str, d: int, ff:str = None, format: str = 'anidado') -> List[Dict]:
+    if format not in FORMATOS_GRAFICA:
+        return ("El formato de grafica " + str(format) + " no existe.", HTTPStatus.NOT_ACCEPTABLE.value)
     with current_app.app_context() :
         if d > 0:
             if PlantaService.exists(current_app.db,np):
@@ -269,18 +444,19 @@ def getAvgFromPlantAgroupByIntervalsToGraph(np:str, d: int, ff:str = None) -> Li
                     lista_fechas = __dateListIntervals(d,fecha_fin)
                 except:
                     return ("Error en el formato de la fecha de fin " + str(ff) +" .", HTTPStatus.NOT_ACCEPTABLE.value)
-                try:
-                    dic_registros_graficar = __createRecordsDcitToGraph()
-                    for fecha in lista_fechas:
-                        lista_registros = RegistroSensorService.listAllAvgFromPlantBetweenDates(current_app.db, nombre_planta, fecha[0], fecha[1])
-                        dic_registros_graficar = __addAllRecordsListToGraph(lista_registros, dic_registros_graficar)
-                    lista_consejos: List[ConsejoPlantaCommon] = ConsejoPlantaService.listAllFromPlant(current_app.db, nombre_planta)
-                    dic_registros_graficar = __addTipsListToGraph(lista_consejos, dic_registros_graficar)
-                # except Exception as e:                  
-                #     return (traceback.print_exc(), HTTPStatus.NOT_FOUND.value)
-                except: 
-                    return ("Error al procesar los datos de la planta " + np + " para graficar.", HTTPStatus.NOT_FOUND.value)
-                return dic_registros_graficar, HTTPStatus.OK.value
+                def graficar():
+                    try:
+                        listas_registros = RegistroSensorService.listAllAvgFromPlantGroupByIntervals(current_app.db, nombre_planta, lista_fechas)
+                        lista_consejos: List[ConsejoPlantaCommon] = ConsejoPlantaService.listAllFromPlant(current_app.db, nombre_planta)
+                        dic_registros_graficar = __graph(format, listas_registros, lista_consejos)
+                    # except Exception as e:                  
+                    #     return (traceback.print_exc(), HTTPStatus.NOT_FOUND.value)
+                    except: 
+                        return ("Error al procesar los datos de la planta " + np + " para graficar.", HTTPStatus.NOT_FOUND.value)
+                    return dic_registros_graficar, HTTPStatus.OK.value
+                # Los intervalos dependen de la hora actual, por lo que forman parte de la version.
+                return __conditional(RegistroSensorService.getVersionFromPlant(current_app.db, nombre_planta, lista_fechas[0][0],
+                                                                               lista_fechas[-1][1], len(lista_fechas)), graficar)
             else:
                 return ("La planta " + np + " no existe.", HTTPStatus.NOT_FOUND.value)
         else:
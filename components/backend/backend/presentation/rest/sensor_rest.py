@@ -113,6 +113,8 @@ def post(body:dict):
             return SensorService.createFromCommon(current_app.db,sensor).toJson(), HTTPStatus.CREATED.value
         except ErrorSensorExiste:
             return ("El sensor " + str(body.get("numero_sensor")) + " de tipo " + str(body.get("tipo_sensor")) + " de la zona " + str(body.get("zona_sensor")) + " ya existe", HTTPStatus.CONFLICT.value)
+        except ValueError as ex:
+            return (str(ex), HTTPStatus.NOT_ACCEPTABLE.value)
         
 def update(body:dict):
     with current_app.app_context() :
@@ -121,6 +123,8 @@ def update(body:dict):
             return SensorService.updateFromCommon(current_app.db,sensor).toJson(), HTTPStatus.OK.value
         except ErrorSensorNoExiste:
             return ("El sensor " + str(body.get("numero_sensor")) + " de tipo " + str(body.get("tipo_sensor")) + " de la zona " + str(body.get("zona_sensor")) + " no existe", HTTPStatus.NOT_FOUND.value)
+        except ValueError as ex:
+            return (str(ex), HTTPStatus.NOT_ACCEPTABLE.value)
 
 
 def unsubscribe(st:str, sz: str ,sid:int) :
@@ -15,3 +15,12 @@ def health_test() -> Tuple[None, Optional[int]]:
         - Tuple[None, Optional[int]]: A tuple of no content and code 204 No Content.
     """
     return (None, HTTPStatus.NO_CONTENT.value)
+
+def cache_statistics() -> Tuple[Dict, Optional[int]]:
+    """Statistics of the in-process metadata cache.
+
+    Returns:
+        - Tuple[Dict, Optional[int]]: A tuple of the hits, misses, evictions, invalidations and entries, and code 200 OK.
+    """
+    with current_app.app_context():
+        return current_app.db.get_metadata_cache().getStatistics(), HTTPStatus.OK.value
@@ -11,4 +11,5 @@ from .consejo_planta_service import ConsejoPlantaService
 from .planta_service import PlantaService
 from .registro_sensor_service import RegistroSensorService
 from .tipo_planta_service import TipoPlantaService
-from .electronic_sensor_service import ElectronicSensorService 
\ No newline at end of file
+from .electronic_sensor_service import ElectronicSensorService 
+from .muestreador_sensores import MuestreadorSensores
\ No newline at end of file
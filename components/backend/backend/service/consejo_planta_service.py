@@ -10,6 +10,9 @@ from common.data.util import ConsejoPlanta as ConsejoPlantaCommon, Planta as Pla
 from common.data.util import TipoSensor, ZonaSensor, ModeloSensor, TipoMedida, UnidadMedida
 
 class ConsejoPlantaService():
+
+    # Region de la cache de metadatos con los datos de este servicio.
+    REGION_CACHE: str = 'consejos_planta'
     
     @staticmethod
     def create(esquema: Esquema, descripcion: str, nombre_planta:str, zona_consejo:ZonaSensor,
@@ -28,6 +31,7 @@ class ConsejoPlantaService():
             raise ex
         finally:
             esquema.remove_session()
+        esquema.get_metadata_cache().invalidate(ConsejoPlantaService.REGION_CACHE)
         return out
     
     @staticmethod
@@ -40,92 +44,140 @@ class ConsejoPlantaService():
 
     @staticmethod
     def exists(esquema: Esquema, nombre_planta: str, zona_consejo:ZonaSensor, tipo_medida:TipoMedida) -> bool:
-        session: Session = esquema.new_session()
-        consejo_existe: bool = ConsejoPlantaSet.get(session, nombre_planta, zona_consejo, tipo_medida)
-        esquema.remove_session()
-        return consejo_existe
+        def cargar() -> bool:
+            session: Session = esquema.new_session()
+            try:
+                consejo_existe: bool = ConsejoPlantaSet.get(session, nombre_planta, zona_consejo, tipo_medida)
+                return bool(consejo_existe)
+            except Exception as ex:
+                raise ex
+            finally:
+                esquema.remove_session()
+        return esquema.get_metadata_cache().get(ConsejoPlantaService.REGION_CACHE, ('exists', nombre_planta, zona_consejo, tipo_medida), cargar)
 
     @staticmethod
     def listAll(esquema: Esquema) -> List[ConsejoPlantaCommon]:
-        out: List[ConsejoPlantaCommon] = []
-        session: Session = esquema.new_session()
-        consejos: List[ConsejoPlanta] = ConsejoPlantaSet.listAll(session)
-        for consejo in consejos:
-            out.append(ConsejoPlantaCommon(consejo.descripcion, consejo.nombre_elemento, consejo.zona_consejo,
-                                                consejo.tipo_medida, consejo.unidad_medida, consejo.valor_minimo,
-                                                consejo.valor_maximo, consejo.horas_minimas, consejo.horas_maximas))
-        esquema.remove_session()
-        return out
+        def cargar() -> List[ConsejoPlantaCommon]:
+            out: List[ConsejoPlantaCommon] = []
+            session: Session = esquema.new_session()
+            try:
+                consejos: List[ConsejoPlanta] = ConsejoPlantaSet.listAll(session)
+                for consejo in consejos:
+                    out.append(ConsejoPlantaCommon(consejo.descripcion, consejo.nombre_elemento, consejo.zona_consejo,
+                                                        consejo.tipo_medida, consejo.unidad_medida, consejo.valor_minimo,
+                                                        consejo.valor_maximo, consejo.horas_minimas, consejo.horas_maximas))
+                return out
+            except Exception as ex:
+                raise ex
+            finally:
+                esquema.remove_session()
+        return esquema.get_metadata_cache().get(ConsejoPlantaService.REGION_CACHE, ('listAll',), cargar)
 
     @staticmethod
     def listAllFromPlant(esquema: Esquema, nombre_planta: str) -> List[ConsejoPlantaCommon]:
-        out: List[ConsejoPlantaCommon] = []
-        session: Session = esquema.new_session()
-        consejos: List[ConsejoPlanta] = ConsejoPlantaSet.listAllFromPlant(session, nombre_planta)
-        for consejo in consejos:
-            out.append(ConsejoPlantaCommon(consejo.descripcion, consejo.nombre_elemento, consejo.zona_consejo,
-                                                consejo.tipo_medida, consejo.unidad_medida, consejo.valor_minimo,
-                                                consejo.valor_maximo, consejo.horas_minimas, consejo.horas_maximas))
-        esquema.remove_session()
-        return out
+        def cargar() -> List[ConsejoPlantaCommon]:
+            out: List[ConsejoPlantaCommon] = []
+            session: Session = esquema.new_session()
+            try:
+                consejos: List[ConsejoPlanta] = ConsejoPlantaSet.listAllFromPlant(session, nombre_planta)
+                for consejo in consejos:
+                    out.append(ConsejoPlantaCommon(consejo.descripcion, consejo.nombre_elemento, consejo.zona_consejo,
+                                                        consejo.tipo_medida, consejo.unidad_medida, consejo.valor_minimo,
+                                                        consejo.valor_maximo, consejo.horas_minimas, consejo.horas_maximas))
+                return out
+            except Exception as ex:
+                raise ex
+            finally:
+                esquema.remove_session()
+        return esquema.get_metadata_cache().get(ConsejoPlantaService.REGION_CACHE, ('listAllFromPlant', nombre_planta), cargar)
     
     @staticmethod
     def listAllFromZone(esquema: Esquema, zona_consejo: ZonaSensor) -> List[ConsejoPlantaCommon]:
-        out: List[ConsejoPlantaCommon] = []
-        session: Session = esquema.new_session()
-        consejos: List[ConsejoPlanta] = ConsejoPlantaSet.listAllFromZone(session, zona_consejo)
-        for consejo in consejos:
-            out.append(ConsejoPlantaCommon(consejo.descripcion, consejo.nombre_elemento, consejo.zona_consejo,
-                                                consejo.tipo_medida, consejo.unidad_medida, consejo.valor_minimo,
-                                                consejo.valor_maximo, consejo.horas_minimas, consejo.horas_maximas))
-        esquema.remove_session()
-        return out
+        def cargar() -> List[ConsejoPlantaCommon]:
+            out: List[ConsejoPlantaCommon] = []
+            session: Session = esquema.new_session()
+            try:
+                consejos: List[ConsejoPlanta] = ConsejoPlantaSet.listAllFromZone(session, zona_consejo)
+                for consejo in consejos:
+                    out.append(ConsejoPlantaCommon(consejo.descripcion, consejo.nombre_elemento, consejo.zona_consejo,
+                                                        consejo.tipo_medida, consejo.unidad_medida, consejo.valor_minimo,
+                                                        consejo.valor_maximo, consejo.horas_minimas, consejo.horas_maximas))
+                return out
+            except Exception as ex:
+                raise ex
+            finally:
+                esquema.remove_session()
+        return esquema.get_metadata_cache().get(ConsejoPlantaService.REGION_CACHE, ('listAllFromZone', zona_consejo), cargar)
 
     @staticmethod
     def listAllFromTypeMeasure(esquema: Esquema, tipo_medida: TipoMedida) -> List[ConsejoPlantaCommon]:
-        out: List[ConsejoPlantaCommon] = []
-        session: Session = esquema.new_session()
-        consejos: List[ConsejoPlanta] = ConsejoPlantaSet.listAllFromTypeMeasure(session, tipo_medida)
-        for consejo in consejos:
-            out.append(ConsejoPlantaCommon(consejo.descripcion, consejo.nombre_elemento, consejo.zona_consejo,
-                                                consejo.tipo_medida, consejo.unidad_medida, consejo.valor_minimo,
-                                                consejo.valor_maximo, consejo.horas_minimas, consejo.horas_maximas))
-        esquema.remove_session()
-        return out
+        def cargar() -> List[ConsejoPlantaCommon]:
+            out: List[ConsejoPlantaCommon] = []
+            session: Session = esquema.new_session()
+            try:
+                consejos: List[ConsejoPlanta] = ConsejoPlantaSet.listAllFromTypeMeasure(session, tipo_medida)
+                for consejo in consejos:
+                    out.append(ConsejoPlantaCommon(consejo.descripcion, consejo.nombre_elemento, consejo.zona_consejo,
+                                                        consejo.tipo_medida, consejo.unidad_medida, consejo.valor_minimo,
+                                                        consejo.valor_maximo, consejo.horas_minimas, consejo.horas_maximas))
+                return out
+            except Exception as ex:
+                raise ex
+            finally:
+                esquema.remove_session()
+        return esquema.get_metadata_cache().get(ConsejoPlantaService.REGION_CACHE, ('listAllFromTypeMeasure', tipo_medida), cargar)
     
     @staticmethod
     def listAllFromPlantAndZone(esquema: Esquema, nombre_planta: str, zona_consejo: ZonaSensor) -> List[ConsejoPlantaCommon]:
-        out: List[ConsejoPlantaCommon] = []
-        session: Session = esquema.new_session()
-        consejos: List[ConsejoPlanta] = ConsejoPlantaSet.listAllFromPlantAndZone(session, nombre_planta, zona_consejo)
-        for consejo in consejos:
-            out.append(ConsejoPlantaCommon(consejo.descripcion, consejo.nombre_elemento, consejo.zona_consejo,
-                                                consejo.tipo_medida, consejo.unidad_medida, consejo.valor_minimo,
-                                                consejo.valor_maximo, consejo.horas_minimas, consejo.horas_maximas))
-        esquema.remove_session()
-        return out
+        def cargar() -> List[ConsejoPlantaCommon]:
+            out: List[ConsejoPlantaCommon] = []
+            session: Session = esquema.new_session()
+            try:
+                consejos: List[ConsejoPlanta] = ConsejoPlantaSet.listAllFromPlantAndZone(session, nombre_planta, zona_consejo)
+                for consejo in consejos:
+                    out.append(ConsejoPlantaCommon(consejo.descripcion, consejo.nombre_elemento, consejo.zona_consejo,
+                                                        consejo.tipo_medida, consejo.unidad_medida, consejo.valor_minimo,
+                                                        consejo.valor_maximo, consejo.horas_minimas, consejo.horas_maximas))
+                return out
+            except Exception as ex:
+                raise ex
+            finally:
+                esquema.remove_session()
+        return esquema.get_metadata_cache().get(ConsejoPlantaService.REGION_CACHE, ('listAllFromPlantAndZone', nombre_planta, zona_consejo), cargar)
 
     @staticmethod
     def listAllFromPlantAndTypeMeasure(esquema: Esquema, nombre_planta: str, tipo_medida: TipoMedida) -> List[ConsejoPlantaCommon]:
-        out: List[ConsejoPlantaCommon] = []
-        session: Session = esquema.new_session()
-        consejos: List[ConsejoPlanta] = ConsejoPlantaSet.listAllFromPlantAndTypeMeasure(session, nombre_planta, tipo_medida)
-        for consejo in consejos:
-            out.append(ConsejoPlantaCommon(consejo.descripcion, consejo.nombre_elemento, consejo.zona_consejo,
-                                                consejo.tipo_medida, consejo.unidad_medida, consejo.valor_minimo,
-                                                consejo.valor_maximo, consejo.horas_minimas, consejo.horas_maximas))
-        esquema.remove_session()
-        return out
+        def cargar() -> List[ConsejoPlantaCommon]:
+            out: List[ConsejoPlantaCommon] = []
+            session: Session = esquema.new_session()
+            try:
+                consejos: List[ConsejoPlanta] = ConsejoPlantaSet.listAllFromPlantAndTypeMeasure(session, nombre_planta, tipo_medida)
+                for consejo in consejos:
+                    out.append(ConsejoPlantaCommon(consejo.descripcion, consejo.nombre_elemento, consejo.zona_consejo,
+                                                        consejo.tipo_medida, consejo.unidad_medida, consejo.valor_minimo,
+                                                        consejo.valor_maximo, consejo.horas_minimas, consejo.horas_maximas))
+                return out
+            except Exception as ex:
+                raise ex
+            finally:
+                esquema.remove_session()
+        return esquema.get_metadata_cache().get(ConsejoPlantaService.REGION_CACHE, ('listAllFromPlantAndTypeMeasure', nombre_planta, tipo_medida), cargar)
 
     @staticmethod
     def get(esquema: Esquema, nombre_planta: str, zona_consejo:ZonaSensor, tipo_medida:TipoMedida) -> ConsejoPlantaCommon:
-        session: Session = esquema.new_session()
-        consejo: ConsejoPlanta = ConsejoPlantaSet.get(session, nombre_planta, zona_consejo, tipo_medida)
-        out= ConsejoPlantaCommon(consejo.descripcion, consejo.nombre_elemento, consejo.zona_consejo,
-                                    consejo.tipo_medida, consejo.unidad_medida, consejo.valor_minimo,
-                                    consejo.valor_maximo, consejo.horas_minimas, consejo.horas_maximas)
-        esquema.remove_session()
-        return out
+        def cargar() -> ConsejoPlantaCommon:
+            session: Session = esquema.new_session()
+            try:
+                consejo: ConsejoPlanta = ConsejoPlantaSet.get(session, nombre_planta, zona_consejo, tipo_medida)
+                out= ConsejoPlantaCommon(consejo.descripcion, consejo.nombre_elemento, consejo.zona_consejo,
+                                            consejo.tipo_medida, consejo.unidad_medida, consejo.valor_minimo,
+                                            consejo.valor_maximo, consejo.horas_minimas, consejo.horas_maximas)
+                return out
+            except Exception as ex:
+                raise ex
+            finally:
+                esquema.remove_session()
+        return esquema.get_metadata_cache().get(ConsejoPlantaService.REGION_CACHE, ('get', nombre_planta, zona_consejo, tipo_medida), cargar)
 
     @staticmethod
     def update(esquema: Esquema, descripcion: str, nombre_planta:str, zona_consejo:ZonaSensor,
@@ -144,6 +196,7 @@ class ConsejoPlantaService():
             raise ex
         finally:
             esquema.remove_session()
+        esquema.get_metadata_cache().invalidate(ConsejoPlantaService.REGION_CACHE)
         return out
     
     @staticmethod
@@ -11,6 +11,9 @@ from common.data.util import ConsejoTipoPlanta as ConsejoTipoPlantaCommon, TipoP
 from common.data.util import TipoSensor, ZonaSensor, ModeloSensor, TipoMedida, UnidadMedida
 
 class ConsejoTipoPlantaService():
+
+    # Region de la cache de metadatos con los datos de este servicio.
+    REGION_CACHE: str = 'consejos_tipo_planta'
     
     @staticmethod
     def create(esquema: Esquema, descripcion: str, tipo_planta:str, zona_consejo:ZonaSensor,
@@ -35,6 +38,7 @@ class ConsejoTipoPlantaService():
             raise ex
         finally:
             esquema.remove_session()
+        esquema.get_metadata_cache().invalidate(ConsejoTipoPlantaService.REGION_CACHE)
         return out
     
     @staticmethod
@@ -47,92 +51,140 @@ class ConsejoTipoPlantaService():
 
     @staticmethod
     def exists(esquema: Esquema, tipo_planta: str, zona_consejo:ZonaSensor, tipo_medida:TipoMedida) -> bool:
-        session: Session = esquema.new_session()
-        consejo_existe: bool = ConsejoTipoPlantaSet.get(session, tipo_planta, zona_consejo, tipo_medida)
-        esquema.remove_session()
-        return consejo_existe
+        def cargar() -> bool:
+            session: Session = esquema.new_session()
+            try:
+                consejo_existe: bool = ConsejoTipoPlantaSet.get(session, tipo_planta, zona_consejo, tipo_medida)
+                return bool(consejo_existe)
+            except Exception as ex:
+                raise ex
+            finally:
+                esquema.remove_session()
+        return esquema.get_metadata_cache().get(ConsejoTipoPlantaService.REGION_CACHE, ('exists', tipo_planta, zona_consejo, tipo_medida), cargar)
 
     @staticmethod
     def listAll(esquema: Esquema) -> List[ConsejoTipoPlantaCommon]:
-        out: List[ConsejoTipoPlantaCommon] = []
-        session: Session = esquema.new_session()
-        consejos: List[ConsejoTipoPlanta] = ConsejoTipoPlantaSet.listAll(session)
-        for consejo in consejos:
-            out.append(ConsejoTipoPlantaCommon(consejo.descripcion, consejo.nombre_elemento, consejo.zona_consejo,
-                                                consejo.tipo_medida, consejo.unidad_medida, consejo.valor_minimo,
-                                                consejo.valor_maximo, consejo.horas_minimas, consejo.horas_maximas))
-        esquema.remove_session()
-        return out
+        def cargar() -> List[ConsejoTipoPlantaCommon]:
+            out: List[ConsejoTipoPlantaCommon] = []
+            session: Session = esquema.new_session()
+            try:
+                consejos: List[ConsejoTipoPlanta] = ConsejoTipoPlantaSet.listAll(session)
+                for consejo in consejos:
+                    out.append(ConsejoTipoPlantaCommon(consejo.descripcion, consejo.nombre_elemento, consejo.zona_consejo,
+                                                        consejo.tipo_medida, consejo.unidad_medida, consejo.valor_minimo,
+                                                        consejo.valor_maximo, consejo.horas_minimas, consejo.horas_maximas))
+                return out
+            except Exception as ex:
+                raise ex
+            finally:
+                esquema.remove_session()
+        return esquema.get_metadata_cache().get(ConsejoTipoPlantaService.REGION_CACHE, ('listAll',), cargar)
 
     @staticmethod
     def listAllFromTypePlant(esquema: Esquema, tipo_planta: str) -> List[ConsejoTipoPlantaCommon]:
-        out: List[ConsejoTipoPlantaCommon] = []
-        session: Session = esquema.new_session()
-        consejos: List[ConsejoTipoPlanta] = ConsejoTipoPlantaSet.listAllFromTypePlant(session, tipo_planta)
-        for consejo in consejos:
-            out.append(ConsejoTipoPlantaCommon(consejo.descripcion, consejo.nombre_elemento, consejo.zona_consejo,
-                                                consejo.tipo_medida, consejo.unidad_medida, consejo.valor_minimo,
-                                                consejo.valor_maximo, consejo.horas_minimas, consejo.horas_maximas))
-        esquema.remove_session()
-        return out
+        def cargar() -> List[ConsejoTipoPlantaCommon]:
+            out: List[ConsejoTipoPlantaCommon] = []
+            session: Session = esquema.new_session()
+            try:
+                consejos: List[ConsejoTipoPlanta] = ConsejoTipoPlantaSet.listAllFromTypePlant(session, tipo_planta)
+                for consejo in consejos:
+                    out.append(ConsejoTipoPlantaCommon(consejo.descripcion, consejo.nombre_elemento, consejo.zona_consejo,
+                                                        consejo.tipo_medida, consejo.unidad_medida, consejo.valor_minimo,
+                                                        consejo.valor_maximo, consejo.horas_minimas, consejo.horas_maximas))
+                return out
+            except Exception as ex:
+                raise ex
+            finally:
+                esquema.remove_session()
+        return esquema.get_metadata_cache().get(ConsejoTipoPlantaService.REGION_CACHE, ('listAllFromTypePlant', tipo_planta), cargar)
     
     @staticmethod
     def listAllFromZone(esquema: Esquema, zona_consejo: ZonaSensor) -> List[ConsejoTipoPlantaCommon]:
-        out: List[ConsejoTipoPlantaCommon] = []
-        session: Session = esquema.new_session()
-        consejos: List[ConsejoTipoPlanta] = ConsejoTipoPlantaSet.listAllFromZone(session, zona_consejo)
-        for consejo in consejos:
-            out.append(ConsejoTipoPlantaCommon(consejo.descripcion, consejo.nombre_elemento, consejo.zona_consejo,
-                                                consejo.tipo_medida, consejo.unidad_medida, consejo.valor_minimo,
-                                                consejo.valor_maximo, consejo.horas_minimas, consejo.horas_maximas))
-        esquema.remove_session()
-        return out
+        def cargar() -> List[ConsejoTipoPlantaCommon]:
+            out: List[ConsejoTipoPlantaCommon] = []
+            session: Session = esquema.new_session()
+            try:
+                consejos: List[ConsejoTipoPlanta] = ConsejoTipoPlantaSet.listAllFromZone(session, zona_consejo)
+                for consejo in consejos:
+                    out.append(ConsejoTipoPlantaCommon(consejo.descripcion, consejo.nombre_elemento, consejo.zona_consejo,
+                                                        consejo.tipo_medida, consejo.unidad_medida, consejo.valor_minimo,
+                                                        consejo.valor_maximo, consejo.horas_minimas, consejo.horas_maximas))
+                return out
+            except Exception as ex:
+                raise ex
+            finally:
+                esquema.remove_session()
+        return esquema.get_metadata_cache().get(ConsejoTipoPlantaService.REGION_CACHE, ('listAllFromZone', zona_consejo), cargar)
 
     @staticmethod
     def listAllFromTypeMeasure(esquema: Esquema, tipo_medida: TipoMedida) -> List[ConsejoTipoPlantaCommon]:
-        out: List[ConsejoTipoPlantaCommon] = []
-        session: Session = esquema.new_session()
-        consejos: List[ConsejoTipoPlanta] = ConsejoTipoPlantaSet.listAllFromTypeMeasure(session, tipo_medida)
-        for consejo in consejos:
-            out.append(ConsejoTipoPlantaCommon(consejo.descripcion, consejo.nombre_elemento, consejo.zona_consejo,
-                                                consejo.tipo_medida, consejo.unidad_medida, consejo.valor_minimo,
-                                                consejo.valor_maximo, consejo.horas_minimas, consejo.horas_maximas))
-        esquema.remove_session()
-        return out
+        def cargar() -> List[ConsejoTipoPlantaCommon]:
+            out: List[ConsejoTipoPlantaCommon] = []
+            session: Session = esquema.new_session()
+            try:
+                consejos: List[ConsejoTipoPlanta] = ConsejoTipoPlantaSet.listAllFromTypeMeasure(session, tipo_medida)
+                for consejo in consejos:
+                    out.append(ConsejoTipoPlantaCommon(consejo.descripcion, consejo.nombre_elemento, consejo.zona_consejo,
+                                                        consejo.tipo_medida, consejo.unidad_medida, consejo.valor_minimo,
+                                                        consejo.valor_maximo, consejo.horas_minimas, consejo.horas_maximas))
+                return out
+            except Exception as ex:
+                raise ex
+            finally:
+                esquema.remove_session()
+        return esquema.get_metadata_cache().get(ConsejoTipoPlantaService.REGION_CACHE, ('listAllFromTypeMeasure', tipo_medida), cargar)
     
     @staticmethod
     def listAllFromTypePlantAndZone(esquema: Esquema, tipo_planta: str, zona_consejo: ZonaSensor) -> List[ConsejoTipoPlantaCommon]:
-        out: List[ConsejoTipoPlantaCommon] = []
-        session: Session = esquema.new_session()
-        consejos: List[ConsejoTipoPlanta] = ConsejoTipoPlantaSet.listAllFromTypePlantAndZone(session, tipo_planta, zona_consejo)
-        for consejo in consejos:
-            out.append(ConsejoTipoPlantaCommon(consejo.descripcion, consejo.nombre_elemento, consejo.zona_consejo,
-                                                consejo.tipo_medida, consejo.unidad_medida, consejo.valor_minimo,
-                                                consejo.valor_maximo, consejo.horas_minimas, consejo.horas_maximas))
-        esquema.remove_session()
-        return out
+        def cargar() -> List[ConsejoTipoPlantaCommon]:
+            out: List[ConsejoTipoPlantaCommon] = []
+            session: Session = esquema.new_session()
+            try:
+                consejos: List[ConsejoTipoPlanta] = ConsejoTipoPlantaSet.listAllFromTypePlantAndZone(session, tipo_planta, zona_consejo)
+                for consejo in consejos:
+                    out.append(ConsejoTipoPlantaCommon(consejo.descripcion, consejo.nombre_elemento, consejo.zona_consejo,
+                                                        consejo.tipo_medida, consejo.unidad_medida, consejo.valor_minimo,
+                                                        consejo.valor_maximo, consejo.horas_minimas, consejo.horas_maximas))
+                return out
+            except Exception as ex:
+                raise ex
+            finally:
+                esquema.remove_session()
+        return esquema.get_metadata_cache().get(ConsejoTipoPlantaService.REGION_CACHE, ('listAllFromTypePlantAndZone', tipo_planta, zona_consejo), cargar)
 
     @staticmethod
     def listAllFromTypePlantAndTypeMeasure(esquema: Esquema, tipo_planta: str, tipo_medida: TipoMedida) -> List[ConsejoTipoPlantaCommon]:
-        out: List[ConsejoTipoPlantaCommon] = []
-        session: Session = esquema.new_session()
-        consejos: List[ConsejoTipoPlanta] = ConsejoTipoPlantaSet.listAllFromTypePlantAndTypeMeasure(session, tipo_planta, tipo_medida)
-        for consejo in consejos:
-            out.append(ConsejoTipoPlantaCommon(consejo.descripcion, consejo.nombre_elemento, consejo.zona_consejo,
-                                                consejo.tipo_medida, consejo.unidad_medida, consejo.valor_minimo,
-                                                consejo.valor_maximo, consejo.horas_minimas, consejo.horas_maximas))
-        esquema.remove_session()
-        return out
+        def cargar() -> List[ConsejoTipoPlantaCommon]:
+            out: List[ConsejoTipoPlantaCommon] = []
+            session: Session = esquema.new_session()
+            try:
+                consejos: List[ConsejoTipoPlanta] = ConsejoTipoPlantaSet.listAllFromTypePlantAndTypeMeasure(session, tipo_planta, tipo_medida)
+                for consejo in consejos:
+                    out.append(ConsejoTipoPlantaCommon(consejo.descripcion, consejo.nombre_elemento, consejo.zona_consejo,
+                                                        consejo.tipo_medida, consejo.unidad_medida, consejo.valor_minimo,
+                                                        consejo.valor_maximo, consejo.horas_minimas, consejo.horas_maximas))
+                return out
+            except Exception as ex:
+                raise ex
+            finally:
+                esquema.remove_session()
+        return esquema.get_metadata_cache().get(ConsejoTipoPlantaService.REGION_CACHE, ('listAllFromTypePlantAndTypeMeasure', tipo_planta, tipo_medida), cargar)
 
     @staticmethod
     def get(esquema: Esquema, tipo_planta: str, zona_consejo:ZonaSensor, tipo_medida:TipoMedida) -> ConsejoTipoPlantaCommon:
-        session: Session = esquema.new_session()
-        consejo: ConsejoTipoPlanta = ConsejoTipoPlantaSet.get(session, tipo_planta, zona_consejo, tipo_medida)
-        out= ConsejoTipoPlantaCommon(consejo.descripcion, consejo.nombre_elemento, consejo.zona_consejo,
-                                    consejo.tipo_medida, consejo.unidad_medida, consejo.valor_minimo,
-                                    consejo.valor_maximo, consejo.horas_minimas, consejo.horas_maximas)
-        esquema.remove_session()
-        return out
+        def cargar() -> ConsejoTipoPlantaCommon:
+            session: Session = esquema.new_session()
+            try:
+                consejo: ConsejoTipoPlanta = ConsejoTipoPlantaSet.get(session, tipo_planta, zona_consejo, tipo_medida)
+                out= ConsejoTipoPlantaCommon(consejo.descripcion, consejo.nombre_elemento, consejo.zona_consejo,
+                                            consejo.tipo_medida, consejo.unidad_medida, consejo.valor_minimo,
+                                            consejo.valor_maximo, consejo.horas_minimas, consejo.horas_maximas)
+                return out
+            except Exception as ex:
+                raise ex
+            finally:
+                esquema.remove_session()
+        return esquema.get_metadata_cache().get(ConsejoTipoPlantaService.REGION_CACHE, ('get', tipo_planta, zona_consejo, tipo_medida), cargar)
 
     @staticmethod
     def update(esquema: Esquema, descripcion: str, tipo_planta:str, zona_consejo:ZonaSensor,
@@ -151,6 +203,7 @@ class ConsejoTipoPlantaService():
             raise ex
         finally:
             esquema.remove_session()
+        esquema.get_metadata_cache().invalidate(ConsejoTipoPlantaService.REGION_CACHE)
         return out
     
     @staticmethod
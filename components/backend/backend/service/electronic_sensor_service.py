@@ -1,34 +1,93 @@
 #Author: Oscar Valverde Escobar
 
+import logging
 from datetime import datetime
-from typing import Union, List, Dict
+from typing import Union, List, Dict, Tuple, Callable
 from sqlalchemy.orm.session import Session
 from backend.data.db.esquema import Esquema
 from backend.data.db.results import Sensor, Planta, RegistroSensor, TipoPlanta, SensorPlanta
 from backend.data.db.resultsets import SensorSet,PlantaSet, RegistroSensorSet, TipoPlantaSet, SensorPlantaSet
 from backend.service import SensorService, RegistroSensorService
-from backend.data.util import SensorBackend
+from backend.data.util import SensorBackend, CarrilesLectura, RegistroSensoresBackend
+from backend.data.electronic import FactoriaSensorElectronico
 from common.data.util import Sensor as SensorCommon, RegistroSensor as RegistroSensorCommon, Planta as PlantaCommon
 from common.data.util import TipoPlanta as TipoPlantaCommon, SensorPlanta as SensorPlantaCommon
 from common.data.util import TipoSensor, ZonaSensor, ModeloSensor, TipoMedida, UnidadMedida
 
 class ElectronicSensorService():
-    
+
+    # Segundos de los que dispone la lectura de cada sensor si no se especifica otro plazo.
+    PLAZO_LECTURA: float = 20.0
+
     @staticmethod
     def readSensor(esquema: Esquema, sensor: SensorCommon) -> List[RegistroSensorCommon]:
-        return SensorBackend(sensor).readSensorAndCreateRecords()    
+        return RegistroSensoresBackend.get(sensor).readSensorAndCreateRecords()    
 
     @staticmethod
-    def readSensors(esquema: Esquema, sensores: List[SensorCommon]) -> List[RegistroSensorCommon]:
-        registros: List[RegistroSensorCommon] = []
+    def readSensors(esquema: Esquema, sensores: List[SensorCommon],
+                    plazo_lectura: float = PLAZO_LECTURA) -> List[RegistroSensorCommon]:
+        carriles: CarrilesLectura = CarrilesLectura(plazo_lectura)
+        try:
+            return ElectronicSensorService.readSensorsReusingBackends(esquema, sensores, carriles)
+        finally:
+            carriles.shutdown()
+
+    @staticmethod
+    def readSensorsReusingBackends(esquema: Esquema, sensores: List[SensorCommon], 
+                                   carriles: CarrilesLectura) -> List[RegistroSensorCommon]:
+        """
+        Lectura concurrente de los sensores reutilizando los objetos de acceso al hardware de lecturas anteriores.
+
+        Los SensorBackend se obtienen de RegistroSensoresBackend, que solo construye los de los sensores
+        nuevos o cuyo conexionado ha cambiado. Cada sensor se lee en el carril de su bus fisico, por lo
+        que la lectura dura lo que el bus mas lento y no la suma de todas. Los sensores de un mismo MCP3008
+        se leen juntos, con una unica rafaga sobre el bus SPI. Los sensores que no terminan dentro de su
+        plazo, o cuya lectura falla, se omiten.
+
+        Args:
+            - esquema (Esquema): Esquema de la base de datos.
+            - sensores (List[SensorCommon]): Sensores a leer.
+            - carriles (CarrilesLectura): Carriles en los que se ejecutan las lecturas.
+
+        Returns:
+            - List[RegistroSensorCommon]: Registros leidos.
+        """
+        # Cada lectura devuelve los registros de un grupo de sensores: uno solo, o todos los de un mismo MCP3008.
+        lecturas: List[Tuple[Tuple, Callable[[float], List[List[RegistroSensorCommon]]]]] = []
+        grupos: List[List[SensorCommon]] = []
+        chips: Dict[Tuple, Tuple[List[SensorCommon], List[SensorBackend]]] = {}
         for sensor in sensores:
-            for registro in ElectronicSensorService.readSensor(esquema, sensor):
-                registros.append(registro)
-        return registros       
+            sensor_backend: SensorBackend = RegistroSensoresBackend.get(sensor)
+            bus: Tuple = FactoriaSensorElectronico.getBusLectura(sensor)
+            if sensor_backend.sensor_electronico.LECTURA_MCP3008:
+                chips.setdefault(bus, ([], []))
+                chips[bus][0].append(sensor)
+                chips[bus][1].append(sensor_backend)
+            else:
+                lecturas.append((bus, lambda limite, sensor_backend=sensor_backend: [sensor_backend.readSensorAndCreateRecords(limite)]))
+                grupos.append([sensor])
+        for bus, (sensores_chip, sensores_backend_chip) in chips.items():
+            lecturas.append((bus, lambda limite, sensores_backend_chip=sensores_backend_chip:
+                             SensorBackend.readMCP3008SensorsAndCreateRecords(sensores_backend_chip, limite)))
+            grupos.append(sensores_chip)
+        registros: List[RegistroSensorCommon] = []
+        for grupo, (terminada, resultado) in zip(grupos, carriles.runByBus(lecturas)):
+            if terminada:
+                for registros_sensor in resultado:
+                    registros.extend(registros_sensor)
+                continue
+            for sensor in grupo:
+                if resultado is None:
+                    logging.getLogger(__name__).warning('Lectura del sensor %s %s %d fuera de plazo', sensor.getTipoSensor(),
+                                                        sensor.getZonaSensor(), sensor.getNumeroSensor())
+                else:
+                    logging.getLogger(__name__).error('Error en la lectura del sensor %s %s %d: %r', sensor.getTipoSensor(),
+                                                      sensor.getZonaSensor(), sensor.getNumeroSensor(), resultado)
+        return registros
 
     @staticmethod
-    def readActiveSensors(esquema: Esquema) -> List[RegistroSensorCommon]:
-        return ElectronicSensorService.readSensors(esquema, SensorService.listAllActive(esquema))      
+    def readActiveSensors(esquema: Esquema, plazo_lectura: float = PLAZO_LECTURA) -> List[RegistroSensorCommon]:
+        return ElectronicSensorService.readSensors(esquema, SensorService.listAllActive(esquema), plazo_lectura)      
 
     @staticmethod
     def SaveRecord(esquema: Esquema, registro: RegistroSensorCommon) -> List[RegistroSensorCommon]:
@@ -36,8 +95,7 @@ class ElectronicSensorService():
 
     @staticmethod
     def SaveRecords(esquema: Esquema, registros: List[RegistroSensorCommon]) -> List[RegistroSensorCommon]:
-        for registro in registros:
-            ElectronicSensorService.SaveRecord(esquema,registro)
+        return RegistroSensorService.createBatch(esquema,registros)
 
     @staticmethod
     def readSensorAndSaveRecords(esquema: Esquema, sensor: SensorCommon) -> List[RegistroSensorCommon]:
@@ -46,13 +104,14 @@ class ElectronicSensorService():
         return registros      
 
     @staticmethod
-    def readSensorsAndSaveRecords(esquema: Esquema, sensores: List[SensorCommon]) -> List[RegistroSensorCommon]:
-        registros: List[RegistroSensorCommon] = ElectronicSensorService.readSensors(esquema, sensores)
+    def readSensorsAndSaveRecords(esquema: Esquema, sensores: List[SensorCommon],
+                                  plazo_lectura: float = PLAZO_LECTURA) -> List[RegistroSensorCommon]:
+        registros: List[RegistroSensorCommon] = ElectronicSensorService.readSensors(esquema, sensores, plazo_lectura)
         ElectronicSensorService.SaveRecords(esquema, registros)
         return registros 
 
     @staticmethod
-    def readActiveSensorsAndSaveRecords(esquema: Esquema) -> List[RegistroSensorCommon]:
-        registros: List[RegistroSensorCommon] = ElectronicSensorService.readActiveSensors(esquema)
+    def readActiveSensorsAndSaveRecords(esquema: Esquema, plazo_lectura: float = PLAZO_LECTURA) -> List[RegistroSensorCommon]:
+        registros: List[RegistroSensorCommon] = ElectronicSensorService.readActiveSensors(esquema, plazo_lectura)
         ElectronicSensorService.SaveRecords(esquema, registros)
         return registros 
@@ -0,0 +1,222 @@
+#Author: Oscar Valverde Escobar
+
+import logging
+import math
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from backend.data.config import BackendConfiguration
+from backend.data.db.esquema import Esquema
+from backend.data.util import PlanificadorLecturas, CarrilesLectura, CompresorLecturas, SpoolRegistros, RegistroSensoresBackend
+from backend.data.electronic import FactoriaSensorElectronico
+from backend.service import SensorService, RegistroSensorService, ElectronicSensorService
+from common.data.util import Sensor as SensorCommon, RegistroSensor as RegistroSensorCommon
+
+class MuestreadorSensores():
+    """
+    Muestreo periodico de los sensores activos desde un unico proceso persistente.
+
+    El motor de la base de datos y los objetos de acceso al hardware se mantienen abiertos entre ciclos, y
+    los sensores electronicos se construyen solo al aparecer un sensor o cambiar su conexionado.
+    Cada sensor se lee con su propio intervalo (o el intervalo de muestreo general si no tiene) mediante
+    un PlanificadorLecturas, y en cada despertar se leen juntas las lecturas pendientes de cada bus.
+    Los buses fisicos se leen a la vez, cada uno en su carril, por lo que un sensor lento solo retrasa
+    a los de su mismo bus.
+    Las lecturas de los sensores con compresion pasan por un CompresorLecturas antes de almacenarse.
+    Los registros se escriben en un SpoolRegistros, que los vuelca a la base de datos en segundo plano, por
+    lo que un bloqueo o una caida de la base de datos no retrasa los ciclos ni pierde lecturas.
+    Los ciclos se ejecutan uno tras otro en el mismo hilo, por lo que nunca se solapan, y las lecturas
+    siguen un calendario fijo para que la duracion de cada ciclo no desplace las siguientes.
+    La compactacion diaria de la base de datos se ejecuta en su propio hilo a partir de la hora configurada,
+    fuera del hilo de muestreo, y no al arrancar.
+    """
+
+    # Segundos que se puede adelantar la lectura de un sensor para agruparla con las de su bus.
+    ADELANTO_MAXIMO_AGRUPACION: float = 1.0
+
+    def __init__(self, esquema: Esquema, cfg: BackendConfiguration, intervalo: float = None, tiempo_importacion: float = 0.0):
+        """
+        Args:
+            - esquema (Esquema): Esquema de la base de datos.
+            - cfg (BackendConfiguration): Configuracion con el intervalo, el plazo de lectura, el intervalo de
+              latido y el fichero de registros pendientes del muestreo y la politica de retencion.
+            - intervalo (float): Segundos entre lecturas de los sensores sin intervalo propio, y entre
+              actualizaciones de la lista de sensores activos. Si no se especifica, el de la configuracion.
+            - tiempo_importacion (float): Segundos empleados en importar los modulos al arrancar el proceso,
+              que se notifican en el primer ciclo.
+        """
+        self.__esquema: Esquema = esquema
+        self.__cfg: BackendConfiguration = cfg
+        self.__intervalo: float = cfg.get_sampling_interval() if intervalo is None else float(intervalo)
+        self.__tiempo_importacion: float = tiempo_importacion
+        self.__planificador: PlanificadorLecturas = PlanificadorLecturas(MuestreadorSensores.ADELANTO_MAXIMO_AGRUPACION)
+        self.__carriles: CarrilesLectura = CarrilesLectura(cfg.get_sampling_read_deadline())
+        self.__compresor: CompresorLecturas = CompresorLecturas(cfg.get_sampling_heartbeat_interval())
+        self.__registros_pendientes: List[RegistroSensorCommon] = []
+        self.__spool: SpoolRegistros = SpoolRegistros(cfg.get_sampling_spool_path(),
+                                                      lambda registros, omitir_existentes: RegistroSensorService.createBatch(
+                                                          esquema, registros, omitir_existentes))
+        self.__sensores: Dict[Tuple, SensorCommon] = {}
+        self.__siguiente_actualizacion: Optional[float] = None
+        self.__siguiente_compactacion: datetime = self.__nextCompactionTime(datetime.now())
+        self.__hilo_compactacion: Optional[threading.Thread] = None
+        self.__parada = threading.Event()
+        self.__logger = logging.getLogger(__name__)
+
+    def __updateSensors(self, ahora: float) -> None:
+        # Planificacion de los sensores nuevos o con otro bus o intervalo, y descarte de los que ya no estan activos.
+        sensores: Dict[Tuple, SensorCommon] = {}
+        planificados = self.__planificador.getScheduled()
+        for sensor in SensorService.listAllActive(self.__esquema):
+            clave: Tuple = (sensor.getTipoSensor(), sensor.getZonaSensor(), sensor.getNumeroSensor())
+            sensores[clave] = sensor
+            intervalo: float = float(sensor.getIntervaloLectura() or self.__intervalo)
+            bus: Tuple = FactoriaSensorElectronico.getBusLectura(sensor)
+            if planificados.get(clave) != (bus, intervalo):
+                self.__planificador.schedule(clave, bus, intervalo, ahora)
+        for clave in planificados:
+            if clave not in sensores:
+                self.__planificador.remove(clave)
+                RegistroSensoresBackend.invalidate(*clave)
+                self.__registros_pendientes.extend(self.__compresor.remove(clave))
+        self.__sensores = sensores
+
+    def __nextCompactionTime(self, fecha: datetime) -> datetime:
+        # Siguiente hora de compactacion posterior a la fecha.
+        compactacion: datetime = fecha.replace(hour=self.__cfg.get_db_compaction_hour(), minute=0, second=0, microsecond=0)
+        return compactacion if compactacion > fecha else compactacion + timedelta(days=1)
+
+    def __compact(self) -> None:
+        inicio: float = time.monotonic()
+        try:
+            eliminados: Dict[str, int] = RegistroSensorService.compact(
+                self.__esquema, self.__cfg.get_db_retention_raw_days(), self.__cfg.get_db_retention_hourly_days(),
+                self.__cfg.get_db_retention_daily_days(), self.__cfg.get_db_compaction_chunk_size())
+        except Exception:
+            self.__logger.exception('Error en la compactacion de la base de datos, se reintenta en el siguiente ciclo')
+            return
+        # Solo tras completarse, de forma que una compactacion fallida no espera al dia siguiente.
+        self.__siguiente_compactacion = self.__nextCompactionTime(datetime.now())
+        self.__logger.info('Compactacion: %.3f s, %d registros, %d medias por hora y %d medias por dia eliminados',
+                           time.monotonic() - inicio, eliminados['registros_sensores'], eliminados['registros_sensores_horarios'],
+                           eliminados['registros_sensores_diarios'])
+
+    def runCycle(self, ahora: float = None) -> Dict[str, float]:
+        """
+        Ejecucion de un ciclo de muestreo: actualizacion periodica de los sensores activos, lectura de los
+        sensores pendientes, escritura de los registros en el fichero de registros pendientes y, una vez al dia
+        a partir de la hora de compactacion, inicio de la compactacion de la base de datos en segundo plano si no
+        esta ya en curso.
+
+        Args:
+            - ahora (float): Instante (time.monotonic) del ciclo. Si no se especifica, el actual.
+
+        Returns:
+            - Dict[str, float]: Segundos empleados en cada fase del ciclo (importacion, sensores, lectura y
+              escritura), numero de sensores leidos, buses, sensores electronicos construidos,
+              lecturas, registros almacenados, lecturas retenidas por la compresion, registros pendientes de
+              volcar a la base de datos y lecturas omitidas por retraso.
+        """
+        if ahora is None:
+            ahora = time.monotonic()
+        tiempos: Dict[str, float] = {'importacion': self.__tiempo_importacion, 'sensores': 0.0, 'lectura': 0.0,
+                                     'escritura': 0.0, 'sensores_leidos': 0, 'buses': 0,
+                                     'construidos': 0, 'lecturas': 0, 'registros': 0, 'retenidas': 0, 'pendientes': 0, 'omitidas': 0}
+        self.__tiempo_importacion = 0.0
+        inicio: float = time.monotonic()
+        if self.__siguiente_actualizacion is None or ahora >= self.__siguiente_actualizacion:
+            self.__updateSensors(ahora)
+            # En el mismo calendario que las lecturas con el intervalo general, para despertar a la vez.
+            self.__siguiente_actualizacion = (math.floor(ahora / self.__intervalo) + 1) * self.__intervalo
+        tiempos['sensores'] = time.monotonic() - inicio
+        inicio = time.monotonic()
+        sensores: List[SensorCommon] = []
+        for bus, claves in self.__planificador.popDue(ahora).items():
+            sensores.extend(self.__sensores[clave] for clave in claves)
+            tiempos['buses'] += 1
+        tiempos['sensores_leidos'] = len(sensores)
+        lecturas: List[RegistroSensorCommon] = []
+        construidos: int = RegistroSensoresBackend.getConstructedCount()
+        if sensores:
+            lecturas = ElectronicSensorService.readSensorsReusingBackends(self.__esquema, sensores, self.__carriles)
+        tiempos['construidos'] = RegistroSensoresBackend.getConstructedCount() - construidos
+        registros: List[RegistroSensorCommon] = self.__registros_pendientes + self.__compresor.compress(lecturas, self.__sensores)
+        self.__registros_pendientes = []
+        tiempos['omitidas'] = self.__planificador.popSkipped()
+        tiempos['lectura'] = time.monotonic() - inicio
+        inicio = time.monotonic()
+        self.__spool.append(registros)
+        tiempos['escritura'] = time.monotonic() - inicio
+        tiempos['lecturas'] = len(lecturas)
+        tiempos['registros'] = len(registros)
+        tiempos['retenidas'] = self.__compresor.getRetainedCount()
+        tiempos['pendientes'] = self.__spool.getPendingCount()
+        if datetime.now() >= self.__siguiente_compactacion and (self.__hilo_compactacion is None
+                                                                 or not self.__hilo_compactacion.is_alive()):
+            self.__hilo_compactacion = threading.Thread(target=self.__compact, name='compactacion', daemon=True)
+            self.__hilo_compactacion.start()
+        return tiempos
+
+    def getNextCycleTime(self) -> float:
+        """
+        Instante (time.monotonic) del siguiente ciclo: la siguiente lectura planificada o la siguiente
+        actualizacion de los sensores activos.
+
+        Returns:
+            - float: Instante del siguiente ciclo.
+        """
+        if self.__siguiente_actualizacion is None:
+            return time.monotonic()
+        siguiente_lectura: Optional[float] = self.__planificador.nextTime()
+        if siguiente_lectura is None:
+            return self.__siguiente_actualizacion
+        return min(siguiente_lectura, self.__siguiente_actualizacion)
+
+    def run(self, numero_ciclos: int = None) -> None:
+        """
+        Ejecucion de ciclos de muestreo hasta que se llame a stop o se alcance el numero de ciclos indicado.
+
+        Si un ciclo dura mas que el intervalo de un sensor, sus lecturas perdidas se omiten en lugar de
+        encadenar lecturas seguidas para recuperarlas.
+
+        Args:
+            - numero_ciclos (int): Numero de ciclos a ejecutar. Si no se especifica, indefinidamente.
+        """
+        RegistroSensorService.catchUpAggregates(self.__esquema)
+        self.__spool.start()
+        ciclo: int = 0
+        while not self.__parada.is_set():
+            siguiente_ciclo: float = self.getNextCycleTime()
+            self.__parada.wait(siguiente_ciclo - time.monotonic())
+            if self.__parada.is_set():
+                break
+            inicio: float = time.monotonic()
+            try:
+                tiempos: Dict[str, float] = self.runCycle(inicio)
+                self.__logger.info('Ciclo %d: retraso %.3f s, importacion %.3f s, sensores %.3f s, lectura %.3f s, '
+                                   'escritura %.3f s, total %.3f s, %d sensores en %d buses, %d construidos, '
+                                   '%d lecturas, %d registros, %d lecturas retenidas, %d registros pendientes', ciclo, inicio - siguiente_ciclo, tiempos['importacion'],
+                                   tiempos['sensores'], tiempos['lectura'], tiempos['escritura'],
+                                   time.monotonic() - inicio, tiempos['sensores_leidos'], tiempos['buses'], tiempos['construidos'],
+                                   tiempos['lecturas'], tiempos['registros'], tiempos['retenidas'], tiempos['pendientes'])
+                if tiempos['omitidas'] > 0:
+                    self.__logger.warning('Ciclo %d: se omiten %d lecturas por retraso', ciclo, tiempos['omitidas'])
+            except Exception:
+                self.__logger.exception('Error en el ciclo de muestreo %d', ciclo)
+            ciclo += 1
+            if numero_ciclos is not None and ciclo >= numero_ciclos:
+                break
+        self.__carriles.shutdown()
+        if self.__hilo_compactacion is not None:
+            self.__hilo_compactacion.join()
+        self.__spool.append(self.__registros_pendientes + self.__compresor.flush())
+        self.__registros_pendientes = []
+        self.__spool.stop()
+        RegistroSensoresBackend.release()
+
+    def stop(self) -> None:
+        """
+        Detencion del muestreo al terminar el ciclo en curso.
+        """
+        self.__parada.set()
@@ -14,6 +14,9 @@ from common.data.util import Planta as PlantaCommon, SensorPlanta as SensorPlant
 
 class PlantaService():
 
+    # Region de la cache de metadatos con los datos de este servicio.
+    REGION_CACHE: str = 'plantas'
+
     @staticmethod
     def create(esquema: Esquema, nombre_planta: str, tipo_planta: str, fecha_plantacion: datetime = datetime.now(),
                  fecha_marchitacion: datetime = None, asociar_sensores_activos = True) -> PlantaCommon:
@@ -34,6 +37,7 @@ class PlantaService():
             raise ex
         finally:
             esquema.remove_session()
+        esquema.get_metadata_cache().invalidate(PlantaService.REGION_CACHE)
         return out
     
     @staticmethod
@@ -42,43 +46,67 @@ class PlantaService():
 
     @staticmethod
     def exists(esquema: Esquema, nombre_planta: str) -> bool:
-        session: Session = esquema.new_session()
-        planta_exists: bool = PlantaSet.get(session, nombre_planta)
-        esquema.remove_session()
-        return planta_exists
+        def cargar() -> bool:
+            session: Session = esquema.new_session()
+            try:
+                planta_exists: bool = PlantaSet.get(session, nombre_planta)
+                return bool(planta_exists)
+            except Exception as ex:
+                raise ex
+            finally:
+                esquema.remove_session()
+        return esquema.get_metadata_cache().get(PlantaService.REGION_CACHE, ('exists', nombre_planta), cargar)
 
     @staticmethod
     def listAll(esquema: Esquema) -> List[PlantaCommon]:
-        out: List[PlantaCommon] = []
-        session: Session = esquema.new_session()
-        registros_planta: List[Planta] = PlantaSet.listAll(session)
-        for planta in registros_planta:
-            out.append(PlantaCommon(planta.nombre_planta,planta.tipo_planta,
-                                            planta.fecha_plantacion,planta.fecha_marchitacion))
-        esquema.remove_session()
-        return out
+        def cargar() -> List[PlantaCommon]:
+            out: List[PlantaCommon] = []
+            session: Session = esquema.new_session()
+            try:
+                registros_planta: List[Planta] = PlantaSet.listAll(session)
+                for planta in registros_planta:
+                    out.append(PlantaCommon(planta.nombre_planta,planta.tipo_planta,
+                                                    planta.fecha_plantacion,planta.fecha_marchitacion))
+                return out
+            except Exception as ex:
+                raise ex
+            finally:
+                esquema.remove_session()
+        return esquema.get_metadata_cache().get(PlantaService.REGION_CACHE, ('listAll',), cargar)
 
     @staticmethod
     def listAllActive(esquema: Esquema) -> List[PlantaCommon]:
-        out: List[PlantaCommon] = []
-        session: Session = esquema.new_session()
-        registros_planta: List[Planta] = PlantaSet.listAllActive(session)
-        for planta in registros_planta:
-            out.append(PlantaCommon(planta.nombre_planta,planta.tipo_planta,
-                                            planta.fecha_plantacion,planta.fecha_marchitacion))
-        esquema.remove_session()
-        return out
+        def cargar() -> List[PlantaCommon]:
+            out: List[PlantaCommon] = []
+            session: Session = esquema.new_session()
+            try:
+                registros_planta: List[Planta] = PlantaSet.listAllActive(session)
+                for planta in registros_planta:
+                    out.append(PlantaCommon(planta.nombre_planta,planta.tipo_planta,
+                                                    planta.fecha_plantacion,planta.fecha_marchitacion))
+                return out
+            except Exception as ex:
+                raise ex
+            finally:
+                esquema.remove_session()
+        return esquema.get_metadata_cache().get(PlantaService.REGION_CACHE, ('listAllActive',), cargar)
     
     @staticmethod
     def listAllFromType(esquema: Esquema, tipo_planta: str) -> List[PlantaCommon]:
-        out: List[PlantaCommon] = []
-        session: Session = esquema.new_session()
-        registros_planta: List[Planta] = PlantaSet.listAllFromType(session, tipo_planta)
-        for planta in registros_planta:
-            out.append(PlantaCommon(planta.nombre_planta,planta.tipo_planta,
-                                            planta.fecha_plantacion,planta.fecha_marchitacion))
-        esquema.remove_session()
-        return out
+        def cargar() -> List[PlantaCommon]:
+            out: List[PlantaCommon] = []
+            session: Session = esquema.new_session()
+            try:
+                registros_planta: List[Planta] = PlantaSet.listAllFromType(session, tipo_planta)
+                for planta in registros_planta:
+                    out.append(PlantaCommon(planta.nombre_planta,planta.tipo_planta,
+                                                    planta.fecha_plantacion,planta.fecha_marchitacion))
+                return out
+            except Exception as ex:
+                raise ex
+            finally:
+                esquema.remove_session()
+        return esquema.get_metadata_cache().get(PlantaService.REGION_CACHE, ('listAllFromType', tipo_planta), cargar)
 
     @staticmethod
     def listAllFromTypeFromCommon(esquema: Esquema, tipo_planta: TipoPlanta) -> List[PlantaCommon]:
@@ -86,14 +114,20 @@ class PlantaService():
 
     @staticmethod
     def listAllActiveFromType(esquema: Esquema, tipo_planta: str) -> List[PlantaCommon]:
-        out: List[PlantaCommon] = []
-        session: Session = esquema.new_session()
-        registros_planta: List[Planta] = PlantaSet.listAllActiveFromType(session, tipo_planta)
-        for planta in registros_planta:
-            out.append(PlantaCommon(planta.nombre_planta,planta.tipo_planta,
-                                            planta.fecha_plantacion,planta.fecha_marchitacion))
-        esquema.remove_session()
-        return out
+        def cargar() -> List[PlantaCommon]:
+            out: List[PlantaCommon] = []
+            session: Session = esquema.new_session()
+            try:
+                registros_planta: List[Planta] = PlantaSet.listAllActiveFromType(session, tipo_planta)
+                for planta in registros_planta:
+                    out.append(PlantaCommon(planta.nombre_planta,planta.tipo_planta,
+                                                    planta.fecha_plantacion,planta.fecha_marchitacion))
+                return out
+            except Exception as ex:
+                raise ex
+            finally:
+                esquema.remove_session()
+        return esquema.get_metadata_cache().get(PlantaService.REGION_CACHE, ('listAllActiveFromType', tipo_planta), cargar)
 
     @staticmethod
     def listAllActiveFromTypeFromCommon(esquema: Esquema, tipo_planta: TipoPlanta) -> List[PlantaCommon]:
@@ -101,12 +135,18 @@ class PlantaService():
 
     @staticmethod
     def get(esquema: Esquema, nombre_planta: str) -> PlantaCommon:
-        session: Session = esquema.new_session()
-        planta: Planta = PlantaSet.get(session, nombre_planta)
-        out= PlantaCommon(planta.nombre_planta,planta.tipo_planta,
-                                  planta.fecha_plantacion,planta.fecha_marchitacion)
-        esquema.remove_session()
-        return out
+        def cargar() -> PlantaCommon:
+            session: Session = esquema.new_session()
+            try:
+                planta: Planta = PlantaSet.get(session, nombre_planta)
+                out= PlantaCommon(planta.nombre_planta,planta.tipo_planta,
+                                          planta.fecha_plantacion,planta.fecha_marchitacion)
+                return out
+            except Exception as ex:
+                raise ex
+            finally:
+                esquema.remove_session()
+        return esquema.get_metadata_cache().get(PlantaService.REGION_CACHE, ('get', nombre_planta), cargar)
     
     @staticmethod
     def getPlantFromRelationFromCommon(esquema: Esquema, sensor_planta : SensorPlantaCommon) -> PlantaCommon:
@@ -131,6 +171,7 @@ class PlantaService():
             raise ex
         finally:
             esquema.remove_session()
+        esquema.get_metadata_cache().invalidate(PlantaService.REGION_CACHE)
         return out
     
     @staticmethod
@@ -145,6 +186,7 @@ class PlantaService():
             planta.setFechaMarchitacion(datetime.now())
             planta = PlantaService.updateFromCommon(esquema, planta)
         SensorPlantaService.unsubscribeAllFromPlantFromCommon(esquema, planta)
+        esquema.get_metadata_cache().invalidate(PlantaService.REGION_CACHE)
         return planta
 
     @staticmethod
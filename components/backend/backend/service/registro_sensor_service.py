@@ -1,18 +1,31 @@
 #Author: Oscar Valverde Escobar
 
-from datetime import datetime
-from typing import List, Dict
+import base64
+import csv
+import hashlib
+import io
+import json
+import numpy as np
+from datetime import datetime, timedelta
+from typing import Iterator, List, Dict, Optional, Set, Tuple
 from sqlalchemy.orm.session import Session # type: ignore
 from backend.data.db.esquema import Esquema
-from backend.data.db.results import RegistroSensor
-from backend.data.db.resultsets import RegistroSensorSet
+from backend.data.db.results import RegistroSensor, RegistroSensorHorario, RegistroSensorDiario, Sensor, SensorPlanta
+from backend.data.db.resultsets import RegistroSensorSet, RegistroSensorAgregadoSet, SensorSet, SensorPlantaSet
+from backend.data.util.cache_intervalos import CacheIntervalos
+from backend.data.util.reductor_series import ReductorSeries
 from common.data.util import RegistroSensor as RegistroSensorCommon, Sensor as SensorCommon
 from common.data.util import Planta as PlantaCommon, SensorPlanta as SensorPlantaCommon
 from common.data.util import TipoSensor, ZonaSensor, TipoMedida, UnidadMedida
-from backend.service import SensorService, PlantaService, SensorPlantaService
+from backend.service import SensorService, PlantaService, SensorPlantaService, ConsejoPlantaService
 
 class RegistroSensorService():
 
+    # Formatos de exportacion de registros: JSON por lineas y CSV.
+    FORMATOS_EXPORTACION: List[str] = ['ndjson', 'csv']
+    # Registros leidos de la base de datos y escritos en cada fragmento de la exportacion.
+    TAMANO_BLOQUE_EXPORTACION: int = 1000
+
     @staticmethod
     def create(esquema: Esquema, tipo_sensor: TipoSensor, zona_sensor: ZonaSensor, 
                         numero_sensor:int, valor:float, unidad_medida: UnidadMedida, fecha:datetime = datetime.now()) -> RegistroSensorCommon:
@@ -29,6 +42,7 @@ class RegistroSensorService():
             raise ex
         finally:
             esquema.remove_session()
+        RegistroSensorService.__invalidateClosedIntervals(esquema, [out])
         return out
     
     @staticmethod
@@ -37,6 +51,54 @@ class RegistroSensorService():
                                             registro_sensor.getNumeroSensor(), registro_sensor.getValor(), 
                                             registro_sensor.getUnidadMedida())
 
+    @staticmethod
+    def createBatch(esquema: Esquema, registros_sensores: List[RegistroSensorCommon], omitir_existentes: bool = False) -> List[RegistroSensorCommon]:
+        """
+        Creacion de multiples registros de sensores en una unica transaccion.
+
+        Args:
+            - esquema (Esquema): Esquema de la base de datos.
+            - registros_sensores (List[RegistroSensorCommon]): Registros a crear. Los que no tienen fecha reciben la actual.
+            - omitir_existentes (bool): Si se omiten los registros que ya existen (mismo sensor, unidad de medida y fecha),
+              para repetir sin duplicados una insercion que puede haberse completado.
+
+        Returns:
+            - List[RegistroSensorCommon]: Registros creados.
+        """
+        session: Session = esquema.new_session()
+        out: List[RegistroSensorCommon] = []
+        try:
+            nuevos_registros_sensores: List[RegistroSensor] = []
+            for registro_sensor in registros_sensores:
+                fecha: datetime = registro_sensor.getFecha() if registro_sensor.getFecha() is not None else datetime.now()
+                nuevos_registros_sensores.append(RegistroSensor(registro_sensor.getTipoSensor(), registro_sensor.getZonaSensor(),
+                                                                registro_sensor.getNumeroSensor(), registro_sensor.getValor(),
+                                                                registro_sensor.getUnidadMedida(), fecha, registro_sensor.getNumeroLecturas(),
+                                                                registro_sensor.getSumaLecturas()))
+            if omitir_existentes:
+                nuevos_registros_sensores = RegistroSensorSet.filterNew(session, nuevos_registros_sensores)
+            RegistroSensorSet.createMany(session, nuevos_registros_sensores)
+            for nuevo_registro_sensor in nuevos_registros_sensores:
+                out.append(RegistroSensorCommon(nuevo_registro_sensor.tipo_sensor,nuevo_registro_sensor.zona_sensor,
+                                                nuevo_registro_sensor.numero_sensor,nuevo_registro_sensor.valor,
+                                                nuevo_registro_sensor.unidad_medida, nuevo_registro_sensor.fecha, 0,
+                                                nuevo_registro_sensor.numero_lecturas, nuevo_registro_sensor.suma_lecturas))
+        except Exception as ex:
+            raise ex
+        finally:
+            esquema.remove_session()
+        RegistroSensorService.__invalidateClosedIntervals(esquema, out)
+        return out
+
+    @staticmethod
+    def __invalidateClosedIntervals(esquema: Esquema, registros_sensores: List[RegistroSensorCommon]) -> None:
+        # Solo los registros anteriores al cierre de los intervalos pueden pertenecer a intervalos de la cache.
+        fecha_cierre: datetime = datetime.now() - timedelta(seconds=esquema.get_interval_cache_grace())
+        for registro_sensor in registros_sensores:
+            if registro_sensor.getFecha() < fecha_cierre:
+                esquema.get_interval_cache().invalidate(registro_sensor.getTipoSensor(), registro_sensor.getZonaSensor(),
+                                                        registro_sensor.getNumeroSensor(), registro_sensor.getFecha())
+
     @staticmethod
     def exists(esquema: Esquema, id_:int) -> bool:
         session: Session = esquema.new_session()
@@ -55,7 +117,7 @@ class RegistroSensorService():
     def listAll(esquema: Esquema) -> List[RegistroSensorCommon]:
         out: List[RegistroSensorCommon] = []
         session: Session = esquema.new_session()
-        registros_sensor: List[RegistroSensor] = RegistroSensorSet.listAll(session)
+        registros_sensor: List[RegistroSensor] = RegistroSensorAgregadoSet.listAll(session)
         for registro_sensor in registros_sensor:
             out.append(RegistroSensorCommon(registro_sensor.tipo_sensor,registro_sensor.zona_sensor,
                                       registro_sensor.numero_sensor,registro_sensor.valor, 
@@ -68,7 +130,7 @@ class RegistroSensorService():
     def listAllFromSensor(esquema: Esquema, tipo_sensor:TipoSensor, zona_sensor: ZonaSensor ,numero_sensor:int) -> List[RegistroSensorCommon]:
         out: List[RegistroSensorCommon] = []
         session: Session = esquema.new_session()
-        registros_sensor: List[RegistroSensor] = RegistroSensorSet.listAllFromSensor(session, tipo_sensor, zona_sensor, numero_sensor)
+        registros_sensor: List[RegistroSensor] = RegistroSensorAgregadoSet.listAllFromSensorBetweenDates(session, tipo_sensor, zona_sensor, numero_sensor)
         for registro_sensor in registros_sensor:
             out.append(RegistroSensorCommon(registro_sensor.tipo_sensor,registro_sensor.zona_sensor,
                                       registro_sensor.numero_sensor,registro_sensor.valor, 
@@ -88,7 +150,7 @@ class RegistroSensorService():
             fecha_fin = datetime.now()
         out: List[RegistroSensorCommon] = []
         session: Session = esquema.new_session()
-        registros_sensor: List[RegistroSensor] = RegistroSensorSet.listAllFromSensorBetweenDates(session, tipo_sensor, zona_sensor, numero_sensor,fecha_inicio,fecha_fin)
+        registros_sensor: List[RegistroSensor] = RegistroSensorAgregadoSet.listAllFromSensorBetweenDates(session, tipo_sensor, zona_sensor, numero_sensor,fecha_inicio,fecha_fin)
         for registro_sensor in registros_sensor:
             out.append(RegistroSensorCommon(registro_sensor.tipo_sensor,registro_sensor.zona_sensor,
                                       registro_sensor.numero_sensor,registro_sensor.valor, 
@@ -107,7 +169,7 @@ class RegistroSensorService():
             fecha_fin = datetime.now()
         out: List[RegistroSensorCommon] = []
         session: Session = esquema.new_session()
-        registros_sensor: List[RegistroSensor] = RegistroSensorSet.getAvgFromSensorBetweenDates(session, tipo_sensor, zona_sensor, numero_sensor,fecha_inicio,fecha_fin)
+        registros_sensor: List[RegistroSensor] = RegistroSensorAgregadoSet.getAvgFromSensorBetweenDates(session, tipo_sensor, zona_sensor, numero_sensor,fecha_inicio,fecha_fin)
         if len(registros_sensor)==0:
             registros_sensor: List[RegistroSensor] = []
             sensor: SensorCommon = SensorService.get(esquema,tipo_sensor,zona_sensor,numero_sensor)
@@ -132,20 +194,7 @@ class RegistroSensorService():
 
     @staticmethod
     def listAllFromPlant(esquema: Esquema, nombre_planta: str) -> List[RegistroSensorCommon]:
-        planta: PlantaCommon = PlantaService.get(esquema,nombre_planta)
-        lista_registros_sensores_planta: List[RegistroSensorCommon] = []
-        sensores_planta_asociados: List[SensorPlantaCommon] =  SensorPlantaService.listAllSensorsFromPlantFromCommon(esquema,planta)
-        for sensor_planta_asociado in sensores_planta_asociados:
-            sensor: SensorCommon = SensorService.getSensorFromRelationFromCommon(esquema, sensor_planta_asociado)
-            fecha_i = sensor_planta_asociado.getFechaAsociacion()
-            fecha_f = sensor_planta_asociado.getFechaAnulacion()
-            if (fecha_f is None):
-                fecha_f = datetime.now()
-            registros_sensor_planta = RegistroSensorService.listAllFromSensorFromCommonBetweenDates(esquema,sensor,fecha_i, fecha_f)
-            for registro_sensor_planta in registros_sensor_planta:
-                lista_registros_sensores_planta.append(registro_sensor_planta)
-
-        return lista_registros_sensores_planta
+        return RegistroSensorService.listAllFromPlantBetweenDates(esquema, nombre_planta, None)
     
     @staticmethod
     def listAllFromPlantFromCommon(esquema: Esquema, planta: PlantaCommon) -> List[RegistroSensorCommon]:
@@ -153,29 +202,225 @@ class RegistroSensorService():
     
     @staticmethod
     def listAllFromPlantBetweenDates(esquema: Esquema, nombre_planta: str, fecha_inicio: datetime, fecha_fin: datetime = None) -> List[RegistroSensorCommon]:
-        planta: PlantaCommon = PlantaService.get(esquema,nombre_planta)
-        lista_registros_sensores_planta: List[RegistroSensorCommon] = []
-        sensores_planta_asociados: List[SensorPlantaCommon] =  SensorPlantaService.listAllSensorsFromPlantFromCommon(esquema,planta)
-        for sensor_planta_asociado in sensores_planta_asociados:
-            sensor: SensorCommon = SensorService.getSensorFromRelationFromCommon(esquema, sensor_planta_asociado)
-            if (fecha_fin is None):
-                fecha_fin = datetime.now()
-            fecha_i = fecha_inicio
-            fecha_f = fecha_fin
-            if fecha_inicio < sensor_planta_asociado.getFechaAsociacion():
-                fecha_i = sensor_planta_asociado.getFechaAsociacion()
-            if sensor_planta_asociado.getFechaAnulacion() is not None:
-                if fecha_fin > sensor_planta_asociado.getFechaAnulacion():
-                    fecha_f = sensor_planta_asociado.getFechaAnulacion()
-            registros_sensor_planta = RegistroSensorService.listAllFromSensorFromCommonBetweenDates(esquema,sensor,fecha_i, fecha_f)
-            for registro_sensor_planta in registros_sensor_planta:
-                lista_registros_sensores_planta.append(registro_sensor_planta)
-        return lista_registros_sensores_planta
+        if fecha_fin is None:
+            fecha_fin = datetime.now()
+        out: List[RegistroSensorCommon] = []
+        session: Session = esquema.new_session()
+        registros_sensor: List[RegistroSensor] = RegistroSensorAgregadoSet.listAllCompactedFromPlant(session, nombre_planta, fecha_inicio, fecha_fin)
+        registros_sensor.extend(RegistroSensorSet.listAllFromPlant(session, nombre_planta, fecha_inicio, fecha_fin))
+        for registro_sensor in registros_sensor:
+            out.append(RegistroSensorCommon(registro_sensor.tipo_sensor,registro_sensor.zona_sensor,
+                                      registro_sensor.numero_sensor,registro_sensor.valor, 
+                                      registro_sensor.unidad_medida, registro_sensor.fecha, 
+                                      registro_sensor.id_))
+        esquema.remove_session()
+        return out
     
     @staticmethod
     def listAllFromPlantFromCommonBetweenDates(esquema: Esquema, planta: PlantaCommon, fecha_inicio: datetime, fecha_fin: datetime = None) -> List[RegistroSensorCommon]:
         return RegistroSensorService.listAllFromPlantBetweenDates(esquema, planta.getNombrePlanta(), fecha_inicio, fecha_fin)
 
+    @staticmethod
+    def listReducedFromPlant(esquema: Esquema, nombre_planta: str, max_puntos: int) -> List[RegistroSensorCommon]:
+        return RegistroSensorService.listReducedFromPlantBetweenDates(esquema, nombre_planta, None, None, max_puntos)
+
+    @staticmethod
+    def listReducedFromPlantBetweenDates(esquema: Esquema, nombre_planta: str, fecha_inicio: datetime, fecha_fin: datetime = None,
+                                         max_puntos: int = 1000) -> List[RegistroSensorCommon]:
+        """
+        Registros de los sensores de una planta reducidos a como mucho max_puntos por serie para graficarlos, siendo
+        cada serie los registros de una zona y tipo de medida. El periodo se divide en max_puntos / 2 intervalos de
+        la misma duracion y de cada uno se devuelven el registro minimo y el maximo de la serie, de forma que los
+        picos y valles (y con ellos las salidas de los limites de los consejos) se conservan.
+
+        El minimo y el maximo de cada sensor e intervalo se calculan en la base de datos sobre la menor resolucion
+        cuyos intervalos no superan la duracion de los de la reduccion (registros originales, horas o dias agregados),
+        por lo que solo se construyen unos pocos registros por intervalo, sin importar la duracion del periodo, y la
+        reduccion de las unidades de medida de cada serie se hace de forma vectorizada con ReductorSeries.
+
+        Args:
+            - esquema (Esquema): Esquema de la base de datos.
+            - nombre_planta (str): Nombre de la planta.
+            - fecha_inicio (datetime): Fecha de inicio (incluida). Si no se especifica, desde el primer registro.
+            - fecha_fin (datetime): Fecha de fin (incluida). Si no se especifica, la fecha actual.
+            - max_puntos (int): Numero maximo de registros por serie.
+
+        Returns:
+            - List[RegistroSensorCommon]: Registros ordenados por fecha, con id -1. Si el minimo y el maximo de un
+              intervalo tienen la misma fecha, el maximo se devuelve un microsegundo despues.
+        """
+        if fecha_fin is None:
+            fecha_fin = datetime.now()
+        out: List[RegistroSensorCommon] = []
+        session: Session = esquema.new_session()
+        try:
+            if fecha_inicio is None:
+                fecha_inicio = RegistroSensorAgregadoSet.getFirstDateFromPlant(session, nombre_planta)
+            if fecha_inicio is None or fecha_inicio > fecha_fin:
+                return out
+            numero_intervalos: int = max(max_puntos // 2, 1)
+            filas: List[Tuple] = RegistroSensorAgregadoSet.listRangesFromPlant(session, nombre_planta, fecha_inicio, fecha_fin,
+                                                                               numero_intervalos)
+        finally:
+            esquema.remove_session()
+        series: Dict[Tuple, List[int]] = {}
+        for indice, fila in enumerate(filas):
+            series.setdefault((fila[1], fila[3].getTipoMedida()), []).append(indice)
+        minimos: np.ndarray = np.array([fila[5] for fila in filas], dtype=float)
+        maximos: np.ndarray = np.array([fila[6] for fila in filas], dtype=float)
+        intervalos: np.ndarray = np.array([fila[7] for fila in filas], dtype=np.intp)
+        for indices_serie in series.values():
+            indices: np.ndarray = np.array(indices_serie)
+            posiciones_minimos, posiciones_maximos = ReductorSeries.reduceMinMax(intervalos[indices], minimos[indices], maximos[indices])
+            for indice_minimo, indice_maximo in zip(indices[posiciones_minimos].tolist(), indices[posiciones_maximos].tolist()):
+                fila_minimo: Tuple = filas[indice_minimo]
+                fila_maximo: Tuple = filas[indice_maximo]
+                out.append(RegistroSensorCommon(fila_minimo[0], fila_minimo[1], fila_minimo[2], fila_minimo[5], fila_minimo[3], fila_minimo[4], -1))
+                if fila_maximo[4] != fila_minimo[4]:
+                    out.append(RegistroSensorCommon(fila_maximo[0], fila_maximo[1], fila_maximo[2], fila_maximo[6], fila_maximo[3], fila_maximo[4], -1))
+                elif fila_maximo[6] != fila_minimo[5]:
+                    # Dos puntos de una serie con la misma fecha se promediarian al graficarlos.
+                    out.append(RegistroSensorCommon(fila_maximo[0], fila_maximo[1], fila_maximo[2], fila_maximo[6], fila_maximo[3],
+                                                    fila_maximo[4] + timedelta(microseconds=1), -1))
+        out.sort(key=lambda registro_sensor: registro_sensor.getFecha())
+        return out
+
+    @staticmethod
+    def getVersionFromPlant(esquema: Esquema, nombre_planta: str, *parametros: object) -> str:
+        """
+        Validador de las respuestas con los registros de los sensores de una planta: cambia con cada registro nuevo,
+        al compactar y al cambiar los consejos de la planta, sus asociaciones con sensores o las unidades de medida
+        de esos sensores. Los consejos, asociaciones y sensores se obtienen de la cache de metadatos, por lo que con
+        la cache caliente solo se consulta la version de los registros.
+
+        Args:
+            - esquema (Esquema): Esquema de la base de datos.
+            - nombre_planta (str): Nombre de la planta.
+            - parametros (object): Otros valores de los que depende la respuesta, como sus intervalos.
+
+        Returns:
+            - str: Validador de la respuesta.
+        """
+        session: Session = esquema.new_session()
+        version: Tuple = RegistroSensorAgregadoSet.getVersion(session)
+        esquema.remove_session()
+        sensores_planta: List[SensorPlantaCommon] = SensorPlantaService.listAllSensorsFromPlant(esquema, nombre_planta)
+        datos: List = [version, parametros, [consejo.toJson() for consejo in ConsejoPlantaService.listAllFromPlant(esquema, nombre_planta)]]
+        for sensor_planta in sensores_planta:
+            sensor: SensorCommon = SensorService.getSensorFromRelationFromCommon(esquema, sensor_planta)
+            datos.append((sensor_planta.toJson(), sensor.getUnidadesMedida()))
+        return hashlib.sha1(repr(datos).encode()).hexdigest()
+
+    @staticmethod
+    def __encodeCursor(cursor: Optional[Tuple[int, datetime, int]]) -> Optional[str]:
+        if cursor is None:
+            return None
+        return base64.urlsafe_b64encode(json.dumps([cursor[0], cursor[1].isoformat(), cursor[2]]).encode()).decode()
+
+    @staticmethod
+    def __decodeCursor(cursor: Optional[str]) -> Optional[Tuple[int, datetime, int]]:
+        if cursor is None:
+            return None
+        try:
+            nivel, fecha, clave = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            return (int(nivel), datetime.fromisoformat(fecha), int(clave))
+        except Exception:
+            raise ValueError('El cursor de paginacion ' + str(cursor) + ' no es valido.')
+
+    @staticmethod
+    def __pageToCommon(pagina: Tuple[List[RegistroSensor], Optional[Tuple[int, datetime, int]]]) -> Tuple[List[RegistroSensorCommon], Optional[str]]:
+        out: List[RegistroSensorCommon] = []
+        for registro_sensor in pagina[0]:
+            out.append(RegistroSensorCommon(registro_sensor.tipo_sensor,registro_sensor.zona_sensor,
+                                      registro_sensor.numero_sensor,registro_sensor.valor, 
+                                      registro_sensor.unidad_medida, registro_sensor.fecha, 
+                                      registro_sensor.id_))
+        return out, RegistroSensorService.__encodeCursor(pagina[1])
+
+    @staticmethod
+    def listAllPage(esquema: Esquema, limite: int, cursor: str = None) -> Tuple[List[RegistroSensorCommon], Optional[str]]:
+        cursor_pagina: Optional[Tuple[int, datetime, int]] = RegistroSensorService.__decodeCursor(cursor)
+        session: Session = esquema.new_session()
+        out = RegistroSensorService.__pageToCommon(RegistroSensorAgregadoSet.listPage(session, limite, cursor_pagina))
+        esquema.remove_session()
+        return out
+
+    @staticmethod
+    def listAllFromSensorPage(esquema: Esquema, tipo_sensor:TipoSensor, zona_sensor: ZonaSensor ,numero_sensor:int, limite: int,
+                              cursor: str = None, fecha_inicio: datetime = None, fecha_fin: datetime = None) -> Tuple[List[RegistroSensorCommon], Optional[str]]:
+        cursor_pagina: Optional[Tuple[int, datetime, int]] = RegistroSensorService.__decodeCursor(cursor)
+        session: Session = esquema.new_session()
+        out = RegistroSensorService.__pageToCommon(RegistroSensorAgregadoSet.listPageFromSensor(
+            session, tipo_sensor, zona_sensor, numero_sensor, limite, cursor_pagina, fecha_inicio, fecha_fin))
+        esquema.remove_session()
+        return out
+
+    @staticmethod
+    def listAllFromPlantPage(esquema: Esquema, nombre_planta: str, limite: int, cursor: str = None,
+                             fecha_inicio: datetime = None, fecha_fin: datetime = None) -> Tuple[List[RegistroSensorCommon], Optional[str]]:
+        cursor_pagina: Optional[Tuple[int, datetime, int]] = RegistroSensorService.__decodeCursor(cursor)
+        session: Session = esquema.new_session()
+        out = RegistroSensorService.__pageToCommon(RegistroSensorAgregadoSet.listPageFromPlant(
+            session, nombre_planta, limite, cursor_pagina, fecha_inicio, fecha_fin))
+        esquema.remove_session()
+        return out
+
+    @staticmethod
+    def __export(esquema: Esquema, formato: str, iterar) -> Iterator[str]:
+        if formato not in RegistroSensorService.FORMATOS_EXPORTACION:
+            raise ValueError('El formato de exportacion ' + str(formato) + ' no existe.')
+        session: Session = esquema.new_session()
+        try:
+            buffer = io.StringIO()
+            escritor_csv = csv.writer(buffer, lineterminator='\n')
+            if formato == 'csv':
+                escritor_csv.writerow(['tipo_sensor', 'zona_sensor', 'numero_sensor', 'valor', 'unidad_medida', 'fecha', 'id',
+                                       'numero_lecturas', 'suma_lecturas'])
+            numero_registros: int = 0
+            for registro_sensor in iterar(session, RegistroSensorService.TAMANO_BLOQUE_EXPORTACION):
+                if formato == 'csv':
+                    escritor_csv.writerow([registro_sensor.tipo_sensor.getTipo(), registro_sensor.zona_sensor.getTipo(),
+                                           registro_sensor.numero_sensor, registro_sensor.valor,
+                                           registro_sensor.unidad_medida.getTipo(), str(registro_sensor.fecha), registro_sensor.id_,
+                                           registro_sensor.numero_lecturas, registro_sensor.suma_lecturas])
+                else:
+                    buffer.write(json.dumps(RegistroSensorCommon(registro_sensor.tipo_sensor,registro_sensor.zona_sensor,
+                                            registro_sensor.numero_sensor,registro_sensor.valor, 
+                                            registro_sensor.unidad_medida, registro_sensor.fecha, 
+                                            registro_sensor.id_, registro_sensor.numero_lecturas,
+                                            registro_sensor.suma_lecturas).toJson(), ensure_ascii=False) + '\n')
+                numero_registros += 1
+                if numero_registros % RegistroSensorService.TAMANO_BLOQUE_EXPORTACION == 0:
+                    yield buffer.getvalue()
+                    buffer.seek(0)
+                    buffer.truncate()
+            if buffer.tell() > 0:
+                yield buffer.getvalue()
+        finally:
+            esquema.remove_session()
+
+    @staticmethod
+    def exportAll(esquema: Esquema, formato: str, fecha_inicio: datetime = None, fecha_fin: datetime = None) -> Iterator[str]:
+        """
+        Exportacion de los registros de todos los sensores en orden cronologico como fragmentos de texto
+        en formato NDJSON o CSV. Los registros se leen y se escriben por bloques, por lo que la memoria
+        empleada no depende del numero de registros exportados.
+        """
+        return RegistroSensorService.__export(esquema, formato, lambda session, tamano_bloque: RegistroSensorAgregadoSet.iterate(
+            session, tamano_bloque, fecha_inicio, fecha_fin))
+
+    @staticmethod
+    def exportFromSensor(esquema: Esquema, formato: str, tipo_sensor:TipoSensor, zona_sensor: ZonaSensor ,numero_sensor:int,
+                         fecha_inicio: datetime = None, fecha_fin: datetime = None) -> Iterator[str]:
+        return RegistroSensorService.__export(esquema, formato, lambda session, tamano_bloque: RegistroSensorAgregadoSet.iterateFromSensor(
+            session, tipo_sensor, zona_sensor, numero_sensor, tamano_bloque, fecha_inicio, fecha_fin))
+
+    @staticmethod
+    def exportFromPlant(esquema: Esquema, formato: str, nombre_planta: str, fecha_inicio: datetime = None,
+                        fecha_fin: datetime = None) -> Iterator[str]:
+        return RegistroSensorService.__export(esquema, formato, lambda session, tamano_bloque: RegistroSensorAgregadoSet.iterateFromPlant(
+            session, nombre_planta, tamano_bloque, fecha_inicio, fecha_fin))
+
     @staticmethod
     def listAllAvgFromPlantBetweenDates(esquema: Esquema, nombre_planta: str, fecha_inicio: datetime, fecha_fin: datetime = None) -> List[RegistroSensorCommon]:
         planta: PlantaCommon = PlantaService.get(esquema,nombre_planta)
@@ -198,6 +443,101 @@ class RegistroSensorService():
                 lista_registros_sensores_planta.append(registro_sensor_planta)
         return lista_registros_sensores_planta
 
+    @staticmethod
+    def __syncIntervalCache(esquema: Esquema, cache: CacheIntervalos, fecha_cierre: datetime) -> Tuple:
+        # Si solo hay registros nuevos se descartan los intervalos cerrados en los que caen; si se han modificado
+        # o compactado registros, toda la cache.
+        session: Session = esquema.new_session()
+        try:
+            version: Tuple = RegistroSensorAgregadoSet.getVersion(session)
+            anterior: Optional[Tuple] = cache.getVersion()
+            if version == anterior:
+                return version
+            registros: Optional[List[Tuple]] = None
+            if anterior is not None and anterior[1:] == version[1:] and anterior[0] is not None and version[0] is not None \
+                    and anterior[0] < version[0]:
+                registros = RegistroSensorSet.listSensorDatesBetweenIds(session, anterior[0], version[0], fecha_cierre)
+        except Exception as ex:
+            raise ex
+        finally:
+            esquema.remove_session()
+        cache.changeVersion(version, registros)
+        return version
+
+    @staticmethod
+    def listAllAvgFromPlantGroupByIntervals(esquema: Esquema, nombre_planta: str, intervalos: List[Tuple[datetime, datetime]]) -> List[List[RegistroSensorCommon]]:
+        """
+        Medias de los registros de los sensores de una planta para cada intervalo, equivalente a llamar a
+        listAllAvgFromPlantBetweenDates por cada intervalo pero calculado con una unica sesion y consulta agrupada.
+
+        Las medias de los intervalos cerrados (terminados hace mas de interval_cache_grace segundos) se guardan en
+        la cache de intervalos del esquema, de forma que solo se consultan los intervalos abiertos y los que no
+        estan en ella. Los registros creados o modificados con este servicio en un intervalo cerrado lo invalidan,
+        y los almacenados por otro proceso se detectan al cambiar la version de los registros.
+
+        Args:
+            - esquema (Esquema): Esquema de la base de datos.
+            - nombre_planta (str): Nombre de la planta.
+            - intervalos (List[Tuple[datetime, datetime]]): Intervalos (inicio, fin) consecutivos, de igual duracion
+              y alineados a horas completas.
+
+        Returns:
+            - List[List[RegistroSensorCommon]]: Por cada intervalo, la media por sensor y unidad de medida. Los sensores
+              sin registros en el intervalo se devuelven con valor 0 en cada una de sus unidades de medida.
+        """
+        out: List[List[RegistroSensorCommon]] = []
+        if len(intervalos) == 0:
+            return out
+        sensores_planta: List[SensorPlantaCommon] = SensorPlantaService.listAllSensorsFromPlant(esquema, nombre_planta)
+        sensores: Dict[Tuple, SensorCommon] = {}
+        for sensor_planta in sensores_planta:
+            clave_sensor: Tuple = (sensor_planta.getTipoSensor(), sensor_planta.getZonaSensor(), sensor_planta.getNumeroSensor())
+            if clave_sensor not in sensores:
+                sensores[clave_sensor] = SensorService.getSensorFromRelationFromCommon(esquema, sensor_planta)
+        duracion_intervalo: timedelta = intervalos[0][1] - intervalos[0][0]
+        cache: CacheIntervalos = esquema.get_interval_cache()
+        # Los intervalos terminados hace mas del margen ya no reciben registros: se toman de la cache si estan.
+        fecha_cierre: datetime = datetime.now() - timedelta(seconds=esquema.get_interval_cache_grace())
+        version: Tuple = RegistroSensorService.__syncIntervalCache(esquema, cache, fecha_cierre)
+        claves: List[Tuple] = [(nombre_planta, tuple(sensores), fecha_inicio, duracion_intervalo) for fecha_inicio, _ in intervalos]
+        medias: List[Optional[Dict[Tuple, List]]] = [cache.get(claves[indice]) if intervalos[indice][1] <= fecha_cierre else None
+                                                     for indice in range(len(intervalos))]
+        pendientes: List[int] = [indice for indice in range(len(intervalos)) if medias[indice] is None]
+        if len(pendientes) > 0:
+            for indice in pendientes:
+                medias[indice] = {}
+            # Una unica consulta desde el primer intervalo pendiente; los ya almacenados que contenga se descartan.
+            primero: int = pendientes[0]
+            por_calcular: Set[int] = set(pendientes)
+            session: Session = esquema.new_session()
+            for registro_sensor in RegistroSensorSet.getAvgFromPlantGroupByIntervals(session, nombre_planta, intervalos[primero][0],
+                                                                                     duracion_intervalo, len(intervalos) - primero):
+                indice: int = primero + (registro_sensor.fecha - intervalos[primero][0]) // duracion_intervalo
+                if indice in por_calcular:
+                    medias[indice].setdefault((registro_sensor.tipo_sensor, registro_sensor.zona_sensor, registro_sensor.numero_sensor),
+                                              []).append((registro_sensor.unidad_medida, registro_sensor.valor))
+            esquema.remove_session()
+            for indice in pendientes:
+                for medias_sensor in medias[indice].values():
+                    medias_sensor.sort(key=lambda media: media[0].name)
+                if intervalos[indice][1] <= fecha_cierre:
+                    cache.put(claves[indice], medias[indice], version)
+        for indice, (fecha_inicio, fecha_fin) in enumerate(intervalos):
+            lista_registros_sensores_planta: List[RegistroSensorCommon] = []
+            for sensor_planta in sensores_planta:
+                clave_sensor: Tuple = (sensor_planta.getTipoSensor(), sensor_planta.getZonaSensor(), sensor_planta.getNumeroSensor())
+                medias_sensor: Optional[List] = medias[indice].get(clave_sensor)
+                if medias_sensor is not None:
+                    for unidad_medida, valor in medias_sensor:
+                        lista_registros_sensores_planta.append(RegistroSensorCommon(*clave_sensor, valor, unidad_medida, fecha_inicio, -1))
+                    continue
+                for unidad_medida in sensores[clave_sensor].getUnidadesMedida():
+                    if unidad_medida is None or unidad_medida == UnidadMedida.SIN_UNIDAD:
+                        continue
+                    lista_registros_sensores_planta.append(RegistroSensorCommon(*clave_sensor, 0, unidad_medida, fecha_inicio, -1))
+            out.append(lista_registros_sensores_planta)
+        return out
+
     @staticmethod
     def listAllAvgFromPlantFromCommonBetweenDates(esquema: Esquema, planta: PlantaCommon, fecha_inicio: datetime, fecha_fin: datetime = None) -> List[RegistroSensorCommon]:
         return RegistroSensorService.listAllAvgFromPlantBetweenDates(esquema, planta.getNombrePlanta(), fecha_inicio, fecha_fin)
@@ -218,16 +558,32 @@ class RegistroSensorService():
         session: Session = esquema.new_session()
         out: RegistroSensorCommon = None
         try:
+            registro_original: RegistroSensor = RegistroSensorSet.get(session, id_)
+            fecha_original: datetime = registro_original.fecha
+            sensor_original: Tuple = (registro_original.tipo_sensor, registro_original.zona_sensor, registro_original.numero_sensor)
+            fecha_compactacion: Optional[datetime] = RegistroSensorAgregadoSet.getCompactionDate(session)
             registro_sensor_modificado: RegistroSensor = RegistroSensorSet.update(session, tipo_sensor, zona_sensor, 
                                                                            numero_sensor, valor, unidad_medida, fecha,id_)
+            for agregado in RegistroSensorAgregadoSet.AGREGADOS:
+                RegistroSensorAgregadoSet.rebuild(session, agregado, fecha_original, fecha_original)
+            if fecha_compactacion is not None and registro_sensor_modificado.fecha < fecha_compactacion:
+                # Los intervalos ya compactados no pueden recalcularse, se les suma el registro movido.
+                RegistroSensorAgregadoSet.updateFromRecords(session, [registro_sensor_modificado])
+                session.commit()
+            else:
+                for agregado in RegistroSensorAgregadoSet.AGREGADOS:
+                    RegistroSensorAgregadoSet.rebuild(session, agregado, registro_sensor_modificado.fecha, registro_sensor_modificado.fecha)
             out= RegistroSensorCommon(registro_sensor_modificado.tipo_sensor,registro_sensor_modificado.zona_sensor,
                                       registro_sensor_modificado.numero_sensor,registro_sensor_modificado.valor, 
                                       registro_sensor_modificado.unidad_medida, registro_sensor_modificado.fecha, 
-                                      registro_sensor_modificado.id_)
+                                      registro_sensor_modificado.id_, registro_sensor_modificado.numero_lecturas,
+                                      registro_sensor_modificado.suma_lecturas)
         except Exception as ex:
             raise ex
         finally:
             esquema.remove_session()
+        esquema.get_interval_cache().invalidate(*sensor_original, fecha_original)
+        esquema.get_interval_cache().invalidate(out.getTipoSensor(), out.getZonaSensor(), out.getNumeroSensor(), out.getFecha())
         return out
     
     @staticmethod
@@ -236,3 +592,51 @@ class RegistroSensorService():
                                             registro_sensor.getNumeroSensor(), registro_sensor.getValor(), 
                                             registro_sensor.getUnidadMedida(), registro_sensor.getId())
 
+    @staticmethod
+    def catchUpAggregates(esquema: Esquema) -> None:
+        session: Session = esquema.new_session()
+        try:
+            RegistroSensorAgregadoSet.catchUp(session)
+        except Exception as ex:
+            raise ex
+        finally:
+            esquema.remove_session()
+
+    @staticmethod
+    def compact(esquema: Esquema, dias_registros: int, dias_horarios: int, dias_diarios: int, tamano_bloque: int) -> Dict[str, int]:
+        """
+        Aplica la politica de retencion: elimina por bloques los registros originales y las medias por hora y por dia
+        anteriores a su periodo de retencion y libera el espacio de la base de datos con un vacuum incremental.
+
+        Antes de eliminar los registros originales se ponen al dia los niveles de agregacion, por lo que su
+        informacion se conserva como media por hora y por dia. Los limites se alinean al inicio del dia.
+
+        Args:
+            - esquema (Esquema): Esquema de la base de datos.
+            - dias_registros (int): Dias que se conservan los registros originales (0 para conservarlos siempre).
+            - dias_horarios (int): Dias que se conservan las medias por hora (0 para conservarlas siempre).
+            - dias_diarios (int): Dias que se conservan las medias por dia (0 para conservarlas siempre).
+            - tamano_bloque (int): Numero maximo de filas eliminadas por transaccion.
+
+        Returns:
+            - Dict[str, int]: Numero de filas eliminadas de cada tabla.
+        """
+        out: Dict[str, int] = {'registros_sensores': 0, 'registros_sensores_horarios': 0, 'registros_sensores_diarios': 0}
+        session: Session = esquema.new_session()
+        try:
+            RegistroSensorAgregadoSet.catchUp(session)
+            hoy: datetime = RegistroSensorDiario.truncarFecha(datetime.now())
+            if dias_registros > 0:
+                out['registros_sensores'] = RegistroSensorSet.deleteBefore(session, hoy - timedelta(days=dias_registros), tamano_bloque)
+            if dias_horarios > 0:
+                out['registros_sensores_horarios'] = RegistroSensorAgregadoSet.deleteBefore(
+                    session, RegistroSensorHorario, hoy - timedelta(days=dias_horarios), tamano_bloque)
+            if dias_diarios > 0:
+                out['registros_sensores_diarios'] = RegistroSensorAgregadoSet.deleteBefore(
+                    session, RegistroSensorDiario, hoy - timedelta(days=dias_diarios), tamano_bloque)
+        except Exception as ex:
+            raise ex
+        finally:
+            esquema.remove_session()
+        esquema.incremental_vacuum()
+        return out
@@ -12,6 +12,9 @@ from backend.data.db.exc import ErrorSensorPlantaExiste, ErrorSensorPlantaNoExis
 
 class SensorPlantaService():
 
+    # Region de la cache de metadatos con los datos de este servicio.
+    REGION_CACHE: str = 'sensores_plantas'
+
     @staticmethod
     def create(esquema: Esquema, tipo_sensor: TipoSensor, zona_sensor: ZonaSensor, 
                                numero_sensor:int, nombre_planta:str, 
@@ -30,6 +33,7 @@ class SensorPlantaService():
             raise ex
         finally:
             esquema.remove_session()
+        esquema.get_metadata_cache().invalidate(SensorPlantaService.REGION_CACHE)
         return out
     
     @staticmethod
@@ -44,58 +48,88 @@ class SensorPlantaService():
 
     @staticmethod
     def exists(esquema: Esquema, id_:int) -> bool:
-        session: Session = esquema.new_session()
-        sensor_planta_existe: bool = SensorPlantaSet.get(session, id_)
-        esquema.remove_session()
-        return sensor_planta_existe
+        def cargar() -> bool:
+            session: Session = esquema.new_session()
+            try:
+                sensor_planta_existe: bool = SensorPlantaSet.get(session, id_)
+                return bool(sensor_planta_existe)
+            except Exception as ex:
+                raise ex
+            finally:
+                esquema.remove_session()
+        return esquema.get_metadata_cache().get(SensorPlantaService.REGION_CACHE, ('exists', id_), cargar)
     
     @staticmethod
     def existsActiveFromSensorAndPlant(esquema: Esquema, tipo_sensor: TipoSensor, zona_sensor: ZonaSensor, 
                                         numero_sensor:int, nombre_planta:str) -> bool:
-        session: Session = esquema.new_session()
-        sensor_planta_existe: bool = SensorPlantaSet.getActiveFromSensorAndPlant(session, tipo_sensor, zona_sensor, 
-                                                                                numero_sensor, nombre_planta)
-        esquema.remove_session()
-        return sensor_planta_existe
+        def cargar() -> bool:
+            session: Session = esquema.new_session()
+            try:
+                sensor_planta_existe: bool = SensorPlantaSet.getActiveFromSensorAndPlant(session, tipo_sensor, zona_sensor, 
+                                                                                        numero_sensor, nombre_planta)
+                return bool(sensor_planta_existe)
+            except Exception as ex:
+                raise ex
+            finally:
+                esquema.remove_session()
+        return esquema.get_metadata_cache().get(SensorPlantaService.REGION_CACHE, ('existsActiveFromSensorAndPlant', tipo_sensor, zona_sensor, numero_sensor, nombre_planta), cargar)
     
     @staticmethod
     def listAll(esquema: Esquema) -> List[SensorPlantaCommon]:
-        out: List[SensorPlantaCommon] = []
-        session: Session = esquema.new_session()
-        registros_sensor: List[SensorPlanta] = SensorPlantaSet.listAll(session)
-        for sensor_planta in registros_sensor:
-            out.append(SensorPlantaCommon(sensor_planta.tipo_sensor, sensor_planta.zona_sensor,
-                                      sensor_planta.numero_sensor, sensor_planta.nombre_planta, 
-                                      sensor_planta.fecha_asociacion, sensor_planta.fecha_anulacion,
-                                      sensor_planta.id_))
-        esquema.remove_session()
-        return out
+        def cargar() -> List[SensorPlantaCommon]:
+            out: List[SensorPlantaCommon] = []
+            session: Session = esquema.new_session()
+            try:
+                registros_sensor: List[SensorPlanta] = SensorPlantaSet.listAll(session)
+                for sensor_planta in registros_sensor:
+                    out.append(SensorPlantaCommon(sensor_planta.tipo_sensor, sensor_planta.zona_sensor,
+                                              sensor_planta.numero_sensor, sensor_planta.nombre_planta, 
+                                              sensor_planta.fecha_asociacion, sensor_planta.fecha_anulacion,
+                                              sensor_planta.id_))
+                return out
+            except Exception as ex:
+                raise ex
+            finally:
+                esquema.remove_session()
+        return esquema.get_metadata_cache().get(SensorPlantaService.REGION_CACHE, ('listAll',), cargar)
 
     @staticmethod
     def listAllActive(esquema: Esquema) -> List[SensorPlantaCommon]:
-        out: List[SensorPlantaCommon] = []
-        session: Session = esquema.new_session()
-        sensores_planta: List[SensorPlanta] = SensorPlantaSet.listAllActive(session)
-        for sensor_planta in sensores_planta:
-            out.append(SensorPlantaCommon(sensor_planta.tipo_sensor, sensor_planta.zona_sensor,
-                                      sensor_planta.numero_sensor, sensor_planta.nombre_planta, 
-                                      sensor_planta.fecha_asociacion, sensor_planta.fecha_anulacion,
-                                      sensor_planta.id_))
-        esquema.remove_session()
-        return out
+        def cargar() -> List[SensorPlantaCommon]:
+            out: List[SensorPlantaCommon] = []
+            session: Session = esquema.new_session()
+            try:
+                sensores_planta: List[SensorPlanta] = SensorPlantaSet.listAllActive(session)
+                for sensor_planta in sensores_planta:
+                    out.append(SensorPlantaCommon(sensor_planta.tipo_sensor, sensor_planta.zona_sensor,
+                                              sensor_planta.numero_sensor, sensor_planta.nombre_planta, 
+                                              sensor_planta.fecha_asociacion, sensor_planta.fecha_anulacion,
+                                              sensor_planta.id_))
+                return out
+            except Exception as ex:
+                raise ex
+            finally:
+                esquema.remove_session()
+        return esquema.get_metadata_cache().get(SensorPlantaService.REGION_CACHE, ('listAllActive',), cargar)
 
     @staticmethod
     def listAllSensorsFromPlant(esquema: Esquema, nombre_planta: str) -> List[SensorPlantaCommon]:
-        out: List[SensorPlantaCommon] = []
-        session: Session = esquema.new_session()
-        sensores: List[SensorPlanta] = SensorPlantaSet.listAllSensorsFromPlant(session, nombre_planta)
-        for sensor_planta in sensores:
-            out.append(SensorPlantaCommon(sensor_planta.tipo_sensor, sensor_planta.zona_sensor,
-                                      sensor_planta.numero_sensor, sensor_planta.nombre_planta, 
-                                      sensor_planta.fecha_asociacion, sensor_planta.fecha_anulacion,
-                                      sensor_planta.id_))
-        esquema.remove_session()
-        return out
+        def cargar() -> List[SensorPlantaCommon]:
+            out: List[SensorPlantaCommon] = []
+            session: Session = esquema.new_session()
+            try:
+                sensores: List[SensorPlanta] = SensorPlantaSet.listAllSensorsFromPlant(session, nombre_planta)
+                for sensor_planta in sensores:
+                    out.append(SensorPlantaCommon(sensor_planta.tipo_sensor, sensor_planta.zona_sensor,
+                                              sensor_planta.numero_sensor, sensor_planta.nombre_planta, 
+                                              sensor_planta.fecha_asociacion, sensor_planta.fecha_anulacion,
+                                              sensor_planta.id_))
+                return out
+            except Exception as ex:
+                raise ex
+            finally:
+                esquema.remove_session()
+        return esquema.get_metadata_cache().get(SensorPlantaService.REGION_CACHE, ('listAllSensorsFromPlant', nombre_planta), cargar)
 
     @staticmethod
     def listAllSensorsFromPlantFromCommon(esquema: Esquema, planta: PlantaCommon) -> List[SensorPlantaCommon]:
@@ -103,16 +137,22 @@ class SensorPlantaService():
 
     @staticmethod
     def listAllActiveSensorsFromPlant(esquema: Esquema, nombre_planta: str) -> List[SensorPlantaCommon]:
-        out: List[SensorPlantaCommon] = []
-        session: Session = esquema.new_session()
-        sensores: List[SensorPlanta] = SensorPlantaSet.listAllActiveSensorsFromPlant(session, nombre_planta)
-        for sensor_planta in sensores:
-            out.append(SensorPlantaCommon(sensor_planta.tipo_sensor, sensor_planta.zona_sensor,
-                                      sensor_planta.numero_sensor, sensor_planta.nombre_planta, 
-                                      sensor_planta.fecha_asociacion, sensor_planta.fecha_anulacion,
-                                      sensor_planta.id_))
-        esquema.remove_session()
-        return out
+        def cargar() -> List[SensorPlantaCommon]:
+            out: List[SensorPlantaCommon] = []
+            session: Session = esquema.new_session()
+            try:
+                sensores: List[SensorPlanta] = SensorPlantaSet.listAllActiveSensorsFromPlant(session, nombre_planta)
+                for sensor_planta in sensores:
+                    out.append(SensorPlantaCommon(sensor_planta.tipo_sensor, sensor_planta.zona_sensor,
+                                              sensor_planta.numero_sensor, sensor_planta.nombre_planta, 
+                                              sensor_planta.fecha_asociacion, sensor_planta.fecha_anulacion,
+                                              sensor_planta.id_))
+                return out
+            except Exception as ex:
+                raise ex
+            finally:
+                esquema.remove_session()
+        return esquema.get_metadata_cache().get(SensorPlantaService.REGION_CACHE, ('listAllActiveSensorsFromPlant', nombre_planta), cargar)
 
     @staticmethod
     def listAllActiveSensorsFromPlantFromCommon(esquema: Esquema, planta: PlantaCommon) -> List[SensorPlantaCommon]:
@@ -140,16 +180,22 @@ class SensorPlantaService():
 
     @staticmethod
     def listAllPlantsFromSensor(esquema: Esquema, tipo_sensor:TipoSensor, zona_sensor: ZonaSensor ,numero_sensor:int) -> List[SensorPlantaCommon]:
-        out: List[SensorPlantaCommon] = []
-        session: Session = esquema.new_session()
-        relacciones_sensor_planta: List[SensorPlanta] = SensorPlantaSet.listAllPlantsFromSensor(session, tipo_sensor, zona_sensor, numero_sensor)
-        for sensor_planta in relacciones_sensor_planta:
-            out.append(SensorPlantaCommon(sensor_planta.tipo_sensor, sensor_planta.zona_sensor,
-                                      sensor_planta.numero_sensor, sensor_planta.nombre_planta, 
-                                      sensor_planta.fecha_asociacion, sensor_planta.fecha_anulacion,
-                                      sensor_planta.id_))
-        esquema.remove_session()
-        return out
+        def cargar() -> List[SensorPlantaCommon]:
+            out: List[SensorPlantaCommon] = []
+            session: Session = esquema.new_session()
+            try:
+                relacciones_sensor_planta: List[SensorPlanta] = SensorPlantaSet.listAllPlantsFromSensor(session, tipo_sensor, zona_sensor, numero_sensor)
+                for sensor_planta in relacciones_sensor_planta:
+                    out.append(SensorPlantaCommon(sensor_planta.tipo_sensor, sensor_planta.zona_sensor,
+                                              sensor_planta.numero_sensor, sensor_planta.nombre_planta, 
+                                              sensor_planta.fecha_asociacion, sensor_planta.fecha_anulacion,
+                                              sensor_planta.id_))
+                return out
+            except Exception as ex:
+                raise ex
+            finally:
+                esquema.remove_session()
+        return esquema.get_metadata_cache().get(SensorPlantaService.REGION_CACHE, ('listAllPlantsFromSensor', tipo_sensor, zona_sensor, numero_sensor), cargar)
 
     @staticmethod
     def listAllPlantsFromSensorFromCommon(esquema: Esquema, sensor: SensorCommon) -> List[SensorPlantaCommon]:
@@ -158,16 +204,22 @@ class SensorPlantaService():
 
     @staticmethod
     def listAllActivePlantsFromSensor(esquema: Esquema, tipo_sensor:TipoSensor, zona_sensor: ZonaSensor ,numero_sensor:int) -> List[SensorPlantaCommon]:
-        out: List[SensorPlantaCommon] = []
-        session: Session = esquema.new_session()
-        relacciones_sensor_planta: List[SensorPlanta] = SensorPlantaSet.listAllActivePlantsFromSensor(session, tipo_sensor, zona_sensor, numero_sensor)
-        for sensor_planta in relacciones_sensor_planta:
-            out.append(SensorPlantaCommon(sensor_planta.tipo_sensor, sensor_planta.zona_sensor,
-                                      sensor_planta.numero_sensor, sensor_planta.nombre_planta, 
-                                      sensor_planta.fecha_asociacion, sensor_planta.fecha_anulacion,
-                                      sensor_planta.id_))
-        esquema.remove_session()
-        return out
+        def cargar() -> List[SensorPlantaCommon]:
+            out: List[SensorPlantaCommon] = []
+            session: Session = esquema.new_session()
+            try:
+                relacciones_sensor_planta: List[SensorPlanta] = SensorPlantaSet.listAllActivePlantsFromSensor(session, tipo_sensor, zona_sensor, numero_sensor)
+                for sensor_planta in relacciones_sensor_planta:
+                    out.append(SensorPlantaCommon(sensor_planta.tipo_sensor, sensor_planta.zona_sensor,
+                                              sensor_planta.numero_sensor, sensor_planta.nombre_planta, 
+                                              sensor_planta.fecha_asociacion, sensor_planta.fecha_anulacion,
+                                              sensor_planta.id_))
+                return out
+            except Exception as ex:
+                raise ex
+            finally:
+                esquema.remove_session()
+        return esquema.get_metadata_cache().get(SensorPlantaService.REGION_CACHE, ('listAllActivePlantsFromSensor', tipo_sensor, zona_sensor, numero_sensor), cargar)
 
     @staticmethod
     def listAllActivePlantsFromSensorFromCommon(esquema: Esquema, sensor: SensorCommon) -> List[SensorPlantaCommon]:
@@ -196,27 +248,39 @@ class SensorPlantaService():
 
     @staticmethod
     def get(esquema: Esquema, id_ : int) -> SensorPlantaCommon:
-        session : Session = esquema.new_session()
-        sensor_planta : SensorPlanta = SensorPlantaSet.get(session, id_)
-        out= SensorPlantaCommon(sensor_planta.tipo_sensor, sensor_planta.zona_sensor,
-                                  sensor_planta.numero_sensor, sensor_planta.nombre_planta, 
-                                  sensor_planta.fecha_asociacion, sensor_planta.fecha_anulacion,
-                                  sensor_planta.id_)
-        esquema.remove_session()
-        return out
+        def cargar() -> SensorPlantaCommon:
+            session : Session = esquema.new_session()
+            try:
+                sensor_planta : SensorPlanta = SensorPlantaSet.get(session, id_)
+                out= SensorPlantaCommon(sensor_planta.tipo_sensor, sensor_planta.zona_sensor,
+                                          sensor_planta.numero_sensor, sensor_planta.nombre_planta, 
+                                          sensor_planta.fecha_asociacion, sensor_planta.fecha_anulacion,
+                                          sensor_planta.id_)
+                return out
+            except Exception as ex:
+                raise ex
+            finally:
+                esquema.remove_session()
+        return esquema.get_metadata_cache().get(SensorPlantaService.REGION_CACHE, ('get', id_), cargar)
 
     @staticmethod
     def getActiveFromSensorAndPlant(esquema: Esquema, tipo_sensor: TipoSensor, zona_sensor: ZonaSensor, 
                                         numero_sensor:int, nombre_planta:str) -> SensorPlantaCommon:
-        session: Session = esquema.new_session()
-        sensor_planta : SensorPlanta = SensorPlantaSet.getActiveFromSensorAndPlant(session, tipo_sensor, zona_sensor, 
-                                                                                numero_sensor, nombre_planta)
-        out= SensorPlantaCommon(sensor_planta.tipo_sensor, sensor_planta.zona_sensor,
-                                  sensor_planta.numero_sensor, sensor_planta.nombre_planta, 
-                                  sensor_planta.fecha_asociacion, sensor_planta.fecha_anulacion,
-                                  sensor_planta.id_)
-        esquema.remove_session()
-        return out
+        def cargar() -> SensorPlantaCommon:
+            session: Session = esquema.new_session()
+            try:
+                sensor_planta : SensorPlanta = SensorPlantaSet.getActiveFromSensorAndPlant(session, tipo_sensor, zona_sensor, 
+                                                                                        numero_sensor, nombre_planta)
+                out= SensorPlantaCommon(sensor_planta.tipo_sensor, sensor_planta.zona_sensor,
+                                          sensor_planta.numero_sensor, sensor_planta.nombre_planta, 
+                                          sensor_planta.fecha_asociacion, sensor_planta.fecha_anulacion,
+                                          sensor_planta.id_)
+                return out
+            except Exception as ex:
+                raise ex
+            finally:
+                esquema.remove_session()
+        return esquema.get_metadata_cache().get(SensorPlantaService.REGION_CACHE, ('getActiveFromSensorAndPlant', tipo_sensor, zona_sensor, numero_sensor, nombre_planta), cargar)
     
     @staticmethod
     def update(esquema: Esquema, tipo_sensor: TipoSensor, zona_sensor: ZonaSensor, numero_sensor:int, 
@@ -234,6 +298,7 @@ class SensorPlantaService():
             raise ex
         finally:
             esquema.remove_session()
+        esquema.get_metadata_cache().invalidate(SensorPlantaService.REGION_CACHE)
         return out
 
     @staticmethod
@@ -249,6 +314,7 @@ class SensorPlantaService():
         if sensor_planta.getFechaAnulacion() is None:
             sensor_planta.setFechaAnulacion(datetime.now())
             sensor_planta = SensorPlantaService.updateFromCommon(esquema, sensor_planta)
+        esquema.get_metadata_cache().invalidate(SensorPlantaService.REGION_CACHE)
         return sensor_planta
 
     @staticmethod
@@ -7,11 +7,15 @@ import backend.service as service
 from backend.data.db.esquema import Esquema
 from backend.data.db.results import Sensor
 from backend.data.db.resultsets import SensorSet
+from backend.data.util import RegistroSensoresBackend
 from backend.service.sensor_planta_service import SensorPlantaService
 from common.data.util import Sensor as SensorCommon, SensorPlanta as SensorPlantaCommon
-from common.data.util import TipoSensor, ZonaSensor, ModeloSensor, TipoMedida, UnidadMedida
+from common.data.util import TipoSensor, ZonaSensor, ModeloSensor, TipoMedida, UnidadMedida, FiltroLectura, CompresionLectura
 
 class SensorService():
+
+    # Region de la cache de metadatos con los datos de este servicio.
+    REGION_CACHE: str = 'sensores'
     
     @staticmethod
     def create(esquema: Esquema, tipo_sensor:TipoSensor, zona_sensor: ZonaSensor ,numero_sensor:int, modelo_sensor:ModeloSensor, nombre_sensor: str,
@@ -19,20 +23,26 @@ class SensorService():
                                patilla_2_lectura:int=None, patilla_3_lectura:int=None, unidad_medida_0:UnidadMedida = UnidadMedida.SIN_UNIDAD,
                                unidad_medida_1:UnidadMedida = UnidadMedida.SIN_UNIDAD, unidad_medida_2:UnidadMedida = UnidadMedida.SIN_UNIDAD,
                                unidad_medida_3:UnidadMedida = UnidadMedida.SIN_UNIDAD, fecha_creacion: datetime = datetime.now() ,
-                               fecha_eliminacion: datetime = None, asociar_plantas_activas=True) -> SensorCommon:
+                               fecha_eliminacion: datetime = None, asociar_plantas_activas=True, intervalo_lectura:int = None,
+                               muestras_lectura:int = None, filtro_lectura:FiltroLectura = None,
+                               compresion_lectura:CompresionLectura = None, desviacion_compresion:float = None) -> SensorCommon:
         session: Session = esquema.new_session()
         out: SensorCommon = None
         try:
             nuevo_sensor: Sensor = SensorSet.create(session, tipo_sensor, zona_sensor, numero_sensor, modelo_sensor, nombre_sensor,
                                                   direccion_lectura, patilla_0_lectura, patilla_1_lectura, 
                                                   patilla_2_lectura, patilla_3_lectura, unidad_medida_0, unidad_medida_1, 
-                                                  unidad_medida_2, unidad_medida_3, fecha_creacion, fecha_eliminacion)
+                                                  unidad_medida_2, unidad_medida_3, fecha_creacion, fecha_eliminacion,
+                                                  intervalo_lectura, muestras_lectura, filtro_lectura,
+                                                  compresion_lectura, desviacion_compresion)
             out= SensorCommon(nuevo_sensor.tipo_sensor, nuevo_sensor.zona_sensor, nuevo_sensor.numero_sensor, 
                               nuevo_sensor.modelo_sensor, nuevo_sensor.nombre_sensor,
                               nuevo_sensor.direccion_lectura, nuevo_sensor.patilla_0_lectura, nuevo_sensor.patilla_1_lectura,
                               nuevo_sensor.patilla_2_lectura, nuevo_sensor.patilla_3_lectura, nuevo_sensor.unidad_medida_0,
                               nuevo_sensor.unidad_medida_1, nuevo_sensor.unidad_medida_2, nuevo_sensor.unidad_medida_3,
-                              nuevo_sensor.fecha_creacion, nuevo_sensor.fecha_eliminacion)
+                              nuevo_sensor.fecha_creacion, nuevo_sensor.fecha_eliminacion, nuevo_sensor.intervalo_lectura,
+                              nuevo_sensor.muestras_lectura, nuevo_sensor.filtro_lectura,
+                              nuevo_sensor.compresion_lectura, nuevo_sensor.desviacion_compresion)
             if asociar_plantas_activas:
                 for planta in service.planta_service.PlantaService.listAllActive(esquema):
                     SensorPlantaService.createRelationFromCommon(esquema, out, planta)
@@ -40,6 +50,7 @@ class SensorService():
             raise ex
         finally:
             esquema.remove_session()
+        esquema.get_metadata_cache().invalidate(SensorService.REGION_CACHE)
         return out
     
     @staticmethod
@@ -50,16 +61,25 @@ class SensorService():
                                     patilla_1_lectura=sensor.getPatillaLectura(1), patilla_2_lectura=sensor.getPatillaLectura(2), 
                                     patilla_3_lectura=sensor.getPatillaLectura(3), unidad_medida_0=sensor.getUnidadMedida(0),
                                     unidad_medida_1=sensor.getUnidadMedida(1), unidad_medida_2=sensor.getUnidadMedida(2), 
-                                    unidad_medida_3=sensor.getUnidadMedida(3)
+                                    unidad_medida_3=sensor.getUnidadMedida(3), intervalo_lectura=sensor.getIntervaloLectura(),
+                                    muestras_lectura=sensor.getMuestrasLectura(), filtro_lectura=sensor.getFiltroLectura(),
+                                    compresion_lectura=sensor.getCompresionLectura(),
+                                    desviacion_compresion=sensor.getDesviacionCompresion()
                                     #,sensor.getFechaCreacion(), sensor.getFechaEliminacion()
                                     )
 
     @staticmethod
     def exists(esquema: Esquema, tipo_sensor:TipoSensor, zona_sensor: ZonaSensor ,numero_sensor:int) -> bool:
-        session: Session = esquema.new_session()
-        sensor_existe: bool = SensorSet.get(session, tipo_sensor, zona_sensor, numero_sensor)
-        esquema.remove_session()
-        return sensor_existe
+        def cargar() -> bool:
+            session: Session = esquema.new_session()
+            try:
+                sensor_existe: bool = SensorSet.get(session, tipo_sensor, zona_sensor, numero_sensor)
+                return bool(sensor_existe)
+            except Exception as ex:
+                raise ex
+            finally:
+                esquema.remove_session()
+        return esquema.get_metadata_cache().get(SensorService.REGION_CACHE, ('exists', tipo_sensor, zona_sensor, numero_sensor), cargar)
 
     @staticmethod
     def listToJson(sensores: List[SensorCommon]) -> List[Dict]:
@@ -70,166 +90,254 @@ class SensorService():
     
     @staticmethod
     def listAll(esquema: Esquema) -> List[SensorCommon]:
-        out: List[SensorCommon] = []
-        session: Session = esquema.new_session()
-        registros_sensor: List[Sensor] = SensorSet.listAll(session)
-        for sensor in registros_sensor:
-            out.append(SensorCommon(sensor.tipo_sensor,sensor.zona_sensor,sensor.numero_sensor,
-                                    sensor.modelo_sensor, sensor.nombre_sensor,
-                                    sensor.direccion_lectura, sensor.patilla_0_lectura, sensor.patilla_1_lectura,
-                                    sensor.patilla_2_lectura, sensor.patilla_3_lectura, sensor.unidad_medida_0,
-                                    sensor.unidad_medida_1, sensor.unidad_medida_2, sensor.unidad_medida_3,
-                                    sensor.fecha_creacion, sensor.fecha_eliminacion))
-        esquema.remove_session()
-        return out
+        def cargar() -> List[SensorCommon]:
+            out: List[SensorCommon] = []
+            session: Session = esquema.new_session()
+            try:
+                registros_sensor: List[Sensor] = SensorSet.listAll(session)
+                for sensor in registros_sensor:
+                    out.append(SensorCommon(sensor.tipo_sensor,sensor.zona_sensor,sensor.numero_sensor,
+                                            sensor.modelo_sensor, sensor.nombre_sensor,
+                                            sensor.direccion_lectura, sensor.patilla_0_lectura, sensor.patilla_1_lectura,
+                                            sensor.patilla_2_lectura, sensor.patilla_3_lectura, sensor.unidad_medida_0,
+                                            sensor.unidad_medida_1, sensor.unidad_medida_2, sensor.unidad_medida_3,
+                                            sensor.fecha_creacion, sensor.fecha_eliminacion, sensor.intervalo_lectura,
+                                            sensor.muestras_lectura, sensor.filtro_lectura, sensor.compresion_lectura,
+                                            sensor.desviacion_compresion))
+                return out
+            except Exception as ex:
+                raise ex
+            finally:
+                esquema.remove_session()
+        return esquema.get_metadata_cache().get(SensorService.REGION_CACHE, ('listAll',), cargar)
 
     @staticmethod
     def listAllActive(esquema: Esquema) -> List[SensorCommon]:
-        out: List[SensorCommon] = []
-        session: Session = esquema.new_session()
-        registros_sensor: List[Sensor] = SensorSet.listAllActive(session)
-        for sensor in registros_sensor:
-            out.append(SensorCommon(sensor.tipo_sensor, sensor.zona_sensor, sensor.numero_sensor,
-                                    sensor.modelo_sensor, sensor.nombre_sensor, 
-                                    sensor.direccion_lectura, sensor.patilla_0_lectura, sensor.patilla_1_lectura,
-                                    sensor.patilla_2_lectura, sensor.patilla_3_lectura, sensor.unidad_medida_0,
-                                    sensor.unidad_medida_1, sensor.unidad_medida_2, sensor.unidad_medida_3,
-                                    sensor.fecha_creacion, sensor.fecha_eliminacion))
-        esquema.remove_session()
-        return out
+        def cargar() -> List[SensorCommon]:
+            out: List[SensorCommon] = []
+            session: Session = esquema.new_session()
+            try:
+                registros_sensor: List[Sensor] = SensorSet.listAllActive(session)
+                for sensor in registros_sensor:
+                    out.append(SensorCommon(sensor.tipo_sensor, sensor.zona_sensor, sensor.numero_sensor,
+                                            sensor.modelo_sensor, sensor.nombre_sensor, 
+                                            sensor.direccion_lectura, sensor.patilla_0_lectura, sensor.patilla_1_lectura,
+                                            sensor.patilla_2_lectura, sensor.patilla_3_lectura, sensor.unidad_medida_0,
+                                            sensor.unidad_medida_1, sensor.unidad_medida_2, sensor.unidad_medida_3,
+                                            sensor.fecha_creacion, sensor.fecha_eliminacion, sensor.intervalo_lectura,
+                                            sensor.muestras_lectura, sensor.filtro_lectura, sensor.compresion_lectura,
+                                            sensor.desviacion_compresion))
+                return out
+            except Exception as ex:
+                raise ex
+            finally:
+                esquema.remove_session()
+        return esquema.get_metadata_cache().get(SensorService.REGION_CACHE, ('listAllActive',), cargar)
     
     @staticmethod
     def listAllFromType(esquema: Esquema, tipo_sensor: TipoSensor) -> List[SensorCommon]:
-        out: List[SensorCommon] = []
-        session: Session = esquema.new_session()
-        registros_sensor: List[Sensor] = SensorSet.listAllFromType(session,tipo_sensor)
-        for sensor in registros_sensor:
-            out.append(SensorCommon(sensor.tipo_sensor, sensor.zona_sensor, sensor.numero_sensor,
-                                    sensor.modelo_sensor, sensor.nombre_sensor,
-                                    sensor.direccion_lectura, sensor.patilla_0_lectura, sensor.patilla_1_lectura,
-                                    sensor.patilla_2_lectura, sensor.patilla_3_lectura, sensor.unidad_medida_0,
-                                    sensor.unidad_medida_1, sensor.unidad_medida_2, sensor.unidad_medida_3,
-                                    sensor.fecha_creacion, sensor.fecha_eliminacion))
-        esquema.remove_session()
-        return out
+        def cargar() -> List[SensorCommon]:
+            out: List[SensorCommon] = []
+            session: Session = esquema.new_session()
+            try:
+                registros_sensor: List[Sensor] = SensorSet.listAllFromType(session,tipo_sensor)
+                for sensor in registros_sensor:
+                    out.append(SensorCommon(sensor.tipo_sensor, sensor.zona_sensor, sensor.numero_sensor,
+                                            sensor.modelo_sensor, sensor.nombre_sensor,
+                                            sensor.direccion_lectura, sensor.patilla_0_lectura, sensor.patilla_1_lectura,
+                                            sensor.patilla_2_lectura, sensor.patilla_3_lectura, sensor.unidad_medida_0,
+                                            sensor.unidad_medida_1, sensor.unidad_medida_2, sensor.unidad_medida_3,
+                                            sensor.fecha_creacion, sensor.fecha_eliminacion, sensor.intervalo_lectura,
+                                            sensor.muestras_lectura, sensor.filtro_lectura, sensor.compresion_lectura,
+                                            sensor.desviacion_compresion))
+                return out
+            except Exception as ex:
+                raise ex
+            finally:
+                esquema.remove_session()
+        return esquema.get_metadata_cache().get(SensorService.REGION_CACHE, ('listAllFromType', tipo_sensor), cargar)
 
     @staticmethod
     def listAllActiveFromType(esquema: Esquema, tipo_sensor: TipoSensor) -> List[SensorCommon]:
-        out: List[SensorCommon] = []
-        session: Session = esquema.new_session()
-        registros_sensor: List[Sensor] = SensorSet.listAllActiveFromType(session,tipo_sensor)
-        for sensor in registros_sensor:
-            out.append(SensorCommon(sensor.tipo_sensor, sensor.zona_sensor, sensor.numero_sensor,
-                                    sensor.modelo_sensor, sensor.nombre_sensor,
-                                    sensor.direccion_lectura, sensor.patilla_0_lectura, sensor.patilla_1_lectura,
-                                    sensor.patilla_2_lectura, sensor.patilla_3_lectura, sensor.unidad_medida_0,
-                                    sensor.unidad_medida_1, sensor.unidad_medida_2, sensor.unidad_medida_3,
-                                    sensor.fecha_creacion, sensor.fecha_eliminacion))
-        esquema.remove_session()
-        return out
+        def cargar() -> List[SensorCommon]:
+            out: List[SensorCommon] = []
+            session: Session = esquema.new_session()
+            try:
+                registros_sensor: List[Sensor] = SensorSet.listAllActiveFromType(session,tipo_sensor)
+                for sensor in registros_sensor:
+                    out.append(SensorCommon(sensor.tipo_sensor, sensor.zona_sensor, sensor.numero_sensor,
+                                            sensor.modelo_sensor, sensor.nombre_sensor,
+                                            sensor.direccion_lectura, sensor.patilla_0_lectura, sensor.patilla_1_lectura,
+                                            sensor.patilla_2_lectura, sensor.patilla_3_lectura, sensor.unidad_medida_0,
+                                            sensor.unidad_medida_1, sensor.unidad_medida_2, sensor.unidad_medida_3,
+                                            sensor.fecha_creacion, sensor.fecha_eliminacion, sensor.intervalo_lectura,
+                                            sensor.muestras_lectura, sensor.filtro_lectura, sensor.compresion_lectura,
+                                            sensor.desviacion_compresion))
+                return out
+            except Exception as ex:
+                raise ex
+            finally:
+                esquema.remove_session()
+        return esquema.get_metadata_cache().get(SensorService.REGION_CACHE, ('listAllActiveFromType', tipo_sensor), cargar)
     
     @staticmethod
     def listAllFromZone(esquema: Esquema, zona_sensor: ZonaSensor) -> List[SensorCommon]:
-        out: List[SensorCommon] = []
-        session: Session = esquema.new_session()
-        registros_sensor: List[Sensor] = SensorSet.listAllFromZone(session,zona_sensor)
-        for sensor in registros_sensor:
-            out.append(SensorCommon(sensor.tipo_sensor, sensor.zona_sensor, sensor.numero_sensor, 
-                                    sensor.modelo_sensor, sensor.nombre_sensor,
-                                    sensor.direccion_lectura, sensor.patilla_0_lectura, sensor.patilla_1_lectura,
-                                    sensor.patilla_2_lectura, sensor.patilla_3_lectura, sensor.unidad_medida_0,
-                                    sensor.unidad_medida_1, sensor.unidad_medida_2, sensor.unidad_medida_3,
-                                    sensor.fecha_creacion, sensor.fecha_eliminacion))
-        esquema.remove_session()
-        return out
+        def cargar() -> List[SensorCommon]:
+            out: List[SensorCommon] = []
+            session: Session = esquema.new_session()
+            try:
+                registros_sensor: List[Sensor] = SensorSet.listAllFromZone(session,zona_sensor)
+                for sensor in registros_sensor:
+                    out.append(SensorCommon(sensor.tipo_sensor, sensor.zona_sensor, sensor.numero_sensor, 
+                                            sensor.modelo_sensor, sensor.nombre_sensor,
+                                            sensor.direccion_lectura, sensor.patilla_0_lectura, sensor.patilla_1_lectura,
+                                            sensor.patilla_2_lectura, sensor.patilla_3_lectura, sensor.unidad_medida_0,
+                                            sensor.unidad_medida_1, sensor.unidad_medida_2, sensor.unidad_medida_3,
+                                            sensor.fecha_creacion, sensor.fecha_eliminacion, sensor.intervalo_lectura,
+                                            sensor.muestras_lectura, sensor.filtro_lectura, sensor.compresion_lectura,
+                                            sensor.desviacion_compresion))
+                return out
+            except Exception as ex:
+                raise ex
+            finally:
+                esquema.remove_session()
+        return esquema.get_metadata_cache().get(SensorService.REGION_CACHE, ('listAllFromZone', zona_sensor), cargar)
 
     @staticmethod
     def listAllActiveFromZone(esquema: Esquema, zona_sensor: ZonaSensor) -> List[SensorCommon]:
-        out: List[SensorCommon] = []
-        session: Session = esquema.new_session()
-        registros_sensor: List[Sensor] = SensorSet.listAllActiveFromZone(session,zona_sensor)
-        for sensor in registros_sensor:
-            out.append(SensorCommon(sensor.tipo_sensor, sensor.zona_sensor, sensor.numero_sensor, 
-                                    sensor.modelo_sensor, sensor.nombre_sensor,
-                                    sensor.direccion_lectura, sensor.patilla_0_lectura, sensor.patilla_1_lectura,
-                                    sensor.patilla_2_lectura, sensor.patilla_3_lectura, sensor.unidad_medida_0,
-                                    sensor.unidad_medida_1, sensor.unidad_medida_2, sensor.unidad_medida_3,
-                                    sensor.fecha_creacion, sensor.fecha_eliminacion))
-        esquema.remove_session()
-        return out
+        def cargar() -> List[SensorCommon]:
+            out: List[SensorCommon] = []
+            session: Session = esquema.new_session()
+            try:
+                registros_sensor: List[Sensor] = SensorSet.listAllActiveFromZone(session,zona_sensor)
+                for sensor in registros_sensor:
+                    out.append(SensorCommon(sensor.tipo_sensor, sensor.zona_sensor, sensor.numero_sensor, 
+                                            sensor.modelo_sensor, sensor.nombre_sensor,
+                                            sensor.direccion_lectura, sensor.patilla_0_lectura, sensor.patilla_1_lectura,
+                                            sensor.patilla_2_lectura, sensor.patilla_3_lectura, sensor.unidad_medida_0,
+                                            sensor.unidad_medida_1, sensor.unidad_medida_2, sensor.unidad_medida_3,
+                                            sensor.fecha_creacion, sensor.fecha_eliminacion, sensor.intervalo_lectura,
+                                            sensor.muestras_lectura, sensor.filtro_lectura, sensor.compresion_lectura,
+                                            sensor.desviacion_compresion))
+                return out
+            except Exception as ex:
+                raise ex
+            finally:
+                esquema.remove_session()
+        return esquema.get_metadata_cache().get(SensorService.REGION_CACHE, ('listAllActiveFromZone', zona_sensor), cargar)
     
     @staticmethod
     def listAllFromTypeAndZone(esquema: Esquema, tipo_sensor: TipoSensor, zona_sensor: ZonaSensor) -> List[SensorCommon]:
-        out: List[SensorCommon] = []
-        session: Session = esquema.new_session()
-        registros_sensor: List[Sensor] = SensorSet.listAllFromTypeAndZone(session,tipo_sensor,zona_sensor)
-        for sensor in registros_sensor:
-            out.append(SensorCommon(sensor.tipo_sensor, sensor.zona_sensor, sensor.numero_sensor, 
-                                    sensor.modelo_sensor, sensor.nombre_sensor,
-                                    sensor.direccion_lectura, sensor.patilla_0_lectura, sensor.patilla_1_lectura,
-                                    sensor.patilla_2_lectura, sensor.patilla_3_lectura, sensor.unidad_medida_0,
-                                    sensor.unidad_medida_1, sensor.unidad_medida_2, sensor.unidad_medida_3,
-                                    sensor.fecha_creacion, sensor.fecha_eliminacion))
-        esquema.remove_session()
-        return out
+        def cargar() -> List[SensorCommon]:
+            out: List[SensorCommon] = []
+            session: Session = esquema.new_session()
+            try:
+                registros_sensor: List[Sensor] = SensorSet.listAllFromTypeAndZone(session,tipo_sensor,zona_sensor)
+                for sensor in registros_sensor:
+                    out.append(SensorCommon(sensor.tipo_sensor, sensor.zona_sensor, sensor.numero_sensor, 
+                                            sensor.modelo_sensor, sensor.nombre_sensor,
+                                            sensor.direccion_lectura, sensor.patilla_0_lectura, sensor.patilla_1_lectura,
+                                            sensor.patilla_2_lectura, sensor.patilla_3_lectura, sensor.unidad_medida_0,
+                                            sensor.unidad_medida_1, sensor.unidad_medida_2, sensor.unidad_medida_3,
+                                            sensor.fecha_creacion, sensor.fecha_eliminacion, sensor.intervalo_lectura,
+                                            sensor.muestras_lectura, sensor.filtro_lectura, sensor.compresion_lectura,
+                                            sensor.desviacion_compresion))
+                return out
+            except Exception as ex:
+                raise ex
+            finally:
+                esquema.remove_session()
+        return esquema.get_metadata_cache().get(SensorService.REGION_CACHE, ('listAllFromTypeAndZone', tipo_sensor, zona_sensor), cargar)
 
     @staticmethod
     def listAllActiveFromTypeAndZone(esquema: Esquema, tipo_sensor: TipoSensor, zona_sensor: ZonaSensor) -> List[SensorCommon]:
-        out: List[SensorCommon] = []
-        session: Session = esquema.new_session()
-        registros_sensor: List[Sensor] = SensorSet.listAllActiveFromTypeAndZone(session,tipo_sensor,zona_sensor)
-        for sensor in registros_sensor:
-            out.append(SensorCommon(sensor.tipo_sensor, sensor.zona_sensor, sensor.numero_sensor,
-                                    sensor.modelo_sensor, sensor.nombre_sensor,
-                                    sensor.direccion_lectura, sensor.patilla_0_lectura, sensor.patilla_1_lectura,
-                                    sensor.patilla_2_lectura, sensor.patilla_3_lectura, sensor.unidad_medida_0,
-                                    sensor.unidad_medida_1, sensor.unidad_medida_2, sensor.unidad_medida_3,
-                                    sensor.fecha_creacion, sensor.fecha_eliminacion))
-        esquema.remove_session()
-        return out
+        def cargar() -> List[SensorCommon]:
+            out: List[SensorCommon] = []
+            session: Session = esquema.new_session()
+            try:
+                registros_sensor: List[Sensor] = SensorSet.listAllActiveFromTypeAndZone(session,tipo_sensor,zona_sensor)
+                for sensor in registros_sensor:
+                    out.append(SensorCommon(sensor.tipo_sensor, sensor.zona_sensor, sensor.numero_sensor,
+                                            sensor.modelo_sensor, sensor.nombre_sensor,
+                                            sensor.direccion_lectura, sensor.patilla_0_lectura, sensor.patilla_1_lectura,
+                                            sensor.patilla_2_lectura, sensor.patilla_3_lectura, sensor.unidad_medida_0,
+                                            sensor.unidad_medida_1, sensor.unidad_medida_2, sensor.unidad_medida_3,
+                                            sensor.fecha_creacion, sensor.fecha_eliminacion, sensor.intervalo_lectura,
+                                            sensor.muestras_lectura, sensor.filtro_lectura, sensor.compresion_lectura,
+                                            sensor.desviacion_compresion))
+                return out
+            except Exception as ex:
+                raise ex
+            finally:
+                esquema.remove_session()
+        return esquema.get_metadata_cache().get(SensorService.REGION_CACHE, ('listAllActiveFromTypeAndZone', tipo_sensor, zona_sensor), cargar)
 
     @staticmethod
     def listAllFromModel(esquema: Esquema, modelo_sensor: ModeloSensor) -> List[SensorCommon]:
-        out: List[SensorCommon] = []
-        session: Session = esquema.new_session()
-        registros_sensor: List[Sensor] = SensorSet.listAllFromModel(session,modelo_sensor)
-        for sensor in registros_sensor:
-            out.append(SensorCommon(sensor.tipo_sensor, sensor.zona_sensor, sensor.numero_sensor,
-                                    sensor.modelo_sensor, sensor.nombre_sensor,
-                                    sensor.direccion_lectura, sensor.patilla_0_lectura, sensor.patilla_1_lectura,
-                                    sensor.patilla_2_lectura, sensor.patilla_3_lectura, sensor.unidad_medida_0,
-                                    sensor.unidad_medida_1, sensor.unidad_medida_2, sensor.unidad_medida_3,
-                                    sensor.fecha_creacion, sensor.fecha_eliminacion))
-        esquema.remove_session()
-        return out
+        def cargar() -> List[SensorCommon]:
+            out: List[SensorCommon] = []
+            session: Session = esquema.new_session()
+            try:
+                registros_sensor: List[Sensor] = SensorSet.listAllFromModel(session,modelo_sensor)
+                for sensor in registros_sensor:
+                    out.append(SensorCommon(sensor.tipo_sensor, sensor.zona_sensor, sensor.numero_sensor,
+                                            sensor.modelo_sensor, sensor.nombre_sensor,
+                                            sensor.direccion_lectura, sensor.patilla_0_lectura, sensor.patilla_1_lectura,
+                                            sensor.patilla_2_lectura, sensor.patilla_3_lectura, sensor.unidad_medida_0,
+                                            sensor.unidad_medida_1, sensor.unidad_medida_2, sensor.unidad_medida_3,
+                                            sensor.fecha_creacion, sensor.fecha_eliminacion, sensor.intervalo_lectura,
+                                            sensor.muestras_lectura, sensor.filtro_lectura, sensor.compresion_lectura,
+                                            sensor.desviacion_compresion))
+                return out
+            except Exception as ex:
+                raise ex
+            finally:
+                esquema.remove_session()
+        return esquema.get_metadata_cache().get(SensorService.REGION_CACHE, ('listAllFromModel', modelo_sensor), cargar)
 
     @staticmethod
     def listAllActiveFromModel(esquema: Esquema, modelo_sensor: ModeloSensor) -> List[SensorCommon]:
-        out: List[SensorCommon] = []
-        session: Session = esquema.new_session()
-        registros_sensor: List[Sensor] = SensorSet.listAllActiveFromModel(session,modelo_sensor)
-        for sensor in registros_sensor:
-            out.append(SensorCommon(sensor.tipo_sensor, sensor.zona_sensor, sensor.numero_sensor,
+        def cargar() -> List[SensorCommon]:
+            out: List[SensorCommon] = []
+            session: Session = esquema.new_session()
+            try:
+                registros_sensor: List[Sensor] = SensorSet.listAllActiveFromModel(session,modelo_sensor)
+                for sensor in registros_sensor:
+                    out.append(SensorCommon(sensor.tipo_sensor, sensor.zona_sensor, sensor.numero_sensor,
+                                            sensor.modelo_sensor, sensor.nombre_sensor,
+                                            sensor.direccion_lectura, sensor.patilla_0_lectura, sensor.patilla_1_lectura,
+                                            sensor.patilla_2_lectura, sensor.patilla_3_lectura, sensor.unidad_medida_0,
+                                            sensor.unidad_medida_1, sensor.unidad_medida_2, sensor.unidad_medida_3,
+                                            sensor.fecha_creacion, sensor.fecha_eliminacion, sensor.intervalo_lectura,
+                                            sensor.muestras_lectura, sensor.filtro_lectura, sensor.compresion_lectura,
+                                            sensor.desviacion_compresion))
+                return out
+            except Exception as ex:
+                raise ex
+            finally:
+                esquema.remove_session()
+        return esquema.get_metadata_cache().get(SensorService.REGION_CACHE, ('listAllActiveFromModel', modelo_sensor), cargar)
+
+    @staticmethod
+    def get(esquema: Esquema, tipo_sensor:TipoSensor, zona_sensor: ZonaSensor ,numero_sensor:int) -> SensorCommon:
+        def cargar() -> SensorCommon:
+            session : Session = esquema.new_session()
+            try:
+                sensor : Sensor = SensorSet.get(session, tipo_sensor, zona_sensor, numero_sensor)
+                out= SensorCommon(sensor.tipo_sensor, sensor.zona_sensor, sensor.numero_sensor,
                                     sensor.modelo_sensor, sensor.nombre_sensor,
                                     sensor.direccion_lectura, sensor.patilla_0_lectura, sensor.patilla_1_lectura,
                                     sensor.patilla_2_lectura, sensor.patilla_3_lectura, sensor.unidad_medida_0,
                                     sensor.unidad_medida_1, sensor.unidad_medida_2, sensor.unidad_medida_3,
-                                    sensor.fecha_creacion, sensor.fecha_eliminacion))
-        esquema.remove_session()
-        return out
-
-    @staticmethod
-    def get(esquema: Esquema, tipo_sensor:TipoSensor, zona_sensor: ZonaSensor ,numero_sensor:int) -> SensorCommon:
-        session : Session = esquema.new_session()
-        sensor : Sensor = SensorSet.get(session, tipo_sensor, zona_sensor, numero_sensor)
-        out= SensorCommon(sensor.tipo_sensor, sensor.zona_sensor, sensor.numero_sensor,
-                            sensor.modelo_sensor, sensor.nombre_sensor,
-                            sensor.direccion_lectura, sensor.patilla_0_lectura, sensor.patilla_1_lectura,
-                            sensor.patilla_2_lectura, sensor.patilla_3_lectura, sensor.unidad_medida_0,
-                            sensor.unidad_medida_1, sensor.unidad_medida_2, sensor.unidad_medida_3,
-                            sensor.fecha_creacion, sensor.fecha_eliminacion)
-        esquema.remove_session()
-        return out
+                                    sensor.fecha_creacion, sensor.fecha_eliminacion, sensor.intervalo_lectura,
+                                    sensor.muestras_lectura, sensor.filtro_lectura, sensor.compresion_lectura,
+                                    sensor.desviacion_compresion)
+                return out
+            except Exception as ex:
+                raise ex
+            finally:
+                esquema.remove_session()
+        return esquema.get_metadata_cache().get(SensorService.REGION_CACHE, ('get', tipo_sensor, zona_sensor, numero_sensor), cargar)
     
     @staticmethod
     def getSensorFromRelationFromCommon(esquema: Esquema, sensor_planta : SensorPlantaCommon) -> SensorCommon:
@@ -241,7 +349,9 @@ class SensorService():
                 modelo_sensor:ModeloSensor, nombre_sensor: str, direccion_lectura:str, patilla_0_lectura:int, patilla_1_lectura:int, 
                 patilla_2_lectura:int, patilla_3_lectura:int, unidad_medida_0:UnidadMedida, unidad_medida_1:UnidadMedida,
                 unidad_medida_2:UnidadMedida, unidad_medida_3:UnidadMedida, fecha_creacion: datetime,
-                fecha_eliminacion: datetime) -> SensorCommon:
+                fecha_eliminacion: datetime, intervalo_lectura:int = None, muestras_lectura:int = None,
+                filtro_lectura:FiltroLectura = None, compresion_lectura:CompresionLectura = None,
+                desviacion_compresion:float = None) -> SensorCommon:
         session: Session = esquema.new_session()
         out: SensorCommon = None
         try:
@@ -250,17 +360,25 @@ class SensorService():
                                                         direccion_lectura, patilla_0_lectura, patilla_1_lectura, 
                                                         patilla_2_lectura, patilla_3_lectura, unidad_medida_0, 
                                                         unidad_medida_1, unidad_medida_2, unidad_medida_3,
-                                                        fecha_creacion, fecha_eliminacion)
+                                                        fecha_creacion, fecha_eliminacion, intervalo_lectura,
+                                                        muestras_lectura, filtro_lectura, compresion_lectura,
+                                                        desviacion_compresion)
             out= SensorCommon(sensor_modificado.tipo_sensor,sensor_modificado.zona_sensor,sensor_modificado.numero_sensor,
                               sensor_modificado.modelo_sensor, sensor_modificado.nombre_sensor, 
                               sensor_modificado.direccion_lectura, sensor_modificado.patilla_0_lectura, 
                               sensor_modificado.patilla_1_lectura, sensor_modificado.patilla_2_lectura, sensor_modificado.patilla_3_lectura, 
                               sensor_modificado.unidad_medida_0, sensor_modificado.unidad_medida_1, sensor_modificado.unidad_medida_2, 
-                              sensor_modificado.unidad_medida_3, sensor_modificado.fecha_creacion, sensor_modificado.fecha_eliminacion)
+                              sensor_modificado.unidad_medida_3, sensor_modificado.fecha_creacion, sensor_modificado.fecha_eliminacion,
+                              sensor_modificado.intervalo_lectura, sensor_modificado.muestras_lectura,
+                              sensor_modificado.filtro_lectura, sensor_modificado.compresion_lectura,
+                              sensor_modificado.desviacion_compresion)
         except Exception as ex:
             raise ex
         finally:
             esquema.remove_session()
+        # El sensor electronico del sensor modificado se vuelve a construir en su siguiente lectura.
+        RegistroSensoresBackend.invalidate(tipo_sensor, zona_sensor, numero_sensor)
+        esquema.get_metadata_cache().invalidate(SensorService.REGION_CACHE)
         return out
     
     @staticmethod
@@ -270,7 +388,9 @@ class SensorService():
                                     sensor.getDireccionLectura(), sensor.getPatillaLectura(0), 
                                     sensor.getPatillaLectura(1), sensor.getPatillaLectura(2), sensor.getPatillaLectura(3),
                                     sensor.getUnidadMedida(0), sensor.getUnidadMedida(1), sensor.getUnidadMedida(2), 
-                                    sensor.getUnidadMedida(3), sensor.getFechaCreacion(), sensor.getFechaEliminacion())
+                                    sensor.getUnidadMedida(3), sensor.getFechaCreacion(), sensor.getFechaEliminacion(),
+                                    sensor.getIntervaloLectura(), sensor.getMuestrasLectura(), sensor.getFiltroLectura(),
+                                    sensor.getCompresionLectura(), sensor.getDesviacionCompresion())
 
     @staticmethod
     def unsubscribe(esquema: Esquema, tipo_sensor:TipoSensor, zona_sensor: ZonaSensor ,numero_sensor:int) -> SensorCommon:
@@ -279,6 +399,8 @@ class SensorService():
             sensor.setFechaEliminacion(datetime.now())
             sensor = SensorService.updateFromCommon(esquema, sensor)
         SensorPlantaService.unsubscribeAllFromSensorFromCommon(esquema, sensor)
+        RegistroSensoresBackend.invalidate(tipo_sensor, zona_sensor, numero_sensor)
+        esquema.get_metadata_cache().invalidate(SensorService.REGION_CACHE)
         return sensor
 
     @staticmethod
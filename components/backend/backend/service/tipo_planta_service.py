@@ -10,6 +10,9 @@ from common.data.util import TipoPlanta as TipoPlantaCommon, ConsejoTipoPlanta a
 
 class TipoPlantaService():
 
+    # Region de la cache de metadatos con los datos de este servicio.
+    REGION_CACHE: str = 'tipos_planta'
+
     @staticmethod
     def create(esquema: Esquema, tipo_planta: str, descripcion_planta: str) -> TipoPlantaCommon:
         session: Session = esquema.new_session()
@@ -25,6 +28,7 @@ class TipoPlantaService():
             raise ex
         finally:
             esquema.remove_session()
+        esquema.get_metadata_cache().invalidate(TipoPlantaService.REGION_CACHE)
         return out
     
     @staticmethod
@@ -33,28 +37,46 @@ class TipoPlantaService():
 
     @staticmethod
     def exists(esquema: Esquema, tipo_planta: str) -> bool:
-        session: Session = esquema.new_session()
-        tipo_planta_exists: bool = TipoPlantaSet.get(session, tipo_planta)
-        esquema.remove_session()
-        return tipo_planta_exists
+        def cargar() -> bool:
+            session: Session = esquema.new_session()
+            try:
+                tipo_planta_exists: bool = TipoPlantaSet.get(session, tipo_planta)
+                return bool(tipo_planta_exists)
+            except Exception as ex:
+                raise ex
+            finally:
+                esquema.remove_session()
+        return esquema.get_metadata_cache().get(TipoPlantaService.REGION_CACHE, ('exists', tipo_planta), cargar)
 
     @staticmethod
     def listAll(esquema: Esquema) -> List[TipoPlantaCommon]:
-        out: List[TipoPlantaCommon] = []
-        session: Session = esquema.new_session()
-        registros_tipo_planta: List[TipoPlanta] = TipoPlantaSet.listAll(session)
-        for tipo_planta in registros_tipo_planta:
-            out.append(TipoPlantaCommon(tipo_planta.tipo_planta,tipo_planta.descripcion_planta))
-        esquema.remove_session()
-        return out
+        def cargar() -> List[TipoPlantaCommon]:
+            out: List[TipoPlantaCommon] = []
+            session: Session = esquema.new_session()
+            try:
+                registros_tipo_planta: List[TipoPlanta] = TipoPlantaSet.listAll(session)
+                for tipo_planta in registros_tipo_planta:
+                    out.append(TipoPlantaCommon(tipo_planta.tipo_planta,tipo_planta.descripcion_planta))
+                return out
+            except Exception as ex:
+                raise ex
+            finally:
+                esquema.remove_session()
+        return esquema.get_metadata_cache().get(TipoPlantaService.REGION_CACHE, ('listAll',), cargar)
 
     @staticmethod
     def get(esquema: Esquema, tipo_planta: str) -> TipoPlantaCommon:
-        session : Session = esquema.new_session()
-        tipo_planta: TipoPlanta = TipoPlantaSet.get(session, tipo_planta)
-        out= TipoPlantaCommon(tipo_planta.tipo_planta,tipo_planta.descripcion_planta)
-        esquema.remove_session()
-        return out
+        def cargar() -> TipoPlantaCommon:
+            session : Session = esquema.new_session()
+            try:
+                registro_tipo_planta: TipoPlanta = TipoPlantaSet.get(session, tipo_planta)
+                out= TipoPlantaCommon(registro_tipo_planta.tipo_planta,registro_tipo_planta.descripcion_planta)
+                return out
+            except Exception as ex:
+                raise ex
+            finally:
+                esquema.remove_session()
+        return esquema.get_metadata_cache().get(TipoPlantaService.REGION_CACHE, ('get', tipo_planta), cargar)
 
     @staticmethod
     def update(esquema: Esquema, tipo_planta: str, descripcion_planta: str) -> TipoPlantaCommon:
@@ -67,6 +89,7 @@ class TipoPlantaService():
             raise ex
         finally:
             esquema.remove_session()
+        esquema.get_metadata_cache().invalidate(TipoPlantaService.REGION_CACHE)
         return out
     
     @staticmethod
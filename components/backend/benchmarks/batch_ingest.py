@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+#Author: Oscar Valverde Escobar
+
+"""
+Comparacion de la insercion de registros de sensores uno a uno (una transaccion y un fsync por registro)
+con la insercion en lote de RegistroSensorService.createBatch (una unica transaccion), para 10, 100 y 1000
+registros, sobre un fichero SQLite temporal.
+
+Uso: python3 benchmarks/batch_ingest.py
+"""
+
+import os
+import tempfile
+import time
+from datetime import datetime
+from typing import List
+from backend.data.config import BackendConfiguration
+from backend.data.db import Esquema
+from backend.service import RegistroSensorService, SensorService
+from common.data.util import TipoSensor, ZonaSensor, UnidadMedida, ModeloSensor, RegistroSensor as RegistroSensorCommon
+
+TAMANOS: List[int] = [10, 100, 1000]
+
+if __name__ == '__main__':
+    with tempfile.TemporaryDirectory() as directorio:
+        cfg: BackendConfiguration = BackendConfiguration()
+        cfg.set_db_connection_string('sqlite:///' + os.path.join(directorio, 'batch_ingest.db'))
+        esquema: Esquema = Esquema(cfg)
+        SensorService.create(esquema, TipoSensor.HUMEDAD, ZonaSensor.MACETA, 1, ModeloSensor.FC28, 'benchmark',
+                             direccion_lectura='MCP3008_0', patilla_0_lectura=8, patilla_1_lectura=0,
+                             unidad_medida_0=UnidadMedida.PORCENTAJE)
+        print('registros  uno a uno   en lote')
+        for tamano in TAMANOS:
+            registros: List[RegistroSensorCommon] = [RegistroSensorCommon(TipoSensor.HUMEDAD, ZonaSensor.MACETA, 1, float(indice),
+                                                                          UnidadMedida.PORCENTAJE, datetime.now())
+                                                     for indice in range(tamano)]
+            inicio: float = time.perf_counter()
+            for registro in registros:
+                RegistroSensorService.createFromCommon(esquema, registro)
+            uno_a_uno: float = time.perf_counter() - inicio
+            inicio = time.perf_counter()
+            RegistroSensorService.createBatch(esquema, registros)
+            en_lote: float = time.perf_counter() - inicio
+            print('%9d %8.1f ms %7.1f ms' % (tamano, uno_a_uno * 1000, en_lote * 1000))
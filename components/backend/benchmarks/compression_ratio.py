@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+#Author: Oscar Valverde Escobar
+
+"""
+Compresion de las lecturas en la ingesta (CompresorLecturas, como en el muestreador) sin compresion, con banda
+muerta y con puerta giratoria, sobre 14 dias de lecturas cada minuto de tres series: temperatura y humedad de un
+DHT11 cuantizadas a 1 unidad y la temperatura de un LM35 con ruido de 0.05. Para cada modo se almacenan las
+lecturas en un fichero SQLite temporal y se miden los registros, la relacion de compresion, el tamano del fichero,
+el coste de la compresion por lectura y la latencia de las consultas de RegistroSensorService. Las medias de 200
+rangos alineados a horas, de 200 rangos no alineados y de los intervalos horarios y diarios de la planta se
+comparan con las obtenidas sin compresion.
+
+Uso: python3 benchmarks/compression_ratio.py
+"""
+
+import json
+import math
+import os
+import random
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Modo: (compresion, desviacion del DHT11, desviacion del LM35).
+MODOS: Dict[str, Tuple[Optional[str], Optional[float], Optional[float]]] = {
+    'sin compresion': (None, None, None),
+    'banda muerta': ('BANDA_MUERTA', 0.0, 0.25),
+    'puerta giratoria': ('PUERTA_GIRATORIA', 0.5, 0.25),
+}
+DIAS_LECTURAS: int = 14
+INTERVALO_LATIDO: float = 3600
+RANGOS_MEDIA: int = 200
+REPETICIONES: int = 5
+SEMILLA: int = 17
+# Segundos de cada lectura tras el inicio del minuto, como las del muestreador, que nunca caen justo en el limite
+# de una hora: los rangos alineados a horas contienen horas completas.
+DESFASE_LECTURA: int = 5
+FECHA_FIN: datetime = datetime(2023, 6, 1)
+FECHA_INICIO: datetime = FECHA_FIN - timedelta(days=DIAS_LECTURAS)
+
+def lecturas() -> List[Tuple[datetime, float, float, float]]:
+    # Ciclo diario con ruido: el DHT11 entrega valores enteros, el LM35 con ruido de medida.
+    aleatorio: random.Random = random.Random(SEMILLA)
+    out: List[Tuple[datetime, float, float, float]] = []
+    for minuto in range(DIAS_LECTURAS * 24 * 60):
+        ciclo: float = math.sin(2 * math.pi * minuto / (24 * 60))
+        temperatura: float = 22 + 5 * ciclo + aleatorio.gauss(0, 0.3)
+        out.append((FECHA_INICIO + timedelta(minutes=minuto, seconds=DESFASE_LECTURA), float(round(temperatura)),
+                    float(round(60 - 12 * ciclo + aleatorio.gauss(0, 0.5))), temperatura + aleatorio.gauss(0, 0.05)))
+    return out
+
+def medir(consulta: Callable) -> float:
+    tiempos: List[float] = []
+    for _ in range(REPETICIONES):
+        inicio: float = time.perf_counter()
+        consulta()
+        tiempos.append(time.perf_counter() - inicio)
+    return min(tiempos) * 1000
+
+def ejecutar(modo: str, directorio: str) -> None:
+    from backend.data.config import BackendConfiguration
+    from backend.data.db import Esquema
+    from backend.data.util.compresor_lecturas import CompresorLecturas
+    from backend.service import PlantaService, TipoPlantaService, SensorService, RegistroSensorService
+    from common.data.util import TipoSensor, ZonaSensor, UnidadMedida, ModeloSensor, CompresionLectura
+    from common.data.util import RegistroSensor as RegistroSensorCommon
+    compresion, desviacion_dht11, desviacion_lm35 = MODOS[modo]
+    compresion_lectura = CompresionLectura[compresion] if compresion is not None else None
+    ruta: str = os.path.join(directorio, modo.replace(' ', '_') + '.db')
+    cfg: BackendConfiguration = BackendConfiguration()
+    cfg.set_db_connection_string('sqlite:///' + ruta)
+    esquema: Esquema = Esquema(cfg)
+    TipoPlantaService.create(esquema, 'Tomatera', 'benchmark')
+    dht11 = SensorService.create(esquema, TipoSensor.TEMPERATURA_Y_HUMEDAD, ZonaSensor.AMBIENTE, 1, ModeloSensor.DHT11,
+                                 'benchmark', direccion_lectura='GPIO', patilla_0_lectura=4,
+                                 unidad_medida_0=UnidadMedida.GRADOS_CENTIGRADOS, unidad_medida_1=UnidadMedida.PORCENTAJE,
+                                 asociar_plantas_activas=False, compresion_lectura=compresion_lectura,
+                                 desviacion_compresion=desviacion_dht11)
+    lm35 = SensorService.create(esquema, TipoSensor.TEMPERATURA, ZonaSensor.AMBIENTE, 2, ModeloSensor.LM35, 'benchmark',
+                                direccion_lectura='MCP3008_0', patilla_0_lectura=8, patilla_1_lectura=0,
+                                unidad_medida_0=UnidadMedida.GRADOS_CENTIGRADOS, asociar_plantas_activas=False,
+                                compresion_lectura=compresion_lectura, desviacion_compresion=desviacion_lm35)
+    PlantaService.create(esquema, 'Tomatera 1', 'Tomatera')
+    # Las lecturas son anteriores al alta de la planta: se adelanta la fecha de asociacion de sus sensores.
+    conexion = sqlite3.connect(ruta)
+    conexion.execute("UPDATE sensores_plantas SET fecha_asociacion = '2020-01-01 00:00:00'")
+    conexion.commit()
+    conexion.close()
+    sensores: Dict = {(sensor.getTipoSensor(), sensor.getZonaSensor(), sensor.getNumeroSensor()): sensor for sensor in (dht11, lm35)}
+    compresor = CompresorLecturas(INTERVALO_LATIDO)
+    registros: List[RegistroSensorCommon] = []
+    numero_lecturas: int = 0
+    tiempo_compresion: float = 0.0
+    for fecha, temperatura, humedad, temperatura_lm35 in lecturas():
+        ciclo: List[RegistroSensorCommon] = [
+            RegistroSensorCommon(TipoSensor.TEMPERATURA_Y_HUMEDAD, ZonaSensor.AMBIENTE, 1, temperatura, UnidadMedida.GRADOS_CENTIGRADOS, fecha),
+            RegistroSensorCommon(TipoSensor.TEMPERATURA_Y_HUMEDAD, ZonaSensor.AMBIENTE, 1, humedad, UnidadMedida.PORCENTAJE, fecha),
+            RegistroSensorCommon(TipoSensor.TEMPERATURA, ZonaSensor.AMBIENTE, 2, temperatura_lm35, UnidadMedida.GRADOS_CENTIGRADOS, fecha)]
+        numero_lecturas += len(ciclo)
+        inicio: float = time.perf_counter()
+        registros.extend(compresor.compress(ciclo, sensores))
+        tiempo_compresion += time.perf_counter() - inicio
+    registros.extend(compresor.flush())
+    RegistroSensorService.createBatch(esquema, registros)
+    tamano: float = os.path.getsize(ruta) / (1024 * 1024)
+    latencias: Dict[str, float] = {
+        'listado 1 dia': medir(lambda: RegistroSensorService.listAllFromSensorBetweenDates(
+            esquema, TipoSensor.TEMPERATURA, ZonaSensor.AMBIENTE, 2, FECHA_FIN - timedelta(days=1), FECHA_FIN)),
+        'listado 14 dias': medir(lambda: RegistroSensorService.listAllFromSensorBetweenDates(
+            esquema, TipoSensor.TEMPERATURA, ZonaSensor.AMBIENTE, 2, FECHA_INICIO, FECHA_FIN)),
+        'media 14 dias': medir(lambda: RegistroSensorService.getAvgFromSensorBetweenDates(
+            esquema, TipoSensor.TEMPERATURA, ZonaSensor.AMBIENTE, 2, FECHA_INICIO + timedelta(minutes=30), FECHA_FIN)),
+        'media 1 dia': medir(lambda: RegistroSensorService.getAvgFromSensorBetweenDates(
+            esquema, TipoSensor.TEMPERATURA, ZonaSensor.AMBIENTE, 2, FECHA_FIN - timedelta(days=1), FECHA_FIN)),
+        'grafica 168 intervalos': medir(lambda: RegistroSensorService.listAllAvgFromPlantGroupByIntervals(
+            esquema, 'Tomatera 1', intervalos(timedelta(hours=1), 168))),
+    }
+    # Medias para comparar con las obtenidas sin compresion, por sensor y unidad de medida.
+    aleatorio: random.Random = random.Random(SEMILLA)
+    medias: Dict[str, List[Optional[float]]] = {'rangos alineados': [], 'rangos no alineados': [], 'intervalos': []}
+    for _ in range(RANGOS_MEDIA):
+        inicio_rango: int = aleatorio.randrange(DIAS_LECTURAS * 24 - 1)
+        fin_rango: int = aleatorio.randrange(inicio_rango + 1, DIAS_LECTURAS * 24)
+        for clave, desplazamiento in (('rangos alineados', 0), ('rangos no alineados', aleatorio.randrange(1, 59))):
+            fecha_inicio: datetime = FECHA_INICIO + timedelta(hours=inicio_rango, minutes=desplazamiento)
+            fecha_fin: datetime = FECHA_INICIO + timedelta(hours=fin_rango, minutes=desplazamiento)
+            for numero, tipo_sensor in ((1, TipoSensor.TEMPERATURA_Y_HUMEDAD), (2, TipoSensor.TEMPERATURA)):
+                medias[clave].extend(valores(RegistroSensorService.getAvgFromSensorBetweenDates(
+                    esquema, tipo_sensor, ZonaSensor.AMBIENTE, numero, fecha_inicio, fecha_fin)))
+    for duracion, numero_intervalos in ((timedelta(hours=1), DIAS_LECTURAS * 24), (timedelta(days=1), DIAS_LECTURAS)):
+        for intervalo in RegistroSensorService.listAllAvgFromPlantGroupByIntervals(esquema, 'Tomatera 1',
+                                                                                  intervalos(duracion, numero_intervalos)):
+            medias['intervalos'].extend(valores(intervalo))
+    with open(os.path.join(directorio, modo.replace(' ', '_') + '.json'), 'w') as fichero:
+        json.dump({'registros': len(registros), 'lecturas': numero_lecturas, 'tamano': tamano,
+                   'compresion_us': tiempo_compresion / numero_lecturas * 1e6, 'latencias': latencias, 'medias': medias}, fichero)
+
+def intervalos(duracion: timedelta, numero_intervalos: int) -> List[Tuple[datetime, datetime]]:
+    return [(FECHA_FIN - duracion * (numero_intervalos - indice), FECHA_FIN - duracion * (numero_intervalos - indice - 1))
+            for indice in range(numero_intervalos)]
+
+def valores(registros) -> List[float]:
+    return [registro.getValor() for registro in sorted(registros, key=lambda registro: (
+        registro.getTipoSensor().name, registro.getNumeroSensor(), registro.getUnidadMedida().name))]
+
+if __name__ == '__main__':
+    if len(sys.argv) == 3:
+        ejecutar(sys.argv[1], sys.argv[2])
+    else:
+        with tempfile.TemporaryDirectory() as directorio:
+            resultados: Dict[str, Dict] = {}
+            for modo in MODOS:
+                subprocess.run([sys.executable, os.path.abspath(__file__), modo, directorio], check=True)
+                with open(os.path.join(directorio, modo.replace(' ', '_') + '.json')) as fichero:
+                    resultados[modo] = json.load(fichero)
+            base: Dict = resultados['sin compresion']
+            print('%-17s %9s %7s %9s %12s' % ('modo', 'registros', 'ratio', 'fichero', 'compresion'))
+            for modo, resultado in resultados.items():
+                print('%-17s %9d %6.1fx %5.1f MiB %7.1f us/lectura' % (
+                    modo, resultado['registros'], base['registros'] / resultado['registros'], resultado['tamano'],
+                    resultado['compresion_us']))
+            print()
+            print('%-23s' % 'consulta' + ''.join('%18s' % modo for modo in resultados))
+            for consulta in base['latencias']:
+                print('%-23s' % consulta + ''.join('%15.2f ms' % resultado['latencias'][consulta] for resultado in resultados.values()))
+            print()
+            print('diferencia maxima de las medias con las de sin compresion')
+            for modo, resultado in resultados.items():
+                if modo == 'sin compresion':
+                    continue
+                print('%-17s' % modo + ''.join('  %s %.2g' % (clave, max(abs(valor - valor_base) for valor, valor_base in zip(
+                    resultado['medias'][clave], base['medias'][clave]))) for clave in base['medias']))
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+#Author: Oscar Valverde Escobar
+
+"""
+Tamano de las respuestas de las graficas de una planta en el formato anidado (por defecto) y en el columnar, sin
+comprimir y con gzip, y tiempo de construccion (la funcion del endpoint) y de serializacion con json.dumps, sobre un
+fichero SQLite temporal con 32 dias de lecturas cada 10 minutos de 4 sensores DHT11. Los endpoints se llaman
+directamente dentro de un contexto de peticion de Flask, sin connexion ni servidor HTTP.
+
+Uso: python3 benchmarks/graph_payload.py
+"""
+
+import gzip
+import json
+import os
+import sqlite3
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Tuple
+from flask import Flask
+from backend.data.config import BackendConfiguration
+from backend.data.db import Esquema
+from backend.presentation.rest import registro_sensor_rest
+from backend.service import PlantaService, TipoPlantaService, SensorService, ConsejoTipoPlantaService, RegistroSensorService
+from common.data.util import TipoSensor, ZonaSensor, UnidadMedida, ModeloSensor, TipoMedida, RegistroSensor as RegistroSensorCommon
+
+SENSORES: int = 4
+DIAS_LECTURAS: int = 32
+FORMATOS: List[str] = ['anidado', 'columnar']
+REPETICIONES: int = 3
+
+def medir(aplicacion: Flask, endpoint: Callable) -> Tuple[int, int, float, float]:
+    construccion: List[float] = []
+    serializacion: List[float] = []
+    for _ in range(REPETICIONES):
+        with aplicacion.test_request_context():
+            inicio: float = time.perf_counter()
+            respuesta = endpoint()
+            construccion.append(time.perf_counter() - inicio)
+        inicio = time.perf_counter()
+        contenido: bytes = json.dumps(respuesta[0]).encode()
+        serializacion.append(time.perf_counter() - inicio)
+    return len(contenido), len(gzip.compress(contenido)), min(construccion) * 1000, min(serializacion) * 1000
+
+def tamano(octetos: int) -> str:
+    return '%.1f KB' % (octetos / 1000) if octetos < 1000000 else '%.2f MB' % (octetos / 1000000)
+
+if __name__ == '__main__':
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta: str = os.path.join(directorio, 'graph_payload.db')
+        cfg: BackendConfiguration = BackendConfiguration()
+        cfg.set_db_connection_string('sqlite:///' + ruta)
+        esquema: Esquema = Esquema(cfg)
+        TipoPlantaService.create(esquema, 'Tomatera', 'benchmark')
+        ConsejoTipoPlantaService.create(esquema, 'benchmark', 'Tomatera', ZonaSensor.AMBIENTE, TipoMedida.TEMPERATURA,
+                                        UnidadMedida.GRADOS_CENTIGRADOS, 10, 30)
+        for numero in range(1, SENSORES + 1):
+            SensorService.create(esquema, TipoSensor.TEMPERATURA_Y_HUMEDAD, ZonaSensor.AMBIENTE, numero, ModeloSensor.DHT11,
+                                 'benchmark', direccion_lectura='GPIO', patilla_0_lectura=4 + numero,
+                                 unidad_medida_0=UnidadMedida.GRADOS_CENTIGRADOS, unidad_medida_1=UnidadMedida.PORCENTAJE,
+                                 asociar_plantas_activas=False)
+        PlantaService.create(esquema, 'Tomatera 1', 'Tomatera')
+        # Las lecturas son anteriores al alta de la planta: se adelanta la fecha de asociacion de sus sensores.
+        conexion = sqlite3.connect(ruta)
+        conexion.execute("UPDATE sensores_plantas SET fecha_asociacion = '2020-01-01 00:00:00'")
+        conexion.commit()
+        conexion.close()
+        ahora: datetime = datetime.now()
+        registros: List[RegistroSensorCommon] = []
+        for indice in range(DIAS_LECTURAS * 24 * 6):
+            for numero in range(1, SENSORES + 1):
+                fecha: datetime = ahora - timedelta(minutes=10 * indice, seconds=numero)
+                registros.append(RegistroSensorCommon(TipoSensor.TEMPERATURA_Y_HUMEDAD, ZonaSensor.AMBIENTE, numero,
+                                                      20 + (indice * 7 + numero) % 11 + 0.37, UnidadMedida.GRADOS_CENTIGRADOS, fecha))
+                registros.append(RegistroSensorCommon(TipoSensor.TEMPERATURA_Y_HUMEDAD, ZonaSensor.AMBIENTE, numero,
+                                                      50 + (indice * 3 + numero) % 13 + 0.61, UnidadMedida.PORCENTAJE, fecha))
+        RegistroSensorService.createBatch(esquema, registros)
+        aplicacion: Flask = Flask(__name__)
+        aplicacion.db = esquema
+        fecha_fin: str = str(ahora)
+        graficas: Dict[str, Callable[[str], Callable]] = {
+            'ToGraph 32 dias': lambda formato: lambda: registro_sensor_rest.getAllFromPlantToGraph('Tomatera 1', format=formato),
+            'BetweenDates 7 dias': lambda formato: lambda: registro_sensor_rest.getAllFromPlantBetweenDatesToGraph(
+                'Tomatera 1', str(ahora - timedelta(days=7)), fecha_fin, format=formato),
+            'BetweenDates 1 dia': lambda formato: lambda: registro_sensor_rest.getAllFromPlantBetweenDatesToGraph(
+                'Tomatera 1', str(ahora - timedelta(days=1)), fecha_fin, format=formato),
+            'AgroupByIntervals 30 dias': lambda formato: lambda: registro_sensor_rest.getAvgFromPlantAgroupByIntervalsToGraph(
+                'Tomatera 1', 30, fecha_fin, format=formato),
+        }
+        print('%d registros' % len(registros))
+        print('%-26s %-9s %10s %9s %12s %11s' % ('grafica', 'formato', 'tamano', 'gzip', 'construccion', 'json.dumps'))
+        for nombre, grafica in graficas.items():
+            for formato in FORMATOS:
+                octetos, octetos_gzip, construccion, serializacion = medir(aplicacion, grafica(formato))
+                print('%-26s %-9s %10s %9s %9.1f ms %8.1f ms' % (nombre, formato, tamano(octetos), tamano(octetos_gzip),
+                                                                construccion, serializacion))
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+#Author: Oscar Valverde Escobar
+
+"""
+Medias por intervalos de una planta (RegistroSensorService.listAllAvgFromPlantGroupByIntervals, la consulta de
+/RegistrosSensores/Avg/FromPlant/AgroupByIntervals/ToGraph) para 1, 7, 14 y 30 dias, con la cache de intervalos
+vacia (frio) y tras una primera peticion (caliente), sobre un fichero SQLite temporal con 32 dias de lecturas
+cada 10 minutos de 4 sensores DHT11. Los intervalos son los de la grafica: de una hora para 1 dia, de 6, 12 y
+24 horas para 7, 14 y 30 dias. En caliente solo se calcula el intervalo en curso.
+
+Uso: python3 benchmarks/interval_cache.py
+"""
+
+import os
+import sqlite3
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Tuple
+from backend.data.config import BackendConfiguration
+from backend.data.db import Esquema
+from backend.service import PlantaService, TipoPlantaService, SensorService, ConsejoTipoPlantaService, RegistroSensorService
+from common.data.util import TipoSensor, ZonaSensor, UnidadMedida, ModeloSensor, TipoMedida, RegistroSensor as RegistroSensorCommon
+
+SENSORES: int = 4
+DIAS_LECTURAS: int = 32
+HORAS_INTERVALO: Dict[int, int] = {1: 1, 7: 6, 14: 12, 30: 24}
+REPETICIONES: int = 3
+
+def intervalos(dias: int, fecha_fin: datetime) -> List[Tuple[datetime, datetime]]:
+    horas: int = HORAS_INTERVALO[dias]
+    # Como en la grafica, el ultimo intervalo es el que esta en curso.
+    fin: datetime = fecha_fin.replace(minute=0, second=0, microsecond=0) + timedelta(hours=horas)
+    numero_intervalos: int = dias * 24 // horas
+    return [(fin - timedelta(hours=horas * (numero_intervalos - indice)), fin - timedelta(hours=horas * (numero_intervalos - indice - 1)))
+            for indice in range(numero_intervalos)]
+
+def medir(esquema: Esquema, lista_intervalos: List[Tuple[datetime, datetime]]) -> Tuple[float, int]:
+    esquema.begin_unit_of_work()
+    inicio: float = time.perf_counter()
+    RegistroSensorService.listAllAvgFromPlantGroupByIntervals(esquema, 'Tomatera 1', lista_intervalos)
+    tiempo: float = time.perf_counter() - inicio
+    return tiempo, esquema.end_unit_of_work()['consultas']
+
+if __name__ == '__main__':
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta: str = os.path.join(directorio, 'interval_cache.db')
+        cfg: BackendConfiguration = BackendConfiguration()
+        cfg.set_db_connection_string('sqlite:///' + ruta)
+        esquema: Esquema = Esquema(cfg)
+        TipoPlantaService.create(esquema, 'Tomatera', 'benchmark')
+        ConsejoTipoPlantaService.create(esquema, 'benchmark', 'Tomatera', ZonaSensor.AMBIENTE, TipoMedida.TEMPERATURA,
+                                        UnidadMedida.GRADOS_CENTIGRADOS, 10, 30)
+        for numero in range(1, SENSORES + 1):
+            SensorService.create(esquema, TipoSensor.TEMPERATURA_Y_HUMEDAD, ZonaSensor.AMBIENTE, numero, ModeloSensor.DHT11,
+                                 'benchmark', direccion_lectura='GPIO', patilla_0_lectura=4 + numero,
+                                 unidad_medida_0=UnidadMedida.GRADOS_CENTIGRADOS, unidad_medida_1=UnidadMedida.PORCENTAJE,
+                                 asociar_plantas_activas=False)
+        PlantaService.create(esquema, 'Tomatera 1', 'Tomatera')
+        # Las lecturas son anteriores al alta de la planta: se adelanta la fecha de asociacion de sus sensores.
+        conexion = sqlite3.connect(ruta)
+        conexion.execute("UPDATE sensores_plantas SET fecha_asociacion = '2020-01-01 00:00:00'")
+        conexion.commit()
+        conexion.close()
+        ahora: datetime = datetime.now()
+        registros: List[RegistroSensorCommon] = []
+        for indice in range(DIAS_LECTURAS * 24 * 6):
+            for numero in range(1, SENSORES + 1):
+                fecha: datetime = ahora - timedelta(minutes=10 * indice, seconds=numero)
+                registros.append(RegistroSensorCommon(TipoSensor.TEMPERATURA_Y_HUMEDAD, ZonaSensor.AMBIENTE, numero,
+                                                      20 + (indice * 7 + numero) % 11, UnidadMedida.GRADOS_CENTIGRADOS, fecha))
+                registros.append(RegistroSensorCommon(TipoSensor.TEMPERATURA_Y_HUMEDAD, ZonaSensor.AMBIENTE, numero,
+                                                      50 + (indice * 3 + numero) % 13, UnidadMedida.PORCENTAJE, fecha))
+        RegistroSensorService.createBatch(esquema, registros)
+        print('%d registros' % len(registros))
+        print('dias  intervalos      frio           caliente')
+        for dias in HORAS_INTERVALO:
+            lista_intervalos: List[Tuple[datetime, datetime]] = intervalos(dias, ahora)
+            frio, consultas_frio = medir(esquema, lista_intervalos)
+            mediciones: List[Tuple[float, int]] = [medir(esquema, lista_intervalos) for _ in range(REPETICIONES)]
+            caliente: float = min(tiempo for tiempo, _ in mediciones)
+            print('%4d %11d %8.1f ms %2d consultas %7.1f ms %2d consultas' % (
+                dias, len(lista_intervalos), frio * 1000, consultas_frio, caliente * 1000, mediciones[-1][1]))
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+#Author: Oscar Valverde Escobar
+
+"""
+Latencia de las lecturas de graficas concurrentes con una rafaga de escrituras del muestreo, con el diario WAL
+y con el diario de rollback (DELETE) de SQLite. Como en el servicio, lectores y escritor son procesos distintos:
+un proceso con cuatro hilos calcula continuamente la media de los ultimos 30 dias de un sensor con 50000
+registros (la consulta de las graficas por intervalos) mientras otro inserta lotes de 20 registros sin pausa.
+
+Uso: python3 benchmarks/journal_contention.py
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+MODOS: List[str] = ['WAL', 'DELETE']
+HILOS_LECTORES: int = 4
+REGISTROS_INICIALES: int = 50000
+REGISTROS_POR_LOTE: int = 20
+DURACION: float = 5.0
+
+def esquema(modo: str, ruta: str):
+    from backend.data.config import BackendConfiguration
+    from backend.data.db import Esquema
+    cfg: BackendConfiguration = BackendConfiguration()
+    cfg.set_db_connection_string('sqlite:///' + ruta)
+    cfg.set_db_journal_mode(modo)
+    return Esquema(cfg)
+
+def preparar(modo: str, ruta: str) -> None:
+    from backend.service import RegistroSensorService, SensorService
+    from common.data.util import TipoSensor, ZonaSensor, UnidadMedida, ModeloSensor, RegistroSensor as RegistroSensorCommon
+    db = esquema(modo, ruta)
+    SensorService.create(db, TipoSensor.HUMEDAD, ZonaSensor.MACETA, 1, ModeloSensor.FC28, 'benchmark',
+                         direccion_lectura='MCP3008_0', patilla_0_lectura=8, patilla_1_lectura=0,
+                         unidad_medida_0=UnidadMedida.PORCENTAJE)
+    ahora: datetime = datetime.now()
+    RegistroSensorService.createBatch(db, [RegistroSensorCommon(TipoSensor.HUMEDAD, ZonaSensor.MACETA, 1, float(indice % 100),
+                                                                UnidadMedida.PORCENTAJE, ahora - timedelta(minutes=10 * indice))
+                                           for indice in range(REGISTROS_INICIALES)])
+
+def leer(modo: str, ruta: str) -> None:
+    from backend.service import RegistroSensorService
+    from common.data.util import TipoSensor, ZonaSensor
+    db = esquema(modo, ruta)
+    latencias: List[float] = []
+    errores: List[Exception] = []
+    fin: float = time.perf_counter() + DURACION
+
+    def lector() -> None:
+        while time.perf_counter() < fin:
+            inicio: float = time.perf_counter()
+            try:
+                RegistroSensorService.getAvgFromSensorBetweenDates(db, TipoSensor.HUMEDAD, ZonaSensor.MACETA, 1,
+                                                                   datetime.now() - timedelta(days=30))
+            except Exception as ex:  # pylint: disable=broad-except
+                errores.append(ex)
+                db.remove_session()
+            latencias.append(time.perf_counter() - inicio)
+
+    hilos: List[threading.Thread] = [threading.Thread(target=lector) for _ in range(HILOS_LECTORES)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    latencias.sort()
+    print('%-6s lecturas %5d  p50 %6.1f ms  p99 %6.1f ms  max %6.1f ms  errores %d' % (
+        modo, len(latencias), latencias[len(latencias) // 2] * 1000, latencias[int(len(latencias) * 0.99)] * 1000,
+        latencias[-1] * 1000, len(errores)), flush=True)
+
+def escribir(modo: str, ruta: str) -> None:
+    from backend.service import RegistroSensorService
+    from common.data.util import TipoSensor, ZonaSensor, UnidadMedida, RegistroSensor as RegistroSensorCommon
+    db = esquema(modo, ruta)
+    latencias: List[float] = []
+    fin: float = time.perf_counter() + DURACION
+    while time.perf_counter() < fin:
+        inicio: float = time.perf_counter()
+        RegistroSensorService.createBatch(db, [RegistroSensorCommon(TipoSensor.HUMEDAD, ZonaSensor.MACETA, 1, 1.0,
+                                                                    UnidadMedida.PORCENTAJE, datetime.now())
+                                               for _ in range(REGISTROS_POR_LOTE)])
+        latencias.append(time.perf_counter() - inicio)
+    latencias.sort()
+    print('%-6s lotes    %5d  p50 %6.1f ms  p99 %6.1f ms  max %6.1f ms' % (
+        modo, len(latencias), latencias[len(latencias) // 2] * 1000, latencias[int(len(latencias) * 0.99)] * 1000,
+        latencias[-1] * 1000), flush=True)
+
+if __name__ == '__main__':
+    if len(sys.argv) == 4:
+        {'preparar': preparar, 'leer': leer, 'escribir': escribir}[sys.argv[1]](sys.argv[2], sys.argv[3])
+    else:
+        for modo in MODOS:
+            with tempfile.TemporaryDirectory() as directorio:
+                ruta: str = os.path.join(directorio, 'journal_contention.db')
+                orden: List[str] = [sys.executable, os.path.abspath(__file__)]
+                subprocess.run(orden + ['preparar', modo, ruta], check=True)
+                procesos = [subprocess.Popen(orden + [papel, modo, ruta]) for papel in ('leer', 'escribir')]
+                for proceso in procesos:
+                    proceso.wait()
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+#Author: Oscar Valverde Escobar
+
+"""
+Coste de la planificacion de las lecturas de PlanificadorLecturas para 1000 y 10000 sensores, repartidos en
+8 buses y con intervalos de lectura entre 1 y 600 segundos, durante una hora de tiempo virtual: cada despertar
+obtiene las lecturas pendientes y salta directamente al instante de la siguiente lectura planificada.
+
+Uso: python3 benchmarks/scheduler_virtual_time.py
+"""
+
+import random
+import time
+from typing import List
+from backend.data.util import PlanificadorLecturas
+
+SENSORES: List[int] = [1000, 10000]
+INTERVALOS: List[int] = [1, 5, 10, 30, 60, 300, 600]
+BUSES: int = 8
+DURACION: float = 3600.0
+
+if __name__ == '__main__':
+    print('sensores   lecturas  esperadas  despertares  CPU (s)  us/lectura  omitidas')
+    for numero_sensores in SENSORES:
+        random.seed(1)
+        intervalos: List[int] = [random.choice(INTERVALOS) for _ in range(numero_sensores)]
+        planificador: PlanificadorLecturas = PlanificadorLecturas(1.0)
+        for sensor, intervalo in enumerate(intervalos):
+            planificador.schedule(sensor, sensor % BUSES, intervalo, 0.0)
+        ahora: float = 0.0
+        lecturas: int = 0
+        despertares: int = 0
+        inicio: float = time.process_time()
+        while ahora < DURACION:
+            lecturas += sum(len(sensores) for sensores in planificador.popDue(ahora).values())
+            despertares += 1
+            ahora = planificador.nextTime()
+        cpu: float = time.process_time() - inicio
+        esperadas: int = sum(int(DURACION) // intervalo + 1 for intervalo in intervalos)
+        print('%8d %10d %10d %12d %8.2f %11.2f %9d' % (numero_sensores, lecturas, esperadas, despertares, cpu,
+                                                     cpu / lecturas * 1e6, planificador.popSkipped()))
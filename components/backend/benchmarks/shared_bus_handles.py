@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+#Author: Oscar Valverde Escobar
+
+"""
+Objetos de bus y de dispositivo creados al dar de alta y al leer 8 sensores FC28 en un mismo MCP3008 y 2
+sensores BH1750, y coste en Python de sus lecturas. Las librerias del hardware (board, busio, digitalio,
+adafruit_mcp3xxx y adafruit_bh1750) se sustituyen en sys.modules por modulos falsos que no hacen E/S y solo
+cuentan las llamadas a sus constructores, por lo que se puede ejecutar en maquinas sin GPIO.
+
+Uso: python3 benchmarks/shared_bus_handles.py
+"""
+
+import collections
+import sys
+import time
+import types
+from typing import List
+
+LECTURAS: int = 20000
+
+CONTADOR: collections.Counter = collections.Counter()
+
+def modulo(nombre: str, **atributos) -> types.ModuleType:
+    falso: types.ModuleType = types.ModuleType(nombre)
+    falso.__dict__.update(atributos)
+    sys.modules[nombre] = falso
+    return falso
+
+class Pin():
+    def __init__(self, numero: int):
+        self.id = numero
+
+def i2c() -> object:
+    CONTADOR['I2C'] += 1
+    return object()
+
+class SPI():
+    def __init__(self, *args, **kwargs):
+        CONTADOR['SPI'] += 1
+
+class DigitalInOut():
+    def __init__(self, *args, **kwargs):
+        CONTADOR['DigitalInOut'] += 1
+
+class ChipSelect():
+    def __init__(self):
+        self.value = True
+
+class BusSPI():
+    def write_readinto(self, salida: bytearray, entrada: bytearray) -> None:
+        # Cuenta de 10 bits distinta para cada canal.
+        cuenta: int = 100 * ((salida[1] >> 4) & 0x07) + 7
+        entrada[0] = 0
+        entrada[1] = (cuenta >> 8) & 0x03
+        entrada[2] = cuenta & 0xff
+
+class DispositivoSPI():
+    def __init__(self):
+        self.spi = BusSPI()
+        self.chip_select = ChipSelect()
+
+    def __enter__(self) -> BusSPI:
+        self.chip_select.value = False
+        return self.spi
+
+    def __exit__(self, *args):
+        self.chip_select.value = True
+
+class MCP3008():
+    def __init__(self, spi, cs):
+        CONTADOR['MCP3008'] += 1
+        self._spi_device = DispositivoSPI()
+        self.__salida: bytearray = bytearray(3)
+        self.__entrada: bytearray = bytearray(3)
+
+    def read(self, canal: int, is_differential: bool = False) -> int:
+        self.__salida[0] = 0x01
+        self.__salida[1] = ((not is_differential) << 7) | (canal << 4)
+        with self._spi_device as spi:
+            spi.write_readinto(self.__salida, self.__entrada)
+        return ((self.__entrada[1] & 0x03) << 8) | self.__entrada[2]
+
+class AnalogIn():
+    def __init__(self, mcp: MCP3008, canal: int):
+        self.__mcp: MCP3008 = mcp
+        self.__canal: int = canal
+
+    @property
+    def value(self) -> int:
+        return self.__mcp.read(self.__canal) << 6
+
+class BH1750():
+    def __init__(self, i2c, address: int = 0x23):
+        CONTADOR['BH1750'] += 1
+        self.lux: float = 100.0
+
+def instalarModulosFalsos() -> None:
+    pines = {'D%d' % numero: Pin(numero) for numero in range(28)}
+    pines.update(SCK=Pin(11), MISO=Pin(9), MOSI=Pin(10), SCK_1=Pin(21), MISO_1=Pin(19), MOSI_1=Pin(20))
+    modulo('board', pin=modulo('board.pin', Pin=Pin), I2C=i2c, **pines)
+    modulo('busio', SPI=SPI)
+    modulo('digitalio', DigitalInOut=DigitalInOut)
+    modulo('adafruit_mcp3xxx', __path__=[])
+    modulo('adafruit_mcp3xxx.mcp3008', MCP3008=MCP3008, **{'P%d' % canal: canal for canal in range(8)})
+    modulo('adafruit_mcp3xxx.analog_in', AnalogIn=AnalogIn)
+    modulo('adafruit_bh1750', BH1750=BH1750)
+
+if __name__ == '__main__':
+    instalarModulosFalsos()
+    from backend.data.electronic import FactoriaSensorElectronico
+    from common.data.util import Sensor as SensorCommon, TipoSensor, ZonaSensor, ModeloSensor, UnidadMedida
+    sensores: List[SensorCommon] = [SensorCommon(TipoSensor.HUMEDAD, ZonaSensor.MACETA, numero, ModeloSensor.FC28, 'fc28_%d' % numero,
+                                                 direccion_lectura='MCP3008_0', patilla_0_lectura=8, patilla_1_lectura=numero,
+                                                 unidad_medida_0=UnidadMedida.PORCENTAJE)
+                                    for numero in range(8)]
+    sensores += [SensorCommon(TipoSensor.LUMINOSIDAD, ZonaSensor.AMBIENTE, numero, ModeloSensor.BH1750, 'bh1750_%d' % numero,
+                              direccion_lectura='I2C', patilla_0_lectura=0x23 + numero, unidad_medida_0=UnidadMedida.LUMENES)
+                 for numero in range(2)]
+    # Las clases de los drivers se importan antes para medir solo el alta de los sensores.
+    for modelo in (ModeloSensor.FC28, ModeloSensor.BH1750):
+        FactoriaSensorElectronico.getDriver(modelo)
+    inicio: float = time.perf_counter()
+    drivers = [FactoriaSensorElectronico.getSensorElectronico(sensor) for sensor in sensores]
+    alta: float = time.perf_counter() - inicio
+    print('alta de 8 FC28 en un MCP3008 y 2 BH1750: %.1f us/sensor, objetos creados %s' % (
+        alta / len(sensores) * 1e6, dict(CONTADOR)))
+    for nombre, drivers_modelo in (('FC28', drivers[:8]), ('BH1750', drivers[8:])):
+        CONTADOR.clear()
+        inicio = time.perf_counter()
+        for indice in range(LECTURAS):
+            drivers_modelo[indice % len(drivers_modelo)].leer_sensor()
+        lectura: float = time.perf_counter() - inicio
+        print('%s: %.2f us/lectura, objetos creados en %d lecturas %s' % (nombre, lectura / LECTURAS * 1e6, LECTURAS,
+                                                                         dict(CONTADOR)))
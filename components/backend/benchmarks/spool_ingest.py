@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+#Author: Oscar Valverde Escobar
+
+"""
+Ingesta sostenida a traves de SpoolRegistros sobre un fichero SQLite temporal: cada 5 ms se anaden los 40
+registros de 20 sensores DHT11 (humedad y temperatura) durante 25 segundos, mientras otra conexion mantiene
+la base de datos bloqueada con BEGIN EXCLUSIVE entre los segundos 5 y 17. Se mide la latencia de las
+adiciones, el maximo de registros pendientes y el tiempo de vaciado final, y se comprueba que todos los
+registros llegan una sola vez a la base de datos.
+
+Uso: python3 benchmarks/spool_ingest.py
+"""
+
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import List
+from backend.data.config import BackendConfiguration
+from backend.data.db import Esquema
+from backend.data.util import SpoolRegistros
+from backend.service import RegistroSensorService, SensorService
+from common.data.util import TipoSensor, ZonaSensor, UnidadMedida, ModeloSensor, RegistroSensor as RegistroSensorCommon
+
+SENSORES: int = 20
+UNIDADES: List[UnidadMedida] = [UnidadMedida.PORCENTAJE, UnidadMedida.GRADOS_CENTIGRADOS]
+PAUSA: float = 0.005
+DURACION: float = 25.0
+INICIO_BLOQUEO: float = 5.0
+DURACION_BLOQUEO: float = 12.0
+
+def bloquear(ruta: str) -> None:
+    conexion = sqlite3.connect(ruta, isolation_level=None)
+    conexion.execute('BEGIN EXCLUSIVE')
+    time.sleep(DURACION_BLOQUEO)
+    conexion.execute('ROLLBACK')
+    conexion.close()
+
+if __name__ == '__main__':
+    # Los fallos de volcado mientras la base de datos esta bloqueada son esperados.
+    logging.basicConfig(level=logging.CRITICAL)
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta: str = os.path.join(directorio, 'spool_ingest.db')
+        cfg: BackendConfiguration = BackendConfiguration()
+        cfg.set_db_connection_string('sqlite:///' + ruta)
+        esquema: Esquema = Esquema(cfg)
+        for numero in range(SENSORES):
+            SensorService.create(esquema, TipoSensor.TEMPERATURA_Y_HUMEDAD, ZonaSensor.AMBIENTE, numero, ModeloSensor.DHT11,
+                                 'benchmark', direccion_lectura='GPIO', patilla_0_lectura=numero, unidad_medida_0=UNIDADES[0],
+                                 unidad_medida_1=UNIDADES[1], asociar_plantas_activas=False)
+        spool: SpoolRegistros = SpoolRegistros(os.path.join(directorio, 'spool_ingest.spool'),
+                                               lambda registros, omitir: RegistroSensorService.createBatch(esquema, registros, omitir))
+        spool.start()
+        threading.Timer(INICIO_BLOQUEO, bloquear, (ruta,)).start()
+        latencias: List[float] = []
+        enviados: int = 0
+        maximo_pendientes: int = 0
+        fecha_base: datetime = datetime(2026, 1, 1)
+        inicio: float = time.monotonic()
+        while time.monotonic() - inicio < DURACION:
+            fecha: datetime = fecha_base + timedelta(seconds=len(latencias))
+            registros: List[RegistroSensorCommon] = [RegistroSensorCommon(TipoSensor.TEMPERATURA_Y_HUMEDAD, ZonaSensor.AMBIENTE, numero,
+                                                                          20.0 + len(latencias) % 7, unidad_medida, fecha)
+                                                     for numero in range(SENSORES) for unidad_medida in UNIDADES]
+            inicio_adicion: float = time.perf_counter()
+            spool.append(registros)
+            latencias.append(time.perf_counter() - inicio_adicion)
+            enviados += len(registros)
+            maximo_pendientes = max(maximo_pendientes, spool.getPendingCount())
+            time.sleep(PAUSA)
+        duracion: float = time.monotonic() - inicio
+        inicio = time.monotonic()
+        while spool.getPendingCount() > 0:
+            time.sleep(0.05)
+        vaciado: float = time.monotonic() - inicio
+        spool.stop()
+        latencias.sort()
+        print('%d registros en %.1f s (%.0f/s), adicion p50 %.2f ms p99 %.2f ms' % (
+            enviados, duracion, enviados / duracion, latencias[len(latencias) // 2] * 1000,
+            latencias[int(len(latencias) * 0.99)] * 1000))
+        print('maximo pendiente %d con la base de datos bloqueada %.0f s, vaciado final %.1f s' % (
+            maximo_pendientes, DURACION_BLOQUEO, vaciado))
+        conexion = sqlite3.connect(ruta)
+        almacenados, distintos = conexion.execute('SELECT count(*), count(DISTINCT numero_sensor || unidad_medida || fecha) '
+                                                  'FROM registros_sensores').fetchone()
+        conexion.close()
+        print('almacenados %d (%d distintos) de %d' % (almacenados, distintos, enviados))
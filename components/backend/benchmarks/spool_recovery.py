@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+#Author: Oscar Valverde Escobar
+
+"""
+Recuperacion de SpoolRegistros tras 24 horas con la base de datos no disponible: 1440 ciclos de un minuto
+de 20 sensores DHT11 (humedad y temperatura) se acumulan en el fichero, el proceso se detiene sin poder
+volcarlos y, al arrancar de nuevo sobre un fichero SQLite temporal, se mide la apertura del fichero y el
+volcado de todos los registros pendientes, omitiendo los que ya existen.
+
+Uso: python3 benchmarks/spool_recovery.py
+"""
+
+import logging
+import os
+import sqlite3
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import List
+from backend.data.config import BackendConfiguration
+from backend.data.db import Esquema
+from backend.data.util import SpoolRegistros
+from backend.service import RegistroSensorService, SensorService
+from common.data.util import TipoSensor, ZonaSensor, UnidadMedida, ModeloSensor, RegistroSensor as RegistroSensorCommon
+
+SENSORES: int = 20
+UNIDADES: List[UnidadMedida] = [UnidadMedida.PORCENTAJE, UnidadMedida.GRADOS_CENTIGRADOS]
+CICLOS: int = 1440
+
+def noDisponible(registros: List[RegistroSensorCommon], omitir: bool) -> None:
+    raise ConnectionError('Base de datos no disponible.')
+
+if __name__ == '__main__':
+    # El volcado fallido al detener el primer proceso es esperado.
+    logging.basicConfig(level=logging.CRITICAL)
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta: str = os.path.join(directorio, 'spool_recovery.db')
+        ruta_spool: str = os.path.join(directorio, 'spool_recovery.spool')
+        spool: SpoolRegistros = SpoolRegistros(ruta_spool, noDisponible)
+        fecha_base: datetime = datetime.now() - timedelta(days=1)
+        inicio: float = time.perf_counter()
+        for ciclo in range(CICLOS):
+            spool.append([RegistroSensorCommon(TipoSensor.TEMPERATURA_Y_HUMEDAD, ZonaSensor.AMBIENTE, numero, 20.0 + ciclo % 11,
+                                               unidad_medida, fecha_base + timedelta(minutes=ciclo))
+                          for numero in range(SENSORES) for unidad_medida in UNIDADES])
+        acumulacion: float = time.perf_counter() - inicio
+        pendientes: int = spool.getPendingCount()
+        spool.stop()
+        print('acumulados %d registros en %d adiciones en %.2f s, fichero de %.0f KiB' % (
+            pendientes, CICLOS, acumulacion, os.path.getsize(ruta_spool) / 1024))
+        cfg: BackendConfiguration = BackendConfiguration()
+        cfg.set_db_connection_string('sqlite:///' + ruta)
+        esquema: Esquema = Esquema(cfg)
+        for numero in range(SENSORES):
+            SensorService.create(esquema, TipoSensor.TEMPERATURA_Y_HUMEDAD, ZonaSensor.AMBIENTE, numero, ModeloSensor.DHT11,
+                                 'benchmark', direccion_lectura='GPIO', patilla_0_lectura=numero, unidad_medida_0=UNIDADES[0],
+                                 unidad_medida_1=UNIDADES[1], asociar_plantas_activas=False)
+        inicio = time.perf_counter()
+        spool = SpoolRegistros(ruta_spool, lambda registros, omitir: RegistroSensorService.createBatch(esquema, registros, omitir))
+        apertura: float = time.perf_counter() - inicio
+        inicio = time.perf_counter()
+        volcados: int = spool.drain()
+        volcado: float = time.perf_counter() - inicio
+        spool.stop()
+        print('apertura %.0f ms con %d pendientes, volcado de %d registros en %.2f s (%.0f/s)' % (
+            apertura * 1000, pendientes, volcados, volcado, volcados / volcado))
+        conexion = sqlite3.connect(ruta)
+        almacenados: int = conexion.execute('SELECT count(*) FROM registros_sensores').fetchone()[0]
+        horarios: int = conexion.execute('SELECT sum(numero_registros) FROM registros_sensores_horarios').fetchone()[0]
+        conexion.close()
+        print('almacenados %d registros, %d en las medias horarias' % (almacenados, horarios))
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+#Author: Oscar Valverde Escobar
+
+"""
+Tiempo de arranque y memoria maxima (RSS) de las importaciones del backend que hace GIH-backend-api-rest
+(backend.data.config, backend.data.db y backend.service), cada una en un proceso nuevo, sin las librerias del
+hardware y con modulos falsos vacios de board, busio, digitalio, adafruit_dht, adafruit_mcp3xxx y adafruit_bh1750
+en la ruta de importacion. Para cada caso se indican tambien los modulos del hardware y los drivers de
+backend.data.electronic cargados y si se ha cargado numpy. Flask y connexion no se importan, por lo que se puede
+ejecutar en maquinas sin GPIO y sin las dependencias de la API REST.
+
+Uso: python3 benchmarks/startup_imports.py
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+REPETICIONES: int = 3
+# Modulos falsos del hardware: ruta relativa del fichero y contenido.
+MODULOS_HARDWARE: Dict[str, str] = {
+    'board/__init__.py': 'SCK = MISO = MOSI = SCK_1 = MISO_1 = MOSI_1 = None\n\ndef I2C():\n    return None\n',
+    'board/pin.py': 'class Pin():\n    def __init__(self, numero):\n        self.id = numero\n',
+    'busio.py': 'class SPI():\n    pass\n',
+    'digitalio.py': 'class DigitalInOut():\n    pass\n',
+    'adafruit_dht.py': 'class DHT11():\n    pass\n',
+    'adafruit_mcp3xxx/__init__.py': '',
+    'adafruit_mcp3xxx/mcp3008.py': 'class MCP3008():\n    pass\n',
+    'adafruit_bh1750.py': 'class BH1750():\n    pass\n',
+}
+NOMBRES_HARDWARE: List[str] = ['board', 'busio', 'digitalio', 'adafruit_dht', 'adafruit_mcp3xxx', 'adafruit_mcp3xxx.mcp3008',
+                               'adafruit_bh1750']
+
+def importar() -> None:
+    import resource
+    import backend.data.config  # pylint: disable=unused-import
+    import backend.data.db  # pylint: disable=unused-import
+    import backend.service  # pylint: disable=unused-import
+    hardware: List[str] = [nombre for nombre in NOMBRES_HARDWARE if nombre in sys.modules]
+    drivers: List[str] = [nombre for nombre in sys.modules if nombre.startswith('backend.data.electronic.')
+                          and nombre != 'backend.data.electronic.factoria_sensor_electronico']
+    print('%d %d %d %d' % (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, len(hardware), len(drivers),
+                           'numpy' in sys.modules))
+
+def medir(ruta_hardware: str) -> None:
+    entorno: Dict[str, str] = dict(os.environ)
+    if ruta_hardware:
+        entorno['PYTHONPATH'] = os.pathsep.join(filter(None, [ruta_hardware, entorno.get('PYTHONPATH')]))
+    tiempos: List[float] = []
+    memorias: List[float] = []
+    for _ in range(REPETICIONES):
+        inicio: float = time.perf_counter()
+        proceso = subprocess.run([sys.executable, os.path.abspath(__file__), 'importar'], env=entorno,
+                                 capture_output=True, text=True)
+        tiempos.append(time.perf_counter() - inicio)
+        if proceso.returncode != 0:
+            print('%-20s error: %s' % ('con hardware falso' if ruta_hardware else 'sin hardware',
+                                       proceso.stderr.strip().splitlines()[-1]))
+            return
+        memoria, hardware, drivers, numpy = (int(valor) for valor in proceso.stdout.split())
+        memorias.append(memoria / 1024)
+    print('%-20s %4.0f-%4.0f ms %6.1f MiB %9d %8d %6s' % (
+        'con hardware falso' if ruta_hardware else 'sin hardware', min(tiempos) * 1000, max(tiempos) * 1000, max(memorias),
+        hardware, drivers, 'si' if numpy else 'no'))
+
+if __name__ == '__main__':
+    if len(sys.argv) == 2:
+        importar()
+    else:
+        with tempfile.TemporaryDirectory() as directorio:
+            for ruta, contenido in MODULOS_HARDWARE.items():
+                os.makedirs(os.path.dirname(os.path.join(directorio, ruta)), exist_ok=True)
+                with open(os.path.join(directorio, ruta), 'w') as fichero:
+                    fichero.write(contenido)
+            print('%-20s %12s %10s %9s %8s %6s' % ('caso', 'tiempo', 'RSS max', 'hardware', 'drivers', 'numpy'))
+            medir('')
+            medir(directorio)
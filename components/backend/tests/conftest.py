@@ -0,0 +1,18 @@
+#Author: Oscar Valverde Escobar
+
+"""
+Configuracion comun de las pruebas. El mapeo de las clases de la base de datos solo puede hacerse una vez
+por proceso, por lo que todas las pruebas comparten el mismo esquema sobre una base de datos en memoria.
+"""
+
+import pytest
+from backend.data.config import BackendConfiguration
+from backend.data.db import Esquema
+
+@pytest.fixture(scope='session')
+def esquema() -> Esquema:
+    configuracion = BackendConfiguration()
+    configuracion.set_db_connection_string('sqlite://')
+    esquema = Esquema(configuracion)
+    yield esquema
+    esquema.remove_session()
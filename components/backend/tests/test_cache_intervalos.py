@@ -0,0 +1,58 @@
+#Author: Oscar Valverde Escobar
+
+"""
+Comprobacion de la cache de intervalos cerrados: un registro almacenado tarde en un intervalo ya cerrado sin pasar
+por el servicio, como los del muestreador desde otro proceso, debe verse en la siguiente peticion.
+"""
+
+from datetime import datetime
+from typing import List, Tuple
+import pytest
+from backend.data.db import Esquema
+from backend.data.db.results import RegistroSensor
+from backend.data.db.resultsets import RegistroSensorAgregadoSet, RegistroSensorSet
+from backend.service import PlantaService, RegistroSensorService, SensorPlantaService, SensorService, TipoPlantaService
+from common.data.util import TipoSensor, ZonaSensor, UnidadMedida, ModeloSensor, RegistroSensor as RegistroSensorCommon
+
+SENSOR: Tuple = (TipoSensor.TEMPERATURA_Y_HUMEDAD, ZonaSensor.AMBIENTE, 4)
+PLANTA: str = 'Pimiento 1'
+INTERVALOS: List[Tuple[datetime, datetime]] = [(datetime(2023, 4, 1, 0), datetime(2023, 4, 1, 1)),
+                                               (datetime(2023, 4, 1, 1), datetime(2023, 4, 1, 2))]
+
+@pytest.fixture(scope='module')
+def datos(esquema: Esquema) -> Esquema:
+    SensorService.create(esquema, *SENSOR, ModeloSensor.DHT11, 'Prueba cache intervalos', direccion_lectura='GPIO',
+                         patilla_0_lectura=22, unidad_medida_0=UnidadMedida.GRADOS_CENTIGRADOS,
+                         unidad_medida_1=UnidadMedida.PORCENTAJE, asociar_plantas_activas=False)
+    TipoPlantaService.create(esquema, 'Pimiento', 'Prueba cache intervalos')
+    PlantaService.create(esquema, PLANTA, 'Pimiento', asociar_sensores_activos=False)
+    SensorPlantaService.create(esquema, *SENSOR, PLANTA, datetime(2023, 1, 1))
+    return esquema
+
+def __media(esquema: Esquema) -> float:
+    intervalos = RegistroSensorService.listAllAvgFromPlantGroupByIntervals(esquema, PLANTA, INTERVALOS)
+    return [registro.getValor() for registro in intervalos[0] if registro.getUnidadMedida() == UnidadMedida.GRADOS_CENTIGRADOS][0]
+
+def test_registro_tardio_de_otro_proceso(datos: Esquema):
+    RegistroSensorService.createBatch(datos, [RegistroSensorCommon(*SENSOR, 10.0, UnidadMedida.GRADOS_CENTIGRADOS,
+                                                                   datetime(2023, 4, 1, 0, 30))])
+    assert __media(datos) == 10.0
+    assert __media(datos) == 10.0
+    # Insercion directa, sin la invalidacion del servicio de este proceso.
+    session = datos.new_session()
+    RegistroSensorSet.createMany(session, [RegistroSensor(*SENSOR, 20.0, UnidadMedida.GRADOS_CENTIGRADOS, datetime(2023, 4, 1, 0, 40))])
+    datos.remove_session()
+    assert __media(datos) == 15.0
+
+def test_registro_modificado_por_otro_proceso(datos: Esquema):
+    registro = RegistroSensorService.createBatch(datos, [RegistroSensorCommon(*SENSOR, 30.0, UnidadMedida.GRADOS_CENTIGRADOS,
+                                                                              datetime(2023, 4, 1, 0, 50))])[0]
+    assert __media(datos) == 20.0
+    # Modificacion directa, recalculando las medias por horas y dias como el servicio de otro proceso.
+    session = datos.new_session()
+    identificador: int = session.query(RegistroSensor.id_).filter_by(fecha=registro.getFecha()).scalar()
+    RegistroSensorSet.update(session, *SENSOR, 60.0, UnidadMedida.GRADOS_CENTIGRADOS, registro.getFecha(), identificador)
+    for agregado in RegistroSensorAgregadoSet.AGREGADOS:
+        RegistroSensorAgregadoSet.rebuild(session, agregado, registro.getFecha(), registro.getFecha())
+    datos.remove_session()
+    assert __media(datos) == 30.0
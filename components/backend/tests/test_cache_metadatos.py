@@ -0,0 +1,72 @@
+#Author: Oscar Valverde Escobar
+
+"""
+Comprobacion de los metodos de lectura de los servicios que pasan por la cache de metadatos: cada uno se
+llama una vez sin datos en la cache (cargandolos de la base de datos) y otra desde la cache, y ambas
+devuelven los datos de prueba.
+"""
+
+import inspect
+from typing import Dict, List, Tuple
+import pytest
+from backend.data.db import Esquema
+from backend.service import (ConsejoPlantaService, ConsejoTipoPlantaService, PlantaService, SensorPlantaService,
+                             SensorService, TipoPlantaService)
+from common.data.util import TipoSensor, ZonaSensor, UnidadMedida, ModeloSensor, TipoMedida
+
+SERVICIOS: List[type] = [ConsejoPlantaService, ConsejoTipoPlantaService, PlantaService, SensorPlantaService,
+                         SensorService, TipoPlantaService]
+
+# Argumentos de los metodos de lectura por nombre de parametro, todos referidos a los datos de prueba.
+ARGUMENTOS: Dict[str, object] = {
+    'tipo_planta': 'Tomatera',
+    'nombre_planta': 'Tomatera 1',
+    'zona_consejo': ZonaSensor.AMBIENTE,
+    'tipo_medida': TipoMedida.TEMPERATURA,
+    'tipo_sensor': TipoSensor.TEMPERATURA_Y_HUMEDAD,
+    'zona_sensor': ZonaSensor.AMBIENTE,
+    'numero_sensor': 1,
+    'modelo_sensor': ModeloSensor.DHT11,
+    'id_': 1,
+}
+
+def __cachedReads() -> List[Tuple[str, object]]:
+    lecturas: List[Tuple[str, object]] = []
+    for servicio in SERVICIOS:
+        for nombre, metodo in inspect.getmembers(servicio, inspect.isfunction):
+            if 'def cargar(' in inspect.getsource(metodo):
+                lecturas.append((servicio.__name__ + '.' + nombre, metodo))
+    return lecturas
+
+LECTURAS: List[Tuple[str, object]] = __cachedReads()
+
+@pytest.fixture(scope='module')
+def datos(esquema: Esquema) -> Esquema:
+    TipoPlantaService.create(esquema, 'Tomatera', 'Prueba')
+    ConsejoTipoPlantaService.create(esquema, 'Prueba', 'Tomatera', ZonaSensor.AMBIENTE, TipoMedida.TEMPERATURA,
+                                    UnidadMedida.GRADOS_CENTIGRADOS, 10, 30)
+    SensorService.create(esquema, TipoSensor.TEMPERATURA_Y_HUMEDAD, ZonaSensor.AMBIENTE, 1, ModeloSensor.DHT11, 'Prueba',
+                         direccion_lectura='GPIO', patilla_0_lectura=4, unidad_medida_0=UnidadMedida.GRADOS_CENTIGRADOS,
+                         unidad_medida_1=UnidadMedida.PORCENTAJE)
+    PlantaService.create(esquema, 'Tomatera 1', 'Tomatera')
+    return esquema
+
+def test_lecturas_cacheadas_encontradas():
+    # Las 47 lecturas de los seis servicios; si se cachea una nueva tambien tiene que probarse.
+    assert len(LECTURAS) == 47
+
+def __toJson(valor: object) -> object:
+    if isinstance(valor, list):
+        return [__toJson(elemento) for elemento in valor]
+    return valor.toJson() if hasattr(valor, 'toJson') else valor
+
+@pytest.mark.parametrize('nombre,metodo', LECTURAS, ids=[nombre for nombre, _ in LECTURAS])
+def test_lectura_cacheada(datos: Esquema, nombre: str, metodo):
+    servicio: type = globals()[nombre.split('.')[0]]
+    argumentos: Dict[str, object] = {parametro: ARGUMENTOS[parametro] for parametro in inspect.signature(metodo).parameters
+                                     if parametro != 'esquema'}
+    datos.get_metadata_cache().invalidate(servicio.REGION_CACHE)
+    cargado = metodo(datos, **argumentos)
+    cacheado = metodo(datos, **argumentos)
+    assert cargado, nombre
+    assert __toJson(cacheado) == __toJson(cargado), nombre
@@ -0,0 +1,81 @@
+#Author: Oscar Valverde Escobar
+
+"""
+Comprobacion del estado almacenado de los registros de los sensores: las inserciones avanzan el ultimo id
+agregado, catchUp solo recalcula los registros posteriores a el y la fecha de compactacion se almacena al
+eliminar registros originales, sin depender del registro mas antiguo.
+"""
+
+from datetime import datetime
+from typing import List, Tuple
+import pytest
+from sqlalchemy import event, insert  # type: ignore
+from backend.data.db import Esquema
+from backend.data.db.results import RegistroSensor, RegistroSensorHorario
+from backend.data.db.resultsets import EstadoRegistrosSensoresSet, RegistroSensorAgregadoSet, RegistroSensorSet
+from backend.service import RegistroSensorService, SensorService
+from common.data.util import TipoSensor, ZonaSensor, UnidadMedida, ModeloSensor, RegistroSensor as RegistroSensorCommon
+
+SENSOR: Tuple = (TipoSensor.TEMPERATURA_Y_HUMEDAD, ZonaSensor.AMBIENTE, 3)
+
+@pytest.fixture(scope='module')
+def datos(esquema: Esquema) -> Esquema:
+    SensorService.create(esquema, *SENSOR, ModeloSensor.DHT11, 'Prueba estado', direccion_lectura='GPIO',
+                         patilla_0_lectura=27, unidad_medida_0=UnidadMedida.GRADOS_CENTIGRADOS,
+                         unidad_medida_1=UnidadMedida.PORCENTAJE)
+    RegistroSensorService.catchUpAggregates(esquema)
+    return esquema
+
+def __estado(esquema: Esquema) -> Tuple:
+    session = esquema.new_session()
+    try:
+        estado = EstadoRegistrosSensoresSet.get(session)
+        return estado.ultimo_id_agregado, EstadoRegistrosSensoresSet.getAggregatedMaxId(session), estado.fecha_compactacion
+    finally:
+        esquema.remove_session()
+
+def test_insercion_avanza_ultimo_id_agregado(datos: Esquema):
+    RegistroSensorService.createBatch(datos, [RegistroSensorCommon(*SENSOR, 20.0 + minuto, UnidadMedida.GRADOS_CENTIGRADOS,
+                                                                   datetime(2023, 3, 1, 10, minuto)) for minuto in range(3)])
+    ultimo_id_agregado, maximo_id, _ = __estado(datos)
+    assert ultimo_id_agregado == maximo_id
+
+def test_catchUp_sin_registros_pendientes_no_recalcula(datos: Esquema):
+    sentencias: List[str] = []
+    def capturar(conexion, cursor, sentencia, parametros, contexto, multiples):  # pylint: disable=unused-argument
+        sentencias.append(sentencia)
+    session = datos.new_session()
+    motor = session.get_bind()
+    event.listen(motor, 'before_cursor_execute', capturar)
+    try:
+        RegistroSensorAgregadoSet.catchUp(session)
+    finally:
+        event.remove(motor, 'before_cursor_execute', capturar)
+        datos.remove_session()
+    assert all(sentencia.lstrip().upper().startswith('SELECT') for sentencia in sentencias), sentencias
+
+def test_catchUp_agrega_registros_pendientes(datos: Esquema):
+    # Registro insertado sin agregar, como por una version anterior o una insercion directa.
+    session = datos.new_session()
+    session.execute(insert(RegistroSensor), [{'tipo_sensor': SENSOR[0], 'zona_sensor': SENSOR[1], 'numero_sensor': SENSOR[2],
+                                              'valor': 30.0, 'unidad_medida': UnidadMedida.GRADOS_CENTIGRADOS,
+                                              'fecha': datetime(2023, 3, 1, 10, 30)}])
+    session.commit()
+    datos.remove_session()
+    RegistroSensorService.catchUpAggregates(datos)
+    ultimo_id_agregado, maximo_id, _ = __estado(datos)
+    assert ultimo_id_agregado == maximo_id
+    session = datos.new_session()
+    intervalo: RegistroSensorHorario = session.query(RegistroSensorHorario).filter_by(
+        tipo_sensor=SENSOR[0], zona_sensor=SENSOR[1], numero_sensor=SENSOR[2], fecha=datetime(2023, 3, 1, 10)).one()
+    assert (intervalo.numero_registros, intervalo.suma_valores) == (4, 93.0)
+    datos.remove_session()
+
+def test_fecha_compactacion_almacenada(datos: Esquema):
+    session = datos.new_session()
+    RegistroSensorSet.deleteBefore(session, datetime(2023, 1, 1, 12), 1000)
+    datos.remove_session()
+    assert __estado(datos)[2] == datetime(2023, 1, 2)
+    # Un registro con fecha anterior no mueve la fecha de compactacion.
+    RegistroSensorService.create(datos, *SENSOR, 15.0, UnidadMedida.GRADOS_CENTIGRADOS, datetime(2022, 12, 1))
+    assert __estado(datos)[2] == datetime(2023, 1, 2)
@@ -0,0 +1,78 @@
+#Author: Oscar Valverde Escobar
+
+"""
+Comprobacion de los planes de consulta de RegistroSensorSet: las lecturas por sensor o planta y rango de fechas,
+sus medias y el filtrado de registros nuevos deben resolverse con el indice de series temporales, y la eliminacion
+de registros antiguos con el indice por fecha, sin recorrer la tabla de registros.
+"""
+
+import re
+from datetime import datetime, timedelta
+from typing import List, Tuple
+import pytest
+from sqlalchemy import event  # type: ignore
+from backend.data.db import Esquema
+from backend.data.db.results import RegistroSensor
+from backend.data.db.resultsets import RegistroSensorSet
+from common.data.util import TipoSensor, ZonaSensor, UnidadMedida
+
+INDICE: str = 'ix_registros_sensores_sensor_fecha'
+INDICE_FECHA: str = 'ix_registros_sensores_fecha'
+
+# Tabla de registros originales, sin las tablas de medias ni la de estado cuyo nombre la contiene.
+TABLA = re.compile(r'\bregistros_sensores\b')
+
+FECHA_FIN: datetime = datetime(2023, 6, 1)
+FECHA_INICIO: datetime = FECHA_FIN - timedelta(days=7)
+# Anterior a todos los registros de las pruebas, para no eliminar ninguno en la base de datos compartida.
+FECHA_ELIMINACION: datetime = datetime(2000, 1, 1)
+
+def __registros() -> List[RegistroSensor]:
+    return [RegistroSensor(TipoSensor.TEMPERATURA_Y_HUMEDAD, ZonaSensor.AMBIENTE, 1, 20.0, UnidadMedida.GRADOS_CENTIGRADOS, fecha)
+            for fecha in (FECHA_INICIO, FECHA_FIN)]
+
+CONSULTAS = {
+    'listAllFromSensor': (INDICE, lambda session: RegistroSensorSet.listAllFromSensor(
+        session, TipoSensor.TEMPERATURA_Y_HUMEDAD, ZonaSensor.AMBIENTE, 1)),
+    'listAllFromSensorBetweenDates': (INDICE, lambda session: RegistroSensorSet.listAllFromSensorBetweenDates(
+        session, TipoSensor.TEMPERATURA_Y_HUMEDAD, ZonaSensor.AMBIENTE, 1, FECHA_INICIO, FECHA_FIN)),
+    'listAllFromPlant': (INDICE, lambda session: RegistroSensorSet.listAllFromPlant(
+        session, 'Tomatera 1', FECHA_INICIO, FECHA_FIN)),
+    'getAvgFromSensorBetweenDates': (INDICE, lambda session: RegistroSensorSet.getAvgFromSensorBetweenDates(
+        session, TipoSensor.TEMPERATURA_Y_HUMEDAD, ZonaSensor.AMBIENTE, 1, FECHA_INICIO, FECHA_FIN)),
+    'getAvgFromTypeAndZoneBetweenDates': (INDICE, lambda session: RegistroSensorSet.getAvgFromTypeAndZoneBetweenDates(
+        session, TipoSensor.TEMPERATURA_Y_HUMEDAD, ZonaSensor.AMBIENTE, FECHA_INICIO, FECHA_FIN)),
+    'getAvgFromPlantGroupByIntervals': (INDICE, lambda session: RegistroSensorSet.getAvgFromPlantGroupByIntervals(
+        session, 'Tomatera 1', FECHA_INICIO, timedelta(hours=6), 28)),
+    'filterNew': (INDICE, lambda session: RegistroSensorSet.filterNew(session, __registros())),
+    'deleteBefore': (INDICE_FECHA, lambda session: RegistroSensorSet.deleteBefore(session, FECHA_ELIMINACION, 1000)),
+}
+
+def __planQuery(esquema: Esquema, consulta) -> List[List[str]]:
+    # Se ejecuta la operacion del conjunto capturando el SQL compilado y los parametros de cada sentencia sobre la
+    # tabla de registros, y se obtiene el plan de cada una.
+    session = esquema.new_session()
+    sentencias: List[Tuple] = []
+    def capturar(conexion, cursor, sentencia, parametros, contexto, multiples):  # pylint: disable=unused-argument
+        if TABLA.search(sentencia):
+            sentencias.append((sentencia, parametros))
+    motor = session.get_bind()
+    event.listen(motor, 'before_cursor_execute', capturar)
+    try:
+        try:
+            consulta(session)
+        finally:
+            event.remove(motor, 'before_cursor_execute', capturar)
+        assert len(sentencias) > 0
+        return [[fila[-1] for fila in session.connection().exec_driver_sql('EXPLAIN QUERY PLAN ' + sentencia, parametros).all()]
+                for sentencia, parametros in sentencias]
+    finally:
+        esquema.remove_session()
+
+@pytest.mark.parametrize('nombre', list(CONSULTAS))
+def test_registro_sensor_set_usa_indice(esquema: Esquema, nombre: str):
+    indice, consulta = CONSULTAS[nombre]
+    planes: List[List[str]] = __planQuery(esquema, consulta)
+    assert any(('USING COVERING INDEX ' + indice) in paso for plan in planes for paso in plan), planes
+    for plan in planes:
+        assert not any(re.match(r'SCAN registros_sensores\b', paso) for paso in plan), plan
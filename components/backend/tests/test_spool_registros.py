@@ -0,0 +1,34 @@
+#Author: Oscar Valverde Escobar
+
+"""
+Comprobacion del volcado del fichero de registros pendientes del muestreo: una linea que no se puede decodificar
+se aparta en el fichero de rechazados y no bloquea los registros posteriores.
+"""
+
+import os
+from datetime import datetime
+from typing import List
+from backend.data.util import SpoolRegistros
+from common.data.util import TipoSensor, ZonaSensor, UnidadMedida, RegistroSensor as RegistroSensorCommon
+
+def __registro(valor: float) -> RegistroSensorCommon:
+    return RegistroSensorCommon(TipoSensor.TEMPERATURA_Y_HUMEDAD, ZonaSensor.AMBIENTE, 1, valor,
+                                UnidadMedida.GRADOS_CENTIGRADOS, datetime(2023, 6, 1, 12), 0)
+
+def test_linea_no_valida_apartada(tmp_path):
+    ruta: str = str(tmp_path / 'registros.spool')
+    # Fichero dejado por una version anterior: un registro valido seguido de dos lineas que ya no se pueden decodificar.
+    lineas_no_validas: bytes = b'["NO_EXISTE", "AMBIENTE", 1, 2.0, "PORCENTAJE", "2023-06-01T12:00:00", null, null]\n{no json\n'
+    with open(ruta, 'wb') as fichero:
+        fichero.write(b'["TEMPERATURA_Y_HUMEDAD", "AMBIENTE", 1, 1.0, "GRADOS_CENTIGRADOS", "2023-06-01T12:00:00", null, null]\n')
+        fichero.write(lineas_no_validas)
+    almacenados: List[RegistroSensorCommon] = []
+    spool = SpoolRegistros(ruta, lambda registros, omitir_existentes: almacenados.extend(registros))
+    spool.append([__registro(3.0)])
+    assert spool.drain() == 2
+    assert [registro.getValor() for registro in almacenados] == [1.0, 3.0]
+    assert spool.getPendingCount() == 0
+    assert os.path.getsize(ruta) == 0
+    with open(ruta + '.rechazados', 'rb') as rechazados:
+        assert rechazados.read() == lineas_no_validas
+    spool.stop()
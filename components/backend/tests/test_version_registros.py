@@ -0,0 +1,44 @@
+#Author: Oscar Valverde Escobar
+
+"""
+Comprobacion de la version de los registros de los sensores (la base de los ETag de las graficas): debe
+cambiar con cada registro nuevo y tambien al modificar un registro ya almacenado.
+"""
+
+from datetime import datetime
+from typing import Tuple
+import pytest
+from backend.data.db import Esquema
+from backend.data.db.resultsets import RegistroSensorAgregadoSet
+from backend.service import RegistroSensorService, SensorService
+from common.data.util import TipoSensor, ZonaSensor, UnidadMedida, ModeloSensor
+
+SENSOR: Tuple = (TipoSensor.TEMPERATURA_Y_HUMEDAD, ZonaSensor.AMBIENTE, 2)
+
+@pytest.fixture(scope='module')
+def datos(esquema: Esquema) -> Esquema:
+    SensorService.create(esquema, *SENSOR, ModeloSensor.DHT11, 'Prueba version', direccion_lectura='GPIO',
+                         patilla_0_lectura=17, unidad_medida_0=UnidadMedida.GRADOS_CENTIGRADOS,
+                         unidad_medida_1=UnidadMedida.PORCENTAJE)
+    return esquema
+
+def __version(esquema: Esquema) -> Tuple:
+    session = esquema.new_session()
+    try:
+        return RegistroSensorAgregadoSet.getVersion(session)
+    finally:
+        esquema.remove_session()
+
+def test_version_cambia_con_registro_nuevo(datos: Esquema):
+    inicial: Tuple = __version(datos)
+    RegistroSensorService.create(datos, *SENSOR, 20.0, UnidadMedida.GRADOS_CENTIGRADOS, datetime(2023, 6, 1, 12))
+    assert __version(datos) != inicial
+
+def test_version_cambia_con_registro_modificado(datos: Esquema):
+    registro = RegistroSensorService.create(datos, *SENSOR, 21.0, UnidadMedida.GRADOS_CENTIGRADOS, datetime(2023, 6, 1, 13))
+    inicial: Tuple = __version(datos)
+    RegistroSensorService.update(datos, *SENSOR, 25.0, UnidadMedida.GRADOS_CENTIGRADOS, registro.getFecha(), registro.getId())
+    modificada: Tuple = __version(datos)
+    assert modificada != inicial
+    RegistroSensorService.update(datos, *SENSOR, 26.0, UnidadMedida.GRADOS_CENTIGRADOS, registro.getFecha(), registro.getId())
+    assert __version(datos) != modificada
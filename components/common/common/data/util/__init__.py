@@ -7,6 +7,8 @@ from .tipo_medida import TipoMedida
 from .tipo_sensor import TipoSensor
 from .zona_sensor import ZonaSensor
 from .modelo_sensor import ModeloSensor
+from .filtro_lectura import FiltroLectura
+from .compresion_lectura import CompresionLectura
 from .registro_sensor import RegistroSensor
 from .planta import Planta
 from .tipo_planta import TipoPlanta
@@ -0,0 +1,33 @@
+""" 
+Enumeracion de metodos de compresion de las lecturas de un sensor antes de almacenarlas.
+"""
+
+from enum import Enum
+
+class CompresionLectura(Enum):
+
+    BANDA_MUERTA = 1, "Banda muerta", "BANDA_MUERTA"
+    PUERTA_GIRATORIA = 2, "Puerta giratoria", "PUERTA_GIRATORIA"
+
+    def __new__(cls, value, nombre, tipo):
+        member = object.__new__(cls)
+        member.__value: int = value
+        member.__nombre: str = nombre
+        member.__tipo: str = tipo
+        return member
+
+    def __int__(self):
+        return self.__value
+
+    def __str__(self):
+        return self.__nombre
+    
+    def getTipo(self):
+        return self.__tipo
+
+    def toJson(self) -> dict:
+        dic={}
+        dic["value"]=int(self)
+        dic["nombre"]=str(self)
+        dic["tipo"]=self.getTipo()
+        return dic
@@ -0,0 +1,34 @@
+""" 
+Enumeracion de filtros para reducir las muestras de una lectura de un sensor a un unico valor.
+"""
+
+from enum import Enum
+
+class FiltroLectura(Enum):
+
+    MEDIANA = 1, "Mediana", "MEDIANA"
+    MEDIA_RECORTADA = 2, "Media recortada", "MEDIA_RECORTADA"
+    MAD = 3, "Media sin valores atipicos (MAD)", "MAD"
+
+    def __new__(cls, value, nombre, tipo):
+        member = object.__new__(cls)
+        member.__value: int = value
+        member.__nombre: str = nombre
+        member.__tipo: str = tipo
+        return member
+
+    def __int__(self):
+        return self.__value
+
+    def __str__(self):
+        return self.__nombre
+    
+    def getTipo(self):
+        return self.__tipo
+
+    def toJson(self) -> dict:
+        dic={}
+        dic["value"]=int(self)
+        dic["nombre"]=str(self)
+        dic["tipo"]=self.getTipo()
+        return dic
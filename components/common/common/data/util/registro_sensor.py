@@ -6,7 +6,8 @@ from common.data.util import TipoSensor, ZonaSensor, TipoMedida, UnidadMedida
 class RegistroSensor:
 
     def __init__(self, tipo_sensor:TipoSensor, zona_sensor:ZonaSensor ,numero_sensor:int, valor:float, 
-                 unidad_medida: UnidadMedida,  fecha:datetime = None, id_: int=0):
+                 unidad_medida: UnidadMedida,  fecha:datetime = None, id_: int=0,
+                 numero_lecturas: int = None, suma_lecturas: float = None):
         self.__tipo_sensor:TipoSensor = tipo_sensor
         self.__zona_sensor:ZonaSensor = zona_sensor
         self.__numero_sensor:int = numero_sensor
@@ -14,6 +15,8 @@ class RegistroSensor:
         self.__unidad_medida:UnidadMedida = unidad_medida
         self.__fecha:datetime = fecha
         self.__id:int = id_
+        self.__numero_lecturas:int = numero_lecturas
+        self.__suma_lecturas:float = suma_lecturas
 
     def getTipoSensor(self) -> TipoSensor:
         return self.__tipo_sensor
@@ -35,6 +38,12 @@ class RegistroSensor:
     
     def getId(self) -> Optional[int]:
         return self.__id
+
+    def getNumeroLecturas(self) -> Optional[int]:
+        return self.__numero_lecturas
+
+    def getSumaLecturas(self) -> Optional[float]:
+        return self.__suma_lecturas
     
     def __str__(self) -> str:
         texto: str = str("El registro " + str(self.getId()) + " del sensor " +  str(self.getNumeroSensor()) + 
@@ -55,6 +64,8 @@ class RegistroSensor:
                             "tipo": self.getUnidadMedida().getTipo()}
         dic["fecha"]=str(self.getFecha())
         dic["id"]=self.getId()
+        dic["numero_lecturas"]=self.getNumeroLecturas()
+        dic["suma_lecturas"]=self.getSumaLecturas()
         return dic
 
     @staticmethod
@@ -65,5 +76,7 @@ class RegistroSensor:
                                 valor=dic.get("valor"),
                                 unidad_medida=UnidadMedida[dic.get("unidad_medida").get("tipo")],
                                 fecha=datetime.fromisoformat(dic.get("fecha")),
-                                id_=dic.get("id"))
+                                id_=dic.get("id"),
+                                numero_lecturas=dic.get("numero_lecturas"),
+                                suma_lecturas=dic.get("suma_lecturas"))
         return sensor
@@ -1,6 +1,6 @@
 from datetime import datetime
 from typing import Optional, Dict, List, Tuple
-from common.data.util import TipoSensor, ZonaSensor, ModeloSensor, TipoMedida, UnidadMedida
+from common.data.util import TipoSensor, ZonaSensor, ModeloSensor, TipoMedida, UnidadMedida, FiltroLectura, CompresionLectura
 from common.data.util import RegistroSensor as RegistroSensorCommon
 
 
@@ -11,7 +11,9 @@ class Sensor:
                  patilla_1_lectura:int=None, patilla_2_lectura:int=None, patilla_3_lectura:int=None,
                  unidad_medida_0:UnidadMedida = UnidadMedida.SIN_UNIDAD, unidad_medida_1:UnidadMedida = UnidadMedida.SIN_UNIDAD, 
                  unidad_medida_2:UnidadMedida = UnidadMedida.SIN_UNIDAD, unidad_medida_3:UnidadMedida = UnidadMedida.SIN_UNIDAD, 
-                 fecha_creacion:datetime = None ,fecha_eliminacion:datetime = None,):
+                 fecha_creacion:datetime = None ,fecha_eliminacion:datetime = None, intervalo_lectura:int = None,
+                 muestras_lectura:int = None, filtro_lectura:FiltroLectura = None,
+                 compresion_lectura:CompresionLectura = None, desviacion_compresion:float = None):
         self.__tipo_sensor: TipoSensor = tipo_sensor
         self.__zona_sensor: ZonaSensor = zona_sensor
         self.__numero_sensor: int = numero_sensor
@@ -22,6 +24,11 @@ class Sensor:
         self.__unidades_medida: List[UnidadMedida] = [unidad_medida_0, unidad_medida_1, unidad_medida_2, unidad_medida_3]
         self.__fecha_creacion: datetime = fecha_creacion
         self.__fecha_eliminacion: datetime = fecha_eliminacion
+        self.__intervalo_lectura: int = intervalo_lectura
+        self.__muestras_lectura: int = muestras_lectura
+        self.__filtro_lectura: FiltroLectura = filtro_lectura
+        self.__compresion_lectura: CompresionLectura = compresion_lectura
+        self.__desviacion_compresion: float = desviacion_compresion
 
     def getTipoSensor(self) -> TipoSensor:
         return self.__tipo_sensor
@@ -94,6 +101,36 @@ class Sensor:
     def setFechaEliminacion(self, fecha_eliminacion:datetime):
         self.__fecha_eliminacion = fecha_eliminacion
 
+    def getIntervaloLectura(self) -> Optional[int]:
+        return self.__intervalo_lectura
+
+    def setIntervaloLectura(self, intervalo_lectura:int):
+        self.__intervalo_lectura = intervalo_lectura
+
+    def getMuestrasLectura(self) -> Optional[int]:
+        return self.__muestras_lectura
+
+    def setMuestrasLectura(self, muestras_lectura:int):
+        self.__muestras_lectura = muestras_lectura
+
+    def getFiltroLectura(self) -> Optional[FiltroLectura]:
+        return self.__filtro_lectura
+
+    def setFiltroLectura(self, filtro_lectura:FiltroLectura):
+        self.__filtro_lectura = filtro_lectura
+
+    def getCompresionLectura(self) -> Optional[CompresionLectura]:
+        return self.__compresion_lectura
+
+    def setCompresionLectura(self, compresion_lectura:CompresionLectura):
+        self.__compresion_lectura = compresion_lectura
+
+    def getDesviacionCompresion(self) -> Optional[float]:
+        return self.__desviacion_compresion
+
+    def setDesviacionCompresion(self, desviacion_compresion:float):
+        self.__desviacion_compresion = desviacion_compresion
+
     def getCode(self) -> int:
         return (int(self.getModeloSensor())*100000000+int(self.getTipoSensor())*1000000+int(self.getZonaSensor())*10000+self.getNumeroSensor())
 
@@ -105,7 +142,10 @@ class Sensor:
           self.getPatillaLectura(1) == other.getPatillaLectura(1) and self.getPatillaLectura(2) == other.getPatillaLectura(2) and
           self.getPatillaLectura(3) == other.getPatillaLectura(3) and self.getUnidadMedida(0) == other.getUnidadMedida(0) and
           self.getUnidadMedida(1) == other.getUnidadMedida(1) and self.getUnidadMedida(2) == other.getUnidadMedida(2) and
-          self.getUnidadMedida(3) == other.getUnidadMedida(3))
+          self.getUnidadMedida(3) == other.getUnidadMedida(3) and self.getIntervaloLectura() == other.getIntervaloLectura() and
+          self.getMuestrasLectura() == other.getMuestrasLectura() and self.getFiltroLectura() == other.getFiltroLectura() and
+          self.getCompresionLectura() == other.getCompresionLectura() and
+          self.getDesviacionCompresion() == other.getDesviacionCompresion())
 
     def __ne__(self, other) -> bool:
       return not self.__eq__(other)
@@ -124,6 +164,11 @@ class Sensor:
                          "\tUnidad de medida 1: " + str(self.getUnidadMedida(1)) + " .\n" +
                          "\tUnidad de medida 2: " + str(self.getUnidadMedida(2)) + " .\n" +
                          "\tUnidad de medida 3: " + str(self.getUnidadMedida(3)) + " .\n" +
+                         "\tIntervalo de lectura: " + str(self.getIntervaloLectura()) + " .\n" +
+                         "\tMuestras por lectura: " + str(self.getMuestrasLectura()) + " .\n" +
+                         "\tFiltro de lectura: " + str(self.getFiltroLectura()) + " .\n" +
+                         "\tCompresion de lecturas: " + str(self.getCompresionLectura()) + " .\n" +
+                         "\tDesviacion de compresion: " + str(self.getDesviacionCompresion()) + " .\n" +
                          "Fue creado en la fecha " + str(self.getFechaCreacion()))
         if self.getFechaEliminacion() is None:
             texto: str  = str(texto + " y sigue activo.")
@@ -156,6 +201,13 @@ class Sensor:
                             "tipo": self.getUnidadMedida(3).getTipo()} if self.getUnidadMedida(3) is not None else None
         dic["fecha_creacion"]=str(self.getFechaCreacion())  if self.getFechaCreacion() is not None else None
         dic["fecha_eliminacion"]=str(self.getFechaEliminacion()) if self.getFechaEliminacion() is not None else None
+        dic["intervalo_lectura"]=self.getIntervaloLectura()
+        dic["muestras_lectura"]=self.getMuestrasLectura()
+        dic["filtro_lectura"]={"nombre": str(self.getFiltroLectura()),
+                            "tipo": self.getFiltroLectura().getTipo()} if self.getFiltroLectura() is not None else None
+        dic["compresion_lectura"]={"nombre": str(self.getCompresionLectura()),
+                            "tipo": self.getCompresionLectura().getTipo()} if self.getCompresionLectura() is not None else None
+        dic["desviacion_compresion"]=self.getDesviacionCompresion()
         return dic
     
     @staticmethod
@@ -175,6 +227,11 @@ class Sensor:
                         unidad_medida_2=UnidadMedida[dic.get("unidad_medida_2").get("tipo")] if dic.get("unidad_medida_2") is not None else UnidadMedida.SIN_UNIDAD, 
                         unidad_medida_3=UnidadMedida[dic.get("unidad_medida_3").get("tipo")] if dic.get("unidad_medida_3") is not None else UnidadMedida.SIN_UNIDAD,
                         fecha_creacion=datetime.fromisoformat(dic.get("fecha_creacion")) if dic.get("fecha_creacion") is not None else None,
-                        fecha_eliminacion=datetime.fromisoformat(dic.get("fecha_eliminacion")) if dic.get("fecha_eliminacion") is not None else None)
+                        fecha_eliminacion=datetime.fromisoformat(dic.get("fecha_eliminacion")) if dic.get("fecha_eliminacion") is not None else None,
+                        intervalo_lectura=dic.get("intervalo_lectura"),
+                        muestras_lectura=dic.get("muestras_lectura"),
+                        filtro_lectura=FiltroLectura[dic.get("filtro_lectura").get("tipo")] if dic.get("filtro_lectura") is not None else None,
+                        compresion_lectura=CompresionLectura[dic.get("compresion_lectura").get("tipo")] if dic.get("compresion_lectura") is not None else None,
+                        desviacion_compresion=dic.get("desviacion_compresion"))
         return sensor
     
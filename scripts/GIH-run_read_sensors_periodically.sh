@@ -12,8 +12,5 @@ path_venv=/GreenInHouse/venv
 cd "$path_venv"/venv_backend/venv_backend_sensors/.venv/bin
 source ./activate
 
-while :
-do
-    ./GIH-backend-read-sensors &
-	sleep $sleep_time
-done
+# Muestreo en un unico proceso persistente: sin solapamiento de ciclos y con compactacion diaria de la base de datos.
+./GIH-backend-sampler $sleep_time
@@ -12,7 +12,7 @@ path_home=/GreenInHouse
 path_script="$path_home"/script
 cd "$path_script"
 
-./GIH-stop_process.sh './GIH-run_read_sensors_periodically.sh' './GIH-backend-read-sensors'
+./GIH-stop_process.sh './GIH-run_read_sensors_periodically.sh' './GIH-backend-read-sensors' './GIH-backend-sampler'
 #lectura periodica de sensores
 $(nohup ./GIH-run_read_sensors_periodically.sh $sleep_read_time >> ./script_log/periodic_read_sensors.out 2>> ./script_log/periodic_read_sensors.err < /dev/null &)
 